@@ -1,6 +1,8 @@
 import calendar
 import datetime
+import itertools
 import numpy
+import os
 import pandas
 import psycopg2
 import psycopg2.extras
@@ -16,12 +18,57 @@ import traceback
 JOIN_COLUMN_SOURCE_NAME = "source_name"
 JOIN_COLUMN_DEST_NAME = "dest_name"
 
+# file formats, for chunked cleanup
+FILE_FORMAT_CSV = "csv"
+FILE_FORMAT_PARQUET = "parquet"
+FILE_FORMAT_SAS7BDAT = "sas7bdat"
+FILE_FORMAT_XPORT = "xport"
+
+# column types, for chunked cleanup
+COLUMN_TYPE_FLOAT = "float"
+COLUMN_TYPE_INT = "int"
+COLUMN_TYPE_STRING = "str"
+
 
 #==============================================================================#
 # functions
 #==============================================================================#
 
 
+def clean_up_sas_string_series( series_IN ):
+
+    '''
+    Accepts a pandas Series of SAS string values (binary strings that come in
+        as "b'<value>'" once converted to str).  Converts the values to
+        strings, replaces missing values (and "nan") with "", and strips the
+        "b'" and "'" from around binary strings, a whole column at a time.
+        Returns the cleaned-up Series.  Used by clean_up_sas_strings() and
+        clean_up_chunk().
+    '''
+
+    # return reference
+    series_OUT = None
+
+    # declare variables
+    binary_string_regex = r"^b'(.*)'$"
+
+    # First, explicitly convert to string (it is a binary string to start).
+    series_OUT = series_IN.astype( 'str' ).fillna( "" )
+
+    # replace all rows that contain "nan" with ""
+    series_OUT = series_OUT.replace( to_replace = "nan", value = "" )
+
+    # For all values that start with "b'" and end with "'", strip that stuff
+    #     off.
+    series_OUT = series_OUT.replace( to_replace = binary_string_regex, value = r"\1", regex = True )
+
+    return series_OUT
+
+#-- END function clean_up_sas_string_series() --#
+
+print( "Function clean_up_sas_string_series() declared at " + str( datetime.datetime.now() ) )
+
+
 def clean_up_sas_strings( df_IN = None ):
 
     '''
@@ -42,8 +89,6 @@ def clean_up_sas_strings( df_IN = None ):
     column_name = ""
     data_type = None
     data_type_name = ""
-    binary_string_regex = r"^b'(.*)'$"
-    temp_series = None
 
     # Make sure we have something passed in.
     if ( df_IN is not None ):
@@ -56,7 +101,7 @@ def clean_up_sas_strings( df_IN = None ):
         column_to_type_series = df_IN.dtypes
 
         # loop.
-        for column_name, data_type in column_to_type_series.iteritems():
+        for column_name, data_type in column_to_type_series.items():
 
             # get name of data type.
             data_type_name = str( data_type )
@@ -68,15 +113,8 @@ def clean_up_sas_strings( df_IN = None ):
 
                 print( "----> column name = " + str( column_name ) + " = " + str( data_type_name ) + "!" )
 
-                # yes.  First, explicitly convert to string (it is a binary string to start).
-                df_IN.loc[ :, column_name ] = df_IN[ column_name ].astype( 'str' )
-
-                # replace all rows that contain "nan" with ""
-                df_IN[ column_name ].replace( to_replace = "nan", value = "", inplace = True )
-
-                # For all values that start with "b'" and end with "'", strip
-                #     that stuff off.
-                df_IN[ column_name ].replace( to_replace = binary_string_regex, value = r"\1", regex = True, inplace = True )
+                # yes.  Convert to string, strip the binary string garbage.
+                df_IN[ column_name ] = clean_up_sas_string_series( df_IN[ column_name ] )
 
             #-- END check to see if data type is "object". --#
 
@@ -213,58 +251,86 @@ print( "Function create_db_sample_csv() declared at " + str( datetime.datetime.n
 
 def is_integer( float_value_IN, is_nan_int_IN = True ):
 
+    '''
+    Accepts a single value.  Returns True if it is a whole number (or if it is
+        NaN and is_nan_int_IN is True), False if not.  To check a whole column
+        or array at once, use is_integer_array().
+    '''
+
     # return reference
     is_integer_OUT = False
 
     # declare variables
     numpy_float = None
-    value_as_string = ""
-    value_as_float = None
-    value_as_int = None
-    value_as_float_again = None
 
     # NaN?
     numpy_float = numpy.float64( float_value_IN )
-    if ( ( numpy_float.dtype == float ) and ( numpy.isnan( numpy_float ) == True ) ):
+    if ( numpy.isnan( numpy_float ) == True ):
 
         # NaN - Do we count NaN as an int?
         is_integer_OUT = is_nan_int_IN
 
+    elif ( numpy.isfinite( numpy_float ) == True ):
+
+        # integer if no fractional part.
+        is_integer_OUT = bool( numpy_float == numpy.floor( numpy_float ) )
+
     else:
 
-        # convert to string, then to float, int, and back to float.
-        value_as_string = str( float_value_IN )
-        #print( "Value = \"" + value_as_string + "\"" )
+        # infinity - not integer.
+        is_integer_OUT = False
+
+    #-- END check to see if NaN --#
 
-        value_as_float = float( value_as_string )
-        #print( "Value as float = \"" + str( value_as_float ) + "\"" )
+    return is_integer_OUT
 
-        value_as_int = int( value_as_float )
-        #print( "Value as int = \"" + str( value_as_int ) + "\"" )
+#-- END function is_integer() --#
 
-        value_as_float_again = float( value_as_int )
-        #print( "Value as float again = \"" + str( value_as_float_again ) + "\"" )
+print( "Function is_integer() declared at " + str( datetime.datetime.now() ) )
 
-        # check if floats are equal
-        if( value_as_float == value_as_float_again ):
 
-            # yes - integer
-            is_integer_OUT = True
+def is_integer_array( value_array_IN, is_nan_int_IN = True ):
 
-        else:
+    '''
+    Vectorized is_integer().  Accepts a NumPy array (any shape), pandas Series
+        or DataFrame of numbers.  Returns a NumPy boolean array the same shape,
+        True where the value is a whole number (or NaN, if is_nan_int_IN is
+        True), False where not (fractional values and infinity).  Checks the
+        whole array at once, rather than one value at a time.
+
+    To see if all values in each column of a 2-D array are integers:
+        is_integer_array( value_array ).all( axis = 0 )
+    '''
 
-            # no - not integer.
-            is_integer_OUT = False
+    # return reference
+    is_integer_array_OUT = None
 
-        #-- END check to see if is integer. --#
+    # declare variables
+    value_array = None
+    nan_array = None
 
-    #-- END check to see if NaN --#
+    # get array of floats.
+    value_array = numpy.asarray( value_array_IN, dtype = numpy.float64 )
 
-    return is_integer_OUT
+    # whole numbers - finite and nothing left over after dividing by 1 (NaN and
+    #     infinity are False here, without warnings).
+    with numpy.errstate( invalid = "ignore" ):
+        is_integer_array_OUT = numpy.isfinite( value_array ) & ( numpy.mod( value_array, 1 ) == 0 )
+    #-- END with numpy.errstate() --#
 
-#-- END function is_integer() --#
+    # Do we count NaN as an int?
+    if ( is_nan_int_IN == True ):
 
-print( "Function is_integer() declared at " + str( datetime.datetime.now() ) )
+        nan_array = numpy.isnan( value_array )
+        is_integer_array_OUT |= nan_array
+
+    #-- END check to see if NaN counts as int --#
+
+    return is_integer_array_OUT
+
+#-- END function is_integer_array() --#
+
+print( "Function is_integer_array() declared at " + str( datetime.datetime.now() ) )
 
 
 def clean_up_floats( df_IN = None, convert_nan_to_IN = -999999 ):
@@ -272,8 +338,10 @@ def clean_up_floats( df_IN = None, convert_nan_to_IN = -999999 ):
     '''
     Checks float columns
 
-    Accepts a pandas DataFrame.  Cleans up values in all "object" columns.
-        Returns the updated DataFrame, or None if error.
+    Accepts a pandas DataFrame.  Checks all "float64" columns at once, using
+        is_integer_array(), and converts any that only contain whole numbers
+        (and NaN) to int, replacing NaN with convert_nan_to_IN.  Returns the
+        updated DataFrame, or None if error.
     '''
 
     # return reference
@@ -285,8 +353,10 @@ def clean_up_floats( df_IN = None, convert_nan_to_IN = -999999 ):
     column_name = ""
     data_type = None
     data_type_name = ""
-    temp_series = None
-    value_count = -1
+    float_column_name_list = None
+    column_is_integer_array = None
+    int_column_name_list = None
+    column_index = -1
 
     # Make sure we have something passed in.
     if ( df_IN is not None ):
@@ -298,42 +368,56 @@ def clean_up_floats( df_IN = None, convert_nan_to_IN = -999999 ):
         # get data types of columns.
         column_to_type_series = df_IN.dtypes
 
-        # loop.
-        for column_name, data_type in column_to_type_series.iteritems():
+        # loop to find float columns.
+        float_column_name_list = []
+        for column_name, data_type in column_to_type_series.items():
 
             # get name of data type.
             data_type_name = str( data_type )
 
             print( "- column name = " + str( column_name ) + "; data type = " + str( data_type_name ) )
 
-            # is it an "object"?
+            # is it a "float64"?
             if ( data_type_name == "float64" ):
 
-                # check to see if all values are integers.
-                temp_series = df_IN[ column_name ].map( is_integer )
+                float_column_name_list.append( column_name )
+
+            #-- END check to see if data type is "float64". --#
+
+        #-- END loop over data types. --#
+
+        # any float columns?
+        if ( len( float_column_name_list ) > 0 ):
 
-                # Any False?
-                value_list = list( temp_series.drop_duplicates() )
-                if ( False not in value_list ):
+            # check to see if all values are integers, all columns in one pass.
+            column_is_integer_array = is_integer_array( df_IN[ float_column_name_list ].to_numpy() ).all( axis = 0 )
 
-                    print( "----> column name = " + str( column_name ) + " = " + str( data_type_name ) + ", is an int!" )
+            int_column_name_list = []
+            for column_index, column_name in enumerate( float_column_name_list ):
 
-                    # no.  Convert column to integer.  Convert NaN to -1...
-                    df_IN.loc[ :, column_name ] = df_IN[ column_name ].fillna( convert_nan_to_IN )
+                if ( column_is_integer_array[ column_index ] == True ):
 
-                    # then store column astype( int ).
-                    df_IN.loc[ :, column_name ] = df_IN[ column_name ].astype( 'int' )
+                    print( "----> column name = " + str( column_name ) + " = float64, is an int!" )
+                    int_column_name_list.append( column_name )
 
                 else:
 
                     # non-integer values.  Do nothing.
-                    print( "----> column name = " + str( column_name ) + " = " + str( data_type_name ) + ", is NOT an int!" )
+                    print( "----> column name = " + str( column_name ) + " = float64, is NOT an int!" )
 
-                #-- END check to see if
+                #-- END check to see if integer column --#
 
-            #-- END check to see if data type is "object". --#
+            #-- END loop over float columns --#
 
-        #-- END loop over data types. --#
+            # Convert integer columns to integer.  Convert NaN to
+            #     convert_nan_to_IN, then store columns astype( int ).
+            if ( len( int_column_name_list ) > 0 ):
+
+                df_IN[ int_column_name_list ] = df_IN[ int_column_name_list ].fillna( convert_nan_to_IN ).astype( 'int' )
+
+            #-- END check to see if any integer columns --#
+
+        #-- END check to see if any float columns --#
 
         # place DataFrame in return reference.
         df_OUT = df_IN
@@ -349,11 +433,381 @@ def clean_up_floats( df_IN = None, convert_nan_to_IN = -999999 ):
 
     return df_OUT
 
-#-- END function clean_up_sas_strings() --#
+#-- END function clean_up_floats() --#
 
 print( "Function clean_up_floats() declared at " + str( datetime.datetime.now() ) )
 
 
+def get_file_format( file_path_IN ):
+
+    '''
+    Accepts a file path.  Returns the format of the file, based on its
+        extension: FILE_FORMAT_SAS7BDAT (".sas7bdat"), FILE_FORMAT_XPORT
+        (".xpt"), FILE_FORMAT_PARQUET (".parquet" or ".pq"), or
+        FILE_FORMAT_CSV (anything else).
+    '''
+
+    # return reference
+    file_format_OUT = None
+
+    # declare variables
+    file_extension = None
+
+    # get extension
+    file_extension = os.path.splitext( file_path_IN )[ 1 ].lower()
+
+    if ( file_extension == ".sas7bdat" ):
+        file_format_OUT = FILE_FORMAT_SAS7BDAT
+    elif ( file_extension == ".xpt" ):
+        file_format_OUT = FILE_FORMAT_XPORT
+    elif ( file_extension in [ ".parquet", ".pq" ] ):
+        file_format_OUT = FILE_FORMAT_PARQUET
+    else:
+        file_format_OUT = FILE_FORMAT_CSV
+    #-- END check of file extension --#
+
+    return file_format_OUT
+
+#-- END function get_file_format() --#
+
+print( "Function get_file_format() declared at " + str( datetime.datetime.now() ) )
+
+
+def read_file_in_chunks( file_path_IN,
+                         chunk_size_IN = 100000,
+                         file_format_IN = None,
+                         encoding_IN = None,
+                         csv_dtype_IN = None ):
+
+    '''
+    Accepts path to a SAS (sas7bdat or xport) or CSV file, and optional chunk
+        size (rows), file format (FILE_FORMAT_*, from extension if not passed
+        in), encoding, and, for CSV, dtype to pass to read_csv().
+        Generator - reads the file chunk_size_IN rows at a time
+        (pandas.read_sas() or pandas.read_csv() with chunksize), yielding a
+        DataFrame per chunk, so the whole file is never in memory.
+    '''
+
+    # declare variables
+    file_format = None
+    reader = None
+    chunk_df = None
+
+    # format
+    file_format = file_format_IN
+    if ( file_format is None ):
+        file_format = get_file_format( file_path_IN )
+    #-- END check to see if format passed in --#
+
+    # open reader
+    if ( file_format in [ FILE_FORMAT_SAS7BDAT, FILE_FORMAT_XPORT ] ):
+        reader = pandas.read_sas( file_path_IN, format = file_format, chunksize = chunk_size_IN, encoding = encoding_IN )
+    elif ( file_format == FILE_FORMAT_CSV ):
+        reader = pandas.read_csv( file_path_IN, chunksize = chunk_size_IN, encoding = encoding_IN, dtype = csv_dtype_IN )
+    else:
+        raise ValueError( "read_file_in_chunks(): can't read file format \"" + str( file_format ) + "\" in chunks." )
+    #-- END check of file format --#
+
+    # read chunks
+    with reader:
+
+        for chunk_df in reader:
+
+            yield chunk_df
+
+        #-- END loop over chunks --#
+
+    #-- END with reader --#
+
+#-- END function read_file_in_chunks() --#
+
+print( "Function read_file_in_chunks() declared at " + str( datetime.datetime.now() ) )
+
+
+def build_chunk_column_type_map( file_path_IN,
+                                 chunk_size_IN = 100000,
+                                 file_format_IN = None,
+                                 encoding_IN = None ):
+
+    '''
+    Accepts path to a SAS or CSV file, and the same chunk options as
+        read_file_in_chunks().  Reads through the file once, chunk by chunk,
+        and decides what type each column should have in every chunk, so
+        cleaned-up chunks all match (a CSV column can be read as int in one
+        chunk, float or strings in another, and a float column can be whole
+        numbers in one chunk but not the next).  Returns a map of column name
+        to one of:
+        - COLUMN_TYPE_STRING - strings in any chunk.  Cleaned up with
+            clean_up_sas_string_series().
+        - COLUMN_TYPE_INT - numbers, all whole numbers or NaN (checked with
+            is_integer_array(), as in clean_up_floats()).
+        - COLUMN_TYPE_FLOAT - numbers, not all whole numbers.
+        - name of the column's pandas dtype - any other type (dates, etc.),
+            left as-is.  If chunks disagree, COLUMN_TYPE_STRING.
+    '''
+
+    # return reference
+    column_to_type_map_OUT = None
+
+    # declare variables
+    chunk_df = None
+    column_name = None
+    column_series = None
+    chunk_column_type = None
+    existing_column_type = None
+
+    column_to_type_map_OUT = {}
+    for chunk_df in read_file_in_chunks( file_path_IN, chunk_size_IN = chunk_size_IN, file_format_IN = file_format_IN, encoding_IN = encoding_IN ):
+
+        for column_name, column_series in chunk_df.items():
+
+            # type of column in this chunk
+            if ( ( column_series.dtype == object ) or ( isinstance( column_series.dtype, pandas.StringDtype ) == True ) ):
+                chunk_column_type = COLUMN_TYPE_STRING
+            elif ( pandas.api.types.is_bool_dtype( column_series.dtype ) == True ):
+                chunk_column_type = str( column_series.dtype )
+            elif ( pandas.api.types.is_integer_dtype( column_series.dtype ) == True ):
+                chunk_column_type = COLUMN_TYPE_INT
+            elif ( pandas.api.types.is_float_dtype( column_series.dtype ) == True ):
+
+                # whole numbers (and NaN)?
+                if ( is_integer_array( column_series.to_numpy() ).all() == True ):
+                    chunk_column_type = COLUMN_TYPE_INT
+                else:
+                    chunk_column_type = COLUMN_TYPE_FLOAT
+                #-- END check to see if all integers --#
+
+            else:
+                chunk_column_type = str( column_series.dtype )
+            #-- END check of column type in chunk --#
+
+            # combine with earlier chunks
+            existing_column_type = column_to_type_map_OUT.get( column_name, None )
+            if ( ( existing_column_type is None ) or ( existing_column_type == chunk_column_type ) ):
+
+                # first chunk, or same as before.
+                column_to_type_map_OUT[ column_name ] = chunk_column_type
+
+            elif ( ( existing_column_type in [ COLUMN_TYPE_INT, COLUMN_TYPE_FLOAT ] ) and ( chunk_column_type in [ COLUMN_TYPE_INT, COLUMN_TYPE_FLOAT ] ) ):
+
+                # numbers, but not all whole numbers.
+                column_to_type_map_OUT[ column_name ] = COLUMN_TYPE_FLOAT
+
+            else:
+
+                # strings in one chunk or types don't agree - strings.
+                column_to_type_map_OUT[ column_name ] = COLUMN_TYPE_STRING
+
+            #-- END check to see how to combine types --#
+
+        #-- END loop over columns --#
+
+    #-- END loop over chunks --#
+
+    return column_to_type_map_OUT
+
+#-- END function build_chunk_column_type_map() --#
+
+print( "Function build_chunk_column_type_map() declared at " + str( datetime.datetime.now() ) )
+
+
+def clean_up_chunk( df_IN, column_to_type_map_IN, convert_nan_to_IN = -999999, lower_case_column_names_IN = True ):
+
+    '''
+    Accepts a chunk of a file as a DataFrame, a map of column names to types
+        from build_chunk_column_type_map(), and optional value to use for NaN
+        in int columns and flag for whether to make column names lower case.
+        Applies the clean_up_sas_strings(), clean_up_floats(), and
+        column_names_to_lower_case() cleanup steps, using the types in the
+        map rather than the types in the chunk, so every chunk comes out the
+        same:
+        - COLUMN_TYPE_STRING - clean_up_sas_string_series().
+        - COLUMN_TYPE_INT - NaN replaced with convert_nan_to_IN, then int.
+        - COLUMN_TYPE_FLOAT - float.
+        - anything else - left as-is.
+        Returns the updated DataFrame.
+    '''
+
+    # return reference
+    df_OUT = None
+
+    # declare variables
+    column_name = None
+    column_type = None
+
+    for column_name, column_type in column_to_type_map_IN.items():
+
+        if ( column_type == COLUMN_TYPE_STRING ):
+            df_IN[ column_name ] = clean_up_sas_string_series( df_IN[ column_name ] )
+        elif ( column_type == COLUMN_TYPE_INT ):
+            df_IN[ column_name ] = df_IN[ column_name ].fillna( convert_nan_to_IN ).astype( 'int64' )
+        elif ( column_type == COLUMN_TYPE_FLOAT ):
+            df_IN[ column_name ] = df_IN[ column_name ].astype( 'float64' )
+        #-- END check of column type --#
+
+    #-- END loop over columns --#
+
+    # lower case column names?
+    if ( lower_case_column_names_IN == True ):
+        df_IN = column_names_to_lower_case( df_IN )
+    #-- END check to see if lower case column names --#
+
+    df_OUT = df_IN
+
+    return df_OUT
+
+#-- END function clean_up_chunk() --#
+
+print( "Function clean_up_chunk() declared at " + str( datetime.datetime.now() ) )
+
+
+def clean_up_file_in_chunks( input_file_path_IN,
+                             output_file_path_IN,
+                             chunk_size_IN = 100000,
+                             input_format_IN = None,
+                             output_format_IN = None,
+                             encoding_IN = None,
+                             output_encoding_IN = "utf-8",
+                             column_to_type_map_IN = None,
+                             convert_nan_to_IN = -999999,
+                             lower_case_column_names_IN = True ):
+
+    '''
+    Streaming version of clean_up_sas_strings(), clean_up_floats(), and
+        column_names_to_lower_case(), for files too big to fit in memory.
+        Accepts path to a SAS (sas7bdat or xport) or CSV file and path to an
+        output file (CSV, or Parquet if the extension is ".parquet"/".pq" or
+        output_format_IN is FILE_FORMAT_PARQUET - needs pyarrow).  Reads the
+        input chunk_size_IN rows at a time, cleans up each chunk with
+        clean_up_chunk(), and appends it to the output, so only one chunk is
+        in memory at a time.
+
+    Column types are decided up front so all chunks match: if no
+        column_to_type_map_IN is passed in, the input is read through once
+        first with build_chunk_column_type_map() (so it is read twice).  To
+        read it once, pass in a map you built or saved from a previous run.
+
+    Returns a dictionary with "chunk_count", "row_count", "column_to_type_map",
+        and "output_file_path".
+    '''
+
+    # return reference
+    status_info_OUT = {}
+
+    # declare variables
+    me = "clean_up_file_in_chunks"
+    output_format = None
+    column_to_type_map = None
+    csv_dtype_map = None
+    column_name = None
+    column_type = None
+    chunk_count = 0
+    row_count = 0
+    chunk_df = None
+    parquet_writer = None
+    arrow_schema = None
+    arrow_table = None
+
+    # output format
+    output_format = output_format_IN
+    if ( output_format is None ):
+        output_format = get_file_format( output_file_path_IN )
+    #-- END check to see if output format passed in --#
+
+    if ( output_format == FILE_FORMAT_PARQUET ):
+
+        # imported here so pyarrow is only needed for Parquet output.
+        import pyarrow
+        import pyarrow.parquet
+
+    elif ( output_format != FILE_FORMAT_CSV ):
+
+        raise ValueError( "In " + me + "(): can't write file format \"" + str( output_format ) + "\"." )
+
+    #-- END check of output format --#
+
+    # column types
+    column_to_type_map = column_to_type_map_IN
+    if ( column_to_type_map is None ):
+
+        print( "In " + me + "(): deciding column types, reading \"" + str( input_file_path_IN ) + "\" at " + str( datetime.datetime.now() ) )
+        column_to_type_map = build_chunk_column_type_map( input_file_path_IN, chunk_size_IN = chunk_size_IN, file_format_IN = input_format_IN, encoding_IN = encoding_IN )
+
+    #-- END check to see if column type map passed in --#
+
+    # read string columns from CSV as strings, so numbers in them stay as they
+    #     are in the file (not "5.0" in chunks where pandas sees floats).
+    csv_dtype_map = {}
+    for column_name, column_type in column_to_type_map.items():
+
+        if ( column_type == COLUMN_TYPE_STRING ):
+            csv_dtype_map[ column_name ] = str
+        #-- END check to see if string column --#
+
+    #-- END loop over column types --#
+
+    try:
+
+        for chunk_df in read_file_in_chunks( input_file_path_IN, chunk_size_IN = chunk_size_IN, file_format_IN = input_format_IN, encoding_IN = encoding_IN, csv_dtype_IN = csv_dtype_map ):
+
+            # clean up...
+            chunk_df = clean_up_chunk( chunk_df, column_to_type_map, convert_nan_to_IN = convert_nan_to_IN, lower_case_column_names_IN = lower_case_column_names_IN )
+
+            # ...and write.
+            if ( output_format == FILE_FORMAT_PARQUET ):
+
+                # first chunk sets schema for the file.
+                if ( parquet_writer is None ):
+
+                    arrow_table = pyarrow.Table.from_pandas( chunk_df, preserve_index = False )
+                    arrow_schema = arrow_table.schema
+                    parquet_writer = pyarrow.parquet.ParquetWriter( output_file_path_IN, arrow_schema )
+
+                else:
+
+                    arrow_table = pyarrow.Table.from_pandas( chunk_df, schema = arrow_schema, preserve_index = False )
+
+                #-- END check to see if first chunk --#
+
+                parquet_writer.write_table( arrow_table )
+
+            else:
+
+                # first chunk creates file and writes header, then append.
+                if ( chunk_count == 0 ):
+                    chunk_df.to_csv( output_file_path_IN, mode = "w", header = True, index = False, encoding = output_encoding_IN )
+                else:
+                    chunk_df.to_csv( output_file_path_IN, mode = "a", header = False, index = False, encoding = output_encoding_IN )
+                #-- END check to see if first chunk --#
+
+            #-- END check of output format --#
+
+            chunk_count += 1
+            row_count += len( chunk_df )
+            print( "In " + me + "(): chunk " + str( chunk_count ) + " written, " + str( row_count ) + " rows so far, at " + str( datetime.datetime.now() ) )
+
+        #-- END loop over chunks --#
+
+    finally:
+
+        if ( parquet_writer is not None ):
+            parquet_writer.close()
+        #-- END check to see if parquet writer --#
+
+    #-- END try...finally --#
+
+    status_info_OUT[ "chunk_count" ] = chunk_count
+    status_info_OUT[ "row_count" ] = row_count
+    status_info_OUT[ "column_to_type_map" ] = column_to_type_map
+    status_info_OUT[ "output_file_path" ] = output_file_path_IN
+
+    return status_info_OUT
+
+#-- END function clean_up_file_in_chunks() --#
+
+print( "Function clean_up_file_in_chunks() declared at " + str( datetime.datetime.now() ) )
+
+
 def output_members( object_IN ):
 
     # declare variables
@@ -1424,143 +1878,570 @@ def create_person_fk( table_name_IN = None,
 print( "Function create_person_fk() declared at " + str( datetime.datetime.now() ) )
 
 
-#check whehter columns with int type contains non-numeric string and return a list of those column names
-def check_int_column_type( df_IN,
-                           column_names_IN,
-                           is_verbose_IN = False):
-    # map column names to counts of errors for each column
-    name_to_value_map = {}
-    current_value_map = {}
-
-    for colmn in column_names_IN:
-        for item in df_IN[colmn]:
-            if type(item) is str:
-                if not item.isdigit():
-                    if ( colmn not in name_to_value_map ):
-                        name_to_value_map[ colmn ] = {}
-                    #-- END check to see if name in map already --#
-                    current_value_map = name_to_value_map[ colmn ]
-
-                    if ( item not in current_value_map ):
-                        current_value_map[ item ] = 0
-                    #-- END check to see if name in map already --#
-
-                    # increment counter for this column
-                    temp_value = current_value_map[ item ]
-                    temp_value += 1
-                    current_value_map[ item ] = temp_value
-
-    if is_verbose_IN:#print( name_to_value_map )
-        for name in name_to_value_map:
-            print( "COLUMN: " + name )
-            value_map = name_to_value_map[ name ]
-            for value in value_map:
-                value_count = value_map[ value ]
-                print( '- ' + value + ' count = ' + str( value_count ) )
+def get_non_digit_string_mask( series_IN ):
+
+    '''
+    Accepts a pandas Series.  Returns a boolean Series, True where the value
+        is a string that is not all digits (str.isdigit() is False), False
+        everywhere else (digit strings, numbers, bytes, NaN).  Uses the pandas
+        string accessor on the string values, so checks them all at once.
+        Columns that can't hold strings (numeric, dates, etc.) are all False.
+    '''
 
-    return name_to_value_map.keys()
+    # return reference
+    mask_OUT = None
 
-print( "Function check_int_column_type() declared at " + str( datetime.datetime.now() ) )
+    # declare variables
+    string_mask = None
+    is_digit_series = None
 
+    # can the column hold strings?
+    if ( ( series_IN.dtype == object ) or ( isinstance( series_IN.dtype, pandas.StringDtype ) == True ) ):
+
+        # which values are strings? (.str fails on columns with none - all
+        #     ints, bytes, etc. - so only use it on the strings.)
+        if ( pandas.api.types.infer_dtype( series_IN, skipna = True ) == "string" ):
+            string_mask = series_IN.notna()
+        else:
+            string_mask = series_IN.apply( isinstance, args = ( str, ) ).astype( bool )
+        #-- END check to see if all strings --#
+
+        mask_OUT = pandas.Series( False, index = series_IN.index )
+        if ( string_mask.any() == True ):
+
+            is_digit_series = series_IN[ string_mask ].astype( str ).str.isdigit()
+            mask_OUT[ string_mask ] = is_digit_series.eq( False ).to_numpy()
+
+        #-- END check to see if any strings --#
 
-# copy raw data to additional column and modify the non-numeric value to nan (-999999)
-def save_rawdata_modify_column_value( df_IN, column_names_IN ,is_verbose_IN = False, nan_default_value_IN = -999999):
-    if type(column_names_IN) is not list:
-        print( 'Error: The second varilabe "Column_names_IN" should be a list. Dataframe unmodified.' )
-        return df_IN
     else:
-        df_OUT=df_IN.copy()
-        for colm_n in column_names_IN:
-            if colm_n in df_OUT.columns:
-                #copy the columns to column_name_raw
-                raw_colm_n=colm_n + '_raw'
-                raw_colm_v=df_OUT[colm_n]
-                df_OUT[raw_colm_n]=raw_colm_v
 
-                #modify the all alpha string to nan_default_value_IN
-                modified_idx=[]
-                ind=0
-                for item in df_OUT[colm_n]:
-                    if type(item) is str:
-                        if not item.isdigit():
-                            modified_idx.append(ind)
-                    ind=ind+1
-                df_OUT.ix[modified_idx,colm_n]=nan_default_value_IN
-            else:
-                print( "Error: The column name {} cannot be found in the dataframe. Dataframe unmodified.".format( colm_n ) )
-                df_OUT=df_IN
-                break
-        return df_OUT
+        # no strings.
+        mask_OUT = pandas.Series( False, index = series_IN.index )
 
-print( "Function save_rawdata_modify_column_value() declared at " + str( datetime.datetime.now() ) )
+    #-- END check to see if column can hold strings --#
 
-# Accepts DataFrame and column name, converts column to in with NaN replaced by -999999.
-def convert_column_to_int( df_IN,
-                           column_name_IN,
+    return mask_OUT
+
+#-- END function get_non_digit_string_mask() --#
+
+print( "Function get_non_digit_string_mask() declared at " + str( datetime.datetime.now() ) )
+
+
+#check whehter columns with int type contains non-numeric string and return a list of those column names
+def check_int_column_type( df_IN,
+                           column_names_IN,
                            is_verbose_IN = False,
-                           float_first_IN = False,
-                           nan_default_value_IN = -999999 ):
+                           return_counts_IN = False ):
 
     '''
-    Accepts a pandas DataFrame and a column name.  Converts any NaN values in
-        column to 0, then converts column to type "int", replacing the old column
-        with the new int column. Returns the updated DataFrame, or None if error.
+    Accepts a pandas DataFrame and a list of names of columns that should hold
+        integers.  Looks for string values in each column that are not all
+        digits (using get_non_digit_string_mask(), a column at a time, rather
+        than a value at a time), and counts each such value.  If
+        is_verbose_IN, prints the counts.  Returns the names of the columns
+        that have non-numeric values or, if return_counts_IN is True, a map of
+        those column names to maps of each non-numeric value to its count.
     '''
 
     # return reference
-    df_OUT = None
+    value_OUT = None
 
     # declare variables
-    current_column = None
-    unique_values_list = None
+    name_to_value_map = {}
+    column_name = None
+    non_digit_mask = None
+    value_count_series = None
+    value_map = None
+    value = None
+    value_count = None
 
-    # Make sure we have something passed in.
-    if ( df_IN is not None ):
+    # map column names to counts of errors for each column
+    for column_name in column_names_IN:
 
-        # got a column name?
-        if ( ( column_name_IN is not None ) and ( column_name_IN != "" ) ):
+        # find non-numeric strings...
+        non_digit_mask = get_non_digit_string_mask( df_IN[ column_name ] )
+        if ( non_digit_mask.any() == True ):
 
-            # convert columns to appropriate types - index, year, quarter, wage,
-            #     hours, and weeks should be integers
-            df_IN[ column_name_IN ] = df_IN[ column_name_IN ].fillna( nan_default_value_IN )
+            # ...and count each value.
+            value_count_series = df_IN[ column_name ][ non_digit_mask ].value_counts( sort = False )
+            name_to_value_map[ column_name ] = value_count_series.to_dict()
 
-            # Check out unique values.
-            unique_values_list = get_distinct_df_column_values( df_IN, column_name_IN, is_verbose_IN )
+        #-- END check to see if any non-numeric strings --#
 
-            # float first?
-            if ( float_first_IN == True ):
+    #-- END loop over columns --#
 
-                # float first...
-                df_IN[ column_name_IN ] = df_IN[ column_name_IN ].astype( float )
+    if ( is_verbose_IN == True ):
 
-            #-- END check to see if float first --#
+        for column_name, value_map in name_to_value_map.items():
 
-            # convert column to int
-            df_IN[ column_name_IN ] = df_IN[ column_name_IN ].astype( int )
+            print( "COLUMN: " + column_name )
+            for value, value_count in value_map.items():
 
-            # store resulting DataFrame so you can return it.
-            df_OUT = df_IN
+                print( '- ' + value + ' count = ' + str( value_count ) )
 
-        else:
+            #-- END loop over values --#
 
-            print( "ERROR - no column name list passed in, so don't know which column to convert." )
-            df_OUT = None
+        #-- END loop over columns --#
+
+    #-- END check to see if verbose --#
 
+    if ( return_counts_IN == True ):
+        value_OUT = name_to_value_map
     else:
+        value_OUT = name_to_value_map.keys()
+    #-- END check to see if return counts --#
 
-        # nothing passed in.  For shame.
-        print( "ERROR - no DataFrame passed in.  Nothing to do." )
-        df_OUT = None
+    return value_OUT
 
-    #-- END check to see if DataFrame passed in. --#
+#-- END function check_int_column_type() --#
 
-    return df_OUT
+print( "Function check_int_column_type() declared at " + str( datetime.datetime.now() ) )
+
+
+# copy raw data to additional column and modify the non-numeric value to nan (-999999)
+def save_rawdata_modify_column_value( df_IN,
+                                      column_names_IN,
+                                      is_verbose_IN = False,
+                                      nan_default_value_IN = -999999,
+                                      is_in_place_IN = False ):
+
+    '''
+    Accepts a pandas DataFrame and a list of names of columns that should hold
+        integers.  For each column, copies the column to "<column_name>_raw",
+        then replaces all string values that are not all digits with
+        nan_default_value_IN, a column at a time (using
+        get_non_digit_string_mask()).  Returns the updated DataFrame.  If the
+        column list is not a list or a column is not in the DataFrame, prints
+        an error and returns the DataFrame unmodified.
+
+    By default, works on a copy of the DataFrame.  To save memory with large
+        DataFrames, set is_in_place_IN to True to skip the copy and update the
+        DataFrame passed in.
+    '''
+
+    # return reference
+    df_OUT = None
+
+    # declare variables
+    missing_column_list = None
+    column_name = None
+    raw_column_name = None
+    column_series = None
+    non_digit_mask = None
+
+    if ( isinstance( column_names_IN, list ) == False ):
+
+        print( 'Error: The second varilabe "Column_names_IN" should be a list. Dataframe unmodified.' )
+        df_OUT = df_IN
+
+    else:
+
+        # check all columns before changing anything.
+        missing_column_list = [ column_name for column_name in column_names_IN if column_name not in df_IN.columns ]
+        if ( len( missing_column_list ) > 0 ):
+
+            print( "Error: The column name {} cannot be found in the dataframe. Dataframe unmodified.".format( missing_column_list[ 0 ] ) )
+            df_OUT = df_IN
+
+        else:
+
+            # copy?
+            if ( is_in_place_IN == True ):
+                df_OUT = df_IN
+            else:
+                df_OUT = df_IN.copy()
+            #-- END check to see if in place --#
+
+            for column_name in column_names_IN:
+
+                #copy the columns to column_name_raw
+                raw_column_name = column_name + '_raw'
+                column_series = df_OUT[ column_name ]
+                df_OUT[ raw_column_name ] = column_series
+
+                #modify the all alpha string to nan_default_value_IN
+                non_digit_mask = get_non_digit_string_mask( column_series )
+                if ( non_digit_mask.any() == True ):
+
+                    # string columns can't hold the default - make them object.
+                    if ( column_series.dtype != object ):
+                        column_series = column_series.astype( object )
+                    #-- END check to see if object column --#
+
+                    df_OUT[ column_name ] = column_series.mask( non_digit_mask, nan_default_value_IN )
+
+                    if ( is_verbose_IN == True ):
+                        print( "- column {}: {} non-numeric values replaced with {}".format( column_name, non_digit_mask.sum(), nan_default_value_IN ) )
+                    #-- END check to see if verbose --#
+
+                #-- END check to see if any non-numeric strings --#
+
+            #-- END loop over columns --#
+
+        #-- END check to see if missing columns --#
+
+    #-- END check to see if column list is list --#
+
+    return df_OUT
+
+#-- END function save_rawdata_modify_column_value() --#
+
+print( "Function save_rawdata_modify_column_value() declared at " + str( datetime.datetime.now() ) )
+
+# Accepts DataFrame and column name, converts column to in with NaN replaced by -999999.
+def convert_column_to_int( df_IN,
+                           column_name_IN,
+                           is_verbose_IN = False,
+                           float_first_IN = False,
+                           nan_default_value_IN = -999999 ):
+
+    '''
+    Accepts a pandas DataFrame and a column name.  Converts any NaN values in
+        column to 0, then converts column to type "int", replacing the old column
+        with the new int column. Returns the updated DataFrame, or None if error.
+    '''
+
+    # return reference
+    df_OUT = None
+
+    # declare variables
+    current_column = None
+    unique_values_list = None
+
+    # Make sure we have something passed in.
+    if ( df_IN is not None ):
+
+        # got a column name?
+        if ( ( column_name_IN is not None ) and ( column_name_IN != "" ) ):
+
+            # convert columns to appropriate types - index, year, quarter, wage,
+            #     hours, and weeks should be integers
+            df_IN[ column_name_IN ] = df_IN[ column_name_IN ].fillna( nan_default_value_IN )
+
+            # Check out unique values.
+            unique_values_list = get_distinct_df_column_values( df_IN, column_name_IN, is_verbose_IN )
+
+            # float first?
+            if ( float_first_IN == True ):
+
+                # float first...
+                df_IN[ column_name_IN ] = df_IN[ column_name_IN ].astype( float )
+
+            #-- END check to see if float first --#
+
+            # convert column to int
+            df_IN[ column_name_IN ] = df_IN[ column_name_IN ].astype( int )
+
+            # store resulting DataFrame so you can return it.
+            df_OUT = df_IN
+
+        else:
+
+            print( "ERROR - no column name list passed in, so don't know which column to convert." )
+            df_OUT = None
+
+    else:
+
+        # nothing passed in.  For shame.
+        print( "ERROR - no DataFrame passed in.  Nothing to do." )
+        df_OUT = None
+
+    #-- END check to see if DataFrame passed in. --#
+
+    return df_OUT
 
 #-- END function convert_column_to_int() --#
 
 print( "Function convert_column_to_int() declared at " + str( datetime.datetime.now() ) )
 
 
+def get_column_db_type( cursor_IN, table_name_IN, column_name_IN ):
+
+    '''
+    Accepts cursor, table name (can include schema: "schema.table"), and
+        column name.  Returns the column's PostgreSQL type, as it would be
+        written in SQL ("integer", "character varying(255)", etc.), or None if
+        column not found.
+    '''
+
+    # return reference
+    type_OUT = None
+
+    # declare variables
+    sql_string = ""
+    current_row = None
+
+    # look up the type in the catalog.
+    sql_string = "SELECT format_type( a.atttypid, a.atttypmod ) AS column_type"
+    sql_string += " FROM pg_attribute a"
+    sql_string += " WHERE a.attrelid = CAST( %s AS regclass )"
+    sql_string += "     AND a.attname = %s"
+    sql_string += "     AND NOT a.attisdropped;"
+    cursor_IN.execute( sql_string, ( table_name_IN, column_name_IN ) )
+    current_row = cursor_IN.fetchone()
+
+    if ( current_row is not None ):
+
+        type_OUT = current_row[ 0 ]
+
+    #-- END check to see if column found --#
+
+    return type_OUT
+
+#-- END function get_column_db_type() --#
+
+print( "Function get_column_db_type() declared at " + str( datetime.datetime.now() ) )
+
+
+def execute_batched( connection_IN,
+                     sql_string_IN,
+                     param_list_IN,
+                     page_size_IN = 1000,
+                     commit_interval_IN = None,
+                     use_execute_values_IN = False,
+                     template_IN = None,
+                     debug_flag_IN = False ):
+
+    '''
+    Accepts connection, SQL with placeholders, and list (or other iterable) of
+        parameter tuples or dictionaries.  Runs the SQL once for each set of
+        parameters, with the parameters bound (not pasted into the SQL),
+        page_size_IN sets of parameters per round trip to the server:
+        - if use_execute_values_IN is True, with
+            psycopg2.extras.execute_values() - SQL has a single "VALUES %s"
+            placeholder, filled in with a row per set of parameters (using
+            template_IN, if passed in).
+        - if not, with psycopg2.extras.execute_batch().
+
+    Commits each time commit_interval_IN sets of parameters have been run
+        (checked after each page), and at the end.  If commit_interval_IN is
+        None, commits once, at the end.  If it is 0, never commits, so the
+        caller can manage the transaction.  Exceptions are not caught - caller
+        should roll back.
+
+    Returns the number of sets of parameters run.
+    '''
+
+    # return reference
+    count_OUT = 0
+
+    # declare variables
+    work_cursor = None
+    param_iterator = None
+    page_size = None
+    current_page = None
+    uncommitted_count = 0
+
+    # init
+    page_size = page_size_IN
+    if ( ( page_size is None ) or ( page_size <= 0 ) ):
+        page_size = 1000
+    #-- END check to see if page size --#
+    param_iterator = iter( param_list_IN )
+
+    work_cursor = connection_IN.cursor()
+
+    try:
+
+        # loop over pages of parameters.
+        current_page = list( itertools.islice( param_iterator, page_size ) )
+        while ( len( current_page ) > 0 ):
+
+            if ( use_execute_values_IN == True ):
+
+                psycopg2.extras.execute_values( work_cursor, sql_string_IN, current_page, template = template_IN, page_size = page_size )
+
+            else:
+
+                psycopg2.extras.execute_batch( work_cursor, sql_string_IN, current_page, page_size = page_size )
+
+            #-- END check to see how to execute --#
+
+            count_OUT += len( current_page )
+            uncommitted_count += len( current_page )
+
+            # commit?
+            if ( ( commit_interval_IN is not None )
+                and ( commit_interval_IN > 0 )
+                and ( uncommitted_count >= commit_interval_IN ) ):
+
+                connection_IN.commit()
+                uncommitted_count = 0
+
+            #-- END check to see if time to commit --#
+
+            if ( debug_flag_IN == True ):
+                print( "====> DEBUG - " + str( count_OUT ) + " parameter sets run - " + str( datetime.datetime.now() ) )
+            #-- END debug --#
+
+            current_page = list( itertools.islice( param_iterator, page_size ) )
+
+        #-- END loop over pages --#
+
+        # commit the rest.
+        if ( ( uncommitted_count > 0 )
+            and ( ( commit_interval_IN is None ) or ( commit_interval_IN > 0 ) ) ):
+
+            connection_IN.commit()
+
+        #-- END check to see if anything left to commit --#
+
+    finally:
+
+        work_cursor.close()
+
+    #-- END try...finally --#
+
+    return count_OUT
+
+#-- END function execute_batched() --#
+
+print( "Function execute_batched() declared at " + str( datetime.datetime.now() ) )
+
+
+def update_column_values_batched( connection_IN,
+                                  table_name_IN,
+                                  column_name_IN,
+                                  id_value_list_IN,
+                                  id_column_name_IN = "id",
+                                  column_db_type_IN = None,
+                                  batch_size_IN = 1000,
+                                  debug_flag_IN = False ):
+
+    '''
+    Accepts connection, table and column names, and list of ( id, value )
+        tuples.  Sets the column to each value in the row with that ID, with
+        one UPDATE...FROM ( VALUES ... ) per batch_size_IN rows, committing
+        after each batch ( execute_batched() ).  Values are cast to the
+        column's type (looked up if column_db_type_IN not passed in).
+
+    If a batch fails with a psycopg2.IntegrityError (a UNIQUE constraint, for
+        example) or psycopg2.DataError (a value that can't be cast to the
+        column's type), it is rolled back and redone one row at a time, and
+        the rows that fail on their own are not updated.  If the column isn't
+        found, raises ValueError.
+
+    Returns map with "updated_count" (rows updated) and "failed_list" (list of
+        ( id, value, exception ) tuples for rows that could not be updated).
+    '''
+
+    # return reference
+    status_info_OUT = {}
+    failed_list_OUT = []
+    status_info_OUT[ "updated_count" ] = 0
+    status_info_OUT[ "failed_list" ] = failed_list_OUT
+
+    # declare variables
+    work_cursor = None
+    column_db_type = None
+    batch_size = None
+    sql_string = ""
+    row_sql_string = ""
+    template_string = ""
+    id_value_list = None
+    batch_start = -1
+    current_batch = None
+    current_id = None
+    current_value = None
+    updated_count = 0
+
+    # init
+    id_value_list = list( id_value_list_IN )
+    batch_size = batch_size_IN
+    if ( ( batch_size is None ) or ( batch_size <= 0 ) ):
+        batch_size = 1000
+    #-- END check to see if batch size --#
+
+    # anything to update?
+    if ( len( id_value_list ) > 0 ):
+
+        # column type
+        column_db_type = column_db_type_IN
+        if ( column_db_type is None ):
+
+            work_cursor = connection_IN.cursor()
+            column_db_type = get_column_db_type( work_cursor, table_name_IN, column_name_IN )
+            work_cursor.close()
+
+        #-- END check to see if column type passed in --#
+
+        if ( column_db_type is None ):
+            raise ValueError( "column " + str( column_name_IN ) + " not found in table " + str( table_name_IN ) + ", so can't update it." )
+        #-- END check to see if column found --#
+
+        # SQL - one statement per batch...
+        sql_string = "UPDATE " + table_name_IN + " AS t"
+        sql_string += " SET " + column_name_IN + " = update_values.new_value"
+        sql_string += " FROM ( VALUES %s ) AS update_values ( id_value, new_value )"
+        sql_string += " WHERE t." + id_column_name_IN + " = update_values.id_value;"
+        template_string = "( %s, CAST( %s AS " + column_db_type + " ) )"
+
+        # ...and one per row, in case batch fails.
+        row_sql_string = "UPDATE " + table_name_IN
+        row_sql_string += " SET " + column_name_IN + " = CAST( %s AS " + column_db_type + " )"
+        row_sql_string += " WHERE " + id_column_name_IN + " = %s;"
+
+        # loop over batches.
+        batch_start = 0
+        while ( batch_start < len( id_value_list ) ):
+
+            current_batch = id_value_list[ batch_start : batch_start + batch_size ]
+
+            # use try to capture UNIQUE constraint violations and bad values.
+            try:
+
+                updated_count += execute_batched( connection_IN,
+                                                  sql_string,
+                                                  current_batch,
+                                                  page_size_IN = batch_size,
+                                                  commit_interval_IN = batch_size,
+                                                  use_execute_values_IN = True,
+                                                  template_IN = template_string,
+                                                  debug_flag_IN = debug_flag_IN )
+
+            except ( psycopg2.IntegrityError, psycopg2.DataError ) as pie:
+
+                # rollback, then redo batch one row at a time.
+                connection_IN.rollback()
+                print( "psycopg2." + type( pie ).__name__ + " caught: " + str( pie ) + " - updating " + str( len( current_batch ) ) + " rows one at a time." )
+
+                work_cursor = connection_IN.cursor()
+                for current_id, current_value in current_batch:
+
+                    try:
+
+                        work_cursor.execute( row_sql_string, ( current_value, current_id ) )
+                        connection_IN.commit()
+                        updated_count += 1
+
+                    except ( psycopg2.IntegrityError, psycopg2.DataError ) as row_pie:
+
+                        connection_IN.rollback()
+                        failed_list_OUT.append( ( current_id, current_value, row_pie ) )
+
+                    #-- END try-except to catch psycopg2.IntegrityError and DataError --#
+
+                #-- END loop over rows in batch --#
+                work_cursor.close()
+
+            #-- END try-except to catch psycopg2.IntegrityError and DataError --#
+
+            batch_start += batch_size
+
+        #-- END loop over batches --#
+
+    #-- END check to see if anything to update --#
+
+    status_info_OUT[ "updated_count" ] = updated_count
+
+    return status_info_OUT
+
+#-- END function update_column_values_batched() --#
+
+print( "Function update_column_values_batched() declared at " + str( datetime.datetime.now() ) )
+
+
 def convert_empty_ints( cursor_IN,
                         table_name_IN = None,
                         empty_value_IN = "-999999",
@@ -1576,7 +2457,9 @@ def convert_empty_ints( cursor_IN,
     Looks for integer columns in the table passed in.  For each integer column,
         looks for rows that contain the empty value.  If any rows with that value,
         updates the table, setting rows with that value to the "replace_with_IN"
-        value.
+        value.  Empty values are counted for all columns in one query, and
+        replaced in all columns in one UPDATE, with values bound as parameters
+        ("NULL" is bound as None).
     '''
 
     # declare variables
@@ -1587,23 +2470,40 @@ def convert_empty_ints( cursor_IN,
     empty_value = ""
     replace_with = ""
     current_row = None
+    schema_name = ""
+    count_sql_list = None
+    set_sql_list = None
+    where_sql_list = None
+    column_name = ""
+    current_empty_count = -1
+    param_map = None
 
     # initialize
     pgsql_cursor = cursor_IN
     empty_value = empty_value_IN
     replace_with = replace_with_IN
+    schema_name = schema_IN
+    if ( ( schema_name is None ) or ( schema_name == "" ) ):
+        schema_name = "public"
+    #-- END check to see if schema --#
+
+    # "NULL" is passed as a string - bind as None.
+    if ( replace_with == "NULL" ):
+        replace_with = None
+    #-- END check to see if NULL --#
+    param_map = { "empty_value" : empty_value, "replace_with" : replace_with }
 
     # build integer column name list.
 
     # SQL string to select columns in table.
     sql_string = "SELECT *"
     sql_string += " FROM information_schema.columns"
-    sql_string += " WHERE table_schema = 'public'"
-    sql_string += "     AND table_name = '" + table_name_IN + "'"
-    sql_string += "     AND data_type LIKE '%int%'"
+    sql_string += " WHERE table_schema = %s"
+    sql_string += "     AND table_name = %s"
+    sql_string += "     AND data_type LIKE '%%int%%'"
     sql_string += ";"
 
-    pgsql_cursor.execute( sql_string )
+    pgsql_cursor.execute( sql_string, ( schema_name, table_name_IN ) )
     for current_row in pgsql_cursor:
 
         # store column name
@@ -1617,49 +2517,66 @@ def convert_empty_ints( cursor_IN,
     list_len = len( integer_column_name_list )
     print( "Found " + str( list_len ) + " matches" )
 
-    # for each integer column, count the empty values in that column.
-    for column_name in integer_column_name_list:
+    # count the empty values in all integer columns, in one query.
+    if ( list_len > 0 ):
+
+        count_sql_list = []
+        for column_name in integer_column_name_list:
+
+            count_sql_list.append( "COUNT( * ) FILTER ( WHERE " + column_name + " = %(empty_value)s ) AS \"" + column_name + "\"" )
 
-        sql_string = "SELECT COUNT( * ) AS empty_count"
-        #sql_string = "SELECT *"
-        sql_string += " FROM " + table_name_IN
-        sql_string += " WHERE " + column_name + " = " + empty_value
+        #-- END loop over column names. --#
+
+        sql_string = "SELECT " + ", ".join( count_sql_list )
+        sql_string += " FROM " + schema_name + "." + table_name_IN
         sql_string += ";"
 
         print( sql_string )
 
-        pgsql_cursor.execute( sql_string )
+        pgsql_cursor.execute( sql_string, param_map )
         current_row = pgsql_cursor.fetchone()
 
-        # get empty count
-        current_empty_count = current_row[ "empty_count" ]
-        #print( "Empty count for column " + column_name + " = " + str( current_empty_count ) )
+        for column_name in integer_column_name_list:
+
+            # get empty count
+            current_empty_count = current_row[ column_name ]
+            #print( "Empty count for column " + column_name + " = " + str( current_empty_count ) )
 
-        if ( current_empty_count > 0 ):
+            if ( current_empty_count > 0 ):
 
-            # add to transform list
-            columns_to_transform_list.append( column_name )
+                # add to transform list
+                columns_to_transform_list.append( column_name )
 
-        #-- END check to see if any rows contain empty value. --#
+            #-- END check to see if any rows contain empty value. --#
 
-    #-- END loop over column names. --#
+        #-- END loop over column names. --#
+
+    #-- END check to see if integer columns --#
 
     print( "Columns to transform: " + str( columns_to_transform_list ) )
 
-    # for each column with empties, change them to NULL.
-    for column_name in columns_to_transform_list:
+    # change empties in all columns that have them with one UPDATE.
+    if ( len( columns_to_transform_list ) > 0 ):
+
+        set_sql_list = []
+        where_sql_list = []
+        for column_name in columns_to_transform_list:
 
-        sql_string = "UPDATE " + table_name_IN
-        sql_string += " SET " + column_name + " = " + replace_with
-        sql_string += " WHERE " + column_name + " = " + empty_value
+            set_sql_list.append( column_name + " = CASE WHEN " + column_name + " = %(empty_value)s THEN %(replace_with)s ELSE " + column_name + " END" )
+            where_sql_list.append( column_name + " = %(empty_value)s" )
+
+        #-- END loop over column names. --#
+
+        sql_string = "UPDATE " + schema_name + "." + table_name_IN
+        sql_string += " SET " + ", ".join( set_sql_list )
+        sql_string += " WHERE " + " OR ".join( where_sql_list )
         sql_string += ";"
 
         print( sql_string )
 
-        pgsql_cursor.execute( sql_string )
-        pgsql_cursor.commit()
+        execute_batched( pgsql_cursor.connection, sql_string, [ param_map ], debug_flag_IN = debug_flag_IN )
 
-    #-- END loop over column names. --#
+    #-- END check to see if columns to transform. --#
 
 #-- END function convert_empty_ints() --#
 
@@ -1670,7 +2587,19 @@ def remove_invalid_person_values( connection_IN,
                                   invalid_value_list_IN,
                                   person_column_IN,
                                   person_column_type_IN = "str",
-                                  debug_flag_IN = False ):
+                                  debug_flag_IN = False,
+                                  table_name_IN = "person",
+                                  batch_size_IN = 1000 ):
+
+    '''
+    Accepts connection, list of invalid values, and name and type of column.
+        Sets the column to NULL in every row of the table (person, unless
+        another table name is passed in) where it contains any of the invalid
+        values.  Values are bound as an array parameter, cast to an array of
+        the column's type ( get_column_db_type() ) so values passed as text
+        can be compared to non-text columns, batch_size_IN values per UPDATE
+        ( execute_batched() ), and committed at the end.
+    '''
 
     # return reference
     status_info_OUT = {}
@@ -1679,8 +2608,11 @@ def remove_invalid_person_values( connection_IN,
     status_message = ""
     sql_update_string = ""
     invalid_value = ""
-    invalid_values_string_list = []
-    invalid_values_string = ""
+    invalid_value_param_list = []
+    param_list = None
+    batch_start = -1
+    work_cursor = None
+    column_db_type = None
 
     # declare variables - exception handling
     exception_type = None
@@ -1700,54 +2632,46 @@ def remove_invalid_person_values( connection_IN,
 
             try:
 
-                # create database cursors - one for looping over person...
-                person_cursor = connection_IN.cursor( cursor_factory = psycopg2.extras.DictCursor )
-
-                # convert all values to strings, just in case.
+                # bind values as they are for non-string columns, as strings
+                #     for string columns.
                 for invalid_value in invalid_value_list_IN:
 
-                    invalid_values_string_list.append( str( invalid_value ) )
+                    if ( person_column_type_IN == "str" ):
+                        invalid_value_param_list.append( str( invalid_value ) )
+                    else:
+                        invalid_value_param_list.append( invalid_value )
+                    #-- END check to see if string --#
 
                 #-- END loop over invalid values --#
 
+                # get column's type, to cast the array of values.
+                work_cursor = connection_IN.cursor()
+                column_db_type = get_column_db_type( work_cursor, table_name_IN, person_column_IN )
+                work_cursor.close()
+
                 # for any row that contains any invalid value, set the value in
                 #     the column whose name was passed in to NULL.
-                sql_update_string = "UPDATE person"
+                sql_update_string = "UPDATE " + table_name_IN
                 sql_update_string += " SET " + person_column_IN + " = NULL"
-                sql_update_string += " WHERE " + person_column_IN + " IN ( "
-
-                # check if string values
-                if ( person_column_type_IN == "str" ):
-
-                    # start with a quote
-                    sql_update_string += "'"
-
-                    # join values with "', '"
-                    invalid_values_string = "', '".join( invalid_values_string_list )
-
-                    # add to SQL string
-                    sql_update_string += invalid_values_string
-
-                    # end with quote
-                    sql_update_string += "'"
-
+                if ( column_db_type is not None ):
+                    sql_update_string += " WHERE " + person_column_IN + " = ANY( CAST( %s AS " + column_db_type + "[] ) );"
                 else:
+                    sql_update_string += " WHERE " + person_column_IN + " = ANY( %s );"
+                #-- END check to see if column type --#
 
-                    # no quotes.  join values with ", "
-                    invalid_values_string = ", ".join( invalid_values_string_list )
-
-                    # add to SQL
-                    sql_update_string += invalid_values_string
+                # one array of values per UPDATE.
+                param_list = []
+                batch_start = 0
+                while ( batch_start < len( invalid_value_param_list ) ):
 
-                #-- END check to see if string, so need quote --#
+                    param_list.append( ( invalid_value_param_list[ batch_start : batch_start + batch_size_IN ], ) )
+                    batch_start += batch_size_IN
 
-                # close IN
-                sql_update_string += " );"
+                #-- END loop over batches of values --#
 
-                # run the update and commit.
+                # run the updates and commit.
                 print( "\"" + sql_update_string + "\" started at " + str( datetime.datetime.now() ) )
-                person_cursor.execute( sql_update_string )
-                connection_IN.commit()
+                execute_batched( connection_IN, sql_update_string, param_list, debug_flag_IN = debug_flag_IN )
                 print( "\"" + sql_update_string + "\" completed at " + str( datetime.datetime.now() ) )
 
             except psycopg2.IntegrityError as pie:
@@ -1762,10 +2686,10 @@ def remove_invalid_person_values( connection_IN,
                 print( "- exception traceback: " + str( traceback.format_exc() ) )
 
                 # And, more details:
-                status_string = "values in column " + str( column_of_interest )
-                status_string += " for person " + str( current_person_id ) + " (docnbr = " + str( current_docnbr ) + "): "
-                status_string += str( value_map )
-                print( status_string )
+                status_message = "removing " + str( len( invalid_value_param_list ) ) + " invalid values from column " + str( person_column_IN )
+                status_message += " in table " + str( table_name_IN ) + ": " + str( invalid_value_param_list )
+                status_info_OUT[ "status_message" ] = status_message
+                print( status_message )
 
                 # rollback
                 connection_IN.rollback()
@@ -1784,11 +2708,7 @@ def remove_invalid_person_values( connection_IN,
                 # rollback
                 connection_IN.rollback()
 
-            finally:
-
-                person_cursor.close()
-
-            #-- END try...except...finally --#
+            #-- END try...except --#
 
 
         else:
@@ -1824,7 +2744,9 @@ def merge_values_into_person( connection_IN,
                               invalid_value_list_IN = None,
                               debug_flag_IN = False,
                               limit_IN = -1,
-                              person_id_list_IN = None ):
+                              person_id_list_IN = None,
+                              is_set_based_IN = False,
+                              batch_size_IN = 10000 ):
 
     '''
     Accepts connection, source table and column name from which you want to
@@ -1835,6 +2757,18 @@ def merge_values_into_person( connection_IN,
         If all are the same, places the value in destination column in the
         person table.  If not, does nothing.
 
+    Otherwise, updates are saved up and run batch_size_IN people at a time, one
+        UPDATE per batch with values bound as parameters
+        ( update_column_values_batched() ).  If a batch breaks a UNIQUE
+        constraint or has a value that can't be cast to the column's type,
+        its people are updated one at a time, and values that can't be
+        stored are added to the invalid values map.
+
+    If is_set_based_IN is True, source tables are matched to person on
+        person_id and the work is done by merge_values_set_based(), with a
+        few queries per source table and one UPDATE per batch_size_IN people,
+        rather than queries and an UPDATE per person.
+
     Returns map of people who had multiple values to their values.
     '''
 
@@ -1889,6 +2823,19 @@ def merge_values_into_person( connection_IN,
     invalid_values_list = None
     cleanup_status_info = None
 
+    # declare variables - set-based
+    set_based_table_info_list = None
+    source_table_info = None
+
+    # declare variables - batched updates
+    person_column_db_type = None
+    person_row_count = -1
+    pending_update_list = None
+    pending_update_map = None
+    pending_update = None
+    update_status_info = None
+    failed_update = None
+
     # initialize
     person_column_name = person_column_IN
 
@@ -1907,255 +2854,297 @@ def merge_values_into_person( connection_IN,
 
     #-- END check to see if invalid values list.
 
-    try:
+    # set-based?
+    if ( is_set_based_IN == True ):
+
+        # yes - match source person_id to person id, then hand off.
+        set_based_table_info_list = []
+        for source_table_info in source_table_info_list_IN:
+
+            source_table_info = dict( source_table_info )
+            if ( source_table_info.get( "join_on_list", None ) is None ):
+                source_table_info[ "join_on_list" ] = [ { JOIN_COLUMN_SOURCE_NAME : "person_id", JOIN_COLUMN_DEST_NAME : "id" } ]
+            #-- END check to see if join on list --#
+            set_based_table_info_list.append( source_table_info )
+
+        #-- END loop over source table information --#
+
+        status_info_OUT = merge_values_set_based( connection_IN,
+                                                  set_based_table_info_list,
+                                                  "person",
+                                                  person_column_name,
+                                                  dest_column_type_IN = person_column_type_IN,
+                                                  is_empty_string_value_IN = is_empty_string_value_IN,
+                                                  invalid_value_list_IN = invalid_value_list_IN,
+                                                  debug_flag_IN = debug_flag_IN,
+                                                  limit_IN = limit_IN,
+                                                  dest_id_list_IN = person_id_list_IN,
+                                                  batch_size_IN = batch_size_IN )
+        error_person_map = status_info_OUT[ "error_map" ]
 
-        # create database cursors - one for looping over person...
-        person_cursor = connection_IN.cursor( cursor_factory = psycopg2.extras.DictCursor )
+    else:
 
-        # ...and a second cursor, for querying related rows.
-        work_cursor = connection_IN.cursor( cursor_factory = psycopg2.extras.DictCursor )
+        try:
 
-        # loop over person records, limiting to those where value is not already set.
-        sql_string = "SELECT *"
-        sql_string += " FROM person"
-        sql_string += " WHERE " + person_column_name + " IS NULL"
+            # create database cursors - one for looping over person...
+            person_cursor = connection_IN.cursor( cursor_factory = psycopg2.extras.DictCursor )
 
-        # do we have a person ID list?
-        if ( ( person_id_list_IN is not None )
-            and ( isinstance( person_id_list_IN, list ) == True )
-            and ( len( person_id_list_IN ) > 0 ) ):
+            # ...and a second cursor, for querying related rows.
+            work_cursor = connection_IN.cursor( cursor_factory = psycopg2.extras.DictCursor )
 
-            # yes.  only persons with ID in that list:
-            sql_string += " AND id IN ( "
+            # loop over person records, limiting to those where value is not already set.
+            sql_string = "SELECT *"
+            sql_string += " FROM person"
+            sql_string += " WHERE " + person_column_name + " IS NULL"
 
-            # loop over IDs.
-            for person_id in person_id_list_IN:
+            # do we have a person ID list?
+            if ( ( person_id_list_IN is not None )
+                and ( isinstance( person_id_list_IN, list ) == True )
+                and ( len( person_id_list_IN ) > 0 ) ):
 
-                # convert to string (in case of integer)
-                person_id_string = str( person_id )
+                # yes.  only persons with ID in that list:
+                sql_string += " AND id = ANY( %(person_id_list)s )"
 
-                # add to list of string IDs.
-                person_id_string_list.append( person_id_string )
+            #-- END check to see if we are limiting to a certain set of person IDs. --#
 
-            #-- END loop over IDs.
+            sql_string += " ORDER BY id ASC"
+            if ( limit_IN > 0 ):
+                sql_string += " LIMIT " + str( limit_IN )
+            #-- END check to see if limit --#
+            sql_string += ";"
 
-            # convert list to comma-delimited string, add to SQL.
-            sql_string += ", ".join( person_id_string_list )
-            sql_string += " )"
+            if ( debug_flag_IN == True ):
+                status_string = "====> DEBUG - before \"" + str( sql_string ) + "\" - " + str( datetime.datetime.now() )
+                print( status_string )
+            #-- END debug --#
+
+            person_cursor.execute( sql_string, { "person_id_list" : person_id_list_IN } )
+            person_row_count = person_cursor.rowcount
+
+            # updates are run in batches - need type of column.
+            person_column_db_type = get_column_db_type( work_cursor, "person", person_column_name )
+            if ( person_column_db_type is None ):
+                raise ValueError( "column " + str( person_column_name ) + " not found in table person, so can't merge values into it." )
+            #-- END check to see if column found --#
+            pending_update_list = []
+            pending_update_map = {}
+
+            # loop over person rows
+            person_counter = 0
+            error_person_map = {}
+            error_person_counter = 0
+            total_value_counter = 0
+            none_counter = 0
+            empty_counter = 0
+            invalid_value_counter = 0
+            no_value_counter = 0
+            single_value_counter = 0
+            multi_value_counter = 0
+            for current_person in person_cursor:
+
+                # increment counter
+                person_counter += 1
+
+                # clear value_set
+                value_map = {}
+
+                # get person ID and docnbr
+                current_person_id = current_person[ "id" ]
+                current_docnbr = current_person[ "ildoc_docnbr" ]
+
+                # loop over source tables
+                for source_table_info in source_table_info_list_IN:
+
+                    # get column and table of interest from source_table_info.
+                    table_of_interest = source_table_info.get( "table_name", None )
+                    column_of_interest = source_table_info.get( "column_name", None )
+                    column_type = source_table_info.get( "column_type", "str" )
+
+                    # got a table name?
+                    if ( ( table_of_interest is not None ) and ( table_of_interest != "" ) ):
+
+                        # got a column name?
+                        if ( ( column_of_interest is not None ) and ( column_of_interest != "" ) ):
 
-        #-- END check to see if we are limiting to a certain set of person IDs. --#
+                            # got what we need.  Get values.
+                            # get values for column of interest from related rows.
+                            related_sql_string = "SELECT DISTINCT( " + column_of_interest + " ) AS unique_value"
+                            related_sql_string += " FROM " + table_of_interest
+                            related_sql_string += " WHERE person_id = %s"
+                            related_sql_string += ";"
 
-        sql_string += " ORDER BY id ASC"
-        if ( limit_IN > 0 ):
-            sql_string += " LIMIT " + str( limit_IN )
-        #-- END check to see if limit --#
-        sql_string += ";"
-
-        if ( debug_flag_IN == True ):
-            status_string = "====> DEBUG - before \"" + str( sql_string ) + "\" - " + str( datetime.datetime.now() )
-            print( status_string )
-        #-- END debug --#
-
-        person_cursor.execute( sql_string )
-
-        # loop over person rows
-        person_counter = 0
-        error_person_map = {}
-        error_person_counter = 0
-        total_value_counter = 0
-        none_counter = 0
-        empty_counter = 0
-        invalid_value_counter = 0
-        no_value_counter = 0
-        single_value_counter = 0
-        multi_value_counter = 0
-        for current_person in person_cursor:
-
-            # increment counter
-            person_counter += 1
-
-            # clear value_set
-            value_map = {}
-
-            # get person ID and docnbr
-            current_person_id = current_person[ "id" ]
-            current_docnbr = current_person[ "ildoc_docnbr" ]
-
-            # loop over source tables
-            for source_table_info in source_table_info_list_IN:
-
-                # get column and table of interest from source_table_info.
-                table_of_interest = source_table_info.get( "table_name", None )
-                column_of_interest = source_table_info.get( "column_name", None )
-                column_type = source_table_info.get( "column_type", "str" )
+                            if ( debug_flag_IN == True ):
+                                status_string = "====> DEBUG - before \"" + str( related_sql_string ) + "\" - " + str( datetime.datetime.now() )
+                                print( status_string )
+                            #-- END debug --#
 
-                # got a table name?
-                if ( ( table_of_interest is not None ) and ( table_of_interest != "" ) ):
+                            # execute SQL
+                            work_cursor.execute( related_sql_string, ( current_person_id, ) )
 
-                    # got a column name?
-                    if ( ( column_of_interest is not None ) and ( column_of_interest != "" ) ):
+                            if ( debug_flag_IN == True ):
+                                status_string = "====> DEBUG - after related_sql_string - " + str( datetime.datetime.now() )
+                                print( status_string )
+                            #-- END debug --#
 
-                        # got what we need.  Get values.
-                        # get values for column of interest from related rows.
-                        related_sql_string = "SELECT DISTINCT( " + column_of_interest + " ) AS unique_value"
-                        related_sql_string += " FROM " + table_of_interest
-                        related_sql_string += " WHERE person_id = " + str( current_person_id )
-                        related_sql_string += ";"
+                            # loop over results, converting each to string and adding it to set
+                            for current_related in work_cursor:
 
-                        if ( debug_flag_IN == True ):
-                            status_string = "====> DEBUG - before \"" + str( related_sql_string ) + "\" - " + str( datetime.datetime.now() )
-                            print( status_string )
-                        #-- END debug --#
+                                # increment counter
+                                total_value_counter += 1
 
-                        # execute SQL
-                        work_cursor.execute( related_sql_string )
+                                # get value
+                                current_value = current_related[ "unique_value" ]
 
-                        if ( debug_flag_IN == True ):
-                            status_string = "====> DEBUG - after related_sql_string - " + str( datetime.datetime.now() )
-                            print( status_string )
-                        #-- END debug --#
+                                # Run through checks to see if value is OK.
+                                is_value_ok = True
 
-                        # loop over results, converting each to string and adding it to set
-                        for current_related in work_cursor:
+                                # is value None?
+                                if ( current_value is None ):
 
-                            # increment counter
-                            total_value_counter += 1
+                                    # None is not a valid value.
+                                    is_value_ok = False
+                                    none_counter += 1
 
-                            # get value
-                            current_value = current_related[ "unique_value" ]
+                                #-- END check to see if None. --#
 
-                            # Run through checks to see if value is OK.
-                            is_value_ok = True
+                                # empty string?
+                                if ( current_value == "" ):
 
-                            # is value None?
-                            if ( current_value is None ):
+                                    empty_counter += 1
 
-                                # None is not a valid value.
-                                is_value_ok = False
-                                none_counter += 1
+                                    # is empty string OK?
+                                    if ( is_empty_string_value_IN == False ):
 
-                            #-- END check to see if None. --#
+                                        # empty string is not OK.
+                                        is_value_ok = False
 
-                            # empty string?
-                            if ( current_value == "" ):
+                                    #-- END check to see if empty string is counted as a value --#
 
-                                empty_counter += 1
+                                #-- END check to see if empty string --#
 
-                                # is empty string OK?
-                                if ( is_empty_string_value_IN == False ):
+                                # is it an invalid value?
+                                if current_value in invalid_values_OUT:
 
-                                    # empty string is not OK.
+                                    # Invalid value.
                                     is_value_ok = False
+                                    invalid_value_counter += 1
 
-                                #-- END check to see if empty string is counted as a value --#
-
-                            #-- END check to see if empty string --#
+                                #-- END check to see if invalid value --#
 
-                            # is it an invalid value?
-                            if current_value in invalid_values_OUT:
+                                # is value OK?
+                                if ( is_value_ok == True ):
 
-                                # Invalid value.
-                                is_value_ok = False
-                                invalid_value_counter += 1
+                                    # convert to string
+                                    value_string = str( current_value )
 
-                            #-- END check to see if invalid value --#
+                                    # add to map
+                                    value_map[ value_string ] = current_value
 
-                            # is value OK?
-                            if ( is_value_ok == True ):
+                                #-- END check to see if value is OK. --#
 
-                                # convert to string
-                                value_string = str( current_value )
+                            #-- END loop over relateds --#
 
-                                # add to map
-                                value_map[ value_string ] = current_value
+                            if ( debug_flag_IN == True ):
+                                status_string = "values in column " + str( column_of_interest )
+                                status_string += " for person " + str( current_person_id ) + " (docnbr = " + str( current_docnbr ) + "): "
+                                status_string += str( value_map )
+                                print( status_string )
+                            #-- END check if debug --#
 
-                            #-- END check to see if value is OK. --#
+                        else:
 
-                        #-- END loop over relateds --#
+                            # no column name specified.
+                            print( "ERROR - No column name specified for table " + str( table_of_interest ) + ".  Moving on." )
 
-                        if ( debug_flag_IN == True ):
-                            status_string = "values in column " + str( column_of_interest )
-                            status_string += " for person " + str( current_person_id ) + " (docnbr = " + str( current_docnbr ) + "): "
-                            status_string += str( value_map )
-                            print( status_string )
-                        #-- END check if debug --#
+                        #-- END check to see if column name passed in. --#
 
                     else:
 
                         # no column name specified.
-                        print( "ERROR - No column name specified for table " + str( table_of_interest ) + ".  Moving on." )
+                        print( "ERROR - No table name specified.  Moving on." )
 
-                    #-- END check to see if column name passed in. --#
+                    #-- END check to see if table name passed in. --#
 
-                else:
+                #-- END loop over table information. --#
 
-                    # no column name specified.
-                    print( "ERROR - No table name specified.  Moving on." )
+                # how many values?
+                value_count = len( value_map )
+                if ( value_count == 1 ):
 
-                #-- END check to see if table name passed in. --#
+                    single_value_counter += 1
 
-            #-- END loop over table information. --#
+                    # great!  store it - save for next batch update.
+                    for value_key, value in six.iteritems( value_map ):
 
-            # how many values?
-            value_count = len( value_map )
-            if ( value_count == 1 ):
+                        pending_update_list.append( ( current_person_id, value ) )
+                        pending_update_map[ current_person_id ] = {
+                            "docnbr" : current_docnbr,
+                            "value_map" : value_map,
+                            "table_name" : table_of_interest,
+                            "column_name" : column_of_interest,
+                            "column_type" : column_type
+                        }
 
-                single_value_counter += 1
+                    #-- END loop over values --#
 
-                # great!  store it!
-                for value_key, value in six.iteritems( value_map ):
+                elif ( value_count == 0 ):
 
-                    # UPDATE!
-                    update_sql_string = "UPDATE person"
+                    # no value.  Make a note.
+                    no_value_counter += 1
 
-                    # is value a string?
-                    if ( person_column_type_IN == "str" ):
+                elif ( value_count > 1 ):
 
-                        # string, so surround in quotes.
-                        update_sql_string += " SET " + person_column_name + " = '" + str( value ) + "'"
+                    multi_value_counter += 1
 
-                    else:
+                    if ( debug_flag_IN == True ):
+                        # ERROR - multiple values - should be consistent.
+                        error_person_map[ current_person_id ] = value_map
+                        error_person_counter += 1
+                        error_message = "ERROR - multiple values in column " + str( column_of_interest )
+                        error_message += " for person " + str( current_person_id )
+                        error_message += ": " + str( error_person_map )
+                        print( error_message )
+                    #-- END DEBUG --#
 
-                        # not string - don't surround with quotes.
-                        update_sql_string += " SET " + person_column_name + " = " + str( value )
+                else:
 
-                    #-- END check to see if value is string --#
+                    print( "ERROR - value count is neither 0, 1, or more than 1.  Should never get here." )
 
-                    update_sql_string += " WHERE id = " + str( current_person_id )
-                    update_sql_string += ";"
+                #-- END check to see if one value. --#
 
-                    #print( "UPDATE SQL: " + update_sql_string )
+                # batch full, or last person?  Run the updates.
+                if ( ( len( pending_update_list ) >= batch_size_IN )
+                    or ( ( person_counter == person_row_count ) and ( len( pending_update_list ) > 0 ) ) ):
 
                     if ( debug_flag_IN == True ):
-                        status_string = "====> DEBUG - before " + str( update_sql_string ) + " - " + str( datetime.datetime.now() )
+                        status_string = "====> DEBUG - before update of " + str( len( pending_update_list ) ) + " people - " + str( datetime.datetime.now() )
                         print( status_string )
                     #-- END debug --#
 
-                    # use try to capture UNIQUE constraint violations.
-                    try:
-
-                        # do it!
-                        work_cursor.execute( update_sql_string )
-                        connection_IN.commit()
+                    update_status_info = update_column_values_batched( connection_IN,
+                                                                       "person",
+                                                                       person_column_name,
+                                                                       pending_update_list,
+                                                                       column_db_type_IN = person_column_db_type,
+                                                                       batch_size_IN = batch_size_IN,
+                                                                       debug_flag_IN = debug_flag_IN )
 
-                    except psycopg2.IntegrityError as pie:
+                    # any that broke a constraint?
+                    for failed_update in update_status_info[ "failed_list" ]:
 
-                        # rollback
-                        connection_IN.rollback()
+                        current_person_id, value, pie = failed_update
+                        pending_update = pending_update_map[ current_person_id ]
+                        table_of_interest = pending_update[ "table_name" ]
+                        column_of_interest = pending_update[ "column_name" ]
+                        column_type = pending_update[ "column_type" ]
 
                         # Exception caught.
-                        print( "psycopg2.IntegrityError caught: " + str( pie ) )
-
-                        # details:
-                        exception_type, exception_value, exception_traceback = sys.exc_info()
-                        print( "- exception type: " + str( exception_type ) )
-                        print( "- exception value: " + str( exception_value ) )
-                        print( "- exception traceback: " + str( traceback.format_exc() ) )
+                        print( "psycopg2." + type( pie ).__name__ + " caught: " + str( pie ) )
 
                         # And, more details:
                         status_string = "values in column " + str( column_of_interest )
-                        status_string += " for person " + str( current_person_id ) + " (docnbr = " + str( current_docnbr ) + "): "
-                        status_string += str( value_map )
+                        status_string += " for person " + str( current_person_id ) + " (docnbr = " + str( pending_update[ "docnbr" ] ) + "): "
+                        status_string += str( pending_update[ "value_map" ] )
                         print( status_string )
 
                         # see if we already have a count of people in this table
@@ -2178,25 +3167,11 @@ def merge_values_into_person( connection_IN,
                             # no - get count of unique users with this value in table of interest.
                             sql_string = "SELECT COUNT( DISTINCT person_id ) AS invalid_person_count"
                             sql_string += " FROM " + table_of_interest
-                            sql_string += " WHERE " + column_of_interest + " = "
-
-                            # is value a string?
-                            if ( column_type == "str" ):
-
-                                # string, so surround in quotes.
-                                sql_string += "'" + str( value ) + "'"
-
-                            else:
-
-                                # not string - don't surround with quotes.
-                                sql_string += str( value )
-
-                            #-- END check to see if value is string --#
-
+                            sql_string += " WHERE " + column_of_interest + " = %s"
                             sql_string += ";"
 
                             # run query
-                            work_cursor.execute( sql_string )
+                            work_cursor.execute( sql_string, ( value, ) )
 
                             # retrieve count
                             for debug_row in work_cursor:
@@ -2211,132 +3186,107 @@ def merge_values_into_person( connection_IN,
 
                         #-- END check to see if table's count is already stored. --#
 
-                    #-- END try-except to catch psycopg2.IntegrityError --#
-
-                    if ( debug_flag_IN == True ):
-                        status_string = "====> DEBUG - after update_sql_string - " + str( datetime.datetime.now() )
-                        print( status_string )
-                    #-- END debug --#
-
-                #-- END loop over values --#
-
-            elif ( value_count == 0 ):
+                    #-- END loop over failed updates --#
 
-                # no value.  Make a note.
-                no_value_counter += 1
+                    pending_update_list = []
+                    pending_update_map = {}
 
-            elif ( value_count > 1 ):
+                #-- END check to see if time to run updates --#
 
-                multi_value_counter += 1
+                # output a heartbeat every 100 people, and commit.
+                if ( ( person_counter % 100 ) == 0 ):
 
-                if ( debug_flag_IN == True ):
-                    # ERROR - multiple values - should be consistent.
-                    error_person_map[ current_person_id ] = value_map
-                    error_person_counter += 1
-                    error_message = "ERROR - multiple values in column " + str( column_of_interest )
-                    error_message += " for person " + str( current_person_id )
-                    error_message += ": " + str( error_person_map )
-                    print( error_message )
-                #-- END DEBUG --#
-
-            else:
+                    # ... and commit.
+                    connection_IN.commit()
 
-                print( "ERROR - value count is neither 0, 1, or more than 1.  Should never get here." )
+                    # debug?
+                    if ( debug_flag_IN == True ):
 
-            #-- END check to see if one value. --#
+                        # output brief status...
+                        status_string = "====> " + str( datetime.datetime.now() )
+                        status_string += " - " + str( person_counter ) + " person_records processed"
+                        print( status_string )
 
-            # output a heartbeat every 100 people, and commit.
-            if ( ( person_counter % 100 ) == 0 ):
+                    #-- END check to see if debug --#
 
-                # ... and commit.
-                connection_IN.commit()
+                #-- END check to see if hundredth person processed. --#
 
-                # debug?
-                if ( debug_flag_IN == True ):
+                # output details every 10000 docnbr values
+                if ( ( person_counter % 10000 ) == 0 ):
 
                     # output brief status...
                     status_string = "====> " + str( datetime.datetime.now() )
                     status_string += " - " + str( person_counter ) + " person_records processed"
                     print( status_string )
 
-                #-- END check to see if debug --#
-
-            #-- END check to see if hundredth person processed. --#
-
-            # output details every 10000 docnbr values
-            if ( ( person_counter % 10000 ) == 0 ):
+                    status_string = "- error total = " + str( error_person_counter )
+                    status_string += "\n- value status per person: 0 = " + str( no_value_counter ) + "; 1 = " + str( single_value_counter ) + "; >1 = " + str( multi_value_counter )
+                    status_string += "\n- Details on no-value source rows: None = " + str( none_counter ) + "; empty = " + str( empty_counter ) + "; invalid = " + str( invalid_value_counter )
+                    print( status_string )
 
-                # output brief status...
-                status_string = "====> " + str( datetime.datetime.now() )
-                status_string += " - " + str( person_counter ) + " person_records processed"
-                print( status_string )
+                #-- END periodic output of exists counter.
 
-                status_string = "- error total = " + str( error_person_counter )
-                status_string += "\n- value status per person: 0 = " + str( no_value_counter ) + "; 1 = " + str( single_value_counter ) + "; >1 = " + str( multi_value_counter )
-                status_string += "\n- Details on no-value source rows: None = " + str( none_counter ) + "; empty = " + str( empty_counter ) + "; invalid = " + str( invalid_value_counter )
-                print( status_string )
+            #-- END loop over persons --#
 
-            #-- END periodic output of exists counter.
+            # clean up the invalid values
+            invalid_values_list = list( six.iterkeys( invalid_values_OUT ) )
+            cleanup_status_info = remove_invalid_person_values( connection_IN,
+                                                                invalid_values_list,
+                                                                person_column_name,
+                                                                person_column_type_IN,
+                                                                debug_flag_IN )
 
-        #-- END loop over persons --#
+            # output summary
+            status_string = "\n\n====> COMPLETE - " + str( datetime.datetime.now() )
+            status_string += "\n==> " + str( person_counter ) + " person_records processed"
+            status_string += "\n- error total = " + str( error_person_counter )
+            status_string += "\n- value status per person: 0 = " + str( no_value_counter ) + "; 1 = " + str( single_value_counter ) + "; >1 = " + str( multi_value_counter )
+            status_string += "\n- Details on values: Total = " + str( total_value_counter ) + "; None = " + str( none_counter ) + "; empty = " + str( empty_counter ) + "; invalid = " + str( invalid_value_counter )
 
-        # clean up the invalid values
-        invalid_values_list = list( six.iterkeys( invalid_values_OUT ) )
-        cleanup_status_info = remove_invalid_person_values( connection_IN,
-                                                            invalid_values_list,
-                                                            person_column_name,
-                                                            person_column_type_IN,
-                                                            debug_flag_IN )
+            print( status_string )
 
-        # output summary
-        status_string = "\n\n====> COMPLETE - " + str( datetime.datetime.now() )
-        status_string += "\n==> " + str( person_counter ) + " person_records processed"
-        status_string += "\n- error total = " + str( error_person_counter )
-        status_string += "\n- value status per person: 0 = " + str( no_value_counter ) + "; 1 = " + str( single_value_counter ) + "; >1 = " + str( multi_value_counter )
-        status_string += "\n- Details on values: Total = " + str( total_value_counter ) + "; None = " + str( none_counter ) + "; empty = " + str( empty_counter ) + "; invalid = " + str( invalid_value_counter )
+        except psycopg2.IntegrityError as pie:
 
-        print( status_string )
+            # Exception caught.
+            print( "psycopg2.IntegrityError caught: " + str( pie ) )
 
-    except psycopg2.IntegrityError as pie:
+            # details:
+            exception_type, exception_value, exception_traceback = sys.exc_info()
+            print( "- exception type: " + str( exception_type ) )
+            print( "- exception value: " + str( exception_value ) )
+            print( "- exception traceback: " + str( traceback.format_exc() ) )
 
-        # Exception caught.
-        print( "psycopg2.IntegrityError caught: " + str( pie ) )
-
-        # details:
-        exception_type, exception_value, exception_traceback = sys.exc_info()
-        print( "- exception type: " + str( exception_type ) )
-        print( "- exception value: " + str( exception_value ) )
-        print( "- exception traceback: " + str( traceback.format_exc() ) )
+            # And, more details:
+            status_string = "values in column " + str( column_of_interest )
+            status_string += " for person " + str( current_person_id ) + " (docnbr = " + str( current_docnbr ) + "): "
+            status_string += str( value_map )
+            print( status_string )
 
-        # And, more details:
-        status_string = "values in column " + str( column_of_interest )
-        status_string += " for person " + str( current_person_id ) + " (docnbr = " + str( current_docnbr ) + "): "
-        status_string += str( value_map )
-        print( status_string )
+            # rollback
+            connection_IN.rollback()
 
-        # rollback
-        connection_IN.rollback()
+        except Exception as e:
 
-    except Exception as e:
+            # Exception caught.
+            print( "Exception caught: " + str( e ) )
 
-        # Exception caught.
-        print( "Exception caught: " + str( e ) )
+            # details:
+            exception_type, exception_value, exception_traceback = sys.exc_info()
+            print( "- exception type: " + str( exception_type ) )
+            print( "- exception value: " + str( exception_value ) )
+            print( "- exception traceback: " + str( traceback.format_exc() ) )
 
-        # details:
-        exception_type, exception_value, exception_traceback = sys.exc_info()
-        print( "- exception type: " + str( exception_type ) )
-        print( "- exception value: " + str( exception_value ) )
-        print( "- exception traceback: " + str( traceback.format_exc() ) )
+            # rollback
+            connection_IN.rollback()
 
-        # rollback
-        connection_IN.rollback()
+        finally:
 
-    finally:
+            person_cursor.close()
+            work_cursor.close()
 
-        person_cursor.close()
-        work_cursor.close()
+        #-- END try...except...finally --#
 
-    #-- END try...except...finally --#
+    #-- END check to see if set-based --#
 
     status_info_OUT[ "error_map" ] = error_person_map
 
@@ -2357,8 +3307,10 @@ def merge_values_into_table( connection_IN,
                              debug_flag_IN = False,
                              limit_IN = -1,
                              dest_id_list_IN = None,
-                             dest_id_column_name = "id",
-                             dest_schema_IN = None ):
+                             dest_id_column_name_IN = "id",
+                             dest_schema_IN = None,
+                             is_set_based_IN = False,
+                             batch_size_IN = 10000 ):
 
     '''
     Accepts connection, source table and column name from which you want to
@@ -2369,6 +3321,11 @@ def merge_values_into_table( connection_IN,
         If all are the same, places the value in destination column in the
         person table.  If not, does nothing.
 
+    If is_set_based_IN is True, the work is done by merge_values_set_based(),
+        with a few queries per source table and one UPDATE per batch_size_IN
+        rows, rather than queries and an UPDATE per row.  Source tables are
+        matched to the destination table using each table's "join_on_list".
+
     Returns map of people who had multiple values to their values.
     '''
 
@@ -2460,438 +3417,955 @@ def merge_values_into_table( connection_IN,
 
     #-- END check to see if invalid values list.
 
-    try:
+    # set-based?
+    if ( is_set_based_IN == True ):
+
+        # yes - hand off.
+        status_info_OUT = merge_values_set_based( connection_IN,
+                                                  source_table_info_list_IN,
+                                                  destination_table_name,
+                                                  destination_column_name,
+                                                  dest_column_type_IN = destination_column_type,
+                                                  is_empty_string_value_IN = is_empty_string_value_IN,
+                                                  invalid_value_list_IN = invalid_value_list_IN,
+                                                  debug_flag_IN = debug_flag_IN,
+                                                  limit_IN = limit_IN,
+                                                  dest_id_list_IN = destination_id_list,
+                                                  dest_id_column_name_IN = destination_id_column_name,
+                                                  dest_schema_IN = destination_schema_name,
+                                                  batch_size_IN = batch_size_IN )
+        error_person_map = status_info_OUT[ "error_map" ]
 
-        # create database cursors - one for looping over person...
-        destination_cursor = connection_IN.cursor( cursor_factory = psycopg2.extras.DictCursor )
+    else:
 
-        # ...and a second cursor, for querying related rows.
-        work_cursor = connection_IN.cursor( cursor_factory = psycopg2.extras.DictCursor )
+        try:
 
-        # loop over person records, limiting to those where value is not already set.
-        sql_string = "SELECT *"
-        sql_string += " FROM "
-        if ( ( destination_schema_name is not None ) and ( destination_schema_name != "" ) ):
-            sql_string += destination_schema_name + "."
-        #-- END check to see if schema name. --#
-        sql_string += destination_table_name
-        sql_string += " WHERE " + destination_column_name + " IS NULL"
+            # create database cursors - one for looping over person...
+            destination_cursor = connection_IN.cursor( cursor_factory = psycopg2.extras.DictCursor )
 
-        # do we have a destination ID list?
-        if ( ( destination_id_list is not None )
-            and ( isinstance( destination_id_list, list ) == True )
-            and ( len( destination_id_list ) > 0 ) ):
+            # ...and a second cursor, for querying related rows.
+            work_cursor = connection_IN.cursor( cursor_factory = psycopg2.extras.DictCursor )
 
-            # yes.  only rows with ID in that list:
-            sql_string += " AND " + destination_id_column_name + " IN ( "
+            # loop over person records, limiting to those where value is not already set.
+            sql_string = "SELECT *"
+            sql_string += " FROM "
+            if ( ( destination_schema_name is not None ) and ( destination_schema_name != "" ) ):
+                sql_string += destination_schema_name + "."
+            #-- END check to see if schema name. --#
+            sql_string += destination_table_name
+            sql_string += " WHERE " + destination_column_name + " IS NULL"
 
-            # loop over IDs.
-            for destination_id in destination_id_list:
+            # do we have a destination ID list?
+            if ( ( destination_id_list is not None )
+                and ( isinstance( destination_id_list, list ) == True )
+                and ( len( destination_id_list ) > 0 ) ):
 
-                # convert to string (in case of integer)
-                destination_id_string = str( destination_id )
+                # yes.  only rows with ID in that list:
+                sql_string += " AND " + destination_id_column_name + " IN ( "
 
-                # add to list of string IDs.
-                destination_id_string_list.append( destination_id_string )
+                # loop over IDs.
+                for destination_id in destination_id_list:
 
-            #-- END loop over IDs.
+                    # convert to string (in case of integer)
+                    destination_id_string = str( destination_id )
 
-            # convert list to comma-delimited string, add to SQL.
-            sql_string += ", ".join( destination_id_string_list )
-            sql_string += " )"
+                    # add to list of string IDs.
+                    destination_id_string_list.append( destination_id_string )
 
-        #-- END check to see if we are limiting to a certain set of IDs. --#
+                #-- END loop over IDs.
 
-        sql_string += " ORDER BY " + destination_id_column_name + " ASC"
-        if ( limit_IN > 0 ):
-            sql_string += " LIMIT " + str( limit_IN )
-        #-- END check to see if limit --#
-        sql_string += ";"
+                # convert list to comma-delimited string, add to SQL.
+                sql_string += ", ".join( destination_id_string_list )
+                sql_string += " )"
 
-        if ( debug_flag_IN == True ):
-            status_string = "====> DEBUG - before \"" + str( sql_string ) + "\" - " + str( datetime.datetime.now() )
-            print( status_string )
-        #-- END debug --#
+            #-- END check to see if we are limiting to a certain set of IDs. --#
 
-        destionation_cursor.execute( sql_string )
+            sql_string += " ORDER BY " + destination_id_column_name + " ASC"
+            if ( limit_IN > 0 ):
+                sql_string += " LIMIT " + str( limit_IN )
+            #-- END check to see if limit --#
+            sql_string += ";"
 
-        # loop over person rows
-        destination_counter = 0
-        error_map = {}
-        error_counter = 0
-        total_value_counter = 0
-        none_counter = 0
-        empty_counter = 0
-        invalid_value_counter = 0
-        no_value_counter = 0
-        single_value_counter = 0
-        multi_value_counter = 0
-        for current_record in destination_cursor:
+            if ( debug_flag_IN == True ):
+                status_string = "====> DEBUG - before \"" + str( sql_string ) + "\" - " + str( datetime.datetime.now() )
+                print( status_string )
+            #-- END debug --#
 
-            # increment counter
-            destination_counter += 1
+            destionation_cursor.execute( sql_string )
 
-            # clear value_set
-            value_map = {}
+            # loop over person rows
+            destination_counter = 0
+            error_map = {}
+            error_counter = 0
+            total_value_counter = 0
+            none_counter = 0
+            empty_counter = 0
+            invalid_value_counter = 0
+            no_value_counter = 0
+            single_value_counter = 0
+            multi_value_counter = 0
+            for current_record in destination_cursor:
 
-            # get person ID and docnbr
-            current_record_id = current_record[ destination_id_column_name ]
+                # increment counter
+                destination_counter += 1
 
-            # loop over source tables
-            for source_table_info in source_table_info_list_IN:
+                # clear value_set
+                value_map = {}
 
-                # get column and table of interest from source_table_info.
-                table_of_interest = source_table_info.get( "table_name", None )
-                column_of_interest = source_table_info.get( "column_name", None )
-                column_type = source_table_info.get( "column_type", "str" )
-                join_on_list = source_table_info.get( "join_on_list", None )
+                # get person ID and docnbr
+                current_record_id = current_record[ destination_id_column_name ]
 
-                # got a table name?
-                if ( ( table_of_interest is not None ) and ( table_of_interest != "" ) ):
+                # loop over source tables
+                for source_table_info in source_table_info_list_IN:
 
-                    # got a column name?
-                    if ( ( column_of_interest is not None ) and ( column_of_interest != "" ) ):
+                    # get column and table of interest from source_table_info.
+                    table_of_interest = source_table_info.get( "table_name", None )
+                    column_of_interest = source_table_info.get( "column_name", None )
+                    column_type = source_table_info.get( "column_type", "str" )
+                    join_on_list = source_table_info.get( "join_on_list", None )
 
-                        # got a JOIN ON list?
-                        if ( ( join_on_list is not None )
-                            and ( isinstance( join_on_list, list ) == True )
-                            and ( len( join_on_list ) > 0 ) ):
+                    # got a table name?
+                    if ( ( table_of_interest is not None ) and ( table_of_interest != "" ) ):
 
-                            # got what we need.  Get values.
-                            # get values for column of interest from related rows.
-                            related_sql_string = "SELECT DISTINCT( " + column_of_interest + " ) AS unique_value"
-                            related_sql_string += " FROM " + table_of_interest
+                        # got a column name?
+                        if ( ( column_of_interest is not None ) and ( column_of_interest != "" ) ):
 
-                            # !TODO - JOIN ON HERE
-                            related_sql_string += " WHERE person_id = " + str( current_person_id )
+                            # got a JOIN ON list?
+                            if ( ( join_on_list is not None )
+                                and ( isinstance( join_on_list, list ) == True )
+                                and ( len( join_on_list ) > 0 ) ):
 
-                            related_sql_string += ";"
+                                # got what we need.  Get values.
+                                # get values for column of interest from related rows.
+                                related_sql_string = "SELECT DISTINCT( " + column_of_interest + " ) AS unique_value"
+                                related_sql_string += " FROM " + table_of_interest
 
-                            if ( debug_flag_IN == True ):
-                                status_string = "====> DEBUG - before \"" + str( related_sql_string ) + "\" - " + str( datetime.datetime.now() )
-                                print( status_string )
-                            #-- END debug --#
+                                # !TODO - JOIN ON HERE
+                                related_sql_string += " WHERE person_id = " + str( current_person_id )
 
-                            # execute SQL
-                            work_cursor.execute( related_sql_string )
+                                related_sql_string += ";"
 
-                            if ( debug_flag_IN == True ):
-                                status_string = "====> DEBUG - after related_sql_string - " + str( datetime.datetime.now() )
-                                print( status_string )
-                            #-- END debug --#
+                                if ( debug_flag_IN == True ):
+                                    status_string = "====> DEBUG - before \"" + str( related_sql_string ) + "\" - " + str( datetime.datetime.now() )
+                                    print( status_string )
+                                #-- END debug --#
 
-                            # loop over results, converting each to string and adding it to set
-                            for current_related in work_cursor:
+                                # execute SQL
+                                work_cursor.execute( related_sql_string )
 
-                                # increment counter
-                                total_value_counter += 1
+                                if ( debug_flag_IN == True ):
+                                    status_string = "====> DEBUG - after related_sql_string - " + str( datetime.datetime.now() )
+                                    print( status_string )
+                                #-- END debug --#
 
-                                # get value
-                                current_value = current_related[ "unique_value" ]
+                                # loop over results, converting each to string and adding it to set
+                                for current_related in work_cursor:
 
-                                # Run through checks to see if value is OK.
-                                is_value_ok = True
+                                    # increment counter
+                                    total_value_counter += 1
 
-                                # is value None?
-                                if ( current_value is None ):
+                                    # get value
+                                    current_value = current_related[ "unique_value" ]
 
-                                    # None is not a valid value.
-                                    is_value_ok = False
-                                    none_counter += 1
+                                    # Run through checks to see if value is OK.
+                                    is_value_ok = True
 
-                                #-- END check to see if None. --#
+                                    # is value None?
+                                    if ( current_value is None ):
 
-                                # empty string?
-                                if ( current_value == "" ):
+                                        # None is not a valid value.
+                                        is_value_ok = False
+                                        none_counter += 1
 
-                                    empty_counter += 1
+                                    #-- END check to see if None. --#
 
-                                    # is empty string OK?
-                                    if ( is_empty_string_value_IN == False ):
+                                    # empty string?
+                                    if ( current_value == "" ):
 
-                                        # empty string is not OK.
-                                        is_value_ok = False
+                                        empty_counter += 1
 
-                                    #-- END check to see if empty string is counted as a value --#
+                                        # is empty string OK?
+                                        if ( is_empty_string_value_IN == False ):
 
-                                #-- END check to see if empty string --#
+                                            # empty string is not OK.
+                                            is_value_ok = False
 
-                                # is it an invalid value?
-                                if current_value in invalid_values_OUT:
+                                        #-- END check to see if empty string is counted as a value --#
 
-                                    # Invalid value.
-                                    is_value_ok = False
-                                    invalid_value_counter += 1
+                                    #-- END check to see if empty string --#
 
-                                #-- END check to see if invalid value --#
+                                    # is it an invalid value?
+                                    if current_value in invalid_values_OUT:
 
-                                # is value OK?
-                                if ( is_value_ok == True ):
+                                        # Invalid value.
+                                        is_value_ok = False
+                                        invalid_value_counter += 1
 
-                                    # convert to string
-                                    value_string = str( current_value )
+                                    #-- END check to see if invalid value --#
 
-                                    # add to map
-                                    value_map[ value_string ] = current_value
+                                    # is value OK?
+                                    if ( is_value_ok == True ):
 
-                                #-- END check to see if value is OK. --#
+                                        # convert to string
+                                        value_string = str( current_value )
 
-                            #-- END loop over relateds --#
+                                        # add to map
+                                        value_map[ value_string ] = current_value
 
-                            if ( debug_flag_IN == True ):
-                                status_string = "values in column " + str( column_of_interest )
-                                status_string += " for person " + str( current_person_id ) + " (docnbr = " + str( current_docnbr ) + "): "
-                                status_string += str( value_map )
-                                print( status_string )
-                            #-- END check if debug --#
+                                    #-- END check to see if value is OK. --#
+
+                                #-- END loop over relateds --#
+
+                                if ( debug_flag_IN == True ):
+                                    status_string = "values in column " + str( column_of_interest )
+                                    status_string += " for person " + str( current_person_id ) + " (docnbr = " + str( current_docnbr ) + "): "
+                                    status_string += str( value_map )
+                                    print( status_string )
+                                #-- END check if debug --#
+
+                            else:
+
+                                # no column name specified.
+                                print( "ERROR - No join columns specified for table " + str( table_of_interest ) + ".  Moving on." )
+                            #-- END check to see if JOIN ON list. --#
 
                         else:
 
                             # no column name specified.
-                            print( "ERROR - No join columns specified for table " + str( table_of_interest ) + ".  Moving on." )
-                        #-- END check to see if JOIN ON list. --#
+                            print( "ERROR - No column name specified for table " + str( table_of_interest ) + ".  Moving on." )
+
+                        #-- END check to see if column name passed in. --#
 
                     else:
 
                         # no column name specified.
-                        print( "ERROR - No column name specified for table " + str( table_of_interest ) + ".  Moving on." )
+                        print( "ERROR - No table name specified.  Moving on." )
 
-                    #-- END check to see if column name passed in. --#
+                    #-- END check to see if table name passed in. --#
 
-                else:
+                #-- END loop over table information. --#
 
-                    # no column name specified.
-                    print( "ERROR - No table name specified.  Moving on." )
+                # how many values?
+                value_count = len( value_map )
+                if ( value_count == 1 ):
 
-                #-- END check to see if table name passed in. --#
+                    single_value_counter += 1
 
-            #-- END loop over table information. --#
+                    # great!  store it!
+                    for value_key, value in six.iteritems( value_map ):
 
-            # how many values?
-            value_count = len( value_map )
-            if ( value_count == 1 ):
+                        # UPDATE!
+                        update_sql_string = "UPDATE person"
 
-                single_value_counter += 1
+                        # is value a string?
+                        if ( person_column_type_IN == "str" ):
 
-                # great!  store it!
-                for value_key, value in six.iteritems( value_map ):
+                            # string, so surround in quotes.
+                            update_sql_string += " SET " + person_column_name + " = '" + str( value ) + "'"
 
-                    # UPDATE!
-                    update_sql_string = "UPDATE person"
+                        else:
 
-                    # is value a string?
-                    if ( person_column_type_IN == "str" ):
+                            # not string - don't surround with quotes.
+                            update_sql_string += " SET " + person_column_name + " = " + str( value )
 
-                        # string, so surround in quotes.
-                        update_sql_string += " SET " + person_column_name + " = '" + str( value ) + "'"
+                        #-- END check to see if value is string --#
 
-                    else:
+                        update_sql_string += " WHERE id = " + str( current_person_id )
+                        update_sql_string += ";"
 
-                        # not string - don't surround with quotes.
-                        update_sql_string += " SET " + person_column_name + " = " + str( value )
+                        #print( "UPDATE SQL: " + update_sql_string )
 
-                    #-- END check to see if value is string --#
+                        if ( debug_flag_IN == True ):
+                            status_string = "====> DEBUG - before " + str( update_sql_string ) + " - " + str( datetime.datetime.now() )
+                            print( status_string )
+                        #-- END debug --#
 
-                    update_sql_string += " WHERE id = " + str( current_person_id )
-                    update_sql_string += ";"
+                        # use try to capture UNIQUE constraint violations.
+                        try:
 
-                    #print( "UPDATE SQL: " + update_sql_string )
+                            # do it!
+                            work_cursor.execute( update_sql_string )
+                            connection_IN.commit()
 
-                    if ( debug_flag_IN == True ):
-                        status_string = "====> DEBUG - before " + str( update_sql_string ) + " - " + str( datetime.datetime.now() )
-                        print( status_string )
-                    #-- END debug --#
+                        except psycopg2.IntegrityError as pie:
 
-                    # use try to capture UNIQUE constraint violations.
-                    try:
+                            # rollback
+                            connection_IN.rollback()
 
-                        # do it!
-                        work_cursor.execute( update_sql_string )
-                        connection_IN.commit()
+                            # Exception caught.
+                            print( "psycopg2.IntegrityError caught: " + str( pie ) )
 
-                    except psycopg2.IntegrityError as pie:
+                            # details:
+                            exception_type, exception_value, exception_traceback = sys.exc_info()
+                            print( "- exception type: " + str( exception_type ) )
+                            print( "- exception value: " + str( exception_value ) )
+                            print( "- exception traceback: " + str( traceback.format_exc() ) )
 
-                        # rollback
-                        connection_IN.rollback()
+                            # And, more details:
+                            status_string = "values in column " + str( column_of_interest )
+                            status_string += " for person " + str( current_person_id ) + " (docnbr = " + str( current_docnbr ) + "): "
+                            status_string += str( value_map )
+                            print( status_string )
 
-                        # Exception caught.
-                        print( "psycopg2.IntegrityError caught: " + str( pie ) )
+                            # see if we already have a count of people in this table
+                            #    who share this value.
 
-                        # details:
-                        exception_type, exception_value, exception_traceback = sys.exc_info()
-                        print( "- exception type: " + str( exception_type ) )
-                        print( "- exception value: " + str( exception_value ) )
-                        print( "- exception traceback: " + str( traceback.format_exc() ) )
+                            # update/add entry to invalid_values_OUT
+                            if ( value not in invalid_values_OUT ):
 
-                        # And, more details:
-                        status_string = "values in column " + str( column_of_interest )
-                        status_string += " for person " + str( current_person_id ) + " (docnbr = " + str( current_docnbr ) + "): "
-                        status_string += str( value_map )
-                        print( status_string )
+                                # add a map for the value to invalid_values_OUT
+                                invalid_values_OUT[ value ] = {}
 
-                        # see if we already have a count of people in this table
-                        #    who share this value.
+                            #-- END check to see if value in invalid_values_OUT --#
 
-                        # update/add entry to invalid_values_OUT
-                        if ( value not in invalid_values_OUT ):
+                            # get map for value
+                            table_to_count_map = invalid_values_OUT.get( value, None )
 
-                            # add a map for the value to invalid_values_OUT
-                            invalid_values_OUT[ value ] = {}
+                            # got a count already for this table?
+                            if ( table_of_interest not in table_to_count_map ):
 
-                        #-- END check to see if value in invalid_values_OUT --#
+                                # no - get count of unique users with this value in table of interest.
+                                sql_string = "SELECT COUNT( DISTINCT person_id ) AS invalid_person_count"
+                                sql_string += " FROM " + table_of_interest
+                                sql_string += " WHERE " + column_of_interest + " = "
 
-                        # get map for value
-                        table_to_count_map = invalid_values_OUT.get( value, None )
+                                # is value a string?
+                                if ( column_type == "str" ):
 
-                        # got a count already for this table?
-                        if ( table_of_interest not in table_to_count_map ):
+                                    # string, so surround in quotes.
+                                    sql_string += "'" + str( value ) + "'"
 
-                            # no - get count of unique users with this value in table of interest.
-                            sql_string = "SELECT COUNT( DISTINCT person_id ) AS invalid_person_count"
-                            sql_string += " FROM " + table_of_interest
-                            sql_string += " WHERE " + column_of_interest + " = "
+                                else:
 
-                            # is value a string?
-                            if ( column_type == "str" ):
+                                    # not string - don't surround with quotes.
+                                    sql_string += str( value )
 
-                                # string, so surround in quotes.
-                                sql_string += "'" + str( value ) + "'"
+                                #-- END check to see if value is string --#
 
-                            else:
+                                sql_string += ";"
 
-                                # not string - don't surround with quotes.
-                                sql_string += str( value )
+                                # run query
+                                work_cursor.execute( sql_string )
 
-                            #-- END check to see if value is string --#
+                                # retrieve count
+                                for debug_row in work_cursor:
 
-                            sql_string += ";"
+                                    # got a count.
+                                    invalid_person_count = debug_row[ "invalid_person_count" ]
 
-                            # run query
-                            work_cursor.execute( sql_string )
+                                #-- END loop over results (should only be one). --#
 
-                            # retrieve count
-                            for debug_row in work_cursor:
+                                # add count for table.
+                                table_to_count_map[ table_of_interest ] = invalid_person_count
 
-                                # got a count.
-                                invalid_person_count = debug_row[ "invalid_person_count" ]
+                            #-- END check to see if table's count is already stored. --#
 
-                            #-- END loop over results (should only be one). --#
+                        #-- END try-except to catch psycopg2.IntegrityError --#
 
-                            # add count for table.
-                            table_to_count_map[ table_of_interest ] = invalid_person_count
+                        if ( debug_flag_IN == True ):
+                            status_string = "====> DEBUG - after update_sql_string - " + str( datetime.datetime.now() )
+                            print( status_string )
+                        #-- END debug --#
 
-                        #-- END check to see if table's count is already stored. --#
+                    #-- END loop over values --#
 
-                    #-- END try-except to catch psycopg2.IntegrityError --#
+                elif ( value_count == 0 ):
 
-                    if ( debug_flag_IN == True ):
-                        status_string = "====> DEBUG - after update_sql_string - " + str( datetime.datetime.now() )
-                        print( status_string )
-                    #-- END debug --#
+                    # no value.  Make a note.
+                    no_value_counter += 1
+
+                elif ( value_count > 1 ):
 
-                #-- END loop over values --#
+                    multi_value_counter += 1
 
-            elif ( value_count == 0 ):
+                    if ( debug_flag_IN == True ):
+                        # ERROR - multiple values - should be consistent.
+                        error_person_map[ current_person_id ] = value_map
+                        error_person_counter += 1
+                        error_message = "ERROR - multiple values in column " + str( column_of_interest )
+                        error_message += " for person " + str( current_person_id )
+                        error_message += ": " + str( error_person_map )
+                        print( error_message )
+                    #-- END DEBUG --#
 
-                # no value.  Make a note.
-                no_value_counter += 1
+                else:
 
-            elif ( value_count > 1 ):
+                    print( "ERROR - value count is neither 0, 1, or more than 1.  Should never get here." )
 
-                multi_value_counter += 1
+                #-- END check to see if one value. --#
 
-                if ( debug_flag_IN == True ):
-                    # ERROR - multiple values - should be consistent.
-                    error_person_map[ current_person_id ] = value_map
-                    error_person_counter += 1
-                    error_message = "ERROR - multiple values in column " + str( column_of_interest )
-                    error_message += " for person " + str( current_person_id )
-                    error_message += ": " + str( error_person_map )
-                    print( error_message )
-                #-- END DEBUG --#
+                # output a heartbeat every 100 people, and commit.
+                if ( ( person_counter % 100 ) == 0 ):
 
-            else:
+                    # ... and commit.
+                    connection_IN.commit()
 
-                print( "ERROR - value count is neither 0, 1, or more than 1.  Should never get here." )
+                    # debug?
+                    if ( debug_flag_IN == True ):
 
-            #-- END check to see if one value. --#
+                        # output brief status...
+                        status_string = "====> " + str( datetime.datetime.now() )
+                        status_string += " - " + str( person_counter ) + " person_records processed"
+                        print( status_string )
 
-            # output a heartbeat every 100 people, and commit.
-            if ( ( person_counter % 100 ) == 0 ):
+                    #-- END check to see if debug --#
 
-                # ... and commit.
-                connection_IN.commit()
+                #-- END check to see if hundredth person processed. --#
 
-                # debug?
-                if ( debug_flag_IN == True ):
+                # output details every 10000 docnbr values
+                if ( ( person_counter % 10000 ) == 0 ):
 
                     # output brief status...
                     status_string = "====> " + str( datetime.datetime.now() )
                     status_string += " - " + str( person_counter ) + " person_records processed"
                     print( status_string )
 
-                #-- END check to see if debug --#
+                    status_string = "- error total = " + str( error_person_counter )
+                    status_string += "\n- value status per person: 0 = " + str( no_value_counter ) + "; 1 = " + str( single_value_counter ) + "; >1 = " + str( multi_value_counter )
+                    status_string += "\n- Details on no-value source rows: None = " + str( none_counter ) + "; empty = " + str( empty_counter ) + "; invalid = " + str( invalid_value_counter )
+                    print( status_string )
 
-            #-- END check to see if hundredth person processed. --#
+                #-- END periodic output of exists counter.
 
-            # output details every 10000 docnbr values
-            if ( ( person_counter % 10000 ) == 0 ):
+            #-- END loop over persons --#
 
-                # output brief status...
-                status_string = "====> " + str( datetime.datetime.now() )
-                status_string += " - " + str( person_counter ) + " person_records processed"
+            # clean up the invalid values
+            invalid_values_list = list( six.iterkeys( invalid_values_OUT ) )
+            cleanup_status_info = remove_invalid_person_values( connection_IN,
+                                                                invalid_values_list,
+                                                                person_column_name,
+                                                                person_column_type_IN,
+                                                                debug_flag_IN )
+
+            # output summary
+            status_string = "\n\n====> COMPLETE - " + str( datetime.datetime.now() )
+            status_string += "\n==> " + str( person_counter ) + " person_records processed"
+            status_string += "\n- error total = " + str( error_person_counter )
+            status_string += "\n- value status per person: 0 = " + str( no_value_counter ) + "; 1 = " + str( single_value_counter ) + "; >1 = " + str( multi_value_counter )
+            status_string += "\n- Details on values: Total = " + str( total_value_counter ) + "; None = " + str( none_counter ) + "; empty = " + str( empty_counter ) + "; invalid = " + str( invalid_value_counter )
+
+            print( status_string )
+
+        except psycopg2.IntegrityError as pie:
+
+            # Exception caught.
+            print( "psycopg2.IntegrityError caught: " + str( pie ) )
+
+            # details:
+            exception_type, exception_value, exception_traceback = sys.exc_info()
+            print( "- exception type: " + str( exception_type ) )
+            print( "- exception value: " + str( exception_value ) )
+            print( "- exception traceback: " + str( traceback.format_exc() ) )
+
+            # And, more details:
+            status_string = "values in column " + str( column_of_interest )
+            status_string += " for person " + str( current_person_id ) + " (docnbr = " + str( current_docnbr ) + "): "
+            status_string += str( value_map )
+            print( status_string )
+
+            # rollback
+            connection_IN.rollback()
+
+        except Exception as e:
+
+            # Exception caught.
+            print( "Exception caught: " + str( e ) )
+
+            # details:
+            exception_type, exception_value, exception_traceback = sys.exc_info()
+            print( "- exception type: " + str( exception_type ) )
+            print( "- exception value: " + str( exception_value ) )
+            print( "- exception traceback: " + str( traceback.format_exc() ) )
+
+            # rollback
+            connection_IN.rollback()
+
+        finally:
+
+            person_cursor.close()
+            work_cursor.close()
+
+        #-- END try...except...finally --#
+
+    #-- END check to see if set-based --#
+
+    status_info_OUT[ "error_map" ] = error_person_map
+
+    return status_info_OUT
+
+#-- END function merge_values_into_table() --#
+
+print( "Function merge_values_into_table() declared at " + str( datetime.datetime.now() ) )
+
+
+def merge_values_set_based( connection_IN,
+                            source_table_info_list_IN,
+                            dest_table_IN,
+                            dest_column_IN,
+                            dest_column_type_IN = "str",
+                            is_empty_string_value_IN = False,
+                            invalid_value_list_IN = None,
+                            debug_flag_IN = False,
+                            limit_IN = -1,
+                            dest_id_list_IN = None,
+                            dest_id_column_name_IN = "id",
+                            dest_schema_IN = None,
+                            batch_size_IN = 10000 ):
+
+    '''
+    Set-based version of merge_values_into_table() (and, with person as the
+        destination and a join of source person_id to person id, of
+        merge_values_into_person()).  Rather than looping over destination
+        rows, it:
+        - stores the IDs of destination rows whose destination column is NULL
+            (limited by dest_id_list_IN and limit_IN) in a temp table.
+        - runs one INSERT...SELECT DISTINCT per source table to stage each
+            destination row's values for the column of interest (as text) in
+            a second temp table.  Source rows are matched to destination rows
+            using "join_on_list" in the table's info: a list of dictionaries
+            with the name of the source column (JOIN_COLUMN_SOURCE_NAME) and
+            destination column (JOIN_COLUMN_DEST_NAME) that must match.
+        - groups the staged values (leaving out NULL, empty string unless
+            is_empty_string_value_IN is True, and invalid values) to find rows
+            where all the sources agree on one value.
+        - updates those rows with one UPDATE...FROM per batch_size_IN rows,
+            committing after each batch.  If a batch fails because of a
+            constraint violation or a value that can't be cast to the
+            column's type, it is redone one row at a time, and values
+            that can't be stored are added to the invalid values map, with
+            the count of distinct source rows that have the value in each
+            source table.
+
+    Invalid values (passed in or found) are then removed from the destination
+        column with remove_invalid_person_values().  Requires PostgreSQL.  The
+        temp tables are always named in pg_temp, so a permanent table with the
+        same name is never dropped or used.
+
+    Returns the same map as merge_values_into_table(): "error_map" (in debug,
+        map of destination IDs that had multiple values to their values) and
+        "invalid_values" (map of invalid values to map of source table names
+        to counts).  Staged values are text, so invalid values found while
+        updating are strings.  If anything goes wrong (including the
+        destination column not being found), the transaction is rolled back
+        and the map also has a "status_message".
+    '''
+
+    # return reference
+    status_info_OUT = {}
+    invalid_values_OUT = {}
+    status_info_OUT[ "error_map" ] = None
+    status_info_OUT[ "invalid_values" ] = invalid_values_OUT
+
+    # declare variables - configuration
+    destination_table_name = None
+    destination_column_name = None
+    destination_id_column_name = None
+    destination_column_db_type = None
+    invalid_value = ""
+    invalid_value_string_list = None
+    batch_size = None
+
+    # declare variables - source tables
+    source_table_info = None
+    table_of_interest = ""
+    column_of_interest = ""
+    join_on_list = None
+    join_on_info = None
+    join_on_source = None
+    join_on_dest = None
+    join_on_sql_list = None
+    source_join_column_list = None
+    source_table_to_join_column_list_map = None
+
+    # declare variables - processing
+    work_cursor = None
+    sql_string = ""
+    value_filter_sql = ""
+    current_row = None
+    destination_counter = -1
+    error_map = {}
+    error_counter = -1
+    batch_start = -1
+    agreed_count = -1
+    batch_row_list = None
+    current_record_id = None
+    current_value = None
+    table_to_count_map = None
+    invalid_count = -1
+    invalid_count_sql = ""
+
+    # declare variables - counts
+    total_value_counter = -1
+    none_counter = -1
+    empty_counter = -1
+    invalid_value_counter = -1
+    no_value_counter = -1
+    single_value_counter = -1
+    multi_value_counter = -1
+    updated_counter = -1
+
+    # declare variables - clean up invalid values
+    invalid_values_list = None
+    cleanup_status_info = None
+
+    # initialize
+    destination_table_name = dest_table_IN
+    if ( ( dest_schema_IN is not None ) and ( dest_schema_IN != "" ) ):
+        destination_table_name = dest_schema_IN + "." + dest_table_IN
+    #-- END check to see if schema name. --#
+    destination_column_name = dest_column_IN
+    destination_id_column_name = dest_id_column_name_IN
+    batch_size = batch_size_IN
+    if ( ( batch_size is None ) or ( batch_size <= 0 ) ):
+        batch_size = 10000
+    #-- END check to see if batch size --#
+    source_table_to_join_column_list_map = {}
+
+    # got invalid values passed in?
+    if ( ( invalid_value_list_IN is not None )
+        and ( isinstance( invalid_value_list_IN, list ) == True )
+        and ( len( invalid_value_list_IN ) > 0 ) ):
+
+        # yes.  Loop.
+        for invalid_value in invalid_value_list_IN:
+
+            # Add each to invalid_values_OUT mapped to empty dict.
+            invalid_values_OUT[ invalid_value ] = {}
+
+        #-- END loop over invalid values passed in. --#
+
+    #-- END check to see if invalid values list.
+
+    # values are compared as text.
+    invalid_value_string_list = [ str( invalid_value ) for invalid_value in invalid_values_OUT ]
+
+    try:
+
+        work_cursor = connection_IN.cursor( cursor_factory = psycopg2.extras.DictCursor )
+
+        # destination column's type, to cast staged values when updating.
+        destination_column_db_type = get_column_db_type( work_cursor, destination_table_name, destination_column_name )
+        if ( destination_column_db_type is None ):
+            raise ValueError( "column " + str( destination_column_name ) + " not found in table " + str( destination_table_name ) + ", so can't merge values into it." )
+        #-- END check to see if column found --#
+
+        # start clean.
+        work_cursor.execute( "DROP TABLE IF EXISTS pg_temp.merge_values_dest, pg_temp.merge_values_raw, pg_temp.merge_values_agreed;" )
+
+        #----------------------------------------------------------------------#
+        # ==> destination rows whose value is not already set.
+
+        sql_string = "CREATE TEMP TABLE pg_temp.merge_values_dest AS"
+        sql_string += " SELECT " + destination_id_column_name + " AS dest_id"
+        sql_string += " FROM " + destination_table_name
+        sql_string += " WHERE " + destination_column_name + " IS NULL"
+
+        # do we have a destination ID list?
+        if ( ( dest_id_list_IN is not None )
+            and ( isinstance( dest_id_list_IN, list ) == True )
+            and ( len( dest_id_list_IN ) > 0 ) ):
+
+            # yes.  only rows with ID in that list:
+            sql_string += " AND " + destination_id_column_name + " = ANY( %(dest_id_list)s )"
+
+        #-- END check to see if we are limiting to a certain set of IDs. --#
+
+        sql_string += " ORDER BY " + destination_id_column_name + " ASC"
+        if ( limit_IN > 0 ):
+            sql_string += " LIMIT " + str( limit_IN )
+        #-- END check to see if limit --#
+        sql_string += ";"
+
+        if ( debug_flag_IN == True ):
+            status_string = "====> DEBUG - before \"" + str( sql_string ) + "\" - " + str( datetime.datetime.now() )
+            print( status_string )
+        #-- END debug --#
+
+        work_cursor.execute( sql_string, { "dest_id_list" : dest_id_list_IN } )
+        work_cursor.execute( "CREATE INDEX ON pg_temp.merge_values_dest ( dest_id );" )
+        work_cursor.execute( "SELECT COUNT( * ) AS destination_count FROM pg_temp.merge_values_dest;" )
+        destination_counter = work_cursor.fetchone()[ "destination_count" ]
+
+        #----------------------------------------------------------------------#
+        # ==> stage values from each source table, one query per table.
+
+        sql_string = "CREATE TEMP TABLE pg_temp.merge_values_raw AS"
+        sql_string += " SELECT dest_id, CAST( NULL AS text ) AS value_text"
+        sql_string += " FROM pg_temp.merge_values_dest LIMIT 0;"
+        work_cursor.execute( sql_string )
+
+        for source_table_info in source_table_info_list_IN:
+
+            # get column and table of interest from source_table_info.
+            table_of_interest = source_table_info.get( "table_name", None )
+            column_of_interest = source_table_info.get( "column_name", None )
+            join_on_list = source_table_info.get( "join_on_list", None )
+
+            # got a table name?
+            if ( ( table_of_interest is not None ) and ( table_of_interest != "" ) ):
+
+                # got a column name?
+                if ( ( column_of_interest is not None ) and ( column_of_interest != "" ) ):
+
+                    # got a JOIN ON list?
+                    if ( ( join_on_list is not None )
+                        and ( isinstance( join_on_list, list ) == True )
+                        and ( len( join_on_list ) > 0 ) ):
+
+                        # build join.
+                        join_on_sql_list = []
+                        source_join_column_list = []
+                        for join_on_info in join_on_list:
+
+                            join_on_source = join_on_info.get( JOIN_COLUMN_SOURCE_NAME )
+                            join_on_dest = join_on_info.get( JOIN_COLUMN_DEST_NAME )
+                            join_on_sql_list.append( "s." + join_on_source + " = d." + join_on_dest )
+                            source_join_column_list.append( "s." + join_on_source )
+
+                        #-- END loop over join columns --#
+                        source_table_to_join_column_list_map[ table_of_interest ] = source_join_column_list
+
+                        # get distinct values for column of interest for each
+                        #     destination row.
+                        sql_string = "INSERT INTO pg_temp.merge_values_raw ( dest_id, value_text )"
+                        sql_string += " SELECT DISTINCT m.dest_id, CAST( s." + column_of_interest + " AS text )"
+                        sql_string += " FROM pg_temp.merge_values_dest m"
+                        sql_string += " JOIN " + destination_table_name + " d ON d." + destination_id_column_name + " = m.dest_id"
+                        sql_string += " JOIN " + table_of_interest + " s ON " + " AND ".join( join_on_sql_list )
+                        sql_string += ";"
+
+                        if ( debug_flag_IN == True ):
+                            status_string = "====> DEBUG - before \"" + str( sql_string ) + "\" - " + str( datetime.datetime.now() )
+                            print( status_string )
+                        #-- END debug --#
+
+                        work_cursor.execute( sql_string )
+
+                    else:
+
+                        # no join columns specified.
+                        print( "ERROR - No join columns specified for table " + str( table_of_interest ) + ".  Moving on." )
+
+                    #-- END check to see if JOIN ON list. --#
+
+                else:
+
+                    # no column name specified.
+                    print( "ERROR - No column name specified for table " + str( table_of_interest ) + ".  Moving on." )
+
+                #-- END check to see if column name passed in. --#
+
+            else:
+
+                # no table name specified.
+                print( "ERROR - No table name specified.  Moving on." )
+
+            #-- END check to see if table name passed in. --#
+
+        #-- END loop over table information. --#
+
+        #----------------------------------------------------------------------#
+        # ==> count and group values.
+
+        # value counts - one per distinct value per source table.
+        sql_string = "SELECT COUNT( * ) AS total_count"
+        sql_string += ", COUNT( * ) FILTER ( WHERE value_text IS NULL ) AS none_count"
+        sql_string += ", COUNT( * ) FILTER ( WHERE value_text = '' ) AS empty_count"
+        sql_string += ", COUNT( * ) FILTER ( WHERE value_text = ANY( CAST( %(invalid_list)s AS text[] ) ) ) AS invalid_count"
+        sql_string += " FROM pg_temp.merge_values_raw;"
+        work_cursor.execute( sql_string, { "invalid_list" : invalid_value_string_list } )
+        current_row = work_cursor.fetchone()
+        total_value_counter = current_row[ "total_count" ]
+        none_counter = current_row[ "none_count" ]
+        empty_counter = current_row[ "empty_count" ]
+        invalid_value_counter = current_row[ "invalid_count" ]
+
+        # which values are OK?
+        value_filter_sql = " WHERE value_text IS NOT NULL"
+        if ( is_empty_string_value_IN == False ):
+            value_filter_sql += " AND value_text <> ''"
+        #-- END check to see if empty string is counted as a value --#
+        value_filter_sql += " AND NOT ( value_text = ANY( CAST( %(invalid_list)s AS text[] ) ) )"
+
+        # rows with one value, numbered for batching...
+        sql_string = "CREATE TEMP TABLE pg_temp.merge_values_agreed AS"
+        sql_string += " SELECT dest_id, MIN( value_text ) AS value_text, ROW_NUMBER() OVER ( ORDER BY dest_id ) AS batch_row_number"
+        sql_string += " FROM pg_temp.merge_values_raw"
+        sql_string += value_filter_sql
+        sql_string += " GROUP BY dest_id"
+        sql_string += " HAVING COUNT( DISTINCT value_text ) = 1;"
+        work_cursor.execute( sql_string, { "invalid_list" : invalid_value_string_list } )
+        work_cursor.execute( "CREATE INDEX ON pg_temp.merge_values_agreed ( batch_row_number );" )
+        work_cursor.execute( "SELECT COUNT( * ) AS agreed_count FROM pg_temp.merge_values_agreed;" )
+        agreed_count = work_cursor.fetchone()[ "agreed_count" ]
+        single_value_counter = agreed_count
+
+        # ...and rows with more than one.
+        sql_string = "SELECT dest_id, ARRAY_AGG( DISTINCT value_text ) AS value_list"
+        sql_string += " FROM pg_temp.merge_values_raw"
+        sql_string += value_filter_sql
+        sql_string += " GROUP BY dest_id"
+        sql_string += " HAVING COUNT( DISTINCT value_text ) > 1;"
+        work_cursor.execute( sql_string, { "invalid_list" : invalid_value_string_list } )
+        multi_value_counter = 0
+        error_map = {}
+        error_counter = 0
+        for current_row in work_cursor:
+
+            multi_value_counter += 1
+
+            if ( debug_flag_IN == True ):
+
+                # ERROR - multiple values - should be consistent.
+                error_map[ current_row[ "dest_id" ] ] = { current_value : current_value for current_value in current_row[ "value_list" ] }
+                error_counter += 1
+
+            #-- END DEBUG --#
+
+        #-- END loop over rows with multiple values --#
+
+        no_value_counter = destination_counter - single_value_counter - multi_value_counter
+        connection_IN.commit()
+
+        #----------------------------------------------------------------------#
+        # ==> update, one statement per batch.
+
+        sql_string = "UPDATE " + destination_table_name + " d"
+        sql_string += " SET " + destination_column_name + " = CAST( a.value_text AS " + destination_column_db_type + " )"
+        sql_string += " FROM pg_temp.merge_values_agreed a"
+        sql_string += " WHERE d." + destination_id_column_name + " = a.dest_id"
+        sql_string += "     AND a.batch_row_number > %(batch_start)s"
+        sql_string += "     AND a.batch_row_number <= %(batch_end)s;"
+
+        updated_counter = 0
+        batch_start = 0
+        while ( batch_start < agreed_count ):
+
+            if ( debug_flag_IN == True ):
+                status_string = "====> DEBUG - before update of rows " + str( batch_start + 1 ) + " to " + str( batch_start + batch_size ) + " - " + str( datetime.datetime.now() )
                 print( status_string )
+            #-- END debug --#
+
+            # use try to capture UNIQUE constraint violations and bad values.
+            try:
+
+                # do it!
+                work_cursor.execute( sql_string, { "batch_start" : batch_start, "batch_end" : batch_start + batch_size } )
+                updated_counter += work_cursor.rowcount
+                connection_IN.commit()
+
+            except ( psycopg2.IntegrityError, psycopg2.DataError ) as pie:
+
+                # rollback
+                connection_IN.rollback()
+
+                # Exception caught - redo batch one row at a time.
+                print( "psycopg2." + type( pie ).__name__ + " caught: " + str( pie ) + " - updating rows " + str( batch_start + 1 ) + " to " + str( batch_start + batch_size ) + " one at a time." )
+
+                work_cursor.execute(
+                    "SELECT dest_id, value_text FROM pg_temp.merge_values_agreed WHERE batch_row_number > %(batch_start)s AND batch_row_number <= %(batch_end)s ORDER BY batch_row_number;",
+                    { "batch_start" : batch_start, "batch_end" : batch_start + batch_size }
+                )
+                batch_row_list = work_cursor.fetchall()
+                for current_row in batch_row_list:
+
+                    current_record_id = current_row[ "dest_id" ]
+                    current_value = current_row[ "value_text" ]
+
+                    try:
+
+                        work_cursor.execute(
+                            "UPDATE " + destination_table_name + " SET " + destination_column_name + " = CAST( %(value)s AS " + destination_column_db_type + " ) WHERE " + destination_id_column_name + " = %(dest_id)s;",
+                            { "value" : current_value, "dest_id" : current_record_id }
+                        )
+                        updated_counter += work_cursor.rowcount
+                        connection_IN.commit()
+
+                    except ( psycopg2.IntegrityError, psycopg2.DataError ) as row_pie:
+
+                        # rollback
+                        connection_IN.rollback()
+                        print( "psycopg2." + type( row_pie ).__name__ + " caught: " + str( row_pie ) )
+                        print( "value for row " + str( current_record_id ) + ": " + str( current_value ) )
+
+                        # update/add entry to invalid_values_OUT
+                        if ( current_value not in invalid_values_OUT ):
+
+                            # add a map for the value to invalid_values_OUT
+                            invalid_values_OUT[ current_value ] = {}
+
+                        #-- END check to see if value in invalid_values_OUT --#
 
-                status_string = "- error total = " + str( error_person_counter )
-                status_string += "\n- value status per person: 0 = " + str( no_value_counter ) + "; 1 = " + str( single_value_counter ) + "; >1 = " + str( multi_value_counter )
-                status_string += "\n- Details on no-value source rows: None = " + str( none_counter ) + "; empty = " + str( empty_counter ) + "; invalid = " + str( invalid_value_counter )
+                        # get map for value
+                        table_to_count_map = invalid_values_OUT.get( current_value, None )
+
+                        # count source rows with this value in each table.
+                        for table_of_interest, source_join_column_list in six.iteritems( source_table_to_join_column_list_map ):
+
+                            if ( table_of_interest not in table_to_count_map ):
+
+                                column_of_interest = None
+                                for source_table_info in source_table_info_list_IN:
+                                    if ( source_table_info.get( "table_name", None ) == table_of_interest ):
+                                        column_of_interest = source_table_info.get( "column_name", None )
+                                    #-- END check to see if table --#
+                                #-- END loop over table information --#
+
+                                invalid_count_sql = "SELECT COUNT( DISTINCT ( " + ", ".join( source_join_column_list ) + " ) ) AS invalid_count"
+                                invalid_count_sql += " FROM " + table_of_interest + " s"
+                                invalid_count_sql += " WHERE CAST( s." + column_of_interest + " AS text ) = %(value)s;"
+                                work_cursor.execute( invalid_count_sql, { "value" : current_value } )
+                                invalid_count = work_cursor.fetchone()[ "invalid_count" ]
+                                table_to_count_map[ table_of_interest ] = invalid_count
+
+                            #-- END check to see if table's count is already stored. --#
+
+                        #-- END loop over source tables --#
+
+                    #-- END try-except to catch psycopg2.IntegrityError and DataError --#
+
+                #-- END loop over rows in batch --#
+
+            #-- END try-except to catch psycopg2.IntegrityError and DataError --#
+
+            batch_start += batch_size
+
+            # output brief status...
+            if ( debug_flag_IN == True ):
+                status_string = "====> " + str( datetime.datetime.now() )
+                status_string += " - " + str( min( batch_start, agreed_count ) ) + " of " + str( agreed_count ) + " rows updated"
                 print( status_string )
+            #-- END check to see if debug --#
 
-            #-- END periodic output of exists counter.
+        #-- END loop over batches --#
 
-        #-- END loop over persons --#
+        # done with temp tables.
+        work_cursor.execute( "DROP TABLE IF EXISTS pg_temp.merge_values_dest, pg_temp.merge_values_raw, pg_temp.merge_values_agreed;" )
+        connection_IN.commit()
 
         # clean up the invalid values
         invalid_values_list = list( six.iterkeys( invalid_values_OUT ) )
         cleanup_status_info = remove_invalid_person_values( connection_IN,
                                                             invalid_values_list,
-                                                            person_column_name,
-                                                            person_column_type_IN,
-                                                            debug_flag_IN )
+                                                            destination_column_name,
+                                                            dest_column_type_IN,
+                                                            debug_flag_IN,
+                                                            table_name_IN = destination_table_name )
 
         # output summary
         status_string = "\n\n====> COMPLETE - " + str( datetime.datetime.now() )
-        status_string += "\n==> " + str( person_counter ) + " person_records processed"
-        status_string += "\n- error total = " + str( error_person_counter )
-        status_string += "\n- value status per person: 0 = " + str( no_value_counter ) + "; 1 = " + str( single_value_counter ) + "; >1 = " + str( multi_value_counter )
+        status_string += "\n==> " + str( destination_counter ) + " " + str( destination_table_name ) + " records processed ( " + str( updated_counter ) + " updated )"
+        status_string += "\n- error total = " + str( error_counter )
+        status_string += "\n- value status per record: 0 = " + str( no_value_counter ) + "; 1 = " + str( single_value_counter ) + "; >1 = " + str( multi_value_counter )
         status_string += "\n- Details on values: Total = " + str( total_value_counter ) + "; None = " + str( none_counter ) + "; empty = " + str( empty_counter ) + "; invalid = " + str( invalid_value_counter )
 
         print( status_string )
 
-    except psycopg2.IntegrityError as pie:
-
-        # Exception caught.
-        print( "psycopg2.IntegrityError caught: " + str( pie ) )
-
-        # details:
-        exception_type, exception_value, exception_traceback = sys.exc_info()
-        print( "- exception type: " + str( exception_type ) )
-        print( "- exception value: " + str( exception_value ) )
-        print( "- exception traceback: " + str( traceback.format_exc() ) )
-
-        # And, more details:
-        status_string = "values in column " + str( column_of_interest )
-        status_string += " for person " + str( current_person_id ) + " (docnbr = " + str( current_docnbr ) + "): "
-        status_string += str( value_map )
-        print( status_string )
-
-        # rollback
-        connection_IN.rollback()
-
     except Exception as e:
 
         # Exception caught.
-        print( "Exception caught: " + str( e ) )
+        status_info_OUT[ "status_message" ] = "Exception caught: " + str( e )
+        print( status_info_OUT[ "status_message" ] )
 
         # details:
         exception_type, exception_value, exception_traceback = sys.exc_info()
@@ -2904,18 +4378,19 @@ def merge_values_into_table( connection_IN,
 
     finally:
 
-        person_cursor.close()
-        work_cursor.close()
+        if ( work_cursor is not None ):
+            work_cursor.close()
+        #-- END check to see if cursor --#
 
     #-- END try...except...finally --#
 
-    status_info_OUT[ "error_map" ] = error_person_map
+    status_info_OUT[ "error_map" ] = error_map
 
     return status_info_OUT
 
-#-- END function merge_values_into_table() --#
+#-- END function merge_values_set_based() --#
 
-print( "Function merge_values_into_table() declared at " + str( datetime.datetime.now() ) )
+print( "Function merge_values_set_based() declared at " + str( datetime.datetime.now() ) )
 
 
 def render_create_index_script_sql( sql_string_IN, index_name_IN ):
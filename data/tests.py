@@ -0,0 +1,824 @@
+# python imports
+import os
+import site
+import re
+import tempfile
+import unittest
+from unittest import mock
+
+# python packages
+import numpy
+import pandas
+
+# import the things we are testing.
+
+try:
+
+    from python_utilities.data import data_functions
+
+except ImportError as ie:
+
+    # get current directory path
+    current_directory_path = os.path.dirname( os.path.abspath( __file__ ) )
+
+    # add to python path
+    site.addsitedir( current_directory_path )
+
+    # try local import
+    import data_functions
+
+#-- END attempt to import data_functions --#
+
+
+class RecordingConnection( object ):
+
+    '''
+    Stand-in for a psycopg2 connection, for testing the SQL functions without
+        a database.  Cursors record each statement run (and each commit and
+        rollback) in statement_list, in order, and get their rows from
+        respond_function_IN: it accepts SQL and parameters and returns a list
+        of rows (rowcount is the number of rows), or raises to fail the
+        statement.
+    '''
+
+    def __init__( self, respond_function_IN = None ):
+
+        self.respond_function = respond_function_IN
+        self.statement_list = []
+        self.commit_count = 0
+        self.rollback_count = 0
+
+    #-- END method __init__() --#
+
+
+    def commit( self ):
+
+        self.commit_count += 1
+        self.statement_list.append( ( "COMMIT", None ) )
+
+    #-- END method commit() --#
+
+
+    def cursor( self, *args, **kwargs ):
+
+        return RecordingCursor( self )
+
+    #-- END method cursor() --#
+
+
+    def get_sql_list( self, contains_IN = "" ):
+
+        return [ current_sql for current_sql, current_params in self.statement_list if contains_IN in current_sql ]
+
+    #-- END method get_sql_list() --#
+
+
+    def rollback( self ):
+
+        self.rollback_count += 1
+        self.statement_list.append( ( "ROLLBACK", None ) )
+
+    #-- END method rollback() --#
+
+#-- END class RecordingConnection --#
+
+
+class RecordingCursor( object ):
+
+    def __init__( self, connection_IN ):
+
+        self.connection = connection_IN
+        self.row_list = []
+        self.rowcount = -1
+
+    #-- END method __init__() --#
+
+
+    def __iter__( self ):
+
+        return iter( self.row_list )
+
+    #-- END method __iter__() --#
+
+
+    def close( self ):
+
+        pass
+
+    #-- END method close() --#
+
+
+    def execute( self, sql_IN, params_IN = None ):
+
+        self.connection.statement_list.append( ( sql_IN, params_IN ) )
+        self.row_list = []
+        if ( self.connection.respond_function is not None ):
+            self.row_list = list( self.connection.respond_function( sql_IN, params_IN ) )
+        #-- END check to see if respond function --#
+        self.rowcount = len( self.row_list )
+
+    #-- END method execute() --#
+
+
+    def fetchall( self ):
+
+        return list( self.row_list )
+
+    #-- END method fetchall() --#
+
+
+    def fetchone( self ):
+
+        # return reference
+        row_OUT = None
+
+        if ( len( self.row_list ) > 0 ):
+            row_OUT = self.row_list[ 0 ]
+        #-- END check to see if rows --#
+
+        return row_OUT
+
+    #-- END method fetchone() --#
+
+#-- END class RecordingCursor --#
+
+
+def fake_execute_batch( cursor_IN, sql_IN, param_list_IN, page_size = 100 ):
+
+    '''
+    Replaces psycopg2.extras.execute_batch() in tests - runs the SQL once,
+        with the list of parameter sets, on the RecordingCursor.
+    '''
+
+    cursor_IN.execute( sql_IN, list( param_list_IN ) )
+
+#-- END function fake_execute_batch() --#
+
+
+def fake_execute_values( cursor_IN, sql_IN, param_list_IN, template = None, page_size = 100 ):
+
+    '''
+    Replaces psycopg2.extras.execute_values() in tests - runs the SQL once,
+        with the list of rows, on the RecordingCursor.
+    '''
+
+    cursor_IN.execute( sql_IN, list( param_list_IN ) )
+
+#-- END function fake_execute_values() --#
+
+
+class TestDataFunctions(unittest.TestCase):
+
+    def test_get_non_digit_string_mask( self ):
+
+        # declare variables
+        test_series = None
+        test_mask = None
+        should_be = None
+
+        # ! ----> test 1 - strings, with a missing value (default dtype)
+        test_series = pandas.Series( [ "1", None, "abc", "2" ] )
+        test_mask = data_functions.get_non_digit_string_mask( test_series )
+        should_be = [ False, False, True, False ]
+
+        # and the assert
+        self.assertEqual( test_mask.tolist(), should_be )
+
+        # ! ----> test 2 - object column, strings, numbers, None and NaN
+        test_series = pandas.Series( [ "1", None, "x", numpy.nan, 5 ], dtype = object )
+        test_mask = data_functions.get_non_digit_string_mask( test_series )
+        should_be = [ False, False, True, False, False ]
+
+        # and the assert
+        self.assertEqual( test_mask.tolist(), should_be )
+
+        # ! ----> test 3 - numeric column
+        test_series = pandas.Series( [ 1.0, numpy.nan ] )
+        test_mask = data_functions.get_non_digit_string_mask( test_series )
+        should_be = [ False, False ]
+
+        # and the assert
+        self.assertEqual( test_mask.tolist(), should_be )
+
+        # ! ----> test 4 - object column, only ints
+        test_series = pandas.Series( [ 1, 2, None ], dtype = object )
+        test_mask = data_functions.get_non_digit_string_mask( test_series )
+        should_be = [ False, False, False ]
+
+        # and the assert
+        self.assertEqual( test_mask.tolist(), should_be )
+
+        # ! ----> test 5 - bytes (raw SAS strings), with a string mixed in
+        test_series = pandas.Series( [ b"abc", b"12", None ], dtype = object )
+        test_mask = data_functions.get_non_digit_string_mask( test_series )
+        should_be = [ False, False, False ]
+
+        # and the assert
+        self.assertEqual( test_mask.tolist(), should_be )
+
+        test_series = pandas.Series( [ b"abc", "x", "7" ], dtype = object )
+        test_mask = data_functions.get_non_digit_string_mask( test_series )
+        should_be = [ False, True, False ]
+
+        # and the assert
+        self.assertEqual( test_mask.tolist(), should_be )
+
+        # ! ----> test 6 - empty
+        test_mask = data_functions.get_non_digit_string_mask( pandas.Series( [], dtype = object ) )
+        self.assertEqual( test_mask.tolist(), [] )
+
+    #-- END method test_get_non_digit_string_mask() --#
+
+
+    def test_is_integer( self ):
+
+        # ! ----> whole numbers, fractions, NaN, infinity
+        self.assertTrue( data_functions.is_integer( 1.0 ) )
+        self.assertTrue( data_functions.is_integer( -3.0 ) )
+        self.assertFalse( data_functions.is_integer( 1.5 ) )
+        self.assertTrue( data_functions.is_integer( numpy.nan ) )
+        self.assertFalse( data_functions.is_integer( numpy.nan, is_nan_int_IN = False ) )
+        self.assertFalse( data_functions.is_integer( numpy.inf ) )
+
+    #-- END method test_is_integer() --#
+
+
+    def test_is_integer_array( self ):
+
+        # declare variables
+        test_array = None
+        should_be = None
+
+        # ! ----> test 1 - 1-D array
+        test_array = numpy.array( [ 1.0, 1.5, numpy.nan, numpy.inf, -2.0 ] )
+        should_be = [ True, False, True, False, True ]
+
+        # and the assert
+        self.assertEqual( data_functions.is_integer_array( test_array ).tolist(), should_be )
+
+        # ! ----> test 2 - NaN not an int
+        should_be = [ True, False, False, False, True ]
+        self.assertEqual( data_functions.is_integer_array( test_array, is_nan_int_IN = False ).tolist(), should_be )
+
+        # ! ----> test 3 - 2-D, all integers by column
+        test_array = numpy.array( [ [ 1.0, 1.5 ], [ numpy.nan, 2.0 ] ] )
+        should_be = [ True, False ]
+        self.assertEqual( data_functions.is_integer_array( test_array ).all( axis = 0 ).tolist(), should_be )
+
+    #-- END method test_is_integer_array() --#
+
+
+    def test_check_int_column_type( self ):
+
+        # declare variables
+        test_df = None
+        column_list = None
+        count_map = None
+
+        # ! ----> test 1 - missing value is not non-numeric
+        test_df = pandas.DataFrame( { "a" : [ "1", None, "2" ] } )
+        column_list = list( data_functions.check_int_column_type( test_df, [ "a" ] ) )
+
+        # and the assert
+        self.assertEqual( column_list, [] )
+
+        # ! ----> test 2 - counts of non-numeric values
+        test_df = pandas.DataFrame( { "a" : [ "1", "x", None, "x" ], "b" : [ "1", "2", "abc", "4" ], "c" : [ 1, 2, 3, 4 ] } )
+        count_map = data_functions.check_int_column_type( test_df, [ "a", "b", "c" ], return_counts_IN = True )
+
+        # and the assert
+        self.assertEqual( count_map, { "a" : { "x" : 2 }, "b" : { "abc" : 1 } } )
+
+        # ! ----> test 3 - object columns of ints and of bytes
+        test_df = pandas.DataFrame( { "a" : pandas.Series( [ 1, 2 ], dtype = object ), "b" : [ b"x", b"1" ] } )
+        column_list = list( data_functions.check_int_column_type( test_df, [ "a", "b" ] ) )
+
+        # and the assert
+        self.assertEqual( column_list, [] )
+
+    #-- END method test_check_int_column_type() --#
+
+
+    def test_clean_up_floats( self ):
+
+        # declare variables
+        test_df = None
+        output_df = None
+
+        test_df = pandas.DataFrame( {
+            "whole" : [ 1.0, numpy.nan, 3.0 ],
+            "fraction" : [ 1.5, 2.0, 3.0 ],
+            "text" : [ "x", "y", "z" ],
+            "all_nan" : [ numpy.nan, numpy.nan, numpy.nan ]
+        } )
+        output_df = data_functions.clean_up_floats( test_df, convert_nan_to_IN = -1 )
+
+        # and the asserts
+        self.assertTrue( pandas.api.types.is_integer_dtype( output_df[ "whole" ].dtype ) )
+        self.assertEqual( output_df[ "whole" ].tolist(), [ 1, -1, 3 ] )
+        self.assertEqual( str( output_df[ "fraction" ].dtype ), "float64" )
+        self.assertEqual( output_df[ "text" ].tolist(), [ "x", "y", "z" ] )
+        self.assertEqual( output_df[ "all_nan" ].tolist(), [ -1, -1, -1 ] )
+
+        # nothing passed in
+        self.assertIsNone( data_functions.clean_up_floats( None ) )
+
+    #-- END method test_clean_up_floats() --#
+
+
+    def test_clean_up_file_in_chunks( self ):
+
+        # declare variables
+        temp_directory = None
+        input_file_path = None
+        output_file_path = None
+        status_info = None
+        output_df = None
+        should_be = None
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+
+            # CSV where column types change from chunk to chunk.
+            input_file_path = os.path.join( temp_directory, "input.csv" )
+            output_file_path = os.path.join( temp_directory, "output.csv" )
+            with open( input_file_path, "w" ) as input_file:
+                input_file.write( "ID,Amt,Name,Mixed\n" )
+                input_file.write( "1,1.0,b'ann',1\n" )
+                input_file.write( "2,,bob,2\n" )
+                input_file.write( "3,2.5,,x\n" )
+                input_file.write( "4,,b'dee',\n" )
+                input_file.write( "5,4,eve,5\n" )
+            #-- END with open() --#
+
+            # ! ----> test 1 - column types decided across all chunks
+            should_be = { "ID" : "int", "Amt" : "float", "Name" : "str", "Mixed" : "str" }
+            self.assertEqual( data_functions.build_chunk_column_type_map( input_file_path, chunk_size_IN = 2 ), should_be )
+
+            # ! ----> test 2 - cleaned file, written a chunk at a time
+            status_info = data_functions.clean_up_file_in_chunks( input_file_path, output_file_path, chunk_size_IN = 2 )
+
+            # and the asserts
+            self.assertEqual( status_info[ "chunk_count" ], 3 )
+            self.assertEqual( status_info[ "row_count" ], 5 )
+            self.assertEqual( status_info[ "column_to_type_map" ], should_be )
+
+            output_df = pandas.read_csv( output_file_path, dtype = { "name" : str, "mixed" : str }, keep_default_na = False )
+            self.assertEqual( list( output_df.columns ), [ "id", "amt", "name", "mixed" ] )
+            self.assertEqual( output_df[ "id" ].tolist(), [ 1, 2, 3, 4, 5 ] )
+            self.assertEqual( output_df[ "name" ].tolist(), [ "ann", "bob", "", "dee", "eve" ] )
+            self.assertEqual( output_df[ "mixed" ].tolist(), [ "1", "2", "x", "", "5" ] )
+
+        #-- END with TemporaryDirectory --#
+
+    #-- END method test_clean_up_file_in_chunks() --#
+
+
+    def test_clean_up_sas_string_series( self ):
+
+        # declare variables
+        test_series = None
+        should_be = None
+
+        test_series = pandas.Series( [ "b'abc'", None, "nan", "plain" ], dtype = object )
+        should_be = [ "abc", "", "", "plain" ]
+
+        # and the assert
+        self.assertEqual( data_functions.clean_up_sas_string_series( test_series ).tolist(), should_be )
+
+    #-- END method test_clean_up_sas_string_series() --#
+
+
+    def test_save_rawdata_modify_column_value( self ):
+
+        # declare variables
+        test_df = None
+        output_df = None
+
+        # ! ----> test 1 - copy, missing value left alone
+        test_df = pandas.DataFrame( { "a" : [ "1", None, "x" ] } )
+        output_df = data_functions.save_rawdata_modify_column_value( test_df, [ "a" ] )
+
+        # and the asserts
+        self.assertIsNot( output_df, test_df )
+        self.assertEqual( list( test_df.columns ), [ "a" ] )
+        self.assertEqual( output_df[ "a" ].tolist()[ 0 ], "1" )
+        self.assertTrue( pandas.isna( output_df[ "a" ].tolist()[ 1 ] ) )
+        self.assertEqual( output_df[ "a" ].tolist()[ 2 ], -999999 )
+        self.assertEqual( output_df[ "a_raw" ].tolist()[ 2 ], "x" )
+
+        # ! ----> test 2 - in place
+        test_df = pandas.DataFrame( { "a" : [ "1", "x" ] } )
+        output_df = data_functions.save_rawdata_modify_column_value( test_df, [ "a" ], nan_default_value_IN = -1, is_in_place_IN = True )
+
+        # and the asserts
+        self.assertIs( output_df, test_df )
+        self.assertEqual( test_df[ "a" ].tolist(), [ "1", -1 ] )
+
+        # ! ----> test 3 - missing column, nothing changed
+        test_df = pandas.DataFrame( { "a" : [ "x" ] } )
+        output_df = data_functions.save_rawdata_modify_column_value( test_df, [ "a", "zz" ], is_in_place_IN = True )
+
+        # and the asserts
+        self.assertIs( output_df, test_df )
+        self.assertEqual( list( test_df.columns ), [ "a" ] )
+
+        # ! ----> test 4 - object column of ints, nothing to change
+        test_df = pandas.DataFrame( { "a" : pandas.Series( [ 1, 2 ], dtype = object ) } )
+        output_df = data_functions.save_rawdata_modify_column_value( test_df, [ "a" ] )
+
+        # and the assert
+        self.assertEqual( output_df[ "a" ].tolist(), [ 1, 2 ] )
+
+    #-- END method test_save_rawdata_modify_column_value() --#
+
+#-- END unittest class TestDataFunctions --#
+
+
+@mock.patch.object( data_functions.psycopg2.extras, "execute_values", fake_execute_values )
+@mock.patch.object( data_functions.psycopg2.extras, "execute_batch", fake_execute_batch )
+class TestMergeValuesSetBased(unittest.TestCase):
+
+    # source tables, both joined to destination on person_id.
+    SOURCE_TABLE_INFO_LIST = [
+        {
+            "table_name" : "source_a",
+            "column_name" : "name_a",
+            "join_on_list" : [ { data_functions.JOIN_COLUMN_SOURCE_NAME : "person_id", data_functions.JOIN_COLUMN_DEST_NAME : "id" } ]
+        },
+        {
+            "table_name" : "source_b",
+            "column_name" : "name_b",
+            "join_on_list" : [ { data_functions.JOIN_COLUMN_SOURCE_NAME : "person_id", data_functions.JOIN_COLUMN_DEST_NAME : "id" } ]
+        }
+    ]
+
+
+    def respond( self, sql_IN, params_IN ):
+
+        '''
+        Rows for a run with 3 destination rows where sources agree, and one
+            where they don't. If self.bad_value is set, UPDATEs that include
+            it fail with an IntegrityError.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        if ( "format_type" in sql_IN ):
+            list_OUT = self.column_type_row_list
+        elif ( "destination_count" in sql_IN ):
+            list_OUT = [ { "destination_count" : 5 } ]
+        elif ( "total_count" in sql_IN ):
+            list_OUT = [ { "total_count" : 8, "none_count" : 1, "empty_count" : 1, "invalid_count" : 0 } ]
+        elif ( "agreed_count" in sql_IN ):
+            list_OUT = [ { "agreed_count" : 3 } ]
+        elif ( "ARRAY_AGG" in sql_IN ):
+            list_OUT = [ { "dest_id" : 9, "value_list" : [ "a", "b" ] } ]
+        elif ( sql_IN.startswith( "SELECT dest_id, value_text" ) == True ):
+            list_OUT = [ { "dest_id" : 1, "value_text" : "ok" }, { "dest_id" : 2, "value_text" : self.bad_value } ]
+        elif ( "invalid_count FROM" in sql_IN ):
+            list_OUT = [ { "invalid_count" : 4 } ]
+        elif ( sql_IN.startswith( "UPDATE person d" ) == True ):
+            if ( self.bad_value is not None ):
+                raise data_functions.psycopg2.IntegrityError( "duplicate key" )
+            #-- END check to see if failing --#
+            list_OUT = range( min( params_IN[ "batch_end" ], 3 ) - params_IN[ "batch_start" ] )
+        elif ( sql_IN.startswith( "UPDATE person SET name = CAST" ) == True ):
+            if ( params_IN[ "value" ] == self.bad_value ):
+                raise data_functions.psycopg2.IntegrityError( "duplicate key" )
+            #-- END check to see if failing --#
+            list_OUT = [ params_IN[ "dest_id" ] ]
+        #-- END check to see which statement --#
+
+        return list_OUT
+
+    #-- END method respond() --#
+
+
+    def setUp( self ):
+
+        self.column_type_row_list = [ ( "character varying(255)", ) ]
+        self.bad_value = None
+
+    #-- END method setUp() --#
+
+
+    def test_staging( self ):
+
+        # declare variables
+        test_connection = None
+        sql_list = None
+
+        test_connection = RecordingConnection( self.respond )
+        data_functions.merge_values_set_based( test_connection, self.SOURCE_TABLE_INFO_LIST, "person", "name", batch_size_IN = 2 )
+
+        # ! ----> temp tables only ever named in pg_temp
+        sql_list = test_connection.get_sql_list( "merge_values_" )
+        self.assertTrue( len( sql_list ) > 0 )
+        for current_sql in sql_list:
+            self.assertIsNone( re.search( r"(?<!pg_temp\.)merge_values_", current_sql ), current_sql )
+        #-- END loop over SQL --#
+
+        # ! ----> dropped before and after
+        sql_list = test_connection.get_sql_list( "DROP TABLE" )
+        self.assertEqual( len( sql_list ), 2 )
+        self.assertEqual( test_connection.statement_list[ 1 ][ 0 ], sql_list[ 0 ] )
+
+        # ! ----> destination rows with no value
+        sql_list = test_connection.get_sql_list( "CREATE TEMP TABLE pg_temp.merge_values_dest" )
+        self.assertEqual( len( sql_list ), 1 )
+        self.assertIn( "FROM person WHERE name IS NULL", sql_list[ 0 ] )
+
+        # ! ----> one INSERT...SELECT per source table
+        sql_list = test_connection.get_sql_list( "INSERT INTO pg_temp.merge_values_raw" )
+        self.assertEqual( len( sql_list ), 2 )
+        self.assertIn( "CAST( s.name_a AS text )", sql_list[ 0 ] )
+        self.assertIn( "JOIN source_a s ON s.person_id = d.id", sql_list[ 0 ] )
+        self.assertIn( "JOIN source_b s ON s.person_id = d.id", sql_list[ 1 ] )
+
+    #-- END method test_staging() --#
+
+
+    def test_grouped_agreement( self ):
+
+        # declare variables
+        test_connection = None
+        status_info = None
+        sql_list = None
+        update_list = None
+
+        test_connection = RecordingConnection( self.respond )
+        status_info = data_functions.merge_values_set_based( test_connection, self.SOURCE_TABLE_INFO_LIST, "person", "name", invalid_value_list_IN = [ "UNKNOWN" ], debug_flag_IN = True, batch_size_IN = 2 )
+
+        # ! ----> rows where all values agree, leaving out NULL, empty, invalid
+        sql_list = test_connection.get_sql_list( "CREATE TEMP TABLE pg_temp.merge_values_agreed" )
+        self.assertEqual( len( sql_list ), 1 )
+        self.assertIn( "value_text IS NOT NULL AND value_text <> ''", sql_list[ 0 ] )
+        self.assertIn( "GROUP BY dest_id HAVING COUNT( DISTINCT value_text ) = 1", sql_list[ 0 ] )
+
+        # ! ----> rows that disagree, in error map (debug)
+        self.assertEqual( status_info[ "error_map" ], { 9 : { "a" : "a", "b" : "b" } } )
+
+        # ! ----> one UPDATE per batch, cast to column type, commit after each
+        update_list = [ ( current_sql, current_params ) for current_sql, current_params in test_connection.statement_list if current_sql.startswith( "UPDATE person d" ) ]
+        self.assertEqual( [ current_params for current_sql, current_params in update_list ], [ { "batch_start" : 0, "batch_end" : 2 }, { "batch_start" : 2, "batch_end" : 4 } ] )
+        self.assertIn( "CAST( a.value_text AS character varying(255) )", update_list[ 0 ][ 0 ] )
+        self.assertEqual( test_connection.statement_list[ test_connection.statement_list.index( update_list[ 0 ] ) + 1 ][ 0 ], "COMMIT" )
+
+        # ! ----> invalid values passed in removed afterwards
+        sql_list = test_connection.get_sql_list( "SET name = NULL" )
+        self.assertEqual( len( sql_list ), 1 )
+        self.assertIn( "ANY( CAST( %s AS character varying(255)[] ) )", sql_list[ 0 ] )
+        self.assertEqual( status_info[ "invalid_values" ], { "UNKNOWN" : {} } )
+        self.assertEqual( test_connection.rollback_count, 0 )
+
+    #-- END method test_grouped_agreement() --#
+
+
+    def test_fallback( self ):
+
+        # declare variables
+        test_connection = None
+        status_info = None
+        row_update_list = None
+
+        self.bad_value = "dup"
+        test_connection = RecordingConnection( self.respond )
+        status_info = data_functions.merge_values_set_based( test_connection, self.SOURCE_TABLE_INFO_LIST, "person", "name", batch_size_IN = 2 )
+
+        # ! ----> failed batches rolled back, redone a row at a time
+        row_update_list = [ current_params for current_sql, current_params in test_connection.statement_list if current_sql.startswith( "UPDATE person SET name = CAST" ) ]
+        self.assertEqual( len( row_update_list ), 4 )
+        self.assertEqual( row_update_list[ 0 ], { "value" : "ok", "dest_id" : 1 } )
+
+        # rollback per failed batch, and per failed row.
+        self.assertEqual( test_connection.rollback_count, 4 )
+
+        # ! ----> value that can't be stored is invalid, with counts per table...
+        self.assertEqual( status_info[ "invalid_values" ], { "dup" : { "source_a" : 4, "source_b" : 4 } } )
+        self.assertEqual( len( test_connection.get_sql_list( "COUNT( DISTINCT ( s.person_id ) ) AS invalid_count FROM source_a" ) ), 1 )
+
+        # ! ----> ...and removed.
+        self.assertEqual( test_connection.statement_list[ -2 ][ 1 ], [ ( [ "dup" ], ) ] )
+
+    #-- END method test_fallback() --#
+
+
+    def test_column_not_found( self ):
+
+        # declare variables
+        test_connection = None
+        status_info = None
+
+        self.column_type_row_list = []
+        test_connection = RecordingConnection( self.respond )
+        status_info = data_functions.merge_values_set_based( test_connection, self.SOURCE_TABLE_INFO_LIST, "person", "missing_column" )
+
+        # and the asserts
+        self.assertIn( "column missing_column not found in table person", status_info[ "status_message" ] )
+        self.assertEqual( test_connection.get_sql_list( "CREATE TEMP TABLE" ), [] )
+        self.assertEqual( test_connection.rollback_count, 1 )
+
+    #-- END method test_column_not_found() --#
+
+#-- END unittest class TestMergeValuesSetBased --#
+
+
+@mock.patch.object( data_functions.psycopg2.extras, "execute_values", fake_execute_values )
+@mock.patch.object( data_functions.psycopg2.extras, "execute_batch", fake_execute_batch )
+class TestBatchedSQL(unittest.TestCase):
+
+    def respond( self, sql_IN, params_IN ):
+
+        '''
+        Rows for an integer "age" column in person. Updates fail with a
+            DataError if they include "x", IntegrityError if "dup".
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        value_list = None
+
+        if ( "format_type" in sql_IN ):
+
+            list_OUT = [ ( "integer", ) ]
+
+        elif ( sql_IN.startswith( "UPDATE" ) == True ):
+
+            # values in this statement.
+            if ( "VALUES %s" in sql_IN ):
+                value_list = [ current_row[ 1 ] for current_row in params_IN ]
+            else:
+                value_list = [ params_IN[ 0 ] ]
+            #-- END check to see if batch or row --#
+
+            if ( "x" in value_list ):
+                raise data_functions.psycopg2.DataError( "invalid input syntax for type integer" )
+            elif ( "dup" in value_list ):
+                raise data_functions.psycopg2.IntegrityError( "duplicate key" )
+            #-- END check to see if failing --#
+
+            list_OUT = value_list
+
+        #-- END check to see which statement --#
+
+        return list_OUT
+
+    #-- END method respond() --#
+
+
+    def test_execute_batched( self ):
+
+        # declare variables
+        test_connection = None
+        param_list = None
+        run_count = None
+        event_list = None
+
+        param_list = [ ( counter, ) for counter in range( 5 ) ]
+
+        # ! ----> test 1 - pages, commit every 4 (checked after each page), and at end
+        test_connection = RecordingConnection()
+        run_count = data_functions.execute_batched( test_connection, "UPDATE t SET a = %s;", iter( param_list ), page_size_IN = 2, commit_interval_IN = 4 )
+        event_list = [ current_params if ( current_sql != "COMMIT" ) else "COMMIT" for current_sql, current_params in test_connection.statement_list ]
+
+        # and the asserts
+        self.assertEqual( run_count, 5 )
+        self.assertEqual( event_list, [ param_list[ 0 : 2 ], param_list[ 2 : 4 ], "COMMIT", param_list[ 4 : ], "COMMIT" ] )
+
+        # ! ----> test 2 - no interval, one commit at end
+        test_connection = RecordingConnection()
+        data_functions.execute_batched( test_connection, "UPDATE t SET a = %s;", param_list, page_size_IN = 2 )
+
+        # and the asserts
+        self.assertEqual( len( test_connection.get_sql_list( "UPDATE" ) ), 3 )
+        self.assertEqual( test_connection.commit_count, 1 )
+        self.assertEqual( test_connection.statement_list[ -1 ][ 0 ], "COMMIT" )
+
+        # ! ----> test 3 - interval 0, caller commits
+        test_connection = RecordingConnection()
+        data_functions.execute_batched( test_connection, "INSERT INTO t ( a ) VALUES %s;", param_list, use_execute_values_IN = True, commit_interval_IN = 0 )
+
+        # and the asserts
+        self.assertEqual( len( test_connection.get_sql_list( "INSERT" ) ), 1 )
+        self.assertEqual( test_connection.commit_count, 0 )
+
+        # ! ----> test 4 - nothing to run
+        test_connection = RecordingConnection()
+        self.assertEqual( data_functions.execute_batched( test_connection, "UPDATE t SET a = %s;", [] ), 0 )
+        self.assertEqual( test_connection.statement_list, [] )
+
+    #-- END method test_execute_batched() --#
+
+
+    def test_update_column_values_batched( self ):
+
+        # declare variables
+        test_connection = None
+        id_value_list = None
+        status_info = None
+        batch_sql_list = None
+        row_sql_list = None
+        failed_list = None
+
+        # ! ----> test 1 - batches of 2, one bad value, one duplicate
+        id_value_list = [ ( 1, "1" ), ( 2, "2" ), ( 3, "x" ), ( 4, "4" ), ( 5, "dup" ) ]
+        test_connection = RecordingConnection( self.respond )
+        status_info = data_functions.update_column_values_batched( test_connection, "person", "age", id_value_list, batch_size_IN = 2 )
+
+        # one UPDATE...FROM ( VALUES ) per batch...
+        batch_sql_list = test_connection.get_sql_list( "VALUES %s" )
+        self.assertEqual( len( batch_sql_list ), 3 )
+        self.assertEqual( batch_sql_list[ 0 ], "UPDATE person AS t SET age = update_values.new_value FROM ( VALUES %s ) AS update_values ( id_value, new_value ) WHERE t.id = update_values.id_value;" )
+
+        # ...failed batches (DataError and IntegrityError) redone a row at a time...
+        row_sql_list = [ current_params for current_sql, current_params in test_connection.statement_list if current_sql.startswith( "UPDATE person SET age = CAST( %s AS integer )" ) ]
+        self.assertEqual( row_sql_list, [ ( "x", 3 ), ( "4", 4 ), ( "dup", 5 ) ] )
+        self.assertEqual( test_connection.rollback_count, 4 )
+
+        # ...and rows that fail on their own reported.
+        self.assertEqual( status_info[ "updated_count" ], 3 )
+        failed_list = status_info[ "failed_list" ]
+        self.assertEqual( [ ( current_id, current_value ) for current_id, current_value, current_exception in failed_list ], [ ( 3, "x" ), ( 5, "dup" ) ] )
+        self.assertIsInstance( failed_list[ 0 ][ 2 ], data_functions.psycopg2.DataError )
+        self.assertIsInstance( failed_list[ 1 ][ 2 ], data_functions.psycopg2.IntegrityError )
+
+        # ! ----> test 2 - column not found
+        test_connection = RecordingConnection()
+        with self.assertRaises( ValueError ):
+            data_functions.update_column_values_batched( test_connection, "person", "missing", id_value_list )
+        #-- END with assertRaises --#
+
+        # ! ----> test 3 - nothing to update, nothing run
+        test_connection = RecordingConnection( self.respond )
+        status_info = data_functions.update_column_values_batched( test_connection, "person", "age", [] )
+        self.assertEqual( status_info[ "updated_count" ], 0 )
+        self.assertEqual( test_connection.statement_list, [] )
+
+    #-- END method test_update_column_values_batched() --#
+
+
+    def test_remove_invalid_person_values( self ):
+
+        # declare variables
+        test_connection = None
+        update_list = None
+
+        test_connection = RecordingConnection( self.respond )
+        data_functions.remove_invalid_person_values( test_connection, [ 1, 2, 3, 4, 5 ], "age", person_column_type_IN = "str", batch_size_IN = 2 )
+
+        # and the asserts
+        update_list = [ ( current_sql, current_params ) for current_sql, current_params in test_connection.statement_list if current_sql.startswith( "UPDATE" ) ]
+        self.assertEqual( len( update_list ), 1 )
+        self.assertEqual( update_list[ 0 ][ 0 ], "UPDATE person SET age = NULL WHERE age = ANY( CAST( %s AS integer[] ) );" )
+        self.assertEqual( update_list[ 0 ][ 1 ], [ ( [ "1", "2" ], ), ( [ "3", "4" ], ), ( [ "5" ], ) ] )
+        self.assertEqual( test_connection.commit_count, 1 )
+
+    #-- END method test_remove_invalid_person_values() --#
+
+
+    def test_convert_empty_ints( self ):
+
+        # declare variables
+        test_connection = None
+        test_cursor = None
+        update_list = None
+
+        def respond( sql_IN, params_IN ):
+
+            # return reference
+            list_OUT = []
+
+            if ( "information_schema.columns" in sql_IN ):
+                list_OUT = [ { "column_name" : "a" }, { "column_name" : "b" } ]
+            elif ( "FILTER" in sql_IN ):
+                list_OUT = [ { "a" : 2, "b" : 0 } ]
+            #-- END check to see which statement --#
+
+            return list_OUT
+
+        #-- END function respond() --#
+
+        test_connection = RecordingConnection( respond )
+        test_cursor = test_connection.cursor()
+        data_functions.convert_empty_ints( test_cursor, "survey" )
+
+        # ! ----> one count query for all integer columns
+        self.assertEqual( len( test_connection.get_sql_list( "FILTER" ) ), 1 )
+
+        # ! ----> one UPDATE, only columns with empties, NULL bound as None
+        update_list = [ ( current_sql, current_params ) for current_sql, current_params in test_connection.statement_list if current_sql.startswith( "UPDATE" ) ]
+        self.assertEqual( len( update_list ), 1 )
+        self.assertEqual( update_list[ 0 ][ 0 ], "UPDATE public.survey SET a = CASE WHEN a = %(empty_value)s THEN %(replace_with)s ELSE a END WHERE a = %(empty_value)s;" )
+        self.assertEqual( update_list[ 0 ][ 1 ], [ { "empty_value" : "-999999", "replace_with" : None } ] )
+        self.assertEqual( test_connection.commit_count, 1 )
+
+    #-- END method test_convert_empty_ints() --#
+
+#-- END unittest class TestBatchedSQL --#
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,10 +19,61 @@ import dateutil.parser
 # import updated because of this: https://stackoverflow.com/questions/48632176/python-dateutil-attributeerror-module-dateutil-has-no-attribute-parse
 
 # python_utilities
+from python_utilities.etl.etl_error import ETLError
 from python_utilities.logging.logging_helper import LoggingHelper
 from python_utilities.status.status_container import StatusContainer
 
 
+#===============================================================================
+# class ETLAttributeUpdateDetail
+#===============================================================================
+
+# lineage: object
+class ETLAttributeUpdateDetail( object ):
+
+    '''
+    Holds the name, old value, and new value of an attribute update, and only
+        formats them into an update detail message when it is converted to a
+        string. Used in place of the message string when
+        ETLAttribute.store_attribute_in_ldm_instance() is in lean status mode.
+    '''
+
+    __slots__ = ( "attr_name", "old_value", "new_value", "prefix" )
+
+    def __init__( self, attr_name_IN, old_value_IN, new_value_IN, prefix_IN = "" ):
+
+        self.attr_name = attr_name_IN
+        self.old_value = old_value_IN
+        self.new_value = new_value_IN
+        self.prefix = prefix_IN
+
+    #-- END constructor --#
+
+    def __str__( self ):
+
+        # return reference
+        string_OUT = None
+
+        string_OUT = "{prefix}{attr_name}: {old_value} ==> {new_value}.".format(
+            prefix = self.prefix,
+            attr_name = self.attr_name,
+            old_value = self.old_value,
+            new_value = self.new_value
+        )
+
+        return string_OUT
+
+    #-- END method __str__() --#
+
+    def __repr__( self ):
+
+        return repr( str( self ) )
+
+    #-- END method __repr__() --#
+
+#-- END class ETLAttributeUpdateDetail --#
+
+
 #===============================================================================
 # class ETLAttribute
 #===============================================================================
@@ -78,6 +129,10 @@ class ETLAttribute( object ):
     PROP_ATTR_OLD_VALUE = "attr_old_value"
     PROP_ATTR_NEW_VALUE = "attr_new_value"
 
+    # status properties returned from store_extra_data_in_ldm_instance()
+    PROP_EXTRA_DATA_CHANGED_COUNT = "extra_data_changed_count"
+    PROP_EXTRA_DATA_NOT_CHANGED_COUNT = "extra_data_not_changed_count"
+
 
     #===========================================================================
     # ! ==> class variables
@@ -93,6 +148,15 @@ class ETLAttribute( object ):
     # status
     include_detailed_status = False
 
+    # lean status - if True (and not debugging), store_attribute_in_ldm_instance()
+    #     doesn't build status messages, and stores update details as
+    #     ETLAttributeUpdateDetail instances that are only formatted if used.
+    lean_status = False
+
+    # related model classes loaded by module and class name, process-wide -
+    #     map of ( module name, class name ) tuples to classes.
+    related_model_class_cache = {}
+
     #===========================================================================
     # ! ==> class methods
     #===========================================================================
@@ -300,11 +364,17 @@ class ETLAttribute( object ):
 
 
     @classmethod
-    def store_attribute_in_ldm_instance( cls, instance_IN, attr_name_IN, attr_value_IN ):
+    def store_attribute_in_ldm_instance( cls, instance_IN, attr_name_IN, attr_value_IN, lean_status_IN = None ):
 
         '''
         Assumes we are working with a django model object that extends
             LoadableDjangoModel (ldm).
+
+        If lean_status_IN is True (defaults to cls.lean_status if None), and
+            debug is off, no messages are added to the status, and the update
+            detail is an ETLAttributeUpdateDetail that formats itself only if
+            converted to a string. The flags in the status are the same either
+            way.
         '''
 
         # return reference
@@ -315,6 +385,7 @@ class ETLAttribute( object ):
         status_message = None
         my_debug_flag = None
         do_detailed_status = False
+        do_messages = None
         attr_exists = None
         current_value = None
         extra_data_json = None
@@ -324,6 +395,13 @@ class ETLAttribute( object ):
         my_debug_flag = cls.debug_flag
         #my_debug_flag = True
         do_detailed_status = cls.include_detailed_status
+        do_messages = True
+        if ( lean_status_IN is None ):
+            lean_status_IN = cls.lean_status
+        #-- END check to see if lean status passed in --#
+        if ( ( lean_status_IN == True ) and ( my_debug_flag != True ) ):
+            do_messages = False
+        #-- END check to see if we build messages --#
         status_OUT = StatusContainer()
         status_OUT.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
 
@@ -355,12 +433,16 @@ class ETLAttribute( object ):
                     current_value = getattr( instance_IN, attr_name_IN )
 
                     # attribute update detail
-                    status_message = "{attr_name}: {old_value} ==> {new_value}.".format(
-                        attr_name = attr_name_IN,
-                        old_value = current_value,
-                        new_value = attr_value_IN
-                    )
-                    status_OUT.set_detail_value( cls.PROP_ATTR_UPDATE_DETAIL, status_message )
+                    if ( do_messages == True ):
+                        status_message = "{attr_name}: {old_value} ==> {new_value}.".format(
+                            attr_name = attr_name_IN,
+                            old_value = current_value,
+                            new_value = attr_value_IN
+                        )
+                        status_OUT.set_detail_value( cls.PROP_ATTR_UPDATE_DETAIL, status_message )
+                    else:
+                        status_OUT.set_detail_value( cls.PROP_ATTR_UPDATE_DETAIL, ETLAttributeUpdateDetail( attr_name_IN, current_value, attr_value_IN ) )
+                    #-- END check to see if messages --#
 
                     # changed?
                     if ( current_value != attr_value_IN ):
@@ -370,25 +452,29 @@ class ETLAttribute( object ):
                         status_OUT.set_detail_value( cls.PROP_WAS_ATTR_UPDATED, True )
 
                         # status message
-                        status_message = "model attribute {attr_name} updated from {old_value} to {new_value}.".format(
-                            attr_name = attr_name_IN,
-                            old_value = current_value,
-                            new_value = attr_value_IN
-                        )
-                        status_OUT.add_message( status_message )
-                        LoggingHelper.output_debug( status_message, method_IN = me, logger_name_IN = cls.MY_LOGGER_NAME, do_print_IN = my_debug_flag )
+                        if ( do_messages == True ):
+                            status_message = "model attribute {attr_name} updated from {old_value} to {new_value}.".format(
+                                attr_name = attr_name_IN,
+                                old_value = current_value,
+                                new_value = attr_value_IN
+                            )
+                            status_OUT.add_message( status_message )
+                            LoggingHelper.output_debug( status_message, method_IN = me, logger_name_IN = cls.MY_LOGGER_NAME, do_print_IN = my_debug_flag )
+                        #-- END check to see if messages --#
 
                     else:
 
                         # not changed - no need to do anything.
                         status_OUT.set_detail_value( cls.PROP_WAS_ATTR_UPDATED, False )
-                        status_message = "model attribute {attr_name} NOT changed (current: {old_value}; new: {new_value}), so NOT updated.".format(
-                            attr_name = attr_name_IN,
-                            old_value = current_value,
-                            new_value = attr_value_IN
-                        )
-                        status_OUT.add_message( status_message )
-                        LoggingHelper.output_debug( status_message, method_IN = me, logger_name_IN = cls.MY_LOGGER_NAME, do_print_IN = my_debug_flag )
+                        if ( do_messages == True ):
+                            status_message = "model attribute {attr_name} NOT changed (current: {old_value}; new: {new_value}), so NOT updated.".format(
+                                attr_name = attr_name_IN,
+                                old_value = current_value,
+                                new_value = attr_value_IN
+                            )
+                            status_OUT.add_message( status_message )
+                            LoggingHelper.output_debug( status_message, method_IN = me, logger_name_IN = cls.MY_LOGGER_NAME, do_print_IN = my_debug_flag )
+                        #-- END check to see if messages --#
 
                     #-- END check if changed. --#
 
@@ -398,22 +484,28 @@ class ETLAttribute( object ):
                     current_value = instance_IN.get_extra_data_attr_value( attr_name_IN )
 
                     # attribute update detail
-                    status_message = "X {attr_name}: {old_value} ==> {new_value}.".format(
-                        attr_name = attr_name_IN,
-                        old_value = current_value,
-                        new_value = attr_value_IN
-                    )
-                    status_OUT.set_detail_value( cls.PROP_ATTR_UPDATE_DETAIL, status_message )
+                    if ( do_messages == True ):
+                        status_message = "X {attr_name}: {old_value} ==> {new_value}.".format(
+                            attr_name = attr_name_IN,
+                            old_value = current_value,
+                            new_value = attr_value_IN
+                        )
+                        status_OUT.set_detail_value( cls.PROP_ATTR_UPDATE_DETAIL, status_message )
+                    else:
+                        status_OUT.set_detail_value( cls.PROP_ATTR_UPDATE_DETAIL, ETLAttributeUpdateDetail( attr_name_IN, current_value, attr_value_IN, prefix_IN = "X " ) )
+                    #-- END check to see if messages --#
 
                     # update status
                     status_OUT.set_detail_value( cls.PROP_WAS_UNKNOWN_ATTR, True )
-                    status_message = "attribute {attr_name} NOT in model, adding to extra data (current: {old_value}; new: {new_value}).".format(
-                        attr_name = attr_name_IN,
-                        old_value = current_value,
-                        new_value = attr_value_IN
-                    )
-                    status_OUT.add_message( status_message )
-                    LoggingHelper.output_debug( status_message, method_IN = me, logger_name_IN = cls.MY_LOGGER_NAME, do_print_IN = my_debug_flag )
+                    if ( do_messages == True ):
+                        status_message = "attribute {attr_name} NOT in model, adding to extra data (current: {old_value}; new: {new_value}).".format(
+                            attr_name = attr_name_IN,
+                            old_value = current_value,
+                            new_value = attr_value_IN
+                        )
+                        status_OUT.add_message( status_message )
+                        LoggingHelper.output_debug( status_message, method_IN = me, logger_name_IN = cls.MY_LOGGER_NAME, do_print_IN = my_debug_flag )
+                    #-- END check to see if messages --#
 
                     # update the value for this attribute in the extra_data
                     #     JSONField.
@@ -474,6 +566,114 @@ class ETLAttribute( object ):
     #-- END method store_attribute_in_ldm_instance() --#
 
 
+    @classmethod
+    def store_extra_data_in_ldm_instance( cls, instance_IN, attr_name_to_value_map_IN, lean_status_IN = None ):
+
+        '''
+        Assumes we are working with a django model object that extends
+            LoadableDjangoModel (ldm), and that none of the names in the
+            dictionary passed in are attributes of the model. Merges all of
+            them into the instance's extra_data with one call to
+            update_extra_data_attrs(), rather than one store per attribute.
+
+        Status returned has PROP_WAS_UNKNOWN_ATTR set to True,
+            PROP_WAS_ATTR_UPDATED set to True if anything changed, counts of
+            attributes changed and not changed, and one update detail for
+            extra_data with old and new values of the attributes that changed.
+            lean_status_IN works like it does in
+            store_attribute_in_ldm_instance().
+        '''
+
+        # return reference
+        status_OUT = None
+
+        # declare variables
+        me = "store_extra_data_in_ldm_instance"
+        status_message = None
+        my_debug_flag = None
+        do_messages = None
+        changed_name_to_old_value_map = None
+        changed_name_to_new_value_map = None
+        current_name = None
+
+        # init
+        my_debug_flag = cls.debug_flag
+        do_messages = True
+        if ( lean_status_IN is None ):
+            lean_status_IN = cls.lean_status
+        #-- END check to see if lean status passed in --#
+        if ( ( lean_status_IN == True ) and ( my_debug_flag != True ) ):
+            do_messages = False
+        #-- END check to see if we build messages --#
+        status_OUT = StatusContainer()
+        status_OUT.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
+
+        # do we have an instance?
+        if ( ( instance_IN is not None ) and ( instance_IN != "" ) ):
+
+            # merge.
+            changed_name_to_old_value_map = instance_IN.update_extra_data_attrs( attr_name_to_value_map_IN )
+
+            # update status
+            status_OUT.set_detail_value( cls.PROP_WAS_UNKNOWN_ATTR, True )
+            status_OUT.set_detail_value( cls.PROP_WAS_ATTR_UPDATED, ( len( changed_name_to_old_value_map ) > 0 ) )
+            status_OUT.set_detail_value( cls.PROP_EXTRA_DATA_CHANGED_COUNT, len( changed_name_to_old_value_map ) )
+            status_OUT.set_detail_value( cls.PROP_EXTRA_DATA_NOT_CHANGED_COUNT, len( attr_name_to_value_map_IN ) - len( changed_name_to_old_value_map ) )
+
+            # attribute update detail
+            changed_name_to_new_value_map = {}
+            for current_name in changed_name_to_old_value_map:
+
+                changed_name_to_new_value_map[ current_name ] = attr_name_to_value_map_IN[ current_name ]
+
+            #-- END loop over changed attributes --#
+            if ( do_messages == True ):
+
+                status_message = "X extra_data: {old_value} ==> {new_value}.".format(
+                    old_value = changed_name_to_old_value_map,
+                    new_value = changed_name_to_new_value_map
+                )
+                status_OUT.set_detail_value( cls.PROP_ATTR_UPDATE_DETAIL, status_message )
+
+                status_message = "attributes {attr_name_list} NOT in model, added to extra data ( changed: {changed_name_list} ).".format(
+                    attr_name_list = list( attr_name_to_value_map_IN ),
+                    changed_name_list = list( changed_name_to_old_value_map )
+                )
+                status_OUT.add_message( status_message )
+                LoggingHelper.output_debug( status_message, method_IN = me, logger_name_IN = cls.MY_LOGGER_NAME, do_print_IN = my_debug_flag )
+
+            else:
+
+                status_OUT.set_detail_value( cls.PROP_ATTR_UPDATE_DETAIL, ETLAttributeUpdateDetail( "extra_data", changed_name_to_old_value_map, changed_name_to_new_value_map, prefix_IN = "X " ) )
+
+            #-- END check to see if messages --#
+
+            # detailed status?
+            if ( cls.include_detailed_status == True ):
+
+                # store details
+                status_OUT.set_detail_value( cls.PROP_ATTR_NAME, "extra_data" )
+                status_OUT.set_detail_value( cls.PROP_ATTR_OLD_VALUE, changed_name_to_old_value_map )
+                status_OUT.set_detail_value( cls.PROP_ATTR_NEW_VALUE, changed_name_to_new_value_map )
+
+            #-- END detailed status --#
+
+        else:
+
+            # no instance. error.
+            status_message = "ERROR in {}(): no load instance passed in, nothing to be done.".format( me )
+            LoggingHelper.log_message( status_message, method_IN = me, logger_name_IN = cls.MY_LOGGER_NAME, log_level_code_IN = logging.ERROR, do_print_IN = True )
+
+            # raise ETLError.
+            raise ETLError( status_message )
+
+        #-- END check to see if instance --#
+
+        return status_OUT
+
+    #-- END method store_extra_data_in_ldm_instance() --#
+
+
     #===========================================================================
     # ! ==> __init__() method - instance variables
     #===========================================================================
@@ -513,6 +713,9 @@ class ETLAttribute( object ):
         self.load_attr_related_model_class_module = None
         self.load_attr_related_model_class_name = None
 
+        # ...and class loaded from module and class name, once resolved.
+        self.resolved_related_model_class = None
+
         # and other related information.
         self.load_attr_related_model_data_type = None
         self.load_attr_related_model_fk_attr_name = None
@@ -521,6 +724,10 @@ class ETLAttribute( object ):
         # processing method hooks.
         self.custom_processing_method_name = None
 
+        # compiled converter (see compile_converter()).
+        self.compiled_converter = None
+        self.compiled_time_zone = None
+
         # debug - class variable now
         #self.debug_flag = False
 
@@ -532,6 +739,193 @@ class ETLAttribute( object ):
     #===========================================================================
 
 
+    def compile_converter( self, time_zone_IN = pytz.UTC ):
+
+        '''
+        Builds a function that converts a (non-None) value the same way
+            process_value() does, with everything it needs from this spec
+            (output type, conversion string, time zone) looked up once and
+            bound in, so converting a value is just a function call. Stores
+            the function (and the time zone it was built for) in this
+            instance, and returns it.
+
+        Values that can't be converted raise, same as process_value() - int()
+            and strptime() raise ValueError, and dateutil (dates with no
+            conversion string) raises dateutil.parser.ParserError, a
+            ValueError.
+
+        If this spec is changed after compiling, call reset_converter() (the
+            setters for the traits the converter uses do this for you).
+        '''
+
+        # return reference
+        converter_OUT = None
+
+        # declare variables
+        out_data_type = None
+        transform_pattern = None
+        parse_date = None
+        strptime = None
+        dateutil_parse = None
+
+        # retrieve info from spec.
+        out_data_type = self.get_load_attr_data_type()
+        transform_pattern = self.get_transform_conversion_string()
+
+        # converter functions - same conversions as process_value().
+        def convert_int( value_IN ):
+
+            value_OUT = value_IN
+            if ( isinstance( value_OUT, int ) == False ):
+
+                if ( isinstance( value_OUT, str ) == True ):
+                    value_OUT = value_OUT.strip()
+                #-- END check to see if string. --#
+
+                value_OUT = int( value_OUT )
+
+            #-- END check to see if int --#
+
+            return value_OUT
+
+        #-- END function convert_int() --#
+
+        def convert_string( value_IN ):
+
+            value_OUT = value_IN
+            if ( isinstance( value_OUT, str ) == False ):
+                value_OUT = str( value_OUT )
+            #-- END check to see if string --#
+
+            return value_OUT.strip()
+
+        #-- END function convert_string() --#
+
+        def convert_none( value_IN ):
+
+            return value_IN
+
+        #-- END function convert_none() --#
+
+        # is there an output data type we transform to...
+        if ( out_data_type == self.DATA_TYPE_INT ):
+
+            converter_OUT = convert_int
+
+        elif ( out_data_type == self.DATA_TYPE_STRING ):
+
+            converter_OUT = convert_string
+
+        elif ( ( out_data_type == self.DATA_TYPE_DATETIME_DATETIME )
+            or ( out_data_type == self.DATA_TYPE_DATETIME_DATE ) ):
+
+            # is there a transform pattern?
+            if ( ( transform_pattern is not None ) and ( transform_pattern != "" ) ):
+
+                # parse using pattern.
+                strptime = datetime.datetime.strptime
+                def parse_date( value_IN ):
+
+                    return strptime( value_IN, transform_pattern )
+
+                #-- END function parse_date() --#
+
+            else:
+
+                # no pattern, let dateutil try to figure it out.
+                dateutil_parse = dateutil.parser.parse
+                def parse_date( value_IN ):
+
+                    return dateutil_parse( value_IN )
+
+                #-- END function parse_date() --#
+
+            #-- END check if transform pattern. --#
+
+            # date or datetime?
+            if ( out_data_type == self.DATA_TYPE_DATETIME_DATE ):
+
+                def convert_date( value_IN ):
+
+                    value_OUT = None
+                    work_value = convert_string( value_IN )
+                    if ( work_value != "" ):
+
+                        value_OUT = parse_date( work_value ).date()
+
+                    #-- END check to see if value is parse-able. --#
+
+                    return value_OUT
+
+                #-- END function convert_date() --#
+
+                converter_OUT = convert_date
+
+            else:
+
+                def convert_datetime( value_IN ):
+
+                    value_OUT = None
+                    work_value = convert_string( value_IN )
+                    if ( work_value != "" ):
+
+                        value_OUT = parse_date( work_value )
+                        if ( ( value_OUT.tzinfo is None ) and ( time_zone_IN is not None ) ):
+                            value_OUT = time_zone_IN.localize( value_OUT )
+                        #-- END check to see if has time zone --#
+
+                    #-- END check to see if value is parse-able. --#
+
+                    return value_OUT
+
+                #-- END function convert_datetime() --#
+
+                converter_OUT = convert_datetime
+
+            #-- END check to see if date or datetime --#
+
+        else:
+
+            # no or unknown output type - nothing to do.
+            converter_OUT = convert_none
+
+        #-- END check to see what type we want --#
+
+        # store
+        self.compiled_converter = converter_OUT
+        self.compiled_time_zone = time_zone_IN
+
+        return converter_OUT
+
+    #-- END method compile_converter() --#
+
+
+    def get_converter( self, time_zone_IN = pytz.UTC ):
+
+        '''
+        Returns compiled converter function for this spec and the time zone
+            passed in, compiling it first if needed.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # get value
+        value_OUT = self.compiled_converter
+
+        # compiled, for this time zone?
+        if ( ( value_OUT is None ) or ( self.compiled_time_zone is not time_zone_IN ) ):
+
+            # no - compile.
+            value_OUT = self.compile_converter( time_zone_IN )
+
+        #-- END check to see if compiled --#
+
+        return value_OUT
+
+    #-- END method get_converter() --#
+
+
     def get_custom_processing_method_name( self ):
 
         # return reference
@@ -722,6 +1116,10 @@ class ETLAttribute( object ):
             Returns the result, if either name is missing, outputs error log and
             returns None. If problems with module or class loading, Exception
             will be thrown.
+
+        Classes loaded from module and class name are cached, both in this
+            instance and process-wide ( cls.related_model_class_cache ), so
+            the import only happens once per module and class name.
         '''
 
         # return reference
@@ -733,17 +1131,18 @@ class ETLAttribute( object ):
         status_message = None
         spec_json = None
         spec_json_string = None
+        json_string = None
         my_attr_name = None
         related_class = None
         related_class_module_name = None
         related_class_module = None
         related_class_name = None
+        cache_key = None
+        class_cache = None
 
         # init
         my_debug_flag = self.debug_flag
         #my_debug_flag = True
-        spec_json = self.to_json()
-        spec_json_string = json.dumps( spec_json, indent = 4, sort_keys = True )
 
         # retrieve spec info.
         my_attr_name = self.get_extract_name()
@@ -752,6 +1151,8 @@ class ETLAttribute( object ):
         related_class_name = self.get_load_attr_related_model_class_name()
 
         if ( my_debug_flag == True ):
+            spec_json = self.to_json()
+            spec_json_string = json.dumps( spec_json, indent = 4, sort_keys = True )
             status_message = "In {my_method_name}() TOP: attribute {my_attr_name}; spec:\n{my_spec_json}.".format(
                 my_method_name = me,
                 my_attr_name = my_attr_name,
@@ -760,8 +1161,13 @@ class ETLAttribute( object ):
             LoggingHelper.output_debug( status_message, method_IN = me, logger_name_IN = self.MY_LOGGER_NAME, do_print_IN = my_debug_flag )
         #-- END DEBUG --#
 
+        # already resolved? Just return it.
+        if ( self.resolved_related_model_class is not None ):
+
+            class_OUT = self.resolved_related_model_class
+
         # are any of the three specified? If not, just return None.
-        if ( ( related_class is not None )
+        elif ( ( related_class is not None )
             or ( ( related_class_module_name is not None ) and ( related_class_module_name != "" ) )
             or ( ( related_class_name is not None ) and ( related_class_name != "" ) ) ):
 
@@ -783,14 +1189,26 @@ class ETLAttribute( object ):
 
                     if ( ( related_class_name is not None ) and ( related_class_name != "" ) ):
 
-                        # try to load the module.
-                        related_class_module = importlib.import_module( related_class_module_name )
+                        # already loaded?
+                        cache_key = ( related_class_module_name, related_class_name )
+                        class_cache = self.related_model_class_cache
+                        related_class = class_cache.get( cache_key, None )
+                        if ( related_class is None ):
+
+                            # try to load the module.
+                            related_class_module = importlib.import_module( related_class_module_name )
 
-                        # and, then, try to retrieve class from module.
-                        related_class = getattr( related_class_module, related_class_name )
+                            # and, then, try to retrieve class from module.
+                            related_class = getattr( related_class_module, related_class_name )
+
+                            # cache it.
+                            class_cache[ cache_key ] = related_class
+
+                        #-- END check to see if class already loaded --#
 
                         # if we get here without exception, return the class.
                         class_OUT = related_class
+                        self.resolved_related_model_class = related_class
 
                         if ( my_debug_flag == True ):
                             status_message = "Loaded related class {my_class} ( module: {my_module}; class: {my_class_name})".format(
@@ -804,6 +1222,8 @@ class ETLAttribute( object ):
                     else:
 
                         # ERROR - no class name. Nothing to do.
+                        spec_json = self.to_json()
+                        json_string = json.dumps( spec_json, indent = 4, sort_keys = True )
 
                         status_message = "ERROR in {my_method_name}(): no related class name passed in for attr_name: {my_attr_name}; full attribute specification:\n{my_spec_json}. If no related class reference stored, must have both related class module name and related class name.  Nothing to be done.".format(
                             my_method_name = me,
@@ -898,7 +1318,7 @@ class ETLAttribute( object ):
     #-- END method get_transform_to_attr_name --#
 
 
-    def process_ldm_object_value( self, value_IN, instance_IN, time_zone_IN = pytz.UTC ):
+    def process_ldm_object_value( self, value_IN, instance_IN, time_zone_IN = pytz.UTC, is_converted_IN = False ):
 
         '''
         takes types and transform traits of attribute spec into account to
@@ -914,6 +1334,9 @@ class ETLAttribute( object ):
         - if transform spec includes storing transformed value in separate
             attribute, once transform is done, add to separate attribute in
             instance.
+        - if is_converted_IN is True, value has already been converted to the
+            load data type (column-wise by ETLFromDataFrame, for example), so
+            conversion is skipped.
 
         '''
 
@@ -947,18 +1370,15 @@ class ETLAttribute( object ):
         # do we have a value?
         if ( value_IN is not None ):
 
-            # first, do normal processing.
-            value_OUT = self.process_value( value_IN, time_zone_IN )
+            # first, do normal processing (unless already converted).
+            if ( is_converted_IN != True ):
+                value_OUT = self.process_value( value_IN, time_zone_IN )
+            #-- END check to see if already converted --#
 
             # do we have an instance?
             if ( instance_IN is not None ):
 
                 # retrieve info from spec.
-                attr_name = self.get_load_attr_name()
-                in_data_type = self.get_extract_data_type()
-                in_logical_type = self.get_extract_logical_type()
-                out_data_type = self.get_load_attr_data_type()
-                transform_pattern = self.get_transform_conversion_string()
                 transform_method_name = self.get_transform_method_name()
                 transform_to_attr_name = self.get_transform_to_attr_name()
 
@@ -1058,6 +1478,8 @@ class ETLAttribute( object ):
         - if extract and load types are set, convert from one to other.
         - if types could use a transform string, see if one is present. If so,
             use it. If not, try to transform using default.
+        - values that can't be converted raise (ValueError - bad int or date
+            string), same as the compiled converter ( compile_converter() ).
         '''
 
         # return reference
@@ -1094,8 +1516,13 @@ class ETLAttribute( object ):
         # retrieve info from spec.
         attr_name = self.get_load_attr_name()
 
+        # not debugging? Use compiled converter.
+        if ( ( my_debug_flag != True ) and ( value_IN is not None ) ):
+
+            value_OUT = self.get_converter( time_zone_IN )( value_IN )
+
         # do we have a value?
-        if ( value_IN is not None ):
+        elif ( value_IN is not None ):
 
             # retrieve info from spec.
             in_data_type = self.get_extract_data_type()
@@ -1184,15 +1611,16 @@ class ETLAttribute( object ):
                             except dateutil.parser.ParserError as pe:
 
                                 # bad date string. Log and print it...
-                                status_message = "unable to parse date string value {date_value} ( exception: {parse_exception} ); transform_pattern: {pattern}; Returning None.".format(
+                                status_message = "unable to parse date string value {date_value} ( exception: {parse_exception} ); transform_pattern: {pattern}; re-raising, same as compiled converter.".format(
                                     date_value = work_value,
                                     parse_exception = pe,
                                     pattern = transform_pattern
                                 )
                                 LoggingHelper.output_debug( status_message, method_IN = me, logger_name_IN = self.MY_LOGGER_NAME, do_print_IN = my_debug_flag )
 
-                                # ...return value passed in.
-                                value_OUT = value_IN
+                                # ...then re-raise (process_records() fails
+                                #     just this record).
+                                raise
 
                             #-- END try...except around date parsing --#
 
@@ -1309,6 +1737,19 @@ class ETLAttribute( object ):
     #-- END method process_value() --#
 
 
+    def reset_converter( self ):
+
+        '''
+        Clears out compiled converter, so it is rebuilt from spec next time it
+            is needed.
+        '''
+
+        self.compiled_converter = None
+        self.compiled_time_zone = None
+
+    #-- END method reset_converter() --#
+
+
     def set_custom_processing_method_name( self, value_IN ):
 
         '''
@@ -1441,6 +1882,9 @@ class ETLAttribute( object ):
         # store value.
         self.load_attr_data_type = value_IN
 
+        # converter depends on this - rebuild next time.
+        self.reset_converter()
+
         # return it.
         value_OUT = self.get_load_attr_data_type()
 
@@ -1481,6 +1925,9 @@ class ETLAttribute( object ):
         # store value.
         self.load_attr_related_model_class = value_IN
 
+        # clear out resolved class - reload next time it is needed.
+        self.resolved_related_model_class = None
+
         # return it.
         value_OUT = self.get_load_attr_related_model_class()
 
@@ -1501,6 +1948,9 @@ class ETLAttribute( object ):
         # store value.
         self.load_attr_related_model_class_module = value_IN
 
+        # clear out resolved class - reload next time it is needed.
+        self.resolved_related_model_class = None
+
         # return it.
         value_OUT = self.get_load_attr_related_model_class_module()
 
@@ -1521,6 +1971,9 @@ class ETLAttribute( object ):
         # store value.
         self.load_attr_related_model_class_name = value_IN
 
+        # clear out resolved class - reload next time it is needed.
+        self.resolved_related_model_class = None
+
         # return it.
         value_OUT = self.get_load_attr_related_model_class_name()
 
@@ -1603,6 +2056,9 @@ class ETLAttribute( object ):
         # store value.
         self.transform_conversion_string = value_IN
 
+        # converter depends on this - rebuild next time.
+        self.reset_converter()
+
         # return it.
         value_OUT = self.get_transform_conversion_string()
 
@@ -0,0 +1,991 @@
+'''
+Usage:
+
+    # import ETLBenchmark
+    from python_utilities.etl.etl_benchmark import ETLBenchmark
+
+    # OPTIONAL - outside of a django project, set up django with a local SQLite
+    #     database (in memory by default) and the app your models are in, then
+    #     create tables for the models.
+    ETLBenchmark.configure_sqlite( installed_app_list_IN = [ "my_app" ] )
+    ETLBenchmark.create_tables( [ Person, Pet ] )
+
+    # make a benchmark for a model that extends LoadableDjangoModel.
+    my_benchmark = ETLBenchmark( model_class_IN = Person )
+
+    # shape of synthetic records: 1000 records, each with values for every
+    #     attribute in the model's ETL spec plus 20 extra fields (stored in
+    #     extra_data), and 3 related records in each related list, 1 level
+    #     deep.
+    my_benchmark.record_count = 1000
+    my_benchmark.extra_field_count = 20
+    my_benchmark.related_count = 3
+    my_benchmark.related_depth = 1
+
+    # run each scenario ( flat dictionaries, dictionaries with nested related
+    #     lists, Excel workbook ), once per set of run_etl() options, and
+    #     append results to a JSON Lines file, to track changes over time.
+    result_list = my_benchmark.run_suite(
+        run_etl_option_list_IN = [ {}, { "bulk_write_batch_size_IN" : 500 } ],
+        results_file_path_IN = "etl_benchmark.jsonl"
+    )
+
+    # each result is a dictionary - records per second, peak memory, queries:
+    for result in result_list:
+        print( result[ ETLBenchmark.PROP_SCENARIO ], result[ ETLBenchmark.PROP_RECORDS_PER_SECOND ], result[ ETLBenchmark.PROP_PEAK_MEMORY_BYTES ], result[ ETLBenchmark.PROP_QUERY_COUNT ] )
+'''
+
+#===============================================================================
+# imports
+#===============================================================================
+
+
+# base python libraries
+import copy
+import datetime
+import json
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+
+# django imports
+import django
+from django.conf import settings
+from django.db import connection
+
+# python_utilities
+from python_utilities.logging.logging_helper import LoggingHelper
+
+# ETL imports
+from python_utilities.etl.etl_attribute import ETLAttribute
+from python_utilities.etl.etl_entity import ETLEntity
+from python_utilities.etl.etl_error import ETLError
+from python_utilities.etl.etl_instrumentation import ETLInstrumentation
+
+
+#===============================================================================
+# class ETLBenchmark
+#===============================================================================
+
+
+# lineage: object
+class ETLBenchmark( object ):
+
+
+    '''
+    ETLBenchmark generates synthetic records for a model that extends
+        LoadableDjangoModel, loads them with run_etl(), and measures the run:
+        records per second, peak memory (python allocations, from tracemalloc)
+        and number of database queries.
+
+    Records are built from the model's ETL spec - a value for every attribute
+        in the spec, plus extra_field_count fields not in the spec (width), and
+        for related attributes, lists of related_count related records built
+        from the related model's spec, related_depth levels deep (depth).
+        Scenarios:
+    - SCENARIO_FLAT_DICT - flat dictionaries, related attributes left out.
+    - SCENARIO_NESTED_DICT - dictionaries with nested related lists, loaded by
+        ETLFromDictionary.process_related().
+    - SCENARIO_EXCEL - flat records written to an Excel workbook, loaded by
+        ETLFromExcelWithHeaders (for the run, the model's initialize_etl() is
+        wrapped so its spec is a copy with extract storage type
+        STORAGE_TYPE_XLSX_WITH_HEADERS).
+
+    Meant to be run against a local SQLite database - configure_sqlite() and
+        create_tables() will set one up if you aren't in a django project.
+        Results include the database vendor, so runs against other databases
+        can be told apart.
+    '''
+
+
+    #===========================================================================
+    # CONSTANTS-ish
+    #===========================================================================
+
+
+    # logger name
+    MY_LOGGER_NAME = "python_utilities.etl.ETLBenchmark"
+
+    # scenarios
+    SCENARIO_FLAT_DICT = "flat_dict"
+    SCENARIO_NESTED_DICT = "nested_dict"
+    SCENARIO_EXCEL = "excel"
+    SCENARIO_LIST = [ SCENARIO_FLAT_DICT, SCENARIO_NESTED_DICT, SCENARIO_EXCEL ]
+
+    # defaults
+    DEFAULT_RECORD_COUNT = 1000
+    DEFAULT_EXTRA_FIELD_COUNT = 10
+    DEFAULT_RELATED_COUNT = 3
+    DEFAULT_RELATED_DEPTH = 1
+    DEFAULT_WORKSHEET_NAME = "benchmark"
+
+    # synthetic values
+    EXTRA_FIELD_PREFIX = "extra_field_"
+    START_DATE = datetime.date( 2000, 1, 1 )
+
+    # result properties
+    PROP_LABEL = "label"
+    PROP_SCENARIO = "scenario"
+    PROP_START_DATETIME = "start_datetime"
+    PROP_DATABASE_VENDOR = "database_vendor"
+    PROP_RECORD_COUNT = "record_count"
+    PROP_RELATED_RECORD_COUNT = "related_record_count"
+    PROP_EXTRA_FIELD_COUNT = "extra_field_count"
+    PROP_RELATED_COUNT = "related_count"
+    PROP_RELATED_DEPTH = "related_depth"
+    PROP_RUN_ETL_OPTIONS = "run_etl_options"
+    PROP_IS_SUCCESS = "is_success"
+    PROP_PROCESSED_RECORD_COUNT = "processed_record_count"
+    PROP_ELAPSED_SECONDS = "elapsed_seconds"
+    PROP_RECORDS_PER_SECOND = "records_per_second"
+    PROP_PEAK_MEMORY_BYTES = "peak_memory_bytes"
+    PROP_QUERY_COUNT = "query_count"
+
+
+    #===========================================================================
+    # ! ==> class variables
+    #===========================================================================
+
+
+    # debug_flag
+    debug_flag = False
+
+
+    #===========================================================================
+    # ! ==> class methods
+    #===========================================================================
+
+
+    @classmethod
+    def build_attr_value( cls, etl_attribute_IN, number_IN ):
+
+        '''
+        Accepts ETLAttribute and a number (1 or more, unique within the
+            attribute - the record number, for example). Returns a synthetic
+            value for the attribute, based on its load data type: the number
+            for ints, a date or datetime that many days after START_DATE,
+            formatted using the attribute's conversion string, or a string
+            made from the attribute name and the number. If the attribute's
+            extract data type is string, the value is a string.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        load_data_type = None
+        conversion_string = None
+        date_value = None
+
+        # init
+        load_data_type = etl_attribute_IN.get_load_attr_data_type()
+        conversion_string = etl_attribute_IN.get_transform_conversion_string()
+
+        # what type?
+        if ( load_data_type == ETLAttribute.DATA_TYPE_INT ):
+
+            value_OUT = number_IN
+
+        elif ( ( load_data_type == ETLAttribute.DATA_TYPE_DATETIME_DATE )
+            or ( load_data_type == ETLAttribute.DATA_TYPE_DATETIME_DATETIME ) ):
+
+            # date or datetime, formatted.
+            date_value = cls.START_DATE + datetime.timedelta( days = number_IN )
+            if ( load_data_type == ETLAttribute.DATA_TYPE_DATETIME_DATETIME ):
+                date_value = datetime.datetime.combine( date_value, datetime.time( 12, 0, 0 ) )
+            #-- END check to see if datetime --#
+
+            if ( ( conversion_string is None )
+                or ( conversion_string == "" )
+                or ( conversion_string == ETLAttribute.FORMAT_DATETIME_ISO_8601 ) ):
+                value_OUT = date_value.isoformat()
+            else:
+                value_OUT = date_value.strftime( conversion_string )
+            #-- END check to see what format --#
+
+        else:
+
+            # string
+            value_OUT = "{name}_{number}".format(
+                name = etl_attribute_IN.get_extract_name(),
+                number = number_IN
+            )
+
+        #-- END check to see what type --#
+
+        # extract as string?
+        if ( etl_attribute_IN.get_extract_data_type() == ETLAttribute.DATA_TYPE_STRING ):
+            value_OUT = str( value_OUT )
+        #-- END check to see if string --#
+
+        return value_OUT
+
+    #-- END class method build_attr_value() --#
+
+
+    @classmethod
+    def build_record( cls,
+                      etl_entity_IN,
+                      number_IN,
+                      extra_field_count_IN = 0,
+                      related_count_IN = 0,
+                      related_depth_IN = 0 ):
+
+        '''
+        Accepts ETLEntity and number of the record (1 or more, unique for the
+            entity). Returns a synthetic record dictionary with a value for
+            each attribute in the spec, extra_field_count_IN fields not in the
+            spec, and, if related_depth_IN is 1 or more, a list of
+            related_count_IN related records for each related attribute (built
+            from the related model's spec, with related_depth_IN - 1 levels
+            below them). Related records get numbers that are unique across
+            all their parents.
+        '''
+
+        # return reference
+        record_OUT = None
+
+        # declare variables
+        key_to_attribute_map = None
+        current_key = None
+        current_attribute = None
+        related_class = None
+        related_entity = None
+        fk_attr_name = None
+        related_record_list = None
+        related_index = None
+        related_number = None
+        current_index = None
+
+        # init
+        record_OUT = {}
+        key_to_attribute_map = etl_entity_IN.get_attr_key_to_attribute_map()
+
+        # values for attributes in spec.
+        for current_key, current_attribute in key_to_attribute_map.items():
+
+            # related?
+            related_class = current_attribute.get_related_model_class()
+            if ( related_class is None ):
+
+                # no - make a value.
+                record_OUT[ current_key ] = cls.build_attr_value( current_attribute, number_IN )
+
+            elif ( ( related_depth_IN > 0 ) and ( related_count_IN > 0 ) ):
+
+                # related, and we are building related records.
+                related_entity = related_class.get_etl_spec()
+                fk_attr_name = current_attribute.get_load_attr_related_model_fk_attr_name()
+                related_record_list = []
+                for related_index in range( related_count_IN ):
+
+                    related_number = ( ( number_IN - 1 ) * related_count_IN ) + related_index + 1
+                    related_record_list.append(
+                        cls.build_related_record(
+                            related_entity,
+                            related_number,
+                            fk_attr_name,
+                            related_count_IN = related_count_IN,
+                            related_depth_IN = related_depth_IN - 1
+                        )
+                    )
+
+                #-- END loop over related records --#
+
+                record_OUT[ current_key ] = related_record_list
+
+            #-- END check to see if related --#
+
+        #-- END loop over attributes in spec --#
+
+        # extra fields
+        for current_index in range( extra_field_count_IN ):
+
+            record_OUT[ "{prefix}{index}".format( prefix = cls.EXTRA_FIELD_PREFIX, index = current_index ) ] = "extra_{number}_{index}".format( number = number_IN, index = current_index )
+
+        #-- END loop over extra fields --#
+
+        return record_OUT
+
+    #-- END class method build_record() --#
+
+
+    @classmethod
+    def build_related_record( cls,
+                              etl_entity_IN,
+                              number_IN,
+                              fk_attr_name_IN,
+                              related_count_IN = 0,
+                              related_depth_IN = 0 ):
+
+        '''
+        Builds a related record ( build_record(), no extra fields ), then
+            removes values for the attribute that holds the foreign key to the
+            parent record (fk_attr_name_IN, or its "_id" column), since the
+            parent sets it.
+        '''
+
+        # return reference
+        record_OUT = None
+
+        # declare variables
+        key_to_attribute_map = None
+        current_key = None
+        current_attribute = None
+        load_attr_name = None
+
+        # build record...
+        record_OUT = cls.build_record(
+            etl_entity_IN,
+            number_IN,
+            extra_field_count_IN = 0,
+            related_count_IN = related_count_IN,
+            related_depth_IN = related_depth_IN
+        )
+
+        # ...and remove foreign key to parent.
+        if ( ( fk_attr_name_IN is not None ) and ( fk_attr_name_IN != "" ) ):
+
+            key_to_attribute_map = etl_entity_IN.get_attr_key_to_attribute_map()
+            for current_key, current_attribute in key_to_attribute_map.items():
+
+                load_attr_name = current_attribute.get_load_attr_name()
+                if ( ( load_attr_name == fk_attr_name_IN )
+                    or ( load_attr_name == "{}_id".format( fk_attr_name_IN ) ) ):
+                    record_OUT.pop( current_key, None )
+                #-- END check to see if foreign key --#
+
+            #-- END loop over attributes --#
+
+        #-- END check to see if foreign key attribute --#
+
+        return record_OUT
+
+    #-- END class method build_related_record() --#
+
+
+    @classmethod
+    def configure_sqlite( cls, database_path_IN = ":memory:", installed_app_list_IN = None, **kwargs ):
+
+        '''
+        If django settings are not yet configured, configures them to use a
+            local SQLite database at the path passed in (in memory by default),
+            with the apps passed in installed (and any other settings passed as
+            keyword arguments), then sets up django. If settings are already
+            configured, does nothing. Returns the database vendor.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        installed_app_list = None
+
+        # already configured?
+        if ( settings.configured == False ):
+
+            # no - configure.
+            installed_app_list = installed_app_list_IN
+            if ( installed_app_list is None ):
+                installed_app_list = []
+            #-- END check to see if apps --#
+
+            settings.configure(
+                INSTALLED_APPS = installed_app_list,
+                DATABASES = {
+                    "default" : {
+                        "ENGINE" : "django.db.backends.sqlite3",
+                        "NAME" : database_path_IN
+                    }
+                },
+                **kwargs
+            )
+            django.setup()
+
+        #-- END check to see if settings configured --#
+
+        value_OUT = connection.vendor
+
+        return value_OUT
+
+    #-- END class method configure_sqlite() --#
+
+
+    @classmethod
+    def create_tables( cls, model_class_list_IN ):
+
+        '''
+        Creates tables for the model classes passed in whose tables aren't in
+            the database yet (for a new SQLite database, for example). Returns
+            list of model classes whose tables were created.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        table_name_list = None
+        model_class = None
+
+        # what tables are there?
+        table_name_list = connection.introspection.table_names()
+
+        # create the ones that are missing.
+        with connection.schema_editor() as schema_editor:
+
+            for model_class in model_class_list_IN:
+
+                if ( model_class._meta.db_table not in table_name_list ):
+
+                    schema_editor.create_model( model_class )
+                    list_OUT.append( model_class )
+
+                #-- END check to see if table exists --#
+
+            #-- END loop over model classes --#
+
+        #-- END with schema_editor --#
+
+        return list_OUT
+
+    #-- END class method create_tables() --#
+
+
+    @classmethod
+    def get_related_model_class_list( cls, etl_entity_IN, related_depth_IN = DEFAULT_RELATED_DEPTH ):
+
+        '''
+        Returns list of model classes of related attributes in the ETLEntity
+            passed in, related_depth_IN levels deep, deepest last.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        current_attribute = None
+        related_class = None
+
+        if ( related_depth_IN > 0 ):
+
+            for current_attribute in etl_entity_IN.get_attr_key_to_attribute_map().values():
+
+                related_class = current_attribute.get_related_model_class()
+                if ( ( related_class is not None ) and ( related_class not in list_OUT ) ):
+
+                    list_OUT.append( related_class )
+                    list_OUT.extend( cls.get_related_model_class_list( related_class.get_etl_spec(), related_depth_IN - 1 ) )
+
+                #-- END check to see if related class --#
+
+            #-- END loop over attributes --#
+
+        #-- END check to see if more levels --#
+
+        return list_OUT
+
+    #-- END class method get_related_model_class_list() --#
+
+
+    @classmethod
+    def write_excel_workbook( cls, file_path_IN, record_list_IN, worksheet_name_IN = DEFAULT_WORKSHEET_NAME ):
+
+        '''
+        Writes records to a new Excel workbook at the path passed in, in a
+            worksheet with the name passed in: a header row of the keys in the
+            first record, then a row per record. Values that are lists or
+            dictionaries (related records) are left out.
+        '''
+
+        # declare variables
+        workbook = None
+        worksheet = None
+        header_list = None
+        current_record = None
+        current_key = None
+        current_value = None
+
+        # imported here so openpyxl is only needed for Excel benchmarks.
+        import openpyxl
+
+        # init
+        workbook = openpyxl.Workbook( write_only = True )
+        worksheet = workbook.create_sheet( worksheet_name_IN )
+
+        # header
+        header_list = []
+        if ( len( record_list_IN ) > 0 ):
+
+            for current_key, current_value in record_list_IN[ 0 ].items():
+
+                if ( isinstance( current_value, ( list, dict ) ) == False ):
+                    header_list.append( current_key )
+                #-- END check to see if related records --#
+
+            #-- END loop over keys in first record --#
+
+        #-- END check to see if records --#
+        worksheet.append( header_list )
+
+        # rows
+        for current_record in record_list_IN:
+
+            worksheet.append( [ current_record.get( current_key, None ) for current_key in header_list ] )
+
+        #-- END loop over records --#
+
+        workbook.save( file_path_IN )
+
+    #-- END class method write_excel_workbook() --#
+
+
+    #===========================================================================
+    # ! ==> __init__() method - instance variables
+    #===========================================================================
+
+
+    def __init__( self, model_class_IN = None, work_directory_IN = None ):
+
+        '''
+        Constructor
+        '''
+
+        # call parent's __init__()
+        super().__init__()
+
+        # model to load (extends LoadableDjangoModel).
+        self.model_class = model_class_IN
+
+        # shape of synthetic records
+        self.record_count = self.DEFAULT_RECORD_COUNT
+        self.extra_field_count = self.DEFAULT_EXTRA_FIELD_COUNT
+        self.related_count = self.DEFAULT_RELATED_COUNT
+        self.related_depth = self.DEFAULT_RELATED_DEPTH
+
+        # measurement
+        self.measure_memory = True
+        self.clear_tables = True
+
+        # directory for Excel workbooks (temp directory if None).
+        self.work_directory = work_directory_IN
+
+        # results
+        self.result_list = []
+
+    #-- END constructor --#
+
+
+    #===========================================================================
+    # ! ==> instance methods
+    #===========================================================================
+
+
+    def build_record_list( self, is_nested_IN = False ):
+
+        '''
+        Returns list of record_count synthetic records for the model. If
+            is_nested_IN is True, records include nested related lists.
+        '''
+
+        # return reference
+        list_OUT = None
+
+        # declare variables
+        etl_entity = None
+        related_depth = None
+        number = None
+
+        # init
+        etl_entity = self.model_class.get_etl_spec()
+        related_depth = 0
+        if ( is_nested_IN == True ):
+            related_depth = self.related_depth
+        #-- END check to see if nested --#
+
+        list_OUT = []
+        for number in range( 1, self.record_count + 1 ):
+
+            list_OUT.append(
+                self.build_record(
+                    etl_entity,
+                    number,
+                    extra_field_count_IN = self.extra_field_count,
+                    related_count_IN = self.related_count,
+                    related_depth_IN = related_depth
+                )
+            )
+
+        #-- END loop over records --#
+
+        return list_OUT
+
+    #-- END method build_record_list() --#
+
+
+    def count_related_records( self, record_list_IN ):
+
+        '''
+        Returns number of related records nested in the records passed in, at
+            all levels.
+        '''
+
+        # return reference
+        value_OUT = 0
+
+        # declare variables
+        current_record = None
+        current_value = None
+
+        for current_record in record_list_IN:
+
+            for current_value in current_record.values():
+
+                if ( isinstance( current_value, list ) == True ):
+                    value_OUT += len( current_value ) + self.count_related_records( current_value )
+                #-- END check to see if related list --#
+
+            #-- END loop over values --#
+
+        #-- END loop over records --#
+
+        return value_OUT
+
+    #-- END method count_related_records() --#
+
+
+    def delete_loaded_rows( self ):
+
+        '''
+        Deletes all rows from the model's table and its related models' tables
+            (deepest first), so each run starts from an empty database.
+        '''
+
+        # declare variables
+        model_class_list = None
+        model_class = None
+
+        # related models, deepest first, then model.
+        model_class_list = self.get_related_model_class_list( self.model_class.get_etl_spec(), self.related_depth )
+        model_class_list.reverse()
+        model_class_list.append( self.model_class )
+
+        for model_class in model_class_list:
+
+            model_class.objects.all().delete()
+
+        #-- END loop over model classes --#
+
+    #-- END method delete_loaded_rows() --#
+
+
+    def run_benchmark( self,
+                       scenario_IN,
+                       record_list_IN = None,
+                       worksheet_file_path_IN = None,
+                       label_IN = None,
+                       run_etl_option_map_IN = None ):
+
+        '''
+        Loads the records passed in (or the worksheet in the Excel file passed
+            in) into the model with run_etl(), using the run_etl() options
+            passed in, and measures the run. Returns dictionary of results
+            (PROP_* constants), which is also added to result_list.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        me = "run_benchmark"
+        run_etl_option_map = None
+        record_count = None
+        related_record_count = None
+        model_class = None
+        original_initialize_etl = None
+        class_initialize_etl = None
+        instrumentation = None
+        started_tracing = None
+        start_dt = None
+        start_time = None
+        elapsed_seconds = None
+        peak_memory_bytes = None
+        etl_status = None
+        status_message = None
+
+        # init
+        model_class = self.model_class
+        run_etl_option_map = dict( run_etl_option_map_IN or {} )
+        instrumentation = ETLInstrumentation( label_IN = label_IN )
+        if ( record_list_IN is not None ):
+            record_count = len( record_list_IN )
+            related_record_count = self.count_related_records( record_list_IN )
+        else:
+            record_count = self.record_count
+            related_record_count = 0
+        #-- END check to see if records --#
+
+        # empty tables?
+        if ( self.clear_tables == True ):
+            self.delete_loaded_rows()
+        #-- END check to see if clearing tables --#
+
+        # set up and run, counting queries. Anything wrapped is put back in
+        #     finally, even if set up fails.
+        try:
+
+            # Excel? run_etl() calls initialize_etl(), so wrap it to return a copy
+            #     of the spec that reads from Excel (a deep copy - a shallow one
+            #     would share its attribute maps with the model's spec).
+            if ( worksheet_file_path_IN is not None ):
+
+                original_initialize_etl = model_class.initialize_etl
+                class_initialize_etl = model_class.__dict__.get( "initialize_etl", None )
+
+                def initialize_excel_etl( cls, *args, **kwargs ):
+
+                    # declare variables
+                    excel_etl_spec = None
+
+                    excel_etl_spec = copy.deepcopy( original_initialize_etl( *args, **kwargs ) )
+                    excel_etl_spec.set_extract_storage_type( ETLEntity.STORAGE_TYPE_XLSX_WITH_HEADERS )
+                    cls.set_etl_spec( excel_etl_spec )
+
+                    return excel_etl_spec
+
+                #-- END function initialize_excel_etl() --#
+
+                model_class.initialize_etl = classmethod( initialize_excel_etl )
+                run_etl_option_map[ "worksheet_file_path_IN" ] = worksheet_file_path_IN
+                run_etl_option_map[ "worksheet_name_IN" ] = self.DEFAULT_WORKSHEET_NAME
+
+            else:
+
+                run_etl_option_map[ "record_list_IN" ] = record_list_IN
+
+            #-- END check to see if Excel --#
+
+            # memory?
+            started_tracing = False
+            if ( self.measure_memory == True ):
+
+                if ( tracemalloc.is_tracing() == False ):
+                    tracemalloc.start()
+                    started_tracing = True
+                #-- END check to see if already tracing --#
+                tracemalloc.reset_peak()
+
+            #-- END check to see if measuring memory --#
+
+            # run, counting queries.
+            start_dt = datetime.datetime.now()
+            start_time = time.perf_counter()
+            with connection.execute_wrapper( instrumentation.count_query ):
+
+                etl_status = self.model_class.run_etl( **run_etl_option_map )
+
+            #-- END with execute_wrapper() --#
+            elapsed_seconds = time.perf_counter() - start_time
+
+            if ( self.measure_memory == True ):
+                peak_memory_bytes = tracemalloc.get_traced_memory()[ 1 ]
+            #-- END check to see if measuring memory --#
+
+        finally:
+
+            if ( started_tracing == True ):
+                tracemalloc.stop()
+            #-- END check to see if we started tracing --#
+
+            # put back initialize_etl(), and the spec it builds.
+            if ( original_initialize_etl is not None ):
+
+                if ( class_initialize_etl is not None ):
+                    model_class.initialize_etl = class_initialize_etl
+                else:
+                    del model_class.initialize_etl
+                #-- END check to see if defined in model class --#
+                model_class.initialize_etl()
+
+            #-- END check to see if initialize_etl() wrapped --#
+
+        #-- END try...finally --#
+
+        # results
+        run_etl_option_map.pop( "record_list_IN", None )
+        value_OUT = {
+            self.PROP_LABEL : label_IN,
+            self.PROP_SCENARIO : scenario_IN,
+            self.PROP_START_DATETIME : start_dt.isoformat(),
+            self.PROP_DATABASE_VENDOR : connection.vendor,
+            self.PROP_RECORD_COUNT : record_count,
+            self.PROP_RELATED_RECORD_COUNT : related_record_count,
+            self.PROP_EXTRA_FIELD_COUNT : self.extra_field_count,
+            self.PROP_RELATED_COUNT : self.related_count,
+            self.PROP_RELATED_DEPTH : self.related_depth,
+            self.PROP_RUN_ETL_OPTIONS : run_etl_option_map,
+            self.PROP_IS_SUCCESS : etl_status.is_success(),
+            self.PROP_PROCESSED_RECORD_COUNT : etl_status.get_detail_value( self.PROP_PROCESSED_RECORD_COUNT, None ),
+            self.PROP_ELAPSED_SECONDS : elapsed_seconds,
+            self.PROP_RECORDS_PER_SECOND : ( record_count / elapsed_seconds ) if ( elapsed_seconds > 0 ) else None,
+            self.PROP_PEAK_MEMORY_BYTES : peak_memory_bytes,
+            self.PROP_QUERY_COUNT : instrumentation.query_count
+        }
+        self.result_list.append( value_OUT )
+
+        if ( self.debug_flag == True ):
+            status_message = "In {method}(): {result}".format( method = me, result = value_OUT )
+            LoggingHelper.output_debug( status_message, method_IN = me, logger_name_IN = self.MY_LOGGER_NAME, do_print_IN = True )
+        #-- END DEBUG --#
+
+        return value_OUT
+
+    #-- END method run_benchmark() --#
+
+
+    def run_suite( self,
+                   scenario_list_IN = None,
+                   run_etl_option_list_IN = None,
+                   results_file_path_IN = None,
+                   label_IN = None ):
+
+        '''
+        Runs each scenario passed in (default SCENARIO_LIST) once for each
+            dictionary of run_etl() options in the list passed in (default is
+            one run with no options). If results file path passed in, appends
+            results to it as JSON Lines. Returns list of results.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        me = "run_suite"
+        scenario_list = None
+        run_etl_option_list = None
+        status_message = None
+        flat_record_list = None
+        nested_record_list = None
+        work_directory = None
+        worksheet_file_path = None
+        current_scenario = None
+        current_option_map = None
+        label = None
+
+        # init
+        scenario_list = scenario_list_IN
+        if ( scenario_list is None ):
+            scenario_list = self.SCENARIO_LIST
+        #-- END check to see if scenarios --#
+
+        run_etl_option_list = run_etl_option_list_IN
+        if ( ( run_etl_option_list is None ) or ( len( run_etl_option_list ) == 0 ) ):
+            run_etl_option_list = [ {} ]
+        #-- END check to see if options --#
+
+        label = label_IN
+        if ( label is None ):
+            label = self.model_class.__name__
+        #-- END check to see if label --#
+
+        # build records once, for all runs.
+        if ( ( self.SCENARIO_FLAT_DICT in scenario_list ) or ( self.SCENARIO_EXCEL in scenario_list ) ):
+            flat_record_list = self.build_record_list( is_nested_IN = False )
+        #-- END check to see if flat records needed --#
+
+        if ( self.SCENARIO_NESTED_DICT in scenario_list ):
+            nested_record_list = self.build_record_list( is_nested_IN = True )
+        #-- END check to see if nested records needed --#
+
+        # Excel workbook?
+        if ( self.SCENARIO_EXCEL in scenario_list ):
+
+            work_directory = self.work_directory
+            if ( work_directory is None ):
+                work_directory = tempfile.gettempdir()
+            #-- END check to see if work directory --#
+
+            worksheet_file_path = os.path.join(
+                work_directory,
+                "etl_benchmark_{label}_{count}.xlsx".format( label = label, count = self.record_count )
+            )
+            self.write_excel_workbook( worksheet_file_path, flat_record_list )
+
+        #-- END check to see if Excel --#
+
+        # run.
+        for current_scenario in scenario_list:
+
+            for current_option_map in run_etl_option_list:
+
+                if ( current_scenario == self.SCENARIO_FLAT_DICT ):
+
+                    # run_etl() can change records, so each run gets a copy.
+                    list_OUT.append( self.run_benchmark( current_scenario, record_list_IN = copy.deepcopy( flat_record_list ), label_IN = label, run_etl_option_map_IN = current_option_map ) )
+
+                elif ( current_scenario == self.SCENARIO_NESTED_DICT ):
+
+                    list_OUT.append( self.run_benchmark( current_scenario, record_list_IN = copy.deepcopy( nested_record_list ), label_IN = label, run_etl_option_map_IN = current_option_map ) )
+
+                elif ( current_scenario == self.SCENARIO_EXCEL ):
+
+                    list_OUT.append( self.run_benchmark( current_scenario, worksheet_file_path_IN = worksheet_file_path, label_IN = label, run_etl_option_map_IN = current_option_map ) )
+
+                else:
+
+                    status_message = "In ETLBenchmark.{method}(): unknown scenario \"{scenario}\".".format( method = me, scenario = current_scenario )
+                    raise ETLError( status_message )
+
+                #-- END check to see which scenario --#
+
+            #-- END loop over run_etl() options --#
+
+        #-- END loop over scenarios --#
+
+        # clean up workbook.
+        if ( ( worksheet_file_path is not None ) and ( os.path.exists( worksheet_file_path ) == True ) ):
+            os.remove( worksheet_file_path )
+        #-- END check to see if workbook --#
+
+        # write results?
+        if ( results_file_path_IN is not None ):
+            self.write_json_lines( results_file_path_IN, list_OUT )
+        #-- END check to see if results file --#
+
+        return list_OUT
+
+    #-- END method run_suite() --#
+
+
+    def write_json_lines( self, file_path_IN, result_list_IN = None ):
+
+        '''
+        Appends results passed in (default result_list) to the file at the path
+            passed in, one line of JSON per result.
+        '''
+
+        # declare variables
+        result_list = None
+        current_result = None
+
+        # init
+        result_list = result_list_IN
+        if ( result_list is None ):
+            result_list = self.result_list
+        #-- END check to see if results passed in --#
+
+        with open( file_path_IN, "a", encoding = "utf-8" ) as json_lines_file:
+
+            for current_result in result_list:
+
+                json_lines_file.write( json.dumps( current_result, sort_keys = True, default = str ) + "\n" )
+
+            #-- END loop over results --#
+
+        #-- END with open() --#
+
+    #-- END method write_json_lines() --#
+
+
+#-- END class ETLBenchmark --#
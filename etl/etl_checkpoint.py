@@ -0,0 +1,292 @@
+#===============================================================================
+# imports
+#===============================================================================
+
+
+# base python libraries
+import datetime
+import json
+import logging
+import os
+
+# ETL imports
+from python_utilities.etl.etl_error import ETLError
+
+
+#===============================================================================
+# class ETLCheckpoint
+#===============================================================================
+
+
+# lineage: object
+class ETLCheckpoint( object ):
+
+
+    '''
+    ETLCheckpoint stores the progress of an ETL run in a small JSON file, so a
+        run that dies part way through can be resumed from the last checkpoint
+        rather than started over:
+    - label - name of run (class being loaded, for example), so a checkpoint
+        isn't resumed by the wrong run.
+    - start_index and record_count - range of records the run was asked to
+        process (0-indexed start; None = from first, to end).
+    - next_index - index of the first record not yet committed.
+    - counter_map - counts (processed, errors, etc.) up to next_index.
+    - is_complete - True once the run has finished.
+
+    A new run calls start(), a resumed run calls load(), then both call
+        update() as records are committed. When resumed, counts passed to
+        update() are added to the counts loaded from the file, so counter_map
+        always has the counts for the whole run.
+
+    The file is written to a temporary file that then replaces the old one,
+        so a crash while saving doesn't corrupt the checkpoint.
+    '''
+
+
+    #===========================================================================
+    # CONSTANTS-ish
+    #===========================================================================
+
+
+    # logger name
+    MY_LOGGER_NAME = "python_utilities.etl.ETLCheckpoint"
+
+    # properties in checkpoint file
+    PROP_LABEL = "label"
+    PROP_START_INDEX = "start_index"
+    PROP_RECORD_COUNT = "record_count"
+    PROP_NEXT_INDEX = "next_index"
+    PROP_COUNTER_MAP = "counter_map"
+    PROP_IS_COMPLETE = "is_complete"
+    PROP_UPDATED_DATETIME = "updated_datetime"
+
+
+    #===========================================================================
+    # ! ==> class variables
+    #===========================================================================
+
+
+    # debug_flag
+    debug_flag = False
+
+
+    #===========================================================================
+    # ! ==> class methods
+    #===========================================================================
+
+
+    #===========================================================================
+    # ! ==> __init__() method - instance variables
+    #===========================================================================
+
+
+    def __init__( self, file_path_IN = None, label_IN = None ):
+
+        '''
+        Constructor
+        '''
+
+        # call parent's __init__()
+        super().__init__()
+
+        # file
+        self.file_path = file_path_IN
+
+        # run
+        self.label = label_IN
+        self.start_index = None
+        self.record_count = None
+
+        # progress
+        self.next_index = None
+        self.counter_map = {}
+        self.base_counter_map = {}
+        self.is_complete = False
+
+    #-- END constructor --#
+
+
+    #===========================================================================
+    # ! ==> instance methods
+    #===========================================================================
+
+
+    def get_remaining_count( self ):
+
+        '''
+        Returns number of records left to process in the run's range after
+            next_index, or None if the run goes to the end of the records.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        start_index = None
+
+        # record count?
+        if ( self.record_count is not None ):
+
+            start_index = self.start_index
+            if ( start_index is None ):
+                start_index = 0
+            #-- END check to see if start index --#
+
+            value_OUT = max( 0, ( start_index + self.record_count ) - self.next_index )
+
+        #-- END check to see if record count --#
+
+        return value_OUT
+
+    #-- END method get_remaining_count() --#
+
+
+    def load( self ):
+
+        '''
+        Loads checkpoint from file. Returns True if there was a checkpoint to
+            load, False if no file. If label is set and doesn't match label in
+            file, raises ETLError.
+        '''
+
+        # return reference
+        value_OUT = False
+
+        # declare variables
+        me = "load"
+        status_message = None
+        checkpoint_json = None
+        file_label = None
+
+        # file?
+        if ( ( self.file_path is not None ) and ( os.path.exists( self.file_path ) == True ) ):
+
+            # read it...
+            with open( self.file_path, "r", encoding = "utf-8" ) as checkpoint_file:
+
+                checkpoint_json = json.load( checkpoint_file )
+
+            #-- END with open() --#
+
+            # ...make sure it is ours...
+            file_label = checkpoint_json.get( self.PROP_LABEL, None )
+            if ( ( self.label is not None ) and ( file_label != self.label ) ):
+
+                status_message = "In ETLCheckpoint.{method}(): checkpoint file {file_path} is for \"{file_label}\", not \"{label}\".".format(
+                    method = me,
+                    file_path = self.file_path,
+                    file_label = file_label,
+                    label = self.label
+                )
+                raise ETLError( status_message )
+
+            #-- END check to see if label matches --#
+
+            # ...and store values.
+            self.label = file_label
+            self.start_index = checkpoint_json.get( self.PROP_START_INDEX, None )
+            self.record_count = checkpoint_json.get( self.PROP_RECORD_COUNT, None )
+            self.next_index = checkpoint_json.get( self.PROP_NEXT_INDEX, None )
+            self.counter_map = checkpoint_json.get( self.PROP_COUNTER_MAP, {} )
+            self.base_counter_map = dict( self.counter_map )
+            self.is_complete = checkpoint_json.get( self.PROP_IS_COMPLETE, False )
+            value_OUT = True
+
+        #-- END check to see if file --#
+
+        return value_OUT
+
+    #-- END method load() --#
+
+
+    def save( self ):
+
+        '''
+        Writes checkpoint to file (to a temporary file first, which then
+            replaces the checkpoint file).
+        '''
+
+        # declare variables
+        checkpoint_json = None
+        temp_file_path = None
+
+        # build JSON
+        checkpoint_json = {
+            self.PROP_LABEL : self.label,
+            self.PROP_START_INDEX : self.start_index,
+            self.PROP_RECORD_COUNT : self.record_count,
+            self.PROP_NEXT_INDEX : self.next_index,
+            self.PROP_COUNTER_MAP : self.counter_map,
+            self.PROP_IS_COMPLETE : self.is_complete,
+            self.PROP_UPDATED_DATETIME : datetime.datetime.now().isoformat()
+        }
+
+        # write to temp file...
+        temp_file_path = "{file_path}.tmp".format( file_path = self.file_path )
+        with open( temp_file_path, "w", encoding = "utf-8" ) as checkpoint_file:
+
+            json.dump( checkpoint_json, checkpoint_file, indent = 4, sort_keys = True )
+            checkpoint_file.flush()
+            os.fsync( checkpoint_file.fileno() )
+
+        #-- END with open() --#
+
+        # ...then replace checkpoint file.
+        os.replace( temp_file_path, self.file_path )
+
+    #-- END method save() --#
+
+
+    def start( self, start_index_IN = None, record_count_IN = None ):
+
+        '''
+        Starts a new run over the range of records passed in - next index is
+            start index, no counts.
+        '''
+
+        # store range
+        self.start_index = start_index_IN
+        self.record_count = record_count_IN
+
+        # reset progress
+        self.next_index = start_index_IN
+        if ( self.next_index is None ):
+            self.next_index = 0
+        #-- END check to see if start index --#
+        self.counter_map = {}
+        self.base_counter_map = {}
+        self.is_complete = False
+
+    #-- END method start() --#
+
+
+    def update( self, next_index_IN, counter_map_IN, is_complete_IN = False ):
+
+        '''
+        Accepts index of first record not yet committed, and counts for this
+            run (added to counts loaded from the file, if resumed). Stores them
+            and saves the checkpoint.
+        '''
+
+        # declare variables
+        current_key = None
+        current_count = None
+
+        # store progress...
+        self.next_index = next_index_IN
+        self.counter_map = dict( self.base_counter_map )
+        for current_key, current_count in counter_map_IN.items():
+
+            self.counter_map[ current_key ] = self.counter_map.get( current_key, 0 ) + current_count
+
+        #-- END loop over counts --#
+        self.is_complete = is_complete_IN
+
+        # ...and save.
+        self.save()
+
+    #-- END method update() --#
+
+
+#-- END class ETLCheckpoint --#
@@ -0,0 +1,491 @@
+#===============================================================================
+# imports
+#===============================================================================
+
+
+# base python libraries
+import pytz
+import types
+
+# python_utilities
+from python_utilities.logging.logging_helper import LoggingHelper
+
+
+#===============================================================================
+# class ETLCompiledEntity
+#===============================================================================
+
+
+# lineage: object
+class ETLCompiledEntity( object ):
+
+
+    '''
+    ETLCompiledEntity is a frozen, read-only copy of an ETLEntity, built once
+        before a run ( ETLEntity.compile() ) and used by ETL processors while
+        processing records. ETLEntity stays the place to build a spec - its
+        maps and lists can change at any time, so lookups go through getter
+        methods and checks on every call. Once compiled:
+    - attributes are stored in __slots__, with no instance dictionary.
+    - key lists are tuples, the required keys are a tuple (in sorted order,
+        so missing fields are always reported in the same order) and a
+        frozenset, and maps are read-only ( types.MappingProxyType ).
+    - column indexes map to keys through a tuple ( index_key_tuple ), so
+        pull_key_for_index() is a tuple lookup rather than a dictionary
+        lookup.
+    - instances can't be changed - setting an attribute raises
+        AttributeError. If the ETLEntity changes, compile it again.
+
+    ETLCompiledEntity has the same "get_*()" and "pull_*()" methods as
+        ETLEntity, so processors can use either one.
+
+    The ETLAttribute instances are shared with the ETLEntity, not copied, so
+        converters compiled on them ( compile_converters() ) are used by both.
+    '''
+
+
+    #===========================================================================
+    # CONSTANTS-ish
+    #===========================================================================
+
+
+    # logger name
+    MY_LOGGER_NAME = "python_utilities.etl.ETLCompiledEntity"
+
+
+    #===========================================================================
+    # ! ==> class variables
+    #===========================================================================
+
+
+    __slots__ = (
+        "extract_storage_type",
+        "extract_first_index",
+        "load_storage_type",
+        "load_class",
+        "attr_key_to_attribute_map",
+        "attr_load_name_to_key_map",
+        "attr_index_to_key_map",
+        "attr_key_to_index_map",
+        "attr_key_to_load_name_map",
+        "index_key_tuple",
+        "required_attr_key_set",
+        "required_attr_key_tuple",
+        "id_attr_key_list",
+        "id_match_type",
+        "data_attr_key_list",
+        "related_entity_attr_key_list",
+        "debug_flag"
+    )
+
+
+    #===========================================================================
+    # ! ==> class methods
+    #===========================================================================
+
+
+    @classmethod
+    def build_index_key_tuple( cls, index_to_key_map_IN ):
+
+        '''
+        Accepts map of column indexes to keys. If all indexes are integers of
+            0 or more, returns a tuple where the key for each index is at that
+            position (None for positions with no key). If not, returns None.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        are_indexes_ok = None
+        index_key_list = None
+        current_index = None
+        current_key = None
+
+        # all indexes integers, 0 or greater?
+        are_indexes_ok = True
+        for current_index in index_to_key_map_IN.keys():
+
+            if ( ( isinstance( current_index, int ) == False ) or ( current_index < 0 ) ):
+                are_indexes_ok = False
+            #-- END check to see if index is OK --#
+
+        #-- END loop over indexes --#
+
+        if ( are_indexes_ok == True ):
+
+            # build list with a spot for each index, then store keys.
+            index_key_list = [ None ] * ( max( index_to_key_map_IN.keys(), default = -1 ) + 1 )
+            for current_index, current_key in index_to_key_map_IN.items():
+
+                index_key_list[ current_index ] = current_key
+
+            #-- END loop over index-key pairs --#
+
+            value_OUT = tuple( index_key_list )
+
+        #-- END check to see if indexes are OK --#
+
+        return value_OUT
+
+    #-- END class method build_index_key_tuple() --#
+
+
+    #===========================================================================
+    # ! ==> __init__() method - instance variables
+    #===========================================================================
+
+
+    def __init__( self, etl_entity_IN, attr_index_to_key_map_IN = None, attr_key_to_index_map_IN = None ):
+
+        '''
+        Constructor - accepts ETLEntity to compile, and optional maps of column
+            index to key and key to column index to use in place of the
+            entity's.
+        '''
+
+        # declare variables
+        value_map = None
+        index_to_key_map = None
+        key_to_index_map = None
+        key_to_attribute_map = None
+        key_to_load_name_map = None
+        current_key = None
+        current_attr = None
+        current_name = None
+        current_value = None
+
+        # call parent's __init__()
+        super().__init__()
+
+        # attribute keys to load names, looked up once.
+        key_to_attribute_map = dict( etl_entity_IN.get_attr_key_to_attribute_map() )
+        key_to_load_name_map = {}
+        for current_key, current_attr in key_to_attribute_map.items():
+
+            key_to_load_name_map[ current_key ] = current_attr.get_load_attr_name()
+
+        #-- END loop over attributes --#
+
+        # index maps - passed in, or from entity.
+        index_to_key_map = attr_index_to_key_map_IN
+        if ( index_to_key_map is None ):
+            index_to_key_map = etl_entity_IN.get_attr_index_to_key_map()
+        #-- END check to see if index-to-key map passed in --#
+
+        key_to_index_map = attr_key_to_index_map_IN
+        if ( key_to_index_map is None ):
+            key_to_index_map = etl_entity_IN.get_attr_key_to_index_map()
+        #-- END check to see if key-to-index map passed in --#
+
+        value_map = {}
+
+        # external information
+        value_map[ "extract_storage_type" ] = etl_entity_IN.get_extract_storage_type()
+        value_map[ "extract_first_index" ] = etl_entity_IN.get_extract_first_index()
+        value_map[ "load_storage_type" ] = etl_entity_IN.get_load_storage_type()
+        value_map[ "load_class" ] = etl_entity_IN.get_load_class()
+
+        # external storage traits
+        value_map[ "attr_key_to_attribute_map" ] = types.MappingProxyType( key_to_attribute_map )
+        value_map[ "attr_load_name_to_key_map" ] = types.MappingProxyType( dict( etl_entity_IN.get_attr_load_name_to_key_map() ) )
+        value_map[ "attr_index_to_key_map" ] = types.MappingProxyType( dict( index_to_key_map ) )
+        value_map[ "attr_key_to_index_map" ] = types.MappingProxyType( dict( key_to_index_map ) )
+        value_map[ "attr_key_to_load_name_map" ] = types.MappingProxyType( key_to_load_name_map )
+        value_map[ "index_key_tuple" ] = self.build_index_key_tuple( value_map[ "attr_index_to_key_map" ] )
+
+        # required in extract...
+        value_map[ "required_attr_key_set" ] = frozenset( etl_entity_IN.get_required_attr_key_set() )
+        value_map[ "required_attr_key_tuple" ] = tuple( sorted( value_map[ "required_attr_key_set" ], key = str ) )
+
+        # ID - record identification
+        value_map[ "id_attr_key_list" ] = tuple( etl_entity_IN.get_id_attr_key_list() )
+        value_map[ "id_match_type" ] = etl_entity_IN.get_id_match_type()
+
+        # data attributes
+        value_map[ "data_attr_key_list" ] = tuple( etl_entity_IN.get_data_attr_key_list() )
+
+        # related entity attributes
+        value_map[ "related_entity_attr_key_list" ] = tuple( etl_entity_IN.get_related_entity_attr_key_list() )
+
+        # debug
+        value_map[ "debug_flag" ] = etl_entity_IN.debug_flag
+
+        # store (around __setattr__(), which doesn't allow changes).
+        for current_name, current_value in value_map.items():
+
+            object.__setattr__( self, current_name, current_value )
+
+        #-- END loop over values --#
+
+    #-- END constructor --#
+
+
+    def __setattr__( self, name_IN, value_IN ):
+
+        '''
+        Compiled entities can't be changed - raises AttributeError.
+        '''
+
+        raise AttributeError( "ETLCompiledEntity is read-only - can't set \"{name}\" (update the ETLEntity and compile() it again).".format( name = name_IN ) )
+
+    #-- END method __setattr__() --#
+
+
+    def __delattr__( self, name_IN ):
+
+        '''
+        Compiled entities can't be changed - raises AttributeError.
+        '''
+
+        raise AttributeError( "ETLCompiledEntity is read-only - can't delete \"{name}\".".format( name = name_IN ) )
+
+    #-- END method __delattr__() --#
+
+
+    #===========================================================================
+    # ! ==> instance methods
+    #===========================================================================
+
+
+    def compile_converters( self, time_zone_IN = pytz.UTC ):
+
+        '''
+        Compiles the converter function for each attribute in this entity (
+            see ETLAttribute.compile_converter() ). Returns map of attribute
+            keys to converter functions.
+        '''
+
+        # return reference
+        map_OUT = None
+
+        # declare variables
+        current_key = None
+        current_attr = None
+
+        # loop over attributes, compiling each.
+        map_OUT = {}
+        for current_key, current_attr in self.attr_key_to_attribute_map.items():
+
+            map_OUT[ current_key ] = current_attr.compile_converter( time_zone_IN )
+
+        #-- END loop over attributes --#
+
+        return map_OUT
+
+    #-- END method compile_converters() --#
+
+
+    def get_attr_index_to_key_map( self ):
+
+        return self.attr_index_to_key_map
+
+    #-- END method get_attr_index_to_key_map --#
+
+
+    def get_attr_key_to_attribute_map( self ):
+
+        return self.attr_key_to_attribute_map
+
+    #-- END method get_attr_key_to_attribute_map --#
+
+
+    def get_attr_key_to_index_map( self ):
+
+        return self.attr_key_to_index_map
+
+    #-- END method get_attr_key_to_index_map --#
+
+
+    def get_attr_load_name_to_key_map( self ):
+
+        return self.attr_load_name_to_key_map
+
+    #-- END method get_attr_load_name_to_key_map --#
+
+
+    def get_data_attr_key_list( self ):
+
+        return self.data_attr_key_list
+
+    #-- END method get_data_attr_key_list --#
+
+
+    def get_extract_first_index( self ):
+
+        return self.extract_first_index
+
+    #-- END method get_extract_first_index --#
+
+
+    def get_extract_storage_type( self ):
+
+        return self.extract_storage_type
+
+    #-- END method get_extract_storage_type --#
+
+
+    def get_id_attr_key_list( self ):
+
+        return self.id_attr_key_list
+
+    #-- END method get_id_attr_key_list --#
+
+
+    def get_id_match_type( self ):
+
+        return self.id_match_type
+
+    #-- END method get_id_match_type --#
+
+
+    def get_load_class( self ):
+
+        return self.load_class
+
+    #-- END method get_load_class --#
+
+
+    def get_load_storage_type( self ):
+
+        return self.load_storage_type
+
+    #-- END method get_load_storage_type --#
+
+
+    def get_related_entity_attr_key_list( self ):
+
+        return self.related_entity_attr_key_list
+
+    #-- END method get_related_entity_attr_key_list --#
+
+
+    def get_required_attr_key_set( self ):
+
+        '''
+        Returns required keys as a frozenset, for membership tests. To loop
+            over them, use get_required_attr_key_tuple().
+        '''
+
+        return self.required_attr_key_set
+
+    #-- END method get_required_attr_key_set --#
+
+
+    def get_required_attr_key_tuple( self ):
+
+        '''
+        Returns required keys as a tuple, in sorted order, so missing fields
+            are always checked (and reported) in the same order.
+        '''
+
+        return self.required_attr_key_tuple
+
+    #-- END method get_required_attr_key_tuple --#
+
+
+    def pull_attr_for_key( self, key_IN ):
+
+        '''
+        Accepts attribute key. Returns ETLAttribute instance associated with
+            that key, or None if none.
+        '''
+
+        return self.attr_key_to_attribute_map.get( key_IN, None )
+
+    #-- END method pull_attr_for_key() --#
+
+
+    def pull_index_for_key( self, key_IN ):
+
+        '''
+        Accepts attribute key. Returns index associated with that key, or None
+            if none.
+        '''
+
+        return self.attr_key_to_index_map.get( key_IN, None )
+
+    #-- END method pull_index_for_key() --#
+
+
+    def pull_key_for_index( self, index_IN ):
+
+        '''
+        Accepts attribute index. Returns key associated with that index, or
+            None if none.
+        '''
+
+        # return reference
+        key_OUT = None
+
+        # declare variables
+        me = "pull_key_for_index"
+        status_message = None
+        index_key_tuple = None
+
+        # index tuple?
+        index_key_tuple = self.index_key_tuple
+        if ( index_key_tuple is not None ):
+
+            # yes - look up by position.
+            if ( ( isinstance( index_IN, int ) == True ) and ( 0 <= index_IN < len( index_key_tuple ) ) ):
+                key_OUT = index_key_tuple[ index_IN ]
+            #-- END check to see if index in tuple --#
+
+        else:
+
+            # no - use map.
+            key_OUT = self.attr_index_to_key_map.get( index_IN, None )
+
+        #-- END check to see if index tuple --#
+
+        if ( ( key_OUT is None ) and ( self.debug_flag == True ) ):
+            status_message = "no key found for index {}, returning None.".format( index_IN )
+            LoggingHelper.output_debug( status_message, method_IN = me, logger_name_IN = self.MY_LOGGER_NAME, do_print_IN = self.debug_flag )
+        #-- END DEBUG --#
+
+        return key_OUT
+
+    #-- END method pull_key_for_index() --#
+
+
+    def pull_load_attr_name_for_index( self, index_IN ):
+
+        '''
+        Accepts attribute index. Returns "load_attr_name" for the attribute
+            with the key for that index, or None if no key for the index.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        index_key = None
+
+        # retrieve key for index
+        index_key = self.pull_key_for_index( index_IN )
+        if ( index_key is not None ):
+
+            value_OUT = self.pull_load_attr_name_for_key( index_key )
+
+        #-- END check to see if key associated with index. --#
+
+        return value_OUT
+
+    #-- END method pull_load_attr_name_for_index() --#
+
+
+    def pull_load_attr_name_for_key( self, key_IN ):
+
+        '''
+        Accepts attribute key. Returns "load_attr_name" for the ETLAttribute
+            with that key, or the key itself if no ETLAttribute (as in
+            ETLEntity).
+        '''
+
+        return self.attr_key_to_load_name_map.get( key_IN, key_IN )
+
+    #-- END method pull_load_attr_name_for_key() --#
+
+
+#-- END class ETLCompiledEntity --#
@@ -0,0 +1,206 @@
+#===============================================================================
+# imports
+#===============================================================================
+
+
+# base python libraries
+import datetime
+import json
+import logging
+
+
+#===============================================================================
+# class ETLDeadLetterSink
+#===============================================================================
+
+
+# lineage: object
+class ETLDeadLetterSink( object ):
+
+
+    '''
+    ETLDeadLetterSink writes records that failed ETL processing to a JSON Lines
+        file, one line per record, as they fail, so they can be looked at or
+        replayed later (each line's "record" can be passed back in to
+        run_etl()). Each line has:
+    - label - name of run (class being loaded, for example).
+    - reason - why the record failed (REASON_* constants).
+    - record_number - number of the record within the run (1 is the first),
+        if known.
+    - message_list - error messages for the record.
+    - record - the record itself. Values JSON can't hold (dates, etc.) are
+        converted to strings.
+    - failed_datetime - when the record was written.
+
+    Lines are flushed as they are written. Open the file with open() and close
+        it with close(), or use an instance as a context manager. The file is
+        appended to, not overwritten.
+    '''
+
+
+    #===========================================================================
+    # CONSTANTS-ish
+    #===========================================================================
+
+
+    # logger name
+    MY_LOGGER_NAME = "python_utilities.etl.ETLDeadLetterSink"
+
+    # reasons
+    REASON_MISSING_REQUIRED = "missing_required"
+    REASON_UPDATE_FAILED = "update_failed"
+    REASON_NO_INSTANCE = "no_instance"
+    REASON_POST_SAVE_FAILED = "post_save_failed"
+
+    # properties in a dead letter line
+    PROP_LABEL = "label"
+    PROP_REASON = "reason"
+    PROP_RECORD_NUMBER = "record_number"
+    PROP_MESSAGE_LIST = "message_list"
+    PROP_RECORD = "record"
+    PROP_FAILED_DATETIME = "failed_datetime"
+
+
+    #===========================================================================
+    # ! ==> class variables
+    #===========================================================================
+
+
+    # debug_flag
+    debug_flag = False
+
+
+    #===========================================================================
+    # ! ==> class methods
+    #===========================================================================
+
+
+    #===========================================================================
+    # ! ==> __init__() method - instance variables
+    #===========================================================================
+
+
+    def __init__( self, file_path_IN = None, label_IN = None ):
+
+        '''
+        Constructor
+        '''
+
+        # call parent's __init__()
+        super().__init__()
+
+        # file
+        self.file_path = file_path_IN
+        self.dead_letter_file = None
+
+        # run
+        self.label = label_IN
+
+        # counts
+        self.record_count = 0
+        self.reason_to_count_map = {}
+
+    #-- END constructor --#
+
+
+    def __enter__( self ):
+
+        self.open()
+        return self
+
+    #-- END method __enter__() --#
+
+
+    def __exit__( self, exception_type_IN, exception_value_IN, traceback_IN ):
+
+        self.close()
+        return False
+
+    #-- END method __exit__() --#
+
+
+    #===========================================================================
+    # ! ==> instance methods
+    #===========================================================================
+
+
+    def close( self ):
+
+        '''
+        Closes the dead letter file, if open.
+        '''
+
+        if ( self.dead_letter_file is not None ):
+
+            self.dead_letter_file.close()
+            self.dead_letter_file = None
+
+        #-- END check to see if file open --#
+
+    #-- END method close() --#
+
+
+    def open( self ):
+
+        '''
+        Opens the dead letter file for appending, if not already open.
+        '''
+
+        if ( self.dead_letter_file is None ):
+
+            self.dead_letter_file = open( self.file_path, "a", encoding = "utf-8" )
+
+        #-- END check to see if file open --#
+
+    #-- END method open() --#
+
+
+    def write_record( self, record_IN, reason_IN, message_list_IN = None, record_number_IN = None ):
+
+        '''
+        Accepts a record that failed processing, the reason it failed (one of
+            the REASON_* constants), and optional list of error messages and
+            record number. Writes them to the dead letter file as a line of
+            JSON (opening the file if needed), and counts them. Returns the
+            dictionary that was written.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        message_list = None
+        json_string = None
+
+        # init
+        message_list = message_list_IN
+        if ( message_list is None ):
+            message_list = []
+        #-- END check to see if message list --#
+
+        # build line...
+        value_OUT = {
+            self.PROP_LABEL : self.label,
+            self.PROP_REASON : reason_IN,
+            self.PROP_RECORD_NUMBER : record_number_IN,
+            self.PROP_MESSAGE_LIST : list( message_list ),
+            self.PROP_RECORD : record_IN,
+            self.PROP_FAILED_DATETIME : datetime.datetime.now().isoformat()
+        }
+        json_string = json.dumps( value_OUT, sort_keys = True, default = str )
+
+        # ...write it...
+        self.open()
+        self.dead_letter_file.write( json_string + "\n" )
+        self.dead_letter_file.flush()
+
+        # ...and count it.
+        self.record_count += 1
+        self.reason_to_count_map[ reason_IN ] = self.reason_to_count_map.get( reason_IN, 0 ) + 1
+
+        return value_OUT
+
+    #-- END method write_record() --#
+
+
+#-- END class ETLDeadLetterSink --#
@@ -1,16 +1,10 @@
-# TODO
-# - add timing information - keep track of:
-#     - // start
-#     - // time and total elapsed at each periodic output.
-#     - elapsed for just period
-#     - average per item.
-
 #===============================================================================
 # imports
 #===============================================================================
 
 
 # base python libraries
+import contextlib
 import datetime
 import dateutil
 import itertools
@@ -20,13 +14,28 @@ import sys
 import time
 import traceback
 
+# django imports
+import django
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db import DataError
+from django.db import IntegrityError
+from django.db import router
+from django.db import transaction
+from django.db.models import Q
+
 # python_utilities
 from python_utilities.status.status_container import StatusContainer
 
 # ETL imports
 from python_utilities.etl.etl_attribute import ETLAttribute
+from python_utilities.etl.etl_checkpoint import ETLCheckpoint
+from python_utilities.etl.etl_dead_letter_sink import ETLDeadLetterSink
 from python_utilities.etl.etl_entity import ETLEntity
 from python_utilities.etl.etl_error import ETLError
+from python_utilities.etl.etl_instrumentation import ETLInstrumentation
 from python_utilities.etl.etl_processor import ETLProcessor
 from python_utilities.etl.etl_object_loader import ETLObjectLoader
 
@@ -60,6 +69,35 @@ class ETLDjangoModelLoader( ETLObjectLoader ):
     # logger name
     MY_LOGGER_NAME = "python_utilities.etl.ETLDjangoModelLoader"
 
+    # batched lookup - default number of records per lookup window.
+    DEFAULT_BATCH_LOOKUP_SIZE = 1000
+
+    # bulk write - default number of instances per bulk write.
+    DEFAULT_BULK_WRITE_BATCH_SIZE = 1000
+
+    # status properties - bulk write
+    STATUS_PROP_BULK_CREATED_COUNT = "bulk_created_count"
+    STATUS_PROP_BULK_UPDATED_COUNT = "bulk_updated_count"
+    STATUS_PROP_BULK_POST_SAVE_ERROR_COUNT = "bulk_post_save_error_count"
+    STATUS_PROP_BULK_SAVE_ERROR_COUNT = "bulk_save_error_count"
+
+    # batched related - default number of related records to accumulate
+    #     before running ETL on them.
+    DEFAULT_RELATED_BATCH_SIZE = 5000
+
+    # status properties - batched related
+    STATUS_PROP_RELATED_RECORD_COUNT = "related_record_count"
+    STATUS_PROP_RELATED_ERROR_COUNT = "related_error_count"
+
+    # status properties - change detection
+    STATUS_PROP_UNCHANGED_SKIPPED_COUNT = "unchanged_skipped_count"
+
+    # checkpoints - default number of records between checkpoints.
+    DEFAULT_CHECKPOINT_EVERY = 1000
+
+    # status properties - checkpoints
+    STATUS_PROP_RESUMED_FROM_INDEX = "resumed_from_index"
+
 
     #===========================================================================
     # ! ==> class variables
@@ -79,6 +117,30 @@ class ETLDjangoModelLoader( ETLObjectLoader ):
     #===========================================================================
 
 
+    @classmethod
+    def initialize_worker_process( cls ):
+
+        '''
+        Initializer for worker processes in a process pool used for parallel
+            ETL ( LoadableDjangoModel.run_etl_parallel() ). Sets up Django if
+            the worker was spawned rather than forked, then closes any
+            database connections inherited from the parent process, so each
+            worker opens its own connection the first time it needs one.
+        '''
+
+        # Django set up? (not if worker was spawned)
+        if ( apps.ready == False ):
+
+            django.setup()
+
+        #-- END check to see if Django set up --#
+
+        # close connections inherited from parent.
+        connections.close_all()
+
+    #-- END class method initialize_worker_process() --#
+
+
     #===========================================================================
     # ! ==> __init__() method - instance variables
     #===========================================================================
@@ -110,6 +172,49 @@ class ETLDjangoModelLoader( ETLObjectLoader ):
         # status - row-level
         #self.unknown_attrs_name_to_value_map = {}
 
+        # check required - batched (see get_batch_required_iterator())
+        self.do_batch_required = False
+        self.missing_required_count = 0
+        self.missing_required_key_count_map = {}
+
+        # id() of each record handed out by get_batch_required_iterator() -->
+        #     its record number in the run (counting records skipped).
+        self.batch_required_record_number_map = {}
+
+        # lookup - batched identity map
+        self.do_batch_lookup = False
+        self.batch_lookup_size = self.DEFAULT_BATCH_LOOKUP_SIZE
+        self.lookup_identity_map = {}
+
+        # save - bulk write buffers
+        self.do_bulk_write = False
+        self.bulk_write_batch_size = self.DEFAULT_BULK_WRITE_BATCH_SIZE
+        self.reset_bulk_write_buffers()
+        self.bulk_created_count = 0
+        self.bulk_updated_count = 0
+        self.bulk_save_error_count = 0
+        self.bulk_post_save_error_count = 0
+
+        # related - batched related-record ETL (see flush_related())
+        self.do_batch_related = False
+        self.related_batch_size = self.DEFAULT_RELATED_BATCH_SIZE
+        self.related_record_count = 0
+        self.related_error_count = 0
+
+        # change detection - name of field on load class that stores hash of
+        #     record last loaded (from load class's
+        #     etl_record_hash_field_name - set in process_records()), and
+        #     hash of current record.
+        self.record_hash_field_name = None
+        self.record_hash = None
+
+        # checkpoints - if checkpoint_file_path is set, progress is saved there
+        #     every checkpoint_every records, and if do_resume is True, an
+        #     incomplete run in the file is resumed (see ETLCheckpoint).
+        self.checkpoint_file_path = None
+        self.checkpoint_every = self.DEFAULT_CHECKPOINT_EVERY
+        self.do_resume = False
+
         # debug
         self.debug_flag = False
 
@@ -121,11 +226,208 @@ class ETLDjangoModelLoader( ETLObjectLoader ):
     #===========================================================================
 
 
+    def add_bulk_post_save( self, instance_IN, record_IN, related_attr_to_spec_map_IN = None ):
+
+        '''
+        Accepts an instance that is waiting in the bulk write buffers, the
+            record it was loaded from, and the map of related keys to attribute
+            specs for the record. Stores them so post-save processing
+            ( process_post_save() ) can be run once the instance has been
+            written by flush_bulk_write().
+        '''
+
+        # add to list of pending post-save processing.
+        self.bulk_post_save_list.append( ( instance_IN, record_IN, related_attr_to_spec_map_IN ) )
+
+    #-- END method add_bulk_post_save() --#
+
+
+    def add_instance_to_bulk_write( self, instance_IN, updated_attr_name_list_IN = None ):
+
+        '''
+        Accepts a changed instance and the list of the names of its attributes
+            that changed. New instances (not yet in database) are buffered for
+            bulk_create(), existing instances for bulk_update(). If
+            updated_attr_name_list_IN is None, all fields are updated.
+
+        Returns the number of instances currently buffered.
+        '''
+
+        # return reference
+        count_OUT = None
+
+        # declare variables
+        instance_id = None
+        current_attr_name = None
+
+        # init
+        instance_id = id( instance_IN )
+
+        # new or existing?
+        if ( instance_IN._state.adding == True ):
+
+            # new - already buffered? (identity map can hand the same new
+            #     instance to more than one record).
+            if ( instance_id not in self.bulk_create_id_set ):
+
+                # no - add it.
+                self.bulk_create_id_set.add( instance_id )
+                self.bulk_create_list.append( instance_IN )
+
+            #-- END check to see if already buffered --#
+
+        else:
+
+            # existing - already buffered?
+            if ( instance_id not in self.bulk_update_id_set ):
+
+                # no - add it.
+                self.bulk_update_id_set.add( instance_id )
+                self.bulk_update_list.append( instance_IN )
+
+            #-- END check to see if already buffered --#
+
+            # add changed attribute names to field set.
+            if ( updated_attr_name_list_IN is not None ):
+
+                for current_attr_name in updated_attr_name_list_IN:
+
+                    self.bulk_update_field_set.add( current_attr_name )
+
+                #-- END loop over updated attribute names --#
+
+            else:
+
+                # no list - update everything.
+                self.bulk_update_all_fields = True
+
+            #-- END check to see if list of updated attributes --#
+
+        #-- END check to see if new or existing --#
+
+        count_OUT = len( self.bulk_create_list ) + len( self.bulk_update_list )
+
+        return count_OUT
+
+    #-- END method add_instance_to_bulk_write() --#
+
+
+    def build_lookup_key( self, record_IN ):
+
+        '''
+        Accepts record. Retrieves the value for each ID attribute key in the
+            ETL spec, converts each to the python type of the matching field on
+            the load class (so "5" from a spreadsheet matches 5 from the
+            database), and returns the values as a tuple, in the order of the
+            spec's ID attribute key list. If any ID value is missing, returns
+            None.
+        '''
+
+        # return reference
+        key_OUT = None
+
+        # declare variables
+        me = "build_lookup_key"
+        my_etl_spec = None
+        id_column_key_list = None
+        current_id_key = None
+        current_id_value = None
+        current_id_attr_name = None
+        key_value_list = None
+
+        # get spec information
+        my_etl_spec = self.get_compiled_entity()
+        id_column_key_list = my_etl_spec.get_id_attr_key_list()
+
+        # loop over id keys
+        key_value_list = []
+        for current_id_key in id_column_key_list:
+
+            # retrieve value and attribute name for key.
+            current_id_value = self.get_value_for_key( record_IN, current_id_key )
+            current_id_attr_name = my_etl_spec.pull_load_attr_name_for_key( current_id_key )
+
+            # got a value?
+            if ( current_id_value is None ):
+
+                # no - can't build a key for this record.
+                key_value_list = None
+                break
+
+            #-- END check to see if value --#
+
+            # normalize and add to list.
+            current_id_value = self.normalize_lookup_value( current_id_attr_name, current_id_value )
+            key_value_list.append( current_id_value )
+
+        #-- END loop over id column keys. --#
+
+        # got a list?
+        if ( ( key_value_list is not None ) and ( len( key_value_list ) > 0 ) ):
+
+            # convert to tuple so it can be used as a dictionary key.
+            key_OUT = tuple( key_value_list )
+
+        #-- END check to see if we have values --#
+
+        return key_OUT
+
+    #-- END method build_lookup_key() --#
+
+
+    def build_record_hash( self, record_IN ):
+
+        '''
+        Accepts record. If dictionary, returns hash from load class's
+            create_etl_record_hash(). If not, or if record can't be converted
+            to JSON, returns None (so record is never skipped as unchanged).
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        me = "build_record_hash"
+        status_message = None
+        my_class = None
+
+        # dictionary?
+        if ( isinstance( record_IN, dict ) == True ):
+
+            my_class = self.get_compiled_entity().get_load_class()
+            try:
+
+                value_OUT = my_class.create_etl_record_hash( record_IN )
+
+            except ( TypeError, ValueError ) as e:
+
+                # not JSON-compatible - can't hash.
+                value_OUT = None
+                status_message = "In {method}(): could not hash record, so it will not be checked for changes: {exception}".format(
+                    method = me,
+                    exception = e
+                )
+                self.output_debug( status_message, method_IN = me, do_print_IN = self.debug_flag )
+
+            #-- END try...except --#
+
+        #-- END check to see if dictionary --#
+
+        return value_OUT
+
+    #-- END method build_record_hash() --#
+
+
     def find_load_instance( self, record_IN, check_required_IN = True ):
 
         '''
         Finds instance of model into which we are "load"-ing
             (Extract-Transform-Load).
+
+        If batched lookup is turned on ( is_batch_lookup_on() ) and the
+            record's ID values were resolved by load_lookup_identity_map(),
+            serves the instance from the in-memory identity map. Otherwise,
+            queries the database for the record's instance.
         '''
 
         # return reference
@@ -149,6 +451,12 @@ class ETLDjangoModelLoader( ETLObjectLoader ):
         attr_to_value_map = None
         lookup_match_count = None
 
+        # declare variables - batched lookup
+        is_resolved = None
+        lookup_key = None
+        identity_map = None
+        match_list = None
+
         #----------------------------------------------------------------------#
         # work
 
@@ -156,7 +464,7 @@ class ETLDjangoModelLoader( ETLObjectLoader ):
         my_debug_flag = self.debug_flag
 
         # get spec information
-        my_etl_spec = self.get_etl_entity()
+        my_etl_spec = self.get_compiled_entity()
         id_column_key_list = my_etl_spec.get_id_attr_key_list()
         my_class = my_etl_spec.get_load_class()
 
@@ -177,63 +485,114 @@ class ETLDjangoModelLoader( ETLObjectLoader ):
 
         if ( has_required == True ):
 
-            # ==> try to lookup existing instance.
-            lookup_qs = my_class.objects.all()
+            # ==> batched lookup - check identity map first.
+            is_resolved = False
             current_entry_instance = None
-            attr_to_value_map = {}
+            if ( self.is_batch_lookup_on() == True ):
 
-            # loop over id keys
-            for current_id_key in id_column_key_list:
+                # build key, see if it was resolved for the current window.
+                lookup_key = self.build_lookup_key( record_IN )
+                identity_map = self.get_lookup_identity_map()
+                if ( ( lookup_key is not None ) and ( lookup_key in identity_map ) ):
 
-                # retrieve value for key.
-                current_id_value = self.get_value_for_key( record_IN, current_id_key )
+                    # resolved - how many matches?
+                    is_resolved = True
+                    match_list = identity_map.get( lookup_key )
+                    if ( len( match_list ) == 1 ):
 
-                # retrieve attribute name for key.
-                current_id_attr_name = my_etl_spec.pull_load_attr_name_for_key( current_id_key )
+                        # one match - use it.
+                        self.existing_count += 1
+                        current_entry_instance = match_list[ 0 ]
 
-                if ( my_debug_flag == True ):
-                    status_message = "Looking for field {id_key} ( attr: {id_attr_name} ) with value \"{id_value}\"".format(
-                        id_key = current_id_key,
-                        id_attr_name = current_id_attr_name,
-                        id_value = current_id_value
-                    )
-                    self.output_debug( status_message, method_IN = me, indent_with_IN = "====> ", do_print_IN = my_debug_flag )
-                #-- END DEBUG --#
+                    else:
 
-                # add to filter
-                # https://stackoverflow.com/questions/9122169/calling-filter-with-a-variable-for-field-name
-                lookup_qs = lookup_qs.filter( **{ current_id_attr_name: current_id_value } )
+                        # no match (or more than one) - create new instance.
+                        self.new_count += 1
+                        current_entry_instance = my_class()
 
-                # add to map
-                attr_to_value_map[ current_id_attr_name ] = current_id_value
+                        # if no match, add new instance to map so later records
+                        #     with the same ID values in this window load into it.
+                        if ( len( match_list ) == 0 ):
 
-            #-- END loop over id column keys. --#
+                            match_list.append( current_entry_instance )
 
-            # 1 match in QuerySet?
-            lookup_match_count = lookup_qs.count()
-            if ( lookup_match_count == 1 ):
+                        #-- END check to see if no match --#
 
-                if ( my_debug_flag == True ):
-                    status_message = "FOUND match for current input row, get()-ing instance ( count: {}; values: {}; query: {} )".format( lookup_match_count, attr_to_value_map, lookup_qs.query )
-                    self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
-                #-- END DEBUG --#
+                    #-- END check to see how many matches --#
+
+                    if ( my_debug_flag == True ):
+                        status_message = "Batched lookup for key {lookup_key}: {match_count} match(es) in identity map.".format(
+                            lookup_key = lookup_key,
+                            match_count = len( match_list )
+                        )
+                        self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
+                    #-- END DEBUG --#
 
-                # - if yes, get()
-                self.existing_count += 1
-                current_entry_instance = lookup_qs.get()
+                #-- END check to see if key resolved in identity map --#
 
-            else:
+            #-- END check to see if batched lookup --#
 
-                if ( my_debug_flag == True ):
-                    status_message = "NO match for current input row, creating new instance ( count: {}; values: {} )".format( lookup_match_count, attr_to_value_map )
-                    self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
-                #-- END DEBUG --#
+            # ==> not resolved - try to lookup existing instance.
+            if ( is_resolved == False ):
+
+                lookup_qs = my_class.objects.all()
+                current_entry_instance = None
+                attr_to_value_map = {}
+
+                # loop over id keys
+                for current_id_key in id_column_key_list:
+
+                    # retrieve value for key.
+                    current_id_value = self.get_value_for_key( record_IN, current_id_key )
+
+                    # retrieve attribute name for key.
+                    current_id_attr_name = my_etl_spec.pull_load_attr_name_for_key( current_id_key )
+
+                    if ( my_debug_flag == True ):
+                        status_message = "Looking for field {id_key} ( attr: {id_attr_name} ) with value \"{id_value}\"".format(
+                            id_key = current_id_key,
+                            id_attr_name = current_id_attr_name,
+                            id_value = current_id_value
+                        )
+                        self.output_debug( status_message, method_IN = me, indent_with_IN = "====> ", do_print_IN = my_debug_flag )
+                    #-- END DEBUG --#
+
+                    # add to filter
+                    # https://stackoverflow.com/questions/9122169/calling-filter-with-a-variable-for-field-name
+                    lookup_qs = lookup_qs.filter( **{ current_id_attr_name: current_id_value } )
+
+                    # add to map
+                    attr_to_value_map[ current_id_attr_name ] = current_id_value
+
+                #-- END loop over id column keys. --#
+
+                # 1 match in QuerySet?
+                lookup_match_count = lookup_qs.count()
+                if ( lookup_match_count == 1 ):
+
+                    if ( my_debug_flag == True ):
+                        status_message = "FOUND match for current input row, get()-ing instance ( count: {}; values: {}; query: {} )".format( lookup_match_count, attr_to_value_map, lookup_qs.query )
+                        self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
+                    #-- END DEBUG --#
+
+                    # - if yes, get()
+                    self.existing_count += 1
+                    current_entry_instance = lookup_qs.get()
+
+                else:
+
+                    if ( my_debug_flag == True ):
+                        status_message = "NO match for current input row, creating new instance ( count: {}; values: {} )".format( lookup_match_count, attr_to_value_map )
+                        self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
+                    #-- END DEBUG --#
 
-                # - if no, create new instance.
-                self.new_count += 1
-                current_entry_instance = my_class()
+                    # - if no, create new instance.
+                    self.new_count += 1
+                    current_entry_instance = my_class()
 
-            #-- END check to see if lookup count == 1 --#
+                #-- END check to see if lookup count == 1 --#
+
+            #-- END check to see if resolved by batched lookup --#
 
             instance_OUT = current_entry_instance
 
@@ -252,253 +611,1406 @@ class ETLDjangoModelLoader( ETLObjectLoader ):
     #-- END method find_load_instance() --#
 
 
-    def process_records(
-        self,
-        start_index_IN = None,
-        record_count_IN = None,
-        do_output_progress_IN = True
-    ):
+    def flush_bulk_write( self ):
 
         '''
-        Processes all records in iterator stored in this instance. returns
-            StatusContainer instance with details on how it all went.
-
-        Postconditions: StatusContainer returned should contain:
-        - the count of the records processed during processing in a
-            StatusContainer detail property named
-            STATUS_PROP_PROCESSED_RECORD_COUNT ( "processed_record_count" ).
-        - the count of the records with errors during processing in a
-            StatusContainer detail property named
-            STATUS_PROP_UPDATE_ERROR_COUNT ( "update_error_count" ).
-        - the count of the records successfully processed during processing in a
-            StatusContainer detail property named
-            STATUS_PROP_UPDATE_SUCCESS_COUNT ( "update_success_count" ).
-        - the count of the records updated during processing in a
-            StatusContainer detail property named
-            STATUS_PROP_UPDATED_RECORD_COUNT ( "updated_record_count" ).
-
-        TODO:
-        - // populate StatusContainer, rather than/in addition to status list.
-        - // test and make sure this all works.
-        - // move process_records up a level to ETLDjangoModelLoader.
-        - // try to make "update_instance_from_record()" for Excel, see if
-            "process_records()" there works the same as "process_rows()".
+        Writes all instances in the bulk write buffers to the database -
+            bulk_create() for new instances, bulk_update() for existing ones
+            (restricted to the attributes that changed), in batches of
+            self.bulk_write_batch_size, inside a single transaction. Then runs
+            post-save processing for the records whose instances were written.
+            Clears the buffers when done.
+
+        If the bulk write fails (DataError or IntegrityError - one bad row
+            rolls back the whole transaction), falls back to saving each
+            instance on its own ( save_bulk_write_instances() ), so only the
+            bad rows fail. Records whose instance could not be saved are
+            counted (self.bulk_save_error_count - process_records() moves them
+            from its success count to its error count, like post-save errors)
+            and written to the dead letter file, as if
+            update_instance_from_record() had failed.
+
+        Note: post-save processing needs the primary keys of the new
+            instances. bulk_create() sets them on PostgreSQL, SQLite and
+            MariaDB, but not on MySQL.
+
+        Returns StatusContainer with counts of instances created and updated,
+            of records whose instance could not be saved, and of records whose
+            post-save processing failed.
         '''
 
-
         # return reference
         status_OUT = None
 
         # declare variables
-        me = "process_records"
+        me = "flush_bulk_write"
         status_message = None
         my_debug_flag = None
-        my_etl_spec = None
-        index_to_key_map = None
-        key_to_index_map = None
-        my_worksheet = None
         my_class = None
-
-        # declare variables - loop over rows
-        record_count = None
-        my_iterator = None
-        start_index = None
-        stop_index = None
-        error_counter = None
-        record_counter = None
-        success_counter = None
-        update_counter = None
-        print_every_x_records = None
+        batch_size = None
+        create_list = None
+        update_list = None
+        update_field_list = None
+        current_field = None
+        failed_instance_id_to_message_map = None
+        created_count = None
+        updated_count = None
+        save_error_count = None
+
+        # declare variables - post-save
+        post_save_list = None
+        current_instance = None
         current_record = None
-        current_entry_instance = None
-
-        # declare variables - timing
-        my_start_dt = None
-        previous_dt = None
-        current_dt = None
-        current_elapsed = None
-        total_elapsed = None
-        total_average = None
-
-        # declare variables - check required
-        has_required = None
-
-        # declare variables - update and save
-        update_status = None
-        was_update_success = None
-        was_instance_updated = None
-        unknown_attr_name_to_value_map = None
-
-        #----------------------------------------------------------------------#
-        # work
+        current_related_map = None
+        post_save_status = None
+        post_save_error_count = None
 
-        if ( do_output_progress_IN == True ):
-            # hello world.
-            status_message = "\n\nTop of {me}! ( @ {right_now} )\n\n".format( me = me, right_now = datetime.datetime.now() )
-            self.output_log_message(
-                status_message,
-                method_IN = me,
-                indent_with_IN = "\n\n====> ",
-                log_level_code_IN = logging.INFO,
-                do_print_IN = True
-            )
-        #-- END check if do_output_progress_IN --#
+        # declare variables - instrumentation
+        phase_start_time = None
 
         # init
         my_debug_flag = self.debug_flag
-        #my_debug_flag = True
-        self.reset_status_information()
-        self.start_dt = datetime.datetime.now()
-        previous_dt = self.start_dt
-        error_counter = 0
-        record_counter = 0
-        success_counter = 0
-        update_counter = 0
-
-        # get spec information
         status_OUT = StatusContainer()
         status_OUT.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
-        my_etl_spec = self.get_etl_entity()
-        index_to_key_map = my_etl_spec.get_attr_index_to_key_map()
-        key_to_index_map = my_etl_spec.get_attr_key_to_index_map()
-        required_attr_key_list = my_etl_spec.get_required_attr_key_set()
-        id_column_key_list = my_etl_spec.get_id_attr_key_list()
-        my_class = my_etl_spec.get_load_class()
+        my_class = self.get_compiled_entity().get_load_class()
+        batch_size = self.get_bulk_write_batch_size()
+        create_list = self.bulk_create_list
+        update_list = self.bulk_update_list
+        post_save_list = self.bulk_post_save_list
+        post_save_error_count = 0
+        save_error_count = 0
+        failed_instance_id_to_message_map = {}
 
-        # get iterator
-        my_iterator = self.get_record_iterator( start_index_IN = start_index_IN, record_count_IN = record_count_IN )
+        # which fields do we update?
+        if ( self.bulk_update_all_fields == True ):
 
-        # get record count
-        record_count = self.get_record_count()
+            # all concrete, non-primary key fields.
+            update_field_list = []
+            for current_field in my_class._meta.concrete_fields:
 
-        # loop over data dictionaries
-        error_counter = 0
-        record_counter = 0
-        success_counter = 0
-        update_counter = 0
-        print_every_x_records = self.update_status_every
-        for current_record in my_iterator:
+                if ( current_field.primary_key == False ):
 
-            # increment counter
-            record_counter += 1
-            #print( "record_counter: {counter}".format( counter = record_counter ) )
+                    update_field_list.append( current_field.name )
 
-            # ==> reset per-row variables
-            self.reset_record_information()
-            unknown_attr_name_to_value_map = self.get_unknown_attrs_name_to_value_map()
+                #-- END check to see if primary key --#
 
-            # ==> check required.
-            has_required = self.has_required( current_record )
-            if ( has_required == True ):
+            #-- END loop over fields --#
 
-                # ==> try to lookup existing instance.
-                current_entry_instance = self.find_load_instance( current_record, check_required_IN = False )
+        else:
 
-                # got an instance?
-                if ( current_entry_instance is not None ):
+            # just the ones that changed.
+            update_field_list = sorted( self.bulk_update_field_set )
 
-                    # update instance from record
-                    update_status = self.update_instance_from_record( current_entry_instance, current_record )
+        #-- END check to see which fields to update --#
 
-                    # evaluate status
-                    was_update_success = update_status.is_success()
-                    was_instance_updated = update_status.get_detail_value( self.PROP_WAS_INSTANCE_UPDATED )
+        # clear out buffers before doing anything that might raise.
+        self.reset_bulk_write_buffers()
+        phase_start_time = self.start_phase_timer()
 
-                    # success?
-                    if ( was_update_success == True ):
+        try:
 
-                        # success
-                        success_counter += 1
+            # write everything in one transaction.
+            with transaction.atomic():
 
-                    else:
+                # new instances
+                if ( len( create_list ) > 0 ):
 
-                        # error
-                        error_counter += 1
+                    my_class.objects.bulk_create( create_list, batch_size = batch_size )
 
-                    #-- END check if success. --#
+                #-- END check to see if anything to create --#
 
-                    # was record updated?
-                    if ( was_instance_updated == True ):
+                # changed instances
+                if ( ( len( update_list ) > 0 ) and ( len( update_field_list ) > 0 ) ):
 
-                        # increment update counter
-                        update_counter += 1
+                    my_class.objects.bulk_update( update_list, update_field_list, batch_size = batch_size )
 
-                    #-- END check if instance was updated --#
+                #-- END check to see if anything to update --#
 
-                    if ( my_debug_flag == True ):
+            #-- END transaction --#
 
-                        # output details of entry update.
-                        status_message = "- in {method}(): update_status = {status_instance} ( success?: {success_flag}; record updated?: {was_updated}; changed list:{changed_list}".format(
-                            method = me,
-                            status_instance = update_status,
-                            success_flag = was_update_success,
-                            was_updated = was_instance_updated,
-                            changed_list = update_status.get_detail_value( self.PROP_UPDATED_ATTR_LIST )
-                        )
-                        self.output_debug( status_message, method_IN = me, indent_with_IN = "\n\n====> ", do_print_IN = my_debug_flag )
+        except ( DataError, IntegrityError ) as de:
 
-                        # and, output unknown attributes.
-                        status_message = "- in {method}(): unknown_attr_name_to_value_map = {unknown_attrs}".format(
-                            method = me,
-                            unknown_attrs = unknown_attr_name_to_value_map
-                        )
-                        self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
+            # log details...
+            status_message = "{error_type} caught bulk writing {create_count} new and {update_count} changed instances of {my_class} ( {error} ). Saving one at a time.".format(
+                error_type = type( de ).__name__,
+                create_count = len( create_list ),
+                update_count = len( update_list ),
+                my_class = my_class,
+                error = de
+            )
+            self.output_log_message(
+                status_message,
+                method_IN = me,
+                log_level_code_IN = logging.ERROR,
+                do_print_IN = True
+            )
 
-                    #-- END DEBUG --#
+            # ...then save one at a time, so only bad rows fail.
+            failed_instance_id_to_message_map = self.save_bulk_write_instances( create_list, update_list, update_field_list )
 
-                else:
+        #-- END try...except around bulk write --#
+
+        self.stop_phase_timer( ETLInstrumentation.PHASE_SAVE, phase_start_time )
+
+        # update running totals
+        created_count = len( [ current_instance for current_instance in create_list if id( current_instance ) not in failed_instance_id_to_message_map ] )
+        updated_count = len( [ current_instance for current_instance in update_list if id( current_instance ) not in failed_instance_id_to_message_map ] )
+        self.bulk_created_count += created_count
+        self.bulk_updated_count += updated_count
+
+        if ( my_debug_flag == True ):
+            status_message = "bulk wrote {create_count} new and {update_count} changed instances ( fields: {field_list} ).".format(
+                create_count = created_count,
+                update_count = updated_count,
+                field_list = update_field_list
+            )
+            self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
+        #-- END DEBUG --#
+
+        # ==> post-save processing for written instances.
+        for current_instance, current_record, current_related_map in post_save_list:
+
+            # instance not saved? Record failed.
+            if ( id( current_instance ) in failed_instance_id_to_message_map ):
+
+                save_error_count += 1
+                status_message = "save failed for record after bulk write failed: {}".format( current_record )
+                self.add_status_message( status_message, category_IN = ETLDeadLetterSink.REASON_UPDATE_FAILED )
+                self.write_dead_letter(
+                    current_record,
+                    ETLDeadLetterSink.REASON_UPDATE_FAILED,
+                    message_list_IN = [ status_message, failed_instance_id_to_message_map[ id( current_instance ) ] ]
+                )
+                continue
+
+            #-- END check to see if instance failed to save --#
+
+            # standard status...
+            post_save_status = StatusContainer()
+            post_save_status.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
+            post_save_status = self.init_status( post_save_status )
+
+            # ...process...
+            post_save_status = self.process_post_save(
+                post_save_status,
+                current_instance,
+                current_record,
+                related_attr_to_spec_map_IN = current_related_map
+            )
+
+            # ...and check for errors.
+            if ( len( post_save_status.get_detail_value( self.PROP_ERROR_STATUS_LIST, [] ) ) > 0 ):
+
+                # error
+                post_save_error_count += 1
+                status_message = "post-save processing failed for record after bulk write: {}".format( current_record )
+                self.add_status_message( status_message, category_IN = ETLDeadLetterSink.REASON_POST_SAVE_FAILED )
+                self.write_dead_letter( current_record, ETLDeadLetterSink.REASON_POST_SAVE_FAILED, message_list_IN = post_save_status.get_message_list() )
+
+            #-- END check to see if errors --#
+
+        #-- END loop over pending post-save processing --#
+
+        # update running totals.
+        self.bulk_save_error_count += save_error_count
+        self.bulk_post_save_error_count += post_save_error_count
+
+        # status
+        status_OUT.set_detail_value( self.STATUS_PROP_BULK_CREATED_COUNT, created_count )
+        status_OUT.set_detail_value( self.STATUS_PROP_BULK_UPDATED_COUNT, updated_count )
+        status_OUT.set_detail_value( self.STATUS_PROP_BULK_SAVE_ERROR_COUNT, save_error_count )
+        status_OUT.set_detail_value( self.STATUS_PROP_BULK_POST_SAVE_ERROR_COUNT, post_save_error_count )
+        if ( ( post_save_error_count + save_error_count ) > 0 ):
+
+            status_OUT.set_status_code( StatusContainer.STATUS_CODE_ERROR )
+
+        #-- END check to see if post-save errors --#
+
+        return status_OUT
+
+    #-- END method flush_bulk_write() --#
+
+
+    def flush_related( self ):
+
+        '''
+        If related records are being accumulated across parent records (
+            self.do_batch_related = True ), runs ETL on all accumulated related
+            records. Called at the end of each lookup window and at the end of
+            process_records(). Does nothing here - child classes that
+            accumulate related records override it.
+
+        Returns StatusContainer.
+        '''
+
+        # return reference
+        status_OUT = None
+
+        # nothing to do by default.
+        status_OUT = StatusContainer()
+        status_OUT.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
+
+        return status_OUT
+
+    #-- END method flush_related() --#
+
+
+    def get_batch_lookup_iterator( self, record_iterator_IN ):
+
+        '''
+        Accepts an iterator over records. Returns a generator that pulls
+            records from the iterator a window of self.batch_lookup_size
+            records at a time, resolves existing instances for each window with
+            a single query ( load_lookup_identity_map() ), then yields the
+            records in the window one at a time.
+        '''
+
+        # declare variables
+        window_size = None
+        record_window = None
+        current_record = None
+        phase_start_time = None
+
+        # init
+        window_size = self.get_batch_lookup_size()
+        if ( ( window_size is None ) or ( window_size < 1 ) ):
+
+            # invalid size - use default.
+            window_size = self.DEFAULT_BATCH_LOOKUP_SIZE
+
+        #-- END check to see if valid window size --#
+
+        # loop until the iterator is exhausted.
+        record_window = list( itertools.islice( record_iterator_IN, window_size ) )
+        while ( len( record_window ) > 0 ):
+
+            # resolve existing instances for the window...
+            phase_start_time = self.start_phase_timer()
+            self.load_lookup_identity_map( record_window )
+            self.stop_phase_timer( ETLInstrumentation.PHASE_FIND_LOAD_INSTANCE, phase_start_time )
+
+            # ...then hand out the records.
+            for current_record in record_window:
+
+                yield current_record
+
+            #-- END loop over records in window --#
+
+            # bulk write? Flush buffers, so next window's lookup sees the
+            #     instances created in this one.
+            if ( self.do_bulk_write == True ):
+
+                self.flush_bulk_write()
+
+            #-- END check to see if bulk write --#
+
+            # batched related? Parents in window are saved - process children.
+            if ( self.do_batch_related == True ):
+
+                phase_start_time = self.start_phase_timer()
+                self.flush_related()
+                self.stop_phase_timer( ETLInstrumentation.PHASE_RELATED, phase_start_time )
+
+            #-- END check to see if batched related --#
+
+            # next window
+            record_window = list( itertools.islice( record_iterator_IN, window_size ) )
+
+        #-- END loop over windows --#
+
+    #-- END method get_batch_lookup_iterator() --#
+
+
+    def get_batch_required_iterator( self, record_iterator_IN ):
+
+        '''
+        Accepts an iterator over records. Returns a generator that pulls
+            records from the iterator a window of self.batch_lookup_size
+            records at a time, checks required values for the whole window at
+            once ( build_required_mask() ), then yields only the records that
+            have all required values. Records missing required values are
+            counted in self.missing_required_count, and per key in
+            self.missing_required_key_count_map, and written to the dead
+            letter file (if there is one) with their record number.
+        '''
+
+        # declare variables
+        window_size = None
+        record_window = None
+        has_required_list = None
+        missing_key_to_count_map = None
+        missing_key = None
+        missing_count = None
+        current_record = None
+        has_required = None
+        record_number = None
+        phase_start_time = None
+
+        # init
+        window_size = self.get_batch_lookup_size()
+        if ( ( window_size is None ) or ( window_size < 1 ) ):
+
+            # invalid size - use default.
+            window_size = self.DEFAULT_BATCH_LOOKUP_SIZE
+
+        #-- END check to see if valid window size --#
+
+        # loop until the iterator is exhausted.
+        record_number = 0
+        record_window = list( itertools.islice( record_iterator_IN, window_size ) )
+        while ( len( record_window ) > 0 ):
+
+            # check required for the window...
+            phase_start_time = self.start_phase_timer()
+            has_required_list, missing_key_to_count_map = self.build_required_mask( record_window )
+            self.stop_phase_timer( ETLInstrumentation.PHASE_HAS_REQUIRED, phase_start_time )
+
+            # ...count missing...
+            self.missing_required_count += has_required_list.count( False )
+            for missing_key, missing_count in missing_key_to_count_map.items():
+
+                self.missing_required_key_count_map[ missing_key ] = self.missing_required_key_count_map.get( missing_key, 0 ) + missing_count
+
+            #-- END loop over missing counts --#
+
+            # ...then hand out the records that have required values.
+            for current_record, has_required in zip( record_window, has_required_list ):
+
+                # count from 1, like process_records().
+                record_number += 1
+                if ( has_required == True ):
+
+                    # remember number - process_records() uses it.
+                    self.batch_required_record_number_map[ id( current_record ) ] = record_number
+                    yield current_record
+
+                elif ( self.dead_letter_sink is not None ):
+
+                    # missing - dead letter, with missing fields.
+                    self.reset_record_information()
+                    self.has_required( current_record )
+                    self.write_dead_letter(
+                        current_record,
+                        ETLDeadLetterSink.REASON_MISSING_REQUIRED,
+                        message_list_IN = [ "missing required fields: {}".format( self.get_missing_field_list() ) ],
+                        record_number_IN = record_number
+                    )
+
+                #-- END check to see if has required --#
+
+            #-- END loop over records in window --#
+
+            # next window
+            record_window = list( itertools.islice( record_iterator_IN, window_size ) )
+
+        #-- END loop over windows --#
+
+    #-- END method get_batch_required_iterator() --#
+
+
+    def get_batch_lookup_size( self ):
+
+        # return reference
+        value_OUT = None
+
+        # get value
+        value_OUT = self.batch_lookup_size
+
+        return value_OUT
+
+    #-- END method get_batch_lookup_size() --#
+
+
+    def get_bulk_write_batch_size( self ):
+
+        # return reference
+        value_OUT = None
+
+        # get value
+        value_OUT = self.bulk_write_batch_size
+
+        return value_OUT
+
+    #-- END method get_bulk_write_batch_size() --#
+
+
+    def get_lookup_field( self, attr_name_IN ):
+
+        '''
+        Accepts attribute name. Returns the Django model field on the load
+            class with that name (or attname - "<fk>_id"), or None if no such
+            field.
+        '''
+
+        # return reference
+        field_OUT = None
+
+        # declare variables
+        my_class = None
+
+        # get load class
+        my_class = self.get_compiled_entity().get_load_class()
+
+        try:
+
+            # look up field.
+            field_OUT = my_class._meta.get_field( attr_name_IN )
+
+        except FieldDoesNotExist as fdne:
+
+            # not a field.
+            field_OUT = None
+
+        #-- END try...except around field lookup --#
+
+        return field_OUT
+
+    #-- END method get_lookup_field() --#
+
+
+    def get_lookup_identity_map( self ):
+
+        # return reference
+        value_OUT = None
+
+        # get value
+        value_OUT = self.lookup_identity_map
+
+        return value_OUT
+
+    #-- END method get_lookup_identity_map() --#
+
+
+    def get_related_batch_size( self ):
+
+        # return reference
+        value_OUT = None
+
+        # get value
+        value_OUT = self.related_batch_size
+
+        return value_OUT
+
+    #-- END method get_related_batch_size() --#
+
+
+    def has_pending_writes( self ):
+
+        '''
+        Returns True if there are instances or post-save processing waiting in
+            the bulk write buffers (so records processed so far aren't all
+            committed yet), False if not.
+        '''
+
+        # return reference
+        value_OUT = False
+
+        # anything in buffers?
+        if ( ( len( self.bulk_create_list ) > 0 )
+            or ( len( self.bulk_update_list ) > 0 )
+            or ( len( self.bulk_post_save_list ) > 0 ) ):
+
+            value_OUT = True
+
+        #-- END check to see if anything in buffers --#
+
+        return value_OUT
+
+    #-- END method has_pending_writes() --#
+
+
+    def is_batch_lookup_on( self ):
+
+        '''
+        Returns True if existing instances are looked up a window at a time,
+            through the identity map - if batched lookup is turned on (
+            self.do_batch_lookup = True ), or bulk write is (it relies on the
+            identity map, so records seen again before a flush load into the
+            instance already in the buffers). False if not.
+        '''
+
+        # return reference
+        value_OUT = False
+
+        # either turned on?
+        if ( ( self.do_batch_lookup == True )
+            or ( self.do_bulk_write == True ) ):
+
+            value_OUT = True
+
+        #-- END check to see if batched lookup --#
+
+        return value_OUT
+
+    #-- END method is_batch_lookup_on() --#
+
+
+    def is_record_unchanged( self, instance_IN, record_IN ):
+
+        '''
+        Change detection: if load class has a record hash field (
+            self.record_hash_field_name ), hashes record ( build_record_hash()
+            ), stores hash in self.record_hash (so update_instance_from_record()
+            can store it in the instance), and returns True if the instance
+            passed in was already saved with that hash. If no hash field, no
+            instance, or hashes don't match, returns False.
+        '''
+
+        # return reference
+        value_OUT = False
+
+        # change detection on?
+        if ( ( self.record_hash_field_name is not None ) and ( instance_IN is not None ) ):
+
+            # hash record...
+            self.record_hash = self.build_record_hash( record_IN )
+
+            # ...and compare to hash stored in saved instance.
+            if ( ( self.record_hash is not None )
+                and ( instance_IN.pk is not None )
+                and ( getattr( instance_IN, self.record_hash_field_name, None ) == self.record_hash ) ):
+
+                value_OUT = True
+
+            #-- END check to see if unchanged --#
+
+        #-- END check to see if change detection --#
+
+        return value_OUT
+
+    #-- END method is_record_unchanged() --#
+
+
+    def load_lookup_identity_map( self, record_list_IN ):
+
+        '''
+        Accepts a list of records (a lookup window). Collects the ID attribute
+            values for each record that has all of them, then retrieves all
+            existing instances of the load class that match any of them with a
+            single query. Replaces the contents of the identity map with a map
+            of each lookup key (tuple of ID values) to a list of the instances
+            that match it (an empty list for keys with no match).
+
+        Returns the number of instances found.
+        '''
+
+        # return reference
+        count_OUT = None
+
+        # declare variables
+        me = "load_lookup_identity_map"
+        status_message = None
+        my_debug_flag = None
+        my_etl_spec = None
+        my_class = None
+        id_column_key_list = None
+        id_attr_name_list = None
+        current_id_key = None
+        identity_map = None
+
+        # declare variables - lookup
+        lookup_key_set = None
+        current_record = None
+        lookup_key = None
+        lookup_q = None
+        current_q = None
+        lookup_qs = None
+        current_instance = None
+        current_attr_name = None
+        current_field = None
+        instance_value_list = None
+        instance_key = None
+
+        # init
+        my_debug_flag = self.debug_flag
+        count_OUT = 0
+        my_etl_spec = self.get_compiled_entity()
+        my_class = my_etl_spec.get_load_class()
+        id_column_key_list = my_etl_spec.get_id_attr_key_list()
+
+        # start a fresh map for each window, so memory stays bounded.
+        identity_map = {}
+        self.set_lookup_identity_map( identity_map )
+
+        # get attribute names for id keys.
+        id_attr_name_list = []
+        for current_id_key in id_column_key_list:
+
+            id_attr_name_list.append( my_etl_spec.pull_load_attr_name_for_key( current_id_key ) )
+
+        #-- END loop over id column keys --#
+
+        # collect keys for records in window.
+        lookup_key_set = set()
+        for current_record in record_list_IN:
+
+            lookup_key = self.build_lookup_key( current_record )
+            if ( lookup_key is not None ):
+
+                lookup_key_set.add( lookup_key )
+
+            #-- END check to see if key --#
+
+        #-- END loop over records in window --#
+
+        # got any keys?
+        if ( len( lookup_key_set ) > 0 ):
+
+            # one ID attribute, or several?
+            if ( len( id_attr_name_list ) == 1 ):
+
+                # one - simple IN query.
+                lookup_qs = my_class.objects.filter(
+                    **{ "{}__in".format( id_attr_name_list[ 0 ] ): [ lookup_key[ 0 ] for lookup_key in lookup_key_set ] }
+                )
+
+            else:
+
+                # several - OR together an exact match on each key.
+                lookup_q = None
+                for lookup_key in lookup_key_set:
+
+                    current_q = Q( **dict( zip( id_attr_name_list, lookup_key ) ) )
+                    if ( lookup_q is None ):
+                        lookup_q = current_q
+                    else:
+                        lookup_q = lookup_q | current_q
+                    #-- END check to see if first Q --#
+
+                #-- END loop over keys --#
+
+                lookup_qs = my_class.objects.filter( lookup_q )
+
+            #-- END check to see how many ID attributes --#
+
+            # every key we asked about gets an entry, even if no match.
+            for lookup_key in lookup_key_set:
+
+                identity_map[ lookup_key ] = []
+
+            #-- END loop over keys --#
+
+            # add each instance to the list for its key.
+            for current_instance in lookup_qs:
+
+                # build key from instance.
+                instance_value_list = []
+                for current_attr_name in id_attr_name_list:
+
+                    # use attname, so FKs give us the ID, not the related instance.
+                    current_field = self.get_lookup_field( current_attr_name )
+                    if ( current_field is not None ):
+                        current_attr_name = current_field.attname
+                    #-- END check to see if field --#
+
+                    instance_value_list.append(
+                        self.normalize_lookup_value( current_attr_name, getattr( current_instance, current_attr_name ) )
+                    )
+
+                #-- END loop over ID attribute names --#
+                instance_key = tuple( instance_value_list )
+
+                # store it.
+                identity_map.setdefault( instance_key, [] ).append( current_instance )
+                count_OUT += 1
+
+            #-- END loop over matching instances --#
+
+        #-- END check to see if keys --#
+
+        if ( my_debug_flag == True ):
+            status_message = "Resolved {key_count} lookup keys with one query: {instance_count} existing instance(s) found.".format(
+                key_count = len( lookup_key_set ),
+                instance_count = count_OUT
+            )
+            self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
+        #-- END DEBUG --#
+
+        return count_OUT
+
+    #-- END method load_lookup_identity_map() --#
+
+
+    def normalize_lookup_value( self, attr_name_IN, value_IN ):
+
+        '''
+        Accepts attribute name and value. Converts value to the python type of
+            the model field for the attribute, so values from records and values
+            from instances compare equal. If no field, or conversion fails,
+            returns value unchanged.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        my_field = None
+
+        # init
+        value_OUT = value_IN
+
+        # got a field?
+        my_field = self.get_lookup_field( attr_name_IN )
+        if ( ( my_field is not None ) and ( value_IN is not None ) ):
+
+            try:
+
+                # convert
+                value_OUT = my_field.to_python( value_IN )
+
+            except ValidationError as ve:
+
+                # leave as-is.
+                value_OUT = value_IN
+
+            #-- END try...except around conversion --#
+
+        #-- END check to see if field --#
+
+        return value_OUT
+
+    #-- END method normalize_lookup_value() --#
+
+
+    def process_post_save(
+        self,
+        status_IN,
+        instance_IN,
+        record_IN,
+        related_attr_to_spec_map_IN = None,
+        save_on_success_IN = True
+    ):
+
+        '''
+        Accepts StatusContainer for the record being processed, the saved
+            instance, the record, and the map of related keys to attribute
+            specs for the record. Runs the post-save hook on the instance
+            ( update_from_record_post_save() ) and adds its result to the
+            status. Child classes can extend this to process related records.
+
+        Returns the status passed in, updated.
+        '''
+
+        # return reference
+        status_OUT = None
+
+        # declare variables
+        post_save_custom_update_status = None
+
+        # init
+        status_OUT = status_IN
+
+        # call instance_IN.update_from_record_post_save(), which can be
+        #     overridden in a particular class to do fancier processing for
+        #     related records.
+        post_save_custom_update_status = instance_IN.update_from_record_post_save( record_IN )
+
+        # process status
+        status_OUT = self.process_result_status(
+            status_OUT,
+            post_save_custom_update_status,
+            self.PROP_WAS_INSTANCE_UPDATED,
+            details_IN = None
+        )
+
+        return status_OUT
+
+    #-- END method process_post_save() --#
+
+
+    def process_records(
+        self,
+        start_index_IN = None,
+        record_count_IN = None,
+        do_output_progress_IN = True
+    ):
+
+        '''
+        Processes all records in iterator stored in this instance. returns
+            StatusContainer instance with details on how it all went.
+
+        Postconditions: StatusContainer returned should contain:
+        - the count of the records processed during processing in a
+            StatusContainer detail property named
+            STATUS_PROP_PROCESSED_RECORD_COUNT ( "processed_record_count" ).
+        - the count of the records with errors during processing in a
+            StatusContainer detail property named
+            STATUS_PROP_UPDATE_ERROR_COUNT ( "update_error_count" ).
+        - the count of the records successfully processed during processing in a
+            StatusContainer detail property named
+            STATUS_PROP_UPDATE_SUCCESS_COUNT ( "update_success_count" ).
+        - the count of the records updated during processing in a
+            StatusContainer detail property named
+            STATUS_PROP_UPDATED_RECORD_COUNT ( "updated_record_count" ).
+        - if bulk write is on ( self.do_bulk_write = True ), the counts of
+            instances created and updated by bulk writes and of records whose
+            post-save processing failed after a bulk write, in detail
+            properties STATUS_PROP_BULK_CREATED_COUNT,
+            STATUS_PROP_BULK_UPDATED_COUNT, and
+            STATUS_PROP_BULK_POST_SAVE_ERROR_COUNT.
+        - if batched related is on ( self.do_batch_related = True ), the counts
+            of related records processed and of related records with errors in
+            detail properties STATUS_PROP_RELATED_RECORD_COUNT and
+            STATUS_PROP_RELATED_ERROR_COUNT.
+        - counts of attributes updated, not changed, and not in the model,
+            in detail properties STATUS_PROP_ATTR_UPDATED_COUNT,
+            STATUS_PROP_ATTR_NOT_CHANGED_COUNT, and
+            STATUS_PROP_ATTR_UNKNOWN_COUNT.
+        - if batched required check is on ( self.do_batch_required = True ),
+            records missing required values are skipped before lookup (
+            get_batch_required_iterator() ), and rather than a status message
+            per record, the count of records skipped and a dictionary of
+            required key to count of records missing it are in detail
+            properties STATUS_PROP_MISSING_REQUIRED_COUNT and
+            STATUS_PROP_MISSING_REQUIRED_KEY_COUNT_MAP. Skipped records are
+            included in the processed record count.
+        - if load class has etl_record_hash_field_name set, records whose
+            hash matches the hash stored in their instance are skipped (no
+            update, save or related processing), and the count of skipped
+            records is in detail property STATUS_PROP_UNCHANGED_SKIPPED_COUNT.
+            Skipped records are not counted as successes or updates.
+        - if self.checkpoint_file_path is set, progress (index of first record
+            not yet committed, and counts) is saved to that file at least
+            self.checkpoint_every records apart, whenever nothing is waiting to
+            be written, and again when the run is complete ( ETLCheckpoint ).
+            If self.do_resume is True and the file has an incomplete run, the
+            run starts from the checkpoint instead of start_index_IN, counts
+            include those from before the checkpoint, and the index resumed
+            from is in detail property STATUS_PROP_RESUMED_FROM_INDEX. If
+            batched required check is on, records missing required values
+            aren't counted in the checkpoint index until the end of the run,
+            so a resumed run might process some records again.
+        - if self.dead_letter_file_path is set, records that fail (missing
+            required values, update failed, post-save processing after bulk
+            write failed) are appended to that file as they fail, as JSON
+            lines with the reason and error messages ( ETLDeadLetterSink ).
+            Counts are in detail properties STATUS_PROP_DEAD_LETTER_COUNT and
+            STATUS_PROP_DEAD_LETTER_REASON_COUNT_MAP.
+        - if self.max_status_message_count is set, only the first and most
+            recent halves of that many status messages are kept (
+            BoundedMessageList ). The count of the rest is in detail property
+            STATUS_PROP_DROPPED_STATUS_MESSAGE_COUNT, and the count of all of
+            them by category in STATUS_PROP_STATUS_MESSAGE_CATEGORY_COUNT_MAP.
+        - if instrumentation is on ( self.do_instrumentation = True ), the
+            timing summary from ETLInstrumentation.build_summary() ( time per
+            phase, records per second, record latency percentiles, and query
+            count ) in detail property STATUS_PROP_INSTRUMENTATION. If
+            self.instrumentation_file_path is set, the summary is also appended
+            to that file as a line of JSON.
+
+        TODO:
+        - // populate StatusContainer, rather than/in addition to status list.
+        - // test and make sure this all works.
+        - // move process_records up a level to ETLDjangoModelLoader.
+        - // try to make "update_instance_from_record()" for Excel, see if
+            "process_records()" there works the same as "process_rows()".
+        '''
+
+
+        # return reference
+        status_OUT = None
 
-                    status_message = "In {}(): row {} - failed to find instance of class {} to load into. This shouldn't happen.".format( me, current_row_index, my_class )
-                    self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
-                    self.add_status_message( status_message )
+        # declare variables
+        me = "process_records"
+        status_message = None
+        my_debug_flag = None
+        my_etl_spec = None
+        index_to_key_map = None
+        key_to_index_map = None
+        my_worksheet = None
+        my_class = None
 
-                #-- END check to see if instance to load into --#
+        # declare variables - loop over rows
+        record_count = None
+        my_iterator = None
+        start_index = None
+        stop_index = None
+        error_counter = None
+        record_counter = None
+        record_number = None
+        success_counter = None
+        update_counter = None
+        print_every_x_records = None
+        current_record = None
+        current_entry_instance = None
+        unchanged_counter = None
 
-            else:
+        # declare variables - timing
+        my_start_dt = None
+        previous_dt = None
+        current_dt = None
+        current_elapsed = None
+        total_elapsed = None
+        total_average = None
+
+        # declare variables - instrumentation
+        my_instrumentation = None
+        cleanup_stack = None
+        record_start_time = None
+        phase_start_time = None
+
+        # declare variables - checkpoints
+        my_checkpoint = None
+        checkpoint_start_index = None
+        checkpoint_record_counter = None
+        resumed_counter_map = None
+
+        # declare variables - check required
+        has_required = None
+
+        # declare variables - update and save
+        update_status = None
+        was_update_success = None
+        was_instance_updated = None
+        unknown_attr_name_to_value_map = None
+
+        #----------------------------------------------------------------------#
+        # work
+
+        if ( do_output_progress_IN == True ):
+            # hello world.
+            status_message = "\n\nTop of {me}! ( @ {right_now} )\n\n".format( me = me, right_now = datetime.datetime.now() )
+            self.output_log_message(
+                status_message,
+                method_IN = me,
+                indent_with_IN = "\n\n====> ",
+                log_level_code_IN = logging.INFO,
+                do_print_IN = True
+            )
+        #-- END check if do_output_progress_IN --#
+
+        # init
+        my_debug_flag = self.debug_flag
+        #my_debug_flag = True
+        self.reset_status_information()
+        self.start_dt = datetime.datetime.now()
+        previous_dt = self.start_dt
+        error_counter = 0
+        record_counter = 0
+        success_counter = 0
+        update_counter = 0
+
+        # get spec information
+        status_OUT = StatusContainer()
+        status_OUT.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
+
+        # compile spec once for this run, in case it changed since last run.
+        self.reset_compiled_entity()
+        my_etl_spec = self.get_compiled_entity()
+        index_to_key_map = my_etl_spec.get_attr_index_to_key_map()
+        key_to_index_map = my_etl_spec.get_attr_key_to_index_map()
+        required_attr_key_list = my_etl_spec.get_required_attr_key_tuple()
+        id_column_key_list = my_etl_spec.get_id_attr_key_list()
+        my_class = my_etl_spec.get_load_class()
+
+        # change detection? Get name of hash field from load class.
+        self.record_hash_field_name = getattr( my_class, "etl_record_hash_field_name", None )
 
-                # missing required fields, move on.
-                status_message = "record {record_number} is missing required fields, moving on.".format(
-                    record_number = record_counter
+        # checkpoints?
+        resumed_counter_map = {}
+        if ( self.checkpoint_file_path is not None ):
+
+            # resume an incomplete run?
+            my_checkpoint = ETLCheckpoint( file_path_IN = self.checkpoint_file_path, label_IN = my_class.__name__ )
+            if ( ( self.do_resume == True )
+                and ( my_checkpoint.load() == True )
+                and ( my_checkpoint.is_complete == False ) ):
+
+                # yes - pick up where it left off.
+                start_index_IN = my_checkpoint.next_index
+                record_count_IN = my_checkpoint.get_remaining_count()
+                resumed_counter_map = my_checkpoint.base_counter_map
+                status_OUT.set_detail_value( self.STATUS_PROP_RESUMED_FROM_INDEX, start_index_IN )
+
+                status_message = "Resuming from checkpoint in {file_path} at record index {start_index}.".format(
+                    file_path = self.checkpoint_file_path,
+                    start_index = start_index_IN
                 )
-                self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
-                #self.output_debug( status_message, method_IN = me, do_print_IN = True )
+                self.output_log_message( status_message, method_IN = me, log_level_code_IN = logging.INFO, do_print_IN = do_output_progress_IN )
                 self.add_status_message( status_message )
 
-            #-- END check if required columns are present. --#
+            else:
 
-            # output a progress message?
-            if ( ( ( record_counter % print_every_x_records ) == 0 )
-                and ( do_output_progress_IN == True ) ):
+                # no - new run.
+                my_checkpoint.start( start_index_IN = start_index_IN, record_count_IN = record_count_IN )
 
-                # basic timing analysis.
-                my_start_dt = self.start_dt
-                current_dt = datetime.datetime.now()
-                current_elapsed = current_dt - previous_dt
-                total_elapsed = current_dt - my_start_dt
-                total_average = total_elapsed / record_counter
-                previous_dt = current_dt
-
-                status_message = "processed {counter} of {count} records ( existing: {existing_count}; new: {new_count} ) @ {right_now} ( timing: last {current_count} elapsed = {current_elapsed}; total elapsed = {total_elapsed}; average = {total_average} ).".format(
-                    counter = record_counter,
-                    count = record_count,
-                    existing_count = self.existing_count,
-                    new_count = self.new_count,
-                    right_now = current_dt,
-                    current_count = print_every_x_records,
-                    current_elapsed = current_elapsed,
-                    total_elapsed = total_elapsed,
-                    total_average = total_average
+            #-- END check to see if resuming --#
+
+            checkpoint_start_index = my_checkpoint.next_index
+            checkpoint_record_counter = 0
+
+        #-- END check to see if checkpoints --#
+
+        # stop counting queries and close dead letter file when done, even
+        #     if processing raises.
+        cleanup_stack = contextlib.ExitStack()
+        try:
+
+            # dead letters?
+            self.dead_letter_sink = None
+            if ( self.dead_letter_file_path is not None ):
+
+                # open sink.
+                self.dead_letter_sink = ETLDeadLetterSink( file_path_IN = self.dead_letter_file_path, label_IN = my_class.__name__ )
+                self.dead_letter_sink.open()
+                cleanup_stack.callback( self.dead_letter_sink.close )
+
+            #-- END check to see if dead letters --#
+
+            # compile attribute converters once, up front.
+            my_etl_spec.compile_converters( self.get_default_time_zone() )
+
+            # instrumentation?
+            if ( self.do_instrumentation == True ):
+
+                # make instance...
+                my_instrumentation = ETLInstrumentation( label_IN = my_class.__name__ )
+                my_instrumentation.start()
+
+                # ...and count queries on the database the class writes to.
+                cleanup_stack.enter_context(
+                    connections[ router.db_for_write( my_class ) ].execute_wrapper( my_instrumentation.count_query )
                 )
-                self.output_log_message(
-                    status_message,
-                    method_IN = me,
-                    indent_with_IN = "\n\n----> ",
-                    log_level_code_IN = logging.INFO,
-                    do_print_IN = True
+
+            #-- END check to see if instrumentation --#
+            self.set_instrumentation( my_instrumentation )
+
+            # get iterator
+            my_iterator = self.get_record_iterator( start_index_IN = start_index_IN, record_count_IN = record_count_IN )
+
+            # batched required check? If so, filter out records missing required
+            #     values a window at a time.
+            if ( self.do_batch_required == True ):
+
+                # wrap iterator so only records with required values come out.
+                my_iterator = self.get_batch_required_iterator( my_iterator )
+
+            #-- END check to see if batched required check --#
+
+            # batched lookup (or bulk write, which relies on it)? If so, resolve
+            #     existing instances a window at a time. Doesn't change
+            #     do_batch_lookup, so turning bulk write off later turns off
+            #     batched lookup, too.
+            if ( self.is_batch_lookup_on() == True ):
+
+                # wrap iterator so identity map is loaded for each window.
+                my_iterator = self.get_batch_lookup_iterator( my_iterator )
+
+            #-- END check to see if batched lookup --#
+
+            # get record count
+            record_count = self.get_record_count()
+
+            # loop over data dictionaries
+            error_counter = 0
+            record_counter = 0
+            success_counter = 0
+            update_counter = 0
+            unchanged_counter = 0
+            print_every_x_records = self.update_status_every
+            for current_record in my_iterator:
+
+                # checkpoint? Only if everything processed so far is committed.
+                if ( ( my_checkpoint is not None )
+                    and ( ( record_counter - checkpoint_record_counter ) >= self.checkpoint_every )
+                    and ( self.has_pending_writes() == False ) ):
+
+                    my_checkpoint.update(
+                        checkpoint_start_index + record_counter,
+                        {
+                            self.STATUS_PROP_PROCESSED_RECORD_COUNT : record_counter,
+                            self.STATUS_PROP_UPDATE_ERROR_COUNT : error_counter + self.bulk_save_error_count + self.bulk_post_save_error_count,
+                            self.STATUS_PROP_UPDATE_SUCCESS_COUNT : success_counter - self.bulk_save_error_count - self.bulk_post_save_error_count,
+                            self.STATUS_PROP_UPDATED_RECORD_COUNT : update_counter
+                        }
+                    )
+                    checkpoint_record_counter = record_counter
+
+                #-- END check to see if checkpoint --#
+
+                # increment counter
+                record_counter += 1
+
+                # record number in run - if required values are checked in
+                #     batches, records skipped so far count, too.
+                record_number = self.batch_required_record_number_map.pop( id( current_record ), record_counter )
+                #print( "record_counter: {counter}".format( counter = record_counter ) )
+                record_start_time = self.start_phase_timer()
+
+                # ==> reset per-row variables
+                self.reset_record_information()
+                unknown_attr_name_to_value_map = self.get_unknown_attrs_name_to_value_map()
+
+                # ==> check required (already done if batched).
+                if ( self.do_batch_required == True ):
+                    has_required = True
+                else:
+                    phase_start_time = self.start_phase_timer()
+                    has_required = self.has_required( current_record )
+                    self.stop_phase_timer( ETLInstrumentation.PHASE_HAS_REQUIRED, phase_start_time )
+                #-- END check to see if batched required check --#
+                if ( has_required == True ):
+
+                    # ==> try to lookup existing instance.
+                    phase_start_time = self.start_phase_timer()
+                    current_entry_instance = self.find_load_instance( current_record, check_required_IN = False )
+                    self.stop_phase_timer( ETLInstrumentation.PHASE_FIND_LOAD_INSTANCE, phase_start_time )
+
+                    # unchanged since it was last loaded?
+                    if ( self.is_record_unchanged( current_entry_instance, current_record ) == True ):
+
+                        # yes - skip it.
+                        unchanged_counter += 1
+
+                    # got an instance?
+                    elif ( current_entry_instance is not None ):
+
+                        # update instance from record - if it raises, fail just
+                        #     this record (dead letter below), not the run.
+                        try:
+
+                            update_status = self.update_instance_from_record( current_entry_instance, current_record )
+
+                        except Exception as e:
+
+                            status_message = "record {} - {} caught updating instance from record: {}".format( record_number, type( e ).__name__, e )
+                            self.output_log_message( status_message, method_IN = me, log_level_code_IN = logging.ERROR, do_print_IN = my_debug_flag )
+                            self.add_status_message( status_message, category_IN = ETLDeadLetterSink.REASON_UPDATE_FAILED )
+                            update_status = StatusContainer()
+                            update_status.set_status_code( StatusContainer.STATUS_CODE_ERROR )
+                            update_status.add_message( status_message )
+                            update_status.set_detail_value( self.PROP_WAS_INSTANCE_UPDATED, False )
+
+                        #-- END try...except around update --#
+
+                        # evaluate status
+                        was_update_success = update_status.is_success()
+                        was_instance_updated = update_status.get_detail_value( self.PROP_WAS_INSTANCE_UPDATED )
+
+                        # success?
+                        if ( was_update_success == True ):
+
+                            # success
+                            success_counter += 1
+
+                        else:
+
+                            # error
+                            error_counter += 1
+                            self.write_dead_letter(
+                                current_record,
+                                ETLDeadLetterSink.REASON_UPDATE_FAILED,
+                                message_list_IN = update_status.get_message_list(),
+                                record_number_IN = record_number
+                            )
+
+                        #-- END check if success. --#
+
+                        # was record updated?
+                        if ( was_instance_updated == True ):
+
+                            # increment update counter
+                            update_counter += 1
+
+                        #-- END check if instance was updated --#
+
+                        if ( my_debug_flag == True ):
+
+                            # output details of entry update.
+                            status_message = "- in {method}(): update_status = {status_instance} ( success?: {success_flag}; record updated?: {was_updated}; changed list:{changed_list}".format(
+                                method = me,
+                                status_instance = update_status,
+                                success_flag = was_update_success,
+                                was_updated = was_instance_updated,
+                                changed_list = update_status.get_detail_value( self.PROP_UPDATED_ATTR_LIST )
+                            )
+                            self.output_debug( status_message, method_IN = me, indent_with_IN = "\n\n====> ", do_print_IN = my_debug_flag )
+
+                            # and, output unknown attributes.
+                            status_message = "- in {method}(): unknown_attr_name_to_value_map = {unknown_attrs}".format(
+                                method = me,
+                                unknown_attrs = unknown_attr_name_to_value_map
+                            )
+                            self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
+
+                        #-- END DEBUG --#
+
+                    else:
+
+                        status_message = "In {}(): row {} - failed to find instance of class {} to load into. This shouldn't happen.".format( me, current_row_index, my_class )
+                        self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
+                        self.add_status_message( status_message, category_IN = ETLDeadLetterSink.REASON_NO_INSTANCE )
+                        self.write_dead_letter( current_record, ETLDeadLetterSink.REASON_NO_INSTANCE, message_list_IN = [ status_message ], record_number_IN = record_number )
+
+                    #-- END check to see if instance to load into --#
+
+                else:
+
+                    # missing required fields, move on.
+                    status_message = "record {record_number} is missing required fields, moving on.".format(
+                        record_number = record_number
+                    )
+                    self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
+                    #self.output_debug( status_message, method_IN = me, do_print_IN = True )
+                    self.add_status_message( status_message, category_IN = ETLDeadLetterSink.REASON_MISSING_REQUIRED )
+                    self.write_dead_letter(
+                        current_record,
+                        ETLDeadLetterSink.REASON_MISSING_REQUIRED,
+                        message_list_IN = [ "missing required fields: {}".format( self.get_missing_field_list() ) ],
+                        record_number_IN = record_number
+                    )
+
+                #-- END check if required columns are present. --#
+
+                # record timing.
+                if ( my_instrumentation is not None ):
+                    my_instrumentation.add_record_time( time.perf_counter() - record_start_time )
+                #-- END check to see if instrumentation --#
+
+                # output a progress message?
+                if ( ( ( record_counter % print_every_x_records ) == 0 )
+                    and ( do_output_progress_IN == True ) ):
+
+                    # basic timing analysis.
+                    my_start_dt = self.start_dt
+                    current_dt = datetime.datetime.now()
+                    current_elapsed = current_dt - previous_dt
+                    total_elapsed = current_dt - my_start_dt
+                    total_average = None
+                    if ( record_counter > 0 ):
+                        total_average = total_elapsed / record_counter
+                    #-- END check to see if any records --#
+                    previous_dt = current_dt
+
+                    status_message = "processed {counter} of {count} records ( existing: {existing_count}; new: {new_count} ) @ {right_now} ( timing: last {current_count} elapsed = {current_elapsed}; total elapsed = {total_elapsed}; average = {total_average} ).".format(
+                        counter = record_counter,
+                        count = record_count,
+                        existing_count = self.existing_count,
+                        new_count = self.new_count,
+                        right_now = current_dt,
+                        current_count = print_every_x_records,
+                        current_elapsed = current_elapsed,
+                        total_elapsed = total_elapsed,
+                        total_average = total_average
+                    )
+                    self.output_log_message(
+                        status_message,
+                        method_IN = me,
+                        indent_with_IN = "\n\n----> ",
+                        log_level_code_IN = logging.INFO,
+                        do_print_IN = True
+                    )
+                #-- END periodic status update. --#
+
+            #-- END loop over records --#
+
+            # bulk write? Flush anything left in the buffers.
+            if ( self.do_bulk_write == True ):
+
+                # flush...
+                self.flush_bulk_write()
+
+                # ...and count records whose save or post-save processing failed
+                #     as errors.
+                error_counter += self.bulk_save_error_count + self.bulk_post_save_error_count
+                success_counter -= self.bulk_save_error_count + self.bulk_post_save_error_count
+
+                # store bulk write counts in status
+                status_OUT.set_detail_value( self.STATUS_PROP_BULK_CREATED_COUNT, self.bulk_created_count )
+                status_OUT.set_detail_value( self.STATUS_PROP_BULK_UPDATED_COUNT, self.bulk_updated_count )
+                status_OUT.set_detail_value( self.STATUS_PROP_BULK_SAVE_ERROR_COUNT, self.bulk_save_error_count )
+                status_OUT.set_detail_value( self.STATUS_PROP_BULK_POST_SAVE_ERROR_COUNT, self.bulk_post_save_error_count )
+
+            #-- END check to see if bulk write --#
+
+            # batched related? Process any related records still waiting.
+            if ( self.do_batch_related == True ):
+
+                # flush...
+                phase_start_time = self.start_phase_timer()
+                self.flush_related()
+                self.stop_phase_timer( ETLInstrumentation.PHASE_RELATED, phase_start_time )
+
+                # ...and store counts in status
+                status_OUT.set_detail_value( self.STATUS_PROP_RELATED_RECORD_COUNT, self.related_record_count )
+                status_OUT.set_detail_value( self.STATUS_PROP_RELATED_ERROR_COUNT, self.related_error_count )
+
+            #-- END check to see if batched related --#
+
+            # batched required check? Count skipped records as processed, and
+            #     store missing counts.
+            if ( self.do_batch_required == True ):
+
+                record_counter += self.missing_required_count
+                status_OUT.set_detail_value( self.STATUS_PROP_MISSING_REQUIRED_COUNT, self.missing_required_count )
+                status_OUT.set_detail_value( self.STATUS_PROP_MISSING_REQUIRED_KEY_COUNT_MAP, self.missing_required_key_count_map )
+
+                if ( self.missing_required_count > 0 ):
+
+                    status_message = "{missing_count} records missing required fields, skipped ( count per field: {key_count_map} ).".format(
+                        missing_count = self.missing_required_count,
+                        key_count_map = self.missing_required_key_count_map
+                    )
+                    self.add_status_message( status_message )
+
+                #-- END check to see if any missing --#
+
+            #-- END check to see if batched required check --#
+
+            # checkpoint? Run is complete.
+            if ( my_checkpoint is not None ):
+
+                # save...
+                my_checkpoint.update(
+                    checkpoint_start_index + record_counter,
+                    {
+                        self.STATUS_PROP_PROCESSED_RECORD_COUNT : record_counter,
+                        self.STATUS_PROP_UPDATE_ERROR_COUNT : error_counter,
+                        self.STATUS_PROP_UPDATE_SUCCESS_COUNT : success_counter,
+                        self.STATUS_PROP_UPDATED_RECORD_COUNT : update_counter
+                    },
+                    is_complete_IN = True
                 )
-            #-- END periodic status update. --#
 
-        #-- END loop over records --#
+                # ...and include counts from before checkpoint resumed from.
+                record_counter += resumed_counter_map.get( self.STATUS_PROP_PROCESSED_RECORD_COUNT, 0 )
+                error_counter += resumed_counter_map.get( self.STATUS_PROP_UPDATE_ERROR_COUNT, 0 )
+                success_counter += resumed_counter_map.get( self.STATUS_PROP_UPDATE_SUCCESS_COUNT, 0 )
+                update_counter += resumed_counter_map.get( self.STATUS_PROP_UPDATED_RECORD_COUNT, 0 )
+
+            #-- END check to see if checkpoints --#
+
+        finally:
+
+            cleanup_stack.close()
+
+        #-- END try...finally around processing --#
+
+        # dead letters? Store counts (sink closed above).
+        if ( self.dead_letter_sink is not None ):
+
+            status_OUT.set_detail_value( self.STATUS_PROP_DEAD_LETTER_COUNT, self.dead_letter_sink.record_count )
+            status_OUT.set_detail_value( self.STATUS_PROP_DEAD_LETTER_REASON_COUNT_MAP, dict( self.dead_letter_sink.reason_to_count_map ) )
+
+        #-- END check to see if dead letters --#
+
+        # status messages bounded? Store counts.
+        if ( self.max_status_message_count is not None ):
+            status_OUT.set_detail_value( self.STATUS_PROP_DROPPED_STATUS_MESSAGE_COUNT, self.get_dropped_status_message_count() )
+            status_OUT.set_detail_value( self.STATUS_PROP_STATUS_MESSAGE_CATEGORY_COUNT_MAP, dict( self.get_status_message_category_count_map() or {} ) )
+        #-- END check to see if status messages bounded --#
+
+        # instrumentation? Store summary.
+        if ( my_instrumentation is not None ):
+
+            my_instrumentation.stop()
+            if ( self.instrumentation_file_path is not None ):
+                status_OUT.set_detail_value( self.STATUS_PROP_INSTRUMENTATION, my_instrumentation.write_json_line( self.instrumentation_file_path ) )
+            else:
+                status_OUT.set_detail_value( self.STATUS_PROP_INSTRUMENTATION, my_instrumentation.build_summary() )
+            #-- END check to see if writing to file --#
+
+        #-- END check to see if instrumentation --#
 
         # output final status message?
         if ( do_output_progress_IN == True ):
@@ -507,7 +2019,10 @@ class ETLDjangoModelLoader( ETLObjectLoader ):
             current_dt = datetime.datetime.now()
             current_elapsed = current_dt - previous_dt
             total_elapsed = current_dt - my_start_dt
-            total_average = total_elapsed / record_counter
+            total_average = None
+            if ( record_counter > 0 ):
+                total_average = total_elapsed / record_counter
+            #-- END check to see if any records --#
             previous_dt = current_dt
 
             status_message = "Processing COMPLETE - processed {counter} of {count} records ( existing: {existing_count}; new: {new_count} ) @ {right_now} ( timing: last {current_count} elapsed = {current_elapsed}; total elapsed = {total_elapsed}; average = {total_average} ).".format(
@@ -516,7 +2031,7 @@ class ETLDjangoModelLoader( ETLObjectLoader ):
                 existing_count = self.existing_count,
                 new_count = self.new_count,
                 right_now = current_dt,
-                current_count = ( record_count % print_every_x_records ),
+                current_count = ( record_counter % print_every_x_records ),
                 current_elapsed = current_elapsed,
                 total_elapsed = total_elapsed,
                 total_average = total_average
@@ -536,11 +2051,217 @@ class ETLDjangoModelLoader( ETLObjectLoader ):
         status_OUT.set_detail_value( self.STATUS_PROP_UPDATE_SUCCESS_COUNT, success_counter )
         status_OUT.set_detail_value( self.STATUS_PROP_UPDATED_RECORD_COUNT, update_counter )
 
+        # change detection?
+        if ( self.record_hash_field_name is not None ):
+            status_OUT.set_detail_value( self.STATUS_PROP_UNCHANGED_SKIPPED_COUNT, unchanged_counter )
+        #-- END check to see if change detection --#
+
+        # and attribute store counts.
+        status_OUT.set_detail_value( self.STATUS_PROP_ATTR_UPDATED_COUNT, self.attr_updated_count )
+        status_OUT.set_detail_value( self.STATUS_PROP_ATTR_NOT_CHANGED_COUNT, self.attr_not_changed_count )
+        status_OUT.set_detail_value( self.STATUS_PROP_ATTR_UNKNOWN_COUNT, self.attr_unknown_count )
+
         return status_OUT
 
     #-- END method process_records() --#
 
 
+    def reset_bulk_write_buffers( self ):
+
+        # bulk write buffers
+        self.bulk_create_list = []
+        self.bulk_create_id_set = set()
+        self.bulk_update_list = []
+        self.bulk_update_id_set = set()
+        self.bulk_update_field_set = set()
+        self.bulk_update_all_fields = False
+        self.bulk_post_save_list = []
+
+    #-- END method reset_bulk_write_buffers() --#
+
+
+    def reset_record_information( self ):
+
+        # call parent method.
+        super().reset_record_information()
+
+        # change detection - hash of current record.
+        self.record_hash = None
+
+    #-- END method reset_record_information() --#
+
+
+    def reset_status_information( self ):
+
+        # call parent method.
+        super().reset_status_information()
+
+        # clear out batched lookup identity map.
+        self.lookup_identity_map = {}
+
+        # clear out bulk write buffers and counts.
+        self.reset_bulk_write_buffers()
+        self.bulk_created_count = 0
+        self.bulk_updated_count = 0
+        self.bulk_save_error_count = 0
+        self.bulk_post_save_error_count = 0
+
+        # clear out batched related counts.
+        self.related_record_count = 0
+        self.related_error_count = 0
+
+        # clear out batched required counts and record numbers.
+        self.missing_required_count = 0
+        self.missing_required_key_count_map = {}
+        self.batch_required_record_number_map = {}
+
+    #-- END method reset_status_information() --#
+
+
+    def save_bulk_write_instances( self, create_list_IN, update_list_IN, update_field_list_IN ):
+
+        '''
+        Fallback for flush_bulk_write() when a bulk write fails. Accepts lists
+            of new and changed instances and the fields to update on the
+            changed ones. save()s each instance on its own, inside its own
+            savepoint, so one bad row doesn't roll back the others. New
+            instances are reset first, since a failed bulk_create() can leave
+            them with primary keys from the rolled-back insert.
+
+        Returns map of id() of each instance that could not be saved to the
+            error message for its exception.
+        '''
+
+        # return reference
+        failed_map_OUT = None
+
+        # declare variables
+        me = "save_bulk_write_instances"
+        status_message = None
+        my_class = None
+        current_instance = None
+
+        # init
+        failed_map_OUT = {}
+        my_class = self.get_compiled_entity().get_load_class()
+
+        # new instances
+        for current_instance in create_list_IN:
+
+            # reset to unsaved.
+            current_instance._state.adding = True
+            if ( my_class._meta.auto_field is not None ):
+                current_instance.pk = None
+            #-- END check to see if auto primary key --#
+
+            try:
+
+                with transaction.atomic():
+                    current_instance.save()
+                #-- END transaction --#
+
+            except ( DataError, IntegrityError ) as de:
+
+                status_message = "{error_type} caught save()-ing new instance: {error}".format( error_type = type( de ).__name__, error = de )
+                self.output_log_message( status_message, method_IN = me, log_level_code_IN = logging.ERROR, do_print_IN = True )
+                failed_map_OUT[ id( current_instance ) ] = status_message
+
+            #-- END try...except around save() --#
+
+        #-- END loop over new instances --#
+
+        # changed instances
+        if ( len( update_field_list_IN ) > 0 ):
+
+            for current_instance in update_list_IN:
+
+                try:
+
+                    with transaction.atomic():
+                        current_instance.save( update_fields = update_field_list_IN )
+                    #-- END transaction --#
+
+                except ( DataError, IntegrityError ) as de:
+
+                    status_message = "{error_type} caught save()-ing changed instance {instance}: {error}".format( error_type = type( de ).__name__, instance = current_instance, error = de )
+                    self.output_log_message( status_message, method_IN = me, log_level_code_IN = logging.ERROR, do_print_IN = True )
+                    failed_map_OUT[ id( current_instance ) ] = status_message
+
+                #-- END try...except around save() --#
+
+            #-- END loop over changed instances --#
+
+        #-- END check to see if fields to update --#
+
+        return failed_map_OUT
+
+    #-- END method save_bulk_write_instances() --#
+
+
+    def set_batch_lookup_size( self, value_IN ):
+
+        # return reference
+        value_OUT = None
+
+        # store value
+        self.batch_lookup_size = value_IN
+
+        # return value
+        value_OUT = self.get_batch_lookup_size()
+
+        return value_OUT
+
+    #-- END method set_batch_lookup_size() --#
+
+
+    def set_bulk_write_batch_size( self, value_IN ):
+
+        # return reference
+        value_OUT = None
+
+        # store value
+        self.bulk_write_batch_size = value_IN
+
+        # return value
+        value_OUT = self.get_bulk_write_batch_size()
+
+        return value_OUT
+
+    #-- END method set_bulk_write_batch_size() --#
+
+
+    def set_lookup_identity_map( self, value_IN ):
+
+        # return reference
+        value_OUT = None
+
+        # store value
+        self.lookup_identity_map = value_IN
+
+        # return value
+        value_OUT = self.get_lookup_identity_map()
+
+        return value_OUT
+
+    #-- END method set_lookup_identity_map() --#
+
+
+    def set_related_batch_size( self, value_IN ):
+
+        # return reference
+        value_OUT = None
+
+        # store value
+        self.related_batch_size = value_IN
+
+        # return value
+        value_OUT = self.get_related_batch_size()
+
+        return value_OUT
+
+    #-- END method set_related_batch_size() --#
+
+
     def update_instance_from_record( self, instance_IN, record_IN, save_on_success_IN = True ):
 
         '''
@@ -549,6 +2270,9 @@ class ETLDjangoModelLoader( ETLObjectLoader ):
             set to True if instance was updated.
         - ETLObjectLoader.PROP_UPDATED_ATTR_LIST ( "updated_attr_list" ) - list
             of ETLAttribute instances of attributes that were updated.
+        - ETLObjectLoader.PROP_UPDATED_ATTR_NAME_LIST ( "updated_attr_name_list" )
+            - list of names of instance attributes that were updated (used to
+            restrict bulk_update() to changed fields).
 
         It can also contain (currently not set):
         - ETLObjectLoader.PROP_NO_CHANGE_ATTR_LIST ( "no_change_attr_list" )
@@ -5,12 +5,14 @@
 # base python libraries
 import datetime
 import logging
+import pytz
 import sys
 import time
 import traceback
 
 # etl imports
 from python_utilities.etl.etl_attribute import ETLAttribute
+from python_utilities.etl.etl_compiled_entity import ETLCompiledEntity
 from python_utilities.etl.etl_error import ETLError
 
 
@@ -44,6 +46,7 @@ class ETLEntity( object ):
     STORAGE_TYPE_LIST_NO_HEADERS = "list_no_headers"
     STORAGE_TYPE_XLSX_WITH_HEADERS = "xlsx_with_headers"
     STORAGE_TYPE_XLSX_NO_HEADERS = "xlsx_no_headers"
+    STORAGE_TYPE_DATAFRAME = "dataframe"
 
     # valid storage types
     VALID_STORAGE_TYPE_LIST = []
@@ -54,6 +57,7 @@ class ETLEntity( object ):
     VALID_STORAGE_TYPE_LIST.append( STORAGE_TYPE_LIST_NO_HEADERS )
     VALID_STORAGE_TYPE_LIST.append( STORAGE_TYPE_XLSX_WITH_HEADERS )
     VALID_STORAGE_TYPE_LIST.append( STORAGE_TYPE_XLSX_NO_HEADERS )
+    VALID_STORAGE_TYPE_LIST.append( STORAGE_TYPE_DATAFRAME )
 
     # type of "load" entity.
     STORAGE_TYPE_PYTHON_CLASS = "python_class"
@@ -386,6 +390,55 @@ class ETLEntity( object ):
     #-- END method add_required_attr_key() --#
 
 
+    def compile( self, attr_index_to_key_map_IN = None, attr_key_to_index_map_IN = None ):
+
+        '''
+        Returns a frozen, read-only copy of this entity to use while processing
+            records ( ETLCompiledEntity ). Changes made to this entity after
+            compiling are not in the copy - compile again. If index maps are
+            passed in, they are used in place of this entity's (for column
+            indexes that differ from one input to the next - the header row of
+            each worksheet, for example).
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # compile
+        value_OUT = ETLCompiledEntity(
+            self,
+            attr_index_to_key_map_IN = attr_index_to_key_map_IN,
+            attr_key_to_index_map_IN = attr_key_to_index_map_IN
+        )
+
+        return value_OUT
+
+    #-- END method compile() --#
+
+
+    def compile_converters( self, time_zone_IN = pytz.UTC ):
+
+        '''
+        Compiles the converter function for each attribute in this entity (
+            see ETLAttribute.compile_converter() ), so the work of reading the
+            spec is done once before a run, not once per value. Returns map
+            of attribute keys to converter functions.
+
+        Compiles this entity and calls ETLCompiledEntity.compile_converters()
+            - attributes are shared with the compiled copy, so the converters
+            are stored on this entity's attributes, too.
+        '''
+
+        # return reference
+        map_OUT = None
+
+        map_OUT = self.compile().compile_converters( time_zone_IN )
+
+        return map_OUT
+
+    #-- END method compile_converters() --#
+
+
     def get_extract_first_index( self ):
 
         # return reference
@@ -555,6 +608,24 @@ class ETLEntity( object ):
     #-- END method get_required_attr_key_set --#
 
 
+    def get_required_attr_key_tuple( self ):
+
+        '''
+        Returns required keys as a tuple, in sorted order (same as
+            ETLCompiledEntity.get_required_attr_key_tuple()).
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # get value
+        value_OUT = tuple( sorted( self.get_required_attr_key_set(), key = str ) )
+
+        return value_OUT
+
+    #-- END method get_required_attr_key_tuple --#
+
+
     def pull_attr_for_key( self, key_IN ):
 
         '''
@@ -0,0 +1,682 @@
+#===============================================================================
+# imports
+#===============================================================================
+
+
+# base python libraries
+import datetime
+import logging
+
+# pandas
+import numpy
+import pandas
+
+# python_utilities
+from python_utilities.status.status_container import StatusContainer
+
+# ETL imports
+from python_utilities.etl.etl_attribute import ETLAttribute
+from python_utilities.etl.etl_dead_letter_sink import ETLDeadLetterSink
+from python_utilities.etl.etl_entity import ETLEntity
+from python_utilities.etl.etl_error import ETLError
+from python_utilities.etl.etl_instrumentation import ETLInstrumentation
+from python_utilities.etl.etl_record_source import ETLRecordSource
+from python_utilities.etl.etl_from_dictionary import ETLFromDictionary
+
+
+#===============================================================================
+# class ETLFromDataFrame
+#===============================================================================
+
+
+# lineage: object --> ETLProcessor --> ETLObjectLoader --> ETLDjangoModelLoader --> ETLFromDictionary
+class ETLFromDataFrame( ETLFromDictionary ):
+
+
+    '''
+    ETLFromDataFrame loads records from a pandas DataFrame, or from an iterable
+        of DataFrame chunks (for example, pandas.read_csv( ..., chunksize = N
+        )), rather than a list of dictionaries.
+
+    Each chunk is converted a column at a time before it is split into rows:
+        for each column with an ETLAttribute, values are converted to the
+        attribute's load data type using pandas (ints, strings, and dates and
+        datetimes with a conversion string). Columns pandas can't convert the
+        same way process_value() would are converted with the attribute's
+        compiled converter instead. Converted rows are then handed to
+        ETLFromDictionary a dictionary at a time, and process_value() skips
+        the conversions already done.
+
+    If batched required check is on ( do_batch_required ), required values
+        are also checked a chunk at a time, with pandas.
+
+    To use with LoadableDjangoModel.run_etl(), set extract storage type in
+        the ETL spec to ETLEntity.STORAGE_TYPE_DATAFRAME, and pass the
+        DataFrame or chunks in record_source_IN.
+    '''
+
+
+    #===========================================================================
+    # CONSTANTS-ish
+    #===========================================================================
+
+
+    # logger name
+    MY_LOGGER_NAME = "python_utilities.etl.ETLFromDataFrame"
+
+
+    #===========================================================================
+    # ! ==> class variables
+    #===========================================================================
+
+
+    # debug_flag
+    debug_flag = False
+
+
+    #===========================================================================
+    # ! ==> class methods
+    #===========================================================================
+
+
+    #===========================================================================
+    # ! ==> __init__() method - instance variables
+    #===========================================================================
+
+
+    def __init__( self ):
+
+        '''
+        Constructor
+        '''
+
+        # call parent's __init__()
+        super().__init__()
+
+        # input - DataFrame, or iterable of DataFrame chunks.
+        self.input_dataframe = None
+        self.input_count_hint = None
+
+        # ETLAttributes whose columns have been converted column-wise.
+        self.converted_attr_set = set()
+
+        # debug
+        self.debug_flag = False
+
+    #-- END constructor --#
+
+
+    #===========================================================================
+    # ! ==> instance methods
+    #===========================================================================
+
+
+    def convert_dataframe( self, dataframe_IN ):
+
+        '''
+        Accepts DataFrame. Returns copy with each column that has an
+            ETLAttribute (and is not a related model) converted to the
+            attribute's load data type ( convert_series() ). Each attribute
+            converted is added to self.converted_attr_set.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        my_etl_spec = None
+        current_column_name = None
+        my_etl_attribute = None
+
+        # init
+        my_etl_spec = self.get_compiled_entity()
+        value_OUT = dataframe_IN.copy()
+
+        # loop over columns
+        for current_column_name in value_OUT.columns:
+
+            # attribute for column?
+            my_etl_attribute = my_etl_spec.pull_attr_for_key( current_column_name )
+            if ( ( my_etl_attribute is not None )
+                and ( my_etl_attribute.get_related_model_class() is None ) ):
+
+                # convert.
+                value_OUT[ current_column_name ] = self.convert_series( value_OUT[ current_column_name ], my_etl_attribute )
+                self.converted_attr_set.add( my_etl_attribute )
+
+            #-- END check to see if attribute --#
+
+        #-- END loop over columns --#
+
+        return value_OUT
+
+    #-- END method convert_dataframe() --#
+
+
+    def convert_series( self, series_IN, attribute_spec_IN ):
+
+        '''
+        Accepts pandas Series and ETLAttribute. Converts non-null values in the
+            series to the attribute's load data type, the same way its compiled
+            converter would, but with pandas:
+        - int - integer columns as is, float columns truncated, string columns
+            stripped and parsed as long as all are whole numbers.
+        - string - string columns stripped, integer columns made strings.
+        - date/datetime - string columns parsed with the attribute's
+            conversion string; datetimes without a time zone get the default
+            time zone.
+
+        Anything else (other column types, dates with no conversion string, or
+            values pandas won't parse) is converted a value at a time with the
+            attribute's compiled converter, so errors match process_value().
+
+        Returns converted Series.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        my_time_zone = None
+        out_data_type = None
+        transform_pattern = None
+        inferred_type = None
+        work_series = None
+        parsed_series = None
+        my_converter = None
+        not_null_mask = None
+        current_value = None
+
+        # init
+        my_time_zone = self.get_default_time_zone()
+        out_data_type = attribute_spec_IN.get_load_attr_data_type()
+        transform_pattern = attribute_spec_IN.get_transform_conversion_string()
+        inferred_type = pandas.api.types.infer_dtype( series_IN, skipna = True )
+
+        try:
+
+            # which type?
+            if ( out_data_type == ETLAttribute.DATA_TYPE_INT ):
+
+                if ( pandas.api.types.is_integer_dtype( series_IN.dtype ) == True ):
+
+                    value_OUT = series_IN.astype( "Int64" )
+
+                elif ( pandas.api.types.is_float_dtype( series_IN.dtype ) == True ):
+
+                    # int() truncates.
+                    value_OUT = numpy.trunc( series_IN ).astype( "Int64" )
+
+                elif ( inferred_type == "string" ):
+
+                    # all whole numbers? If not, int() would raise, so let the
+                    #     converter do it.
+                    work_series = pandas.to_numeric( series_IN.astype( "string" ).str.strip(), errors = "raise" )
+                    if ( pandas.api.types.is_integer_dtype( work_series.dtype ) == False ):
+                        raise ValueError( "not all whole numbers" )
+                    #-- END check to see if all whole numbers --#
+
+                    value_OUT = work_series.astype( "Int64" )
+
+                else:
+
+                    raise TypeError( "column type {} not converted column-wise".format( inferred_type ) )
+
+                #-- END check to see column type --#
+
+            elif ( out_data_type == ETLAttribute.DATA_TYPE_STRING ):
+
+                if ( inferred_type == "string" ):
+
+                    value_OUT = series_IN.str.strip()
+
+                elif ( pandas.api.types.is_integer_dtype( series_IN.dtype ) == True ):
+
+                    value_OUT = series_IN.astype( str )
+
+                else:
+
+                    raise TypeError( "column type {} not converted column-wise".format( inferred_type ) )
+
+                #-- END check to see column type --#
+
+            elif ( ( ( out_data_type == ETLAttribute.DATA_TYPE_DATETIME_DATE )
+                    or ( out_data_type == ETLAttribute.DATA_TYPE_DATETIME_DATETIME ) )
+                and ( transform_pattern is not None )
+                and ( transform_pattern != "" )
+                and ( inferred_type == "string" ) ):
+
+                # strip, empty strings are None, parse.
+                work_series = series_IN.str.strip()
+                work_series = work_series.where( work_series != "" )
+                parsed_series = pandas.to_datetime( work_series, format = transform_pattern, errors = "raise" )
+
+                # date or datetime?
+                if ( out_data_type == ETLAttribute.DATA_TYPE_DATETIME_DATE ):
+
+                    value_OUT = parsed_series.dt.date
+
+                else:
+
+                    # time zone?
+                    if ( ( parsed_series.dt.tz is None ) and ( my_time_zone is not None ) ):
+                        parsed_series = parsed_series.dt.tz_localize( my_time_zone )
+                    #-- END check to see if time zone --#
+
+                    value_OUT = pandas.Series(
+                        list( parsed_series.dt.to_pydatetime() ),
+                        index = series_IN.index,
+                        dtype = object
+                    )
+
+                #-- END check to see if date or datetime --#
+
+                # NaT to None
+                value_OUT = value_OUT.where( parsed_series.notna(), None )
+
+            elif ( ( out_data_type is None ) or ( out_data_type == "" ) ):
+
+                # no type - nothing to convert.
+                value_OUT = series_IN
+
+            else:
+
+                raise TypeError( "type {} not converted column-wise".format( out_data_type ) )
+
+            #-- END check to see what type we want --#
+
+        except ( ValueError, TypeError ) as e:
+
+            # convert a value at a time, into an object Series so pandas
+            #     doesn't re-infer a type (ints with nulls would become floats).
+            my_converter = attribute_spec_IN.get_converter( my_time_zone )
+            not_null_mask = series_IN.notna()
+            value_OUT = series_IN.astype( object )
+            value_OUT[ not_null_mask ] = [ my_converter( current_value ) for current_value in series_IN[ not_null_mask ] ]
+
+        #-- END try...except around column-wise conversion --#
+
+        return value_OUT
+
+    #-- END method convert_series() --#
+
+
+    def filter_required( self, dataframe_IN, first_record_number_IN = None ):
+
+        '''
+        Accepts DataFrame, and optional record number of its first row.
+            Checks required values for all rows at once (missing if null or
+            empty string, same as has_required()). Adds counts of rows missing
+            required values to self.missing_required_count and
+            self.missing_required_key_count_map, writes each of those rows to
+            the dead letter file (if there is one) with the keys it is missing
+            and its record number, and returns DataFrame with only rows that
+            have all required values.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        my_etl_spec = None
+        required_attr_key_list = None
+        has_required_series = None
+        current_required_key = None
+        missing_series = None
+        missing_count = None
+        key_to_missing_series_map = None
+
+        # declare variables - dead letters
+        missing_dataframe = None
+        missing_position_array = None
+        missing_position = None
+        current_record = None
+        missing_key_list = None
+        record_number = None
+
+        # init
+        my_etl_spec = self.get_compiled_entity()
+        required_attr_key_list = my_etl_spec.get_required_attr_key_tuple()
+        has_required_series = pandas.Series( True, index = dataframe_IN.index )
+        key_to_missing_series_map = {}
+
+        # loop over required keys
+        for current_required_key in required_attr_key_list:
+
+            # column present? If not, all missing.
+            if ( current_required_key in dataframe_IN.columns ):
+                missing_series = dataframe_IN[ current_required_key ].isna() | ( dataframe_IN[ current_required_key ] == "" )
+            else:
+                missing_series = pandas.Series( True, index = dataframe_IN.index )
+            #-- END check to see if column present --#
+
+            # any missing?
+            missing_count = int( missing_series.sum() )
+            if ( missing_count > 0 ):
+
+                self.missing_required_key_count_map[ current_required_key ] = self.missing_required_key_count_map.get( current_required_key, 0 ) + missing_count
+                has_required_series = has_required_series & ~missing_series
+                key_to_missing_series_map[ current_required_key ] = missing_series.to_numpy()
+
+            #-- END check to see if any missing --#
+
+        #-- END loop over required keys --#
+
+        # count...
+        self.missing_required_count += int( ( ~has_required_series ).sum() )
+
+        # ...dead letter the rows that are missing values...
+        if ( ( self.dead_letter_sink is not None )
+            and ( len( key_to_missing_series_map ) > 0 ) ):
+
+            # rows missing values, nulls as None, with position in chunk.
+            missing_dataframe = dataframe_IN[ ~has_required_series ]
+            missing_dataframe = missing_dataframe.astype( object ).where( missing_dataframe.notna(), None )
+            missing_position_array = numpy.flatnonzero( ~has_required_series.to_numpy() )
+            for missing_position, current_record in zip( missing_position_array, missing_dataframe.to_dict( "records" ) ):
+
+                # which keys is it missing?
+                missing_key_list = [ current_required_key for current_required_key, missing_series in key_to_missing_series_map.items() if missing_series[ missing_position ] == True ]
+
+                # record number?
+                record_number = None
+                if ( first_record_number_IN is not None ):
+                    record_number = first_record_number_IN + int( missing_position )
+                #-- END check to see if record number --#
+
+                self.write_dead_letter(
+                    current_record,
+                    ETLDeadLetterSink.REASON_MISSING_REQUIRED,
+                    message_list_IN = [ "missing required fields: {}".format( missing_key_list ) ],
+                    record_number_IN = record_number
+                )
+
+            #-- END loop over rows missing values --#
+
+        #-- END check to see if dead letters --#
+
+        # ...then filter.
+        value_OUT = dataframe_IN[ has_required_series ]
+
+        return value_OUT
+
+    #-- END method filter_required() --#
+
+
+    def get_batch_required_iterator( self, record_iterator_IN ):
+
+        '''
+        Overrides parent: required values are checked a chunk at a time in
+            iter_dataframe_records(), so returns iterator passed in.
+        '''
+
+        return record_iterator_IN
+
+    #-- END method get_batch_required_iterator() --#
+
+
+    def get_dataframe_chunk_iterator( self ):
+
+        '''
+        Returns iterator over input DataFrame chunks - just the one if input is
+            a DataFrame.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        my_input = None
+
+        # DataFrame or chunks?
+        my_input = self.get_input_dataframe()
+        if ( isinstance( my_input, pandas.DataFrame ) == True ):
+            value_OUT = iter( [ my_input ] )
+        else:
+            value_OUT = iter( my_input )
+        #-- END check to see if DataFrame --#
+
+        return value_OUT
+
+    #-- END method get_dataframe_chunk_iterator() --#
+
+
+    def get_input_dataframe( self ):
+
+        # return reference
+        value_OUT = None
+
+        # get value
+        value_OUT = self.input_dataframe
+
+        return value_OUT
+
+    #-- END method get_input_dataframe() --#
+
+
+    def get_record_count( self ):
+
+        '''
+        Returns count hint if set, else number of rows if input is a DataFrame,
+            else None (chunks aren't counted until read).
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # count hint?
+        value_OUT = self.input_count_hint
+        if ( ( value_OUT is None )
+            and ( isinstance( self.get_input_dataframe(), pandas.DataFrame ) == True ) ):
+
+            value_OUT = len( self.get_input_dataframe() )
+
+        #-- END check to see if count hint --#
+
+        return value_OUT
+
+    #-- END method get_record_count() --#
+
+
+    def get_record_iterator( self, start_index_IN = None, record_count_IN = None, use_islice_IN = False ):
+
+        '''
+        Overrides parent: returns iter_dataframe_records().
+        '''
+
+        # return reference
+        value_OUT = None
+
+        value_OUT = self.iter_dataframe_records( start_index_IN = start_index_IN, record_count_IN = record_count_IN )
+
+        return value_OUT
+
+    #-- END method get_record_iterator() --#
+
+
+    def iter_dataframe_records( self, start_index_IN = None, record_count_IN = None ):
+
+        '''
+        Generator that reads input DataFrame chunks, and for each: takes the
+            rows from start index (0-indexed, across all chunks) up to record
+            count, converts it ( convert_dataframe() ), filters out rows
+            missing required values if batched required check is on (
+            filter_required() ), then yields each row as a dictionary with
+            nulls as None.
+        '''
+
+        # declare variables
+        start_index = None
+        stop_index = None
+        row_offset = None
+        current_chunk = None
+        chunk_length = None
+        chunk_start = None
+        chunk_stop = None
+        phase_start_time = None
+        first_record_number = None
+        record_number_list = None
+        record_index = None
+        current_record = None
+
+        # init
+        start_index = start_index_IN
+        if ( start_index is None ):
+            start_index = 0
+        #-- END check to see if start index --#
+
+        if ( record_count_IN is not None ):
+            stop_index = start_index + record_count_IN
+        #-- END check to see if record count --#
+
+        # loop over chunks.
+        row_offset = 0
+        for current_chunk in self.get_dataframe_chunk_iterator():
+
+            # rows in this chunk within start and stop?
+            chunk_length = len( current_chunk )
+            chunk_start = max( 0, start_index - row_offset )
+            chunk_stop = chunk_length
+            if ( stop_index is not None ):
+                chunk_stop = min( chunk_length, stop_index - row_offset )
+            #-- END check to see if stop index --#
+
+            if ( chunk_start < chunk_stop ):
+
+                # convert...
+                current_chunk = current_chunk.iloc[ chunk_start : chunk_stop ]
+                phase_start_time = self.start_phase_timer()
+                current_chunk = self.convert_dataframe( current_chunk )
+                self.stop_phase_timer( ETLInstrumentation.PHASE_PROCESS_VALUE, phase_start_time )
+
+                # ...check required (index is position in chunk, so rows
+                #     kept can be numbered)...
+                first_record_number = row_offset + chunk_start - start_index + 1
+                record_number_list = None
+                if ( self.do_batch_required == True ):
+
+                    phase_start_time = self.start_phase_timer()
+                    current_chunk = current_chunk.reset_index( drop = True )
+                    current_chunk = self.filter_required( current_chunk, first_record_number_IN = first_record_number )
+                    record_number_list = ( current_chunk.index + first_record_number ).tolist()
+                    self.stop_phase_timer( ETLInstrumentation.PHASE_HAS_REQUIRED, phase_start_time )
+
+                #-- END check to see if batched required check --#
+
+                # ...and hand out rows, nulls as None.
+                current_chunk = current_chunk.astype( object ).where( current_chunk.notna(), None )
+                for record_index, current_record in enumerate( current_chunk.to_dict( "records" ) ):
+
+                    # rows skipped? Remember number - process_records() uses it.
+                    if ( record_number_list is not None ):
+                        self.batch_required_record_number_map[ id( current_record ) ] = record_number_list[ record_index ]
+                    #-- END check to see if rows skipped --#
+
+                    yield current_record
+
+                #-- END loop over rows --#
+
+            #-- END check to see if any rows in chunk --#
+
+            # next chunk - done?
+            row_offset += chunk_length
+            if ( ( stop_index is not None ) and ( row_offset >= stop_index ) ):
+                break
+            #-- END check to see if done --#
+
+        #-- END loop over chunks --#
+
+    #-- END method iter_dataframe_records() --#
+
+
+    def process_value( self, value_IN, attribute_spec_IN, instance_IN ):
+
+        '''
+        Overrides parent: if attribute's column was already converted (
+            convert_dataframe() ), tells attribute to skip conversion, but
+            still do transform method and transform to separate attribute. If
+            not, calls parent.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # converted?
+        if ( ( attribute_spec_IN is not None )
+            and ( value_IN is not None )
+            and ( attribute_spec_IN in self.converted_attr_set ) ):
+
+            value_OUT = attribute_spec_IN.process_ldm_object_value(
+                value_IN,
+                instance_IN,
+                self.get_default_time_zone(),
+                is_converted_IN = True
+            )
+
+        else:
+
+            # call parent
+            value_OUT = super().process_value( value_IN, attribute_spec_IN, instance_IN )
+
+        #-- END check to see if converted --#
+
+        return value_OUT
+
+    #-- END method process_value() --#
+
+
+    def set_input_dataframe( self, value_IN, count_hint_IN = None ):
+
+        '''
+        Accepts pandas DataFrame, or iterable of DataFrame chunks, and optional
+            count of rows (for progress output when input is chunks).
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # store values
+        self.input_dataframe = value_IN
+        self.input_count_hint = count_hint_IN
+        self.converted_attr_set = set()
+
+        # clear out status variables.
+        self.reset_status_information()
+
+        # return value
+        value_OUT = self.get_input_dataframe()
+
+        return value_OUT
+
+    #-- END method set_input_dataframe() --#
+
+
+    def set_record_source( self, value_IN ):
+
+        '''
+        Overrides parent: record source is a DataFrame or iterable of DataFrame
+            chunks, so stores it as input DataFrame ( set_input_dataframe() ).
+            If ETLRecordSource passed in (from run_etl_parallel(), for
+            example), uses its iterable and count hint.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # ETLRecordSource?
+        if ( isinstance( value_IN, ETLRecordSource ) == True ):
+
+            value_OUT = self.set_input_dataframe( value_IN.get_iterable(), count_hint_IN = value_IN.get_count_hint() )
+
+        else:
+
+            value_OUT = self.set_input_dataframe( value_IN )
+
+        #-- END check to see if ETLRecordSource --#
+
+        return value_OUT
+
+    #-- END method set_record_source() --#
+
+
+#-- END class ETLFromDataFrame --#
@@ -30,6 +30,7 @@ from python_utilities.status.status_container import StatusContainer
 from python_utilities.etl.etl_attribute import ETLAttribute
 from python_utilities.etl.etl_entity import ETLEntity
 from python_utilities.etl.etl_error import ETLError
+from python_utilities.etl.etl_instrumentation import ETLInstrumentation
 from python_utilities.etl.etl_processor import ETLProcessor
 from python_utilities.etl.etl_object_loader import ETLObjectLoader
 from python_utilities.etl.etl_django_model_loader import ETLDjangoModelLoader
@@ -97,6 +98,9 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
         # input
         self.input_worksheet = None
 
+        # related - records waiting for batched related-record ETL.
+        self.reset_related_buffers()
+
         # status - worksheet-level
         #self.status_message_list = []
         #self.latest_status = None
@@ -119,6 +123,225 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
     #===========================================================================
 
 
+    def add_related_records( self, related_class_IN, related_record_list_IN ):
+
+        '''
+        Accepts related class and list of related records (with foreign keys
+            to the parent already filled in). Adds the records to the list
+            waiting to be loaded into that class by flush_related(). If the
+            number of records waiting reaches self.related_batch_size, calls
+            flush_related().
+
+        Returns the number of related records waiting.
+        '''
+
+        # return reference
+        count_OUT = None
+
+        # declare variables
+        class_to_record_list_map = None
+        related_record_list = None
+
+        # get list for class, creating if needed...
+        class_to_record_list_map = self.related_class_to_record_list_map
+        related_record_list = class_to_record_list_map.get( related_class_IN, None )
+        if ( related_record_list is None ):
+
+            related_record_list = []
+            class_to_record_list_map[ related_class_IN ] = related_record_list
+
+        #-- END check to see if list for class --#
+
+        # ...and add records.
+        related_record_list.extend( related_record_list_IN )
+        self.related_pending_count += len( related_record_list_IN )
+
+        # time to flush?
+        if ( self.related_pending_count >= self.get_related_batch_size() ):
+
+            self.flush_related()
+
+        #-- END check to see if time to flush --#
+
+        count_OUT = self.related_pending_count
+
+        return count_OUT
+
+    #-- END method add_related_records() --#
+
+
+    def build_param_summary( self, related_to_instance_IN, record_IN, attr_spec_IN ):
+
+        '''
+        Builds summary of parameters passed to
+            process_related_build_record_list(), for error messages - JSON for
+            the record and attribute spec, so only call when needed.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        extract_record_output = None
+        related_attr_spec_output = None
+
+        # extract_record
+        if ( record_IN is not None ):
+            extract_record_output = json.dumps( record_IN, indent = 4, sort_keys = True )
+        else:
+            extract_record_output = record_IN
+        #-- END see if we can convert extract_record to JSON string. --#
+
+        # related_attr_spec
+        if ( attr_spec_IN is not None ):
+            related_attr_spec_output = json.dumps( attr_spec_IN.to_json(), indent = 4, sort_keys = True )
+        else:
+            related_attr_spec_output = attr_spec_IN
+        #-- END see if we can convert related_attr_spec to JSON string. --#
+
+        value_OUT = "param summary\n\n- related_to_instance_IN: {instance}\n\n- record_IN:\n{record}\n\n- ==> attr_spec_IN:\n{related_spec}".format(
+            instance = related_to_instance_IN,
+            record = extract_record_output,
+            related_spec = related_attr_spec_output
+        )
+
+        return value_OUT
+
+    #-- END method build_param_summary() --#
+
+
+    def flush_related( self ):
+
+        '''
+        Runs ETL on all related records accumulated by add_related_records()
+            - one run_etl() per related class, rather than one per parent
+            record. Then clears the accumulated records. Counts of related
+            records processed and related records with errors are added to
+            self.related_record_count and self.related_error_count.
+
+        Each nested run_etl() gets this run's options - default time zone,
+            batched lookup, bulk writes, batched related and required checks,
+            lean status, dead letter file, and status message limit.
+            Checkpoints and instrumentation stay with this run.
+
+        Returns StatusContainer with a nested status for each run_etl().
+        '''
+
+        # return reference
+        status_OUT = None
+
+        # declare variables
+        me = "flush_related"
+        status_message = None
+        my_debug_flag = None
+        class_to_record_list_map = None
+        related_class = None
+        related_record_list = None
+        related_status = None
+        related_bulk_write_batch_size = None
+        related_batch_lookup_size = None
+        related_related_batch_size = None
+
+        # init
+        my_debug_flag = self.debug_flag
+        status_OUT = StatusContainer()
+        status_OUT.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
+        class_to_record_list_map = self.related_class_to_record_list_map
+
+        # clear out buffers before doing anything that might raise.
+        self.reset_related_buffers()
+
+        # bulk writing? Related records should, too.
+        if ( self.do_bulk_write == True ):
+
+            related_bulk_write_batch_size = self.get_bulk_write_batch_size()
+
+        #-- END check to see if bulk write --#
+
+        # batched lookup? Related records should, too.
+        if ( self.do_batch_lookup == True ):
+
+            related_batch_lookup_size = self.get_batch_lookup_size()
+
+        #-- END check to see if batched lookup --#
+
+        # batched related? Related records' related records should, too.
+        if ( self.do_batch_related == True ):
+
+            related_related_batch_size = self.get_related_batch_size()
+
+        #-- END check to see if batched related --#
+
+        # loop over related classes.
+        for related_class, related_record_list in class_to_record_list_map.items():
+
+            if ( my_debug_flag == True ):
+                status_message = "running ETL on {record_count} related records for {related_class}.".format(
+                    record_count = len( related_record_list ),
+                    related_class = related_class
+                )
+                self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
+            #-- END DEBUG --#
+
+            # one nested ETL run for all records for this class (looking up
+            #     existing related instances a window at a time if this run
+            #     does).
+            related_status = related_class.run_etl(
+                related_record_list,
+                debug_flag_IN = my_debug_flag,
+                default_time_zone_IN = self.get_default_time_zone(),
+                batch_lookup_size_IN = related_batch_lookup_size,
+                bulk_write_batch_size_IN = related_bulk_write_batch_size,
+                lean_status_IN = self.lean_status,
+                related_batch_size_IN = related_related_batch_size,
+                batch_required_IN = self.do_batch_required,
+                dead_letter_file_path_IN = self.dead_letter_file_path,
+                max_status_message_count_IN = self.max_status_message_count
+            )
+
+            # update counts
+            self.related_record_count += related_status.get_detail_value( self.STATUS_PROP_PROCESSED_RECORD_COUNT, 0 )
+            self.related_error_count += related_status.get_detail_value( self.STATUS_PROP_UPDATE_ERROR_COUNT, 0 )
+
+            # store status
+            status_OUT.add_status_container( related_status )
+            if ( related_status.is_success() == False ):
+
+                # error
+                status_OUT.set_status_code( StatusContainer.STATUS_CODE_ERROR )
+                status_message = "errors running ETL on {record_count} related records for {related_class}: {message_list}".format(
+                    record_count = len( related_record_list ),
+                    related_class = related_class,
+                    message_list = related_status.get_message_list()
+                )
+                self.add_status_message( status_message )
+
+            #-- END check to see if success --#
+
+        #-- END loop over related classes --#
+
+        return status_OUT
+
+    #-- END method flush_related() --#
+
+
+    def get_column_values( self, record_list_IN, key_IN ):
+
+        '''
+        Overrides parent: gets value for key from each record dictionary
+            directly.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        value_OUT = [ current_record.get( key_IN, None ) for current_record in record_list_IN ]
+
+        return value_OUT
+
+    #-- END method get_column_values() --#
+
+
     def get_value_for_key( self, record_IN, key_IN ):
 
         # return reference
@@ -151,6 +374,92 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
     #-- END method get_value_for_key() --#
 
 
+    def has_pending_writes( self ):
+
+        '''
+        Extends parent: also True if related records are waiting for
+            flush_related().
+        '''
+
+        # return reference
+        value_OUT = False
+
+        # call parent, then check related.
+        value_OUT = super().has_pending_writes()
+        if ( ( value_OUT == False ) and ( self.related_pending_count > 0 ) ):
+
+            value_OUT = True
+
+        #-- END check to see if related pending --#
+
+        return value_OUT
+
+    #-- END method has_pending_writes() --#
+
+
+    def process_post_save(
+        self,
+        status_IN,
+        instance_IN,
+        record_IN,
+        related_attr_to_spec_map_IN = None,
+        save_on_success_IN = True
+    ):
+
+        '''
+        Extends parent's process_post_save(): after the post-save hook, if
+            there are related records in the record, calls process_related()
+            to process them, and adds its result to the status.
+
+        Returns the status passed in, updated.
+        '''
+
+        # return reference
+        status_OUT = None
+
+        # declare variables
+        related_status = None
+        phase_start_time = None
+
+        # call parent - post-save hook.
+        status_OUT = super().process_post_save(
+            status_IN,
+            instance_IN,
+            record_IN,
+            related_attr_to_spec_map_IN = related_attr_to_spec_map_IN,
+            save_on_success_IN = save_on_success_IN
+        )
+
+        # any related to process?
+        if ( ( related_attr_to_spec_map_IN is not None ) and ( len( related_attr_to_spec_map_IN ) > 0 ) ):
+
+            # call process_related() method.
+            phase_start_time = self.start_phase_timer()
+            related_status = self.process_related(
+                instance_IN,
+                record_IN,
+                related_attr_to_spec_map_IN,
+                save_on_success_IN = save_on_success_IN
+            )
+            self.stop_phase_timer( ETLInstrumentation.PHASE_RELATED, phase_start_time )
+
+            # process status
+            status_OUT = self.process_result_status(
+                status_OUT,
+                related_status,
+                self.PROP_WAS_INSTANCE_UPDATED,
+                details_IN = None
+            )
+
+        #-- END check if related. --#
+
+        # TODO - post-related hook?
+
+        return status_OUT
+
+    #-- END method process_post_save() --#
+
+
     def process_related(
         self,
         related_to_instance_IN,
@@ -217,7 +526,7 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
         status_OUT.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
         my_debug_flag = self.debug_flag
         #my_debug_flag = True
-        my_etl_spec = self.get_etl_entity()
+        my_etl_spec = self.get_compiled_entity()
         related_to_instance = related_to_instance_IN
         extract_record = record_IN
         related_record_list = None
@@ -285,8 +594,16 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
                             # got a related record list?
                             if ( ( related_record_list is not None ) and ( len( related_record_list ) > 0 ) ):
 
-                                # OK to process?
-                                if ( is_ok_to_process == True ):
+                                # OK to process? Batched, and no custom method?
+                                if ( ( is_ok_to_process == True )
+                                    and ( self.do_batch_related == True )
+                                    and ( ( related_processing_method_name is None ) or ( related_processing_method_name == "" ) ) ):
+
+                                    # yes - save records for one run_etl()
+                                    #     across parents ( flush_related() ).
+                                    self.add_related_records( related_class, related_record_list )
+
+                                elif ( is_ok_to_process == True ):
 
                                     # call method
                                     related_status = self.process_related_call_method(
@@ -443,10 +760,7 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
         my_etl_spec = None
         related_to_instance = None
         extract_record = None
-        extract_record_output = None
         related_attr_spec = None
-        related_attr_spec_output = None
-        param_summary = None
         related_attr_key = None
         related_attr_value = None
         attr_value_type = None
@@ -470,30 +784,14 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
         record_list_OUT = list()
         my_debug_flag = self.debug_flag
         #my_debug_flag = True
-        my_etl_spec = self.get_etl_entity()
+        my_etl_spec = self.get_compiled_entity()
         related_to_instance = related_to_instance_IN
 
-        # init - extract_record
+        # init - extract_record and related_attr_spec (summary of parameters
+        #     for error messages is built only if needed, by
+        #     build_param_summary()).
         extract_record = record_IN
-        if ( extract_record is not None ):
-            extract_record_output = json.dumps( extract_record, indent = 4, sort_keys = True )
-        else:
-            extract_record_output = extract_record
-        #-- END see if we can convert extract_record to JSON string. --#
-
-        # init - related_attr_spec
         related_attr_spec = attr_spec_IN
-        if ( related_attr_spec is not None ):
-            related_attr_spec_output = json.dumps( related_attr_spec.to_json(), indent = 4, sort_keys = True )
-        else:
-            related_attr_spec_output = related_attr_spec
-        #-- END see if we can convert related_attr_spec to JSON string. --#
-
-        param_summary = "param summary\n\n- related_to_instance_IN: {instance}\n\n- record_IN:\n{record}\n\n- ==> attr_spec_IN:\n{related_spec}".format(
-            instance = related_to_instance,
-            record = extract_record_output,
-            related_spec = related_attr_spec_output
-        )
 
         # got an instance?
         if ( related_to_instance is not None ):
@@ -683,7 +981,7 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
 
                     # no related_attr_spec. Error.
                     status_message = "WARNING - No attribute specification passed in. Can't build related record list. {param_summary}".format(
-                        param_summary = param_summary
+                        param_summary = self.build_param_summary( related_to_instance, extract_record, related_attr_spec )
                     )
                     self.output_log_message( status_message, method_IN = me, log_level_code_IN = logging.WARNING, do_print_OUT = my_debug_flag )
                     self.add_status_message( status_message )
@@ -697,7 +995,7 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
 
                 # no record passed in - log error, return error status.
                 status_message = "ERROR - No record passed in to update. Can't build related record list. {param_summary}".format(
-                    param_summary = param_summary
+                    param_summary = self.build_param_summary( related_to_instance, extract_record, related_attr_spec )
                 )
                 self.output_log_message( status_message, method_IN = me, log_level_code_IN = logging.ERROR )
                 self.add_status_message( status_message )
@@ -711,7 +1009,7 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
 
             # no instance passed in - log error, raise exception.
             status_message = "ERROR - No instance passed in to update. Can't build related record list. {param_summary}".format(
-                param_summary = param_summary
+                param_summary = self.build_param_summary( related_to_instance, extract_record, related_attr_spec )
             )
             self.output_log_message( status_message, method_IN = me, log_level_code_IN = logging.ERROR )
             self.add_status_message( status_message )
@@ -926,6 +1224,26 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
     #-- END method process_related_call_method() --#
 
 
+    def reset_related_buffers( self ):
+
+        # related records waiting for flush_related(), by related class.
+        self.related_class_to_record_list_map = {}
+        self.related_pending_count = 0
+
+    #-- END method reset_related_buffers() --#
+
+
+    def reset_status_information( self ):
+
+        # call parent method.
+        super().reset_status_information()
+
+        # clear out related records waiting for flush_related().
+        self.reset_related_buffers()
+
+    #-- END method reset_status_information() --#
+
+
     def update_instance_from_record( self, instance_IN, record_IN, save_on_success_IN = True ):
 
         # return reference
@@ -968,6 +1286,15 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
         was_attr_updated = None
         was_instance_updated = None
         error_status_list = None
+        updated_attr_name_list = None
+        transform_to_attr_name = None
+
+        # declare variables - extra data
+        do_merge_extra_data = None
+        extra_data_name_to_value_map = None
+
+        # declare variables - instrumentation
+        phase_start_time = None
 
         # declare variables - debug
         json_string = None
@@ -979,7 +1306,7 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
         status_OUT = StatusContainer()
         status_OUT.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
         my_debug_flag = self.debug_flag
-        my_etl_spec = self.get_etl_entity()
+        my_etl_spec = self.get_compiled_entity()
         current_entry_instance = instance_IN
         current_record = record_IN
         related_attr_to_spec_map = dict()
@@ -994,6 +1321,7 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
 
         # store supporting information in status instance.
         status_OUT = self.init_status( status_OUT )
+        updated_attr_name_list = status_OUT.get_detail_value( self.PROP_UPDATED_ATTR_NAME_LIST )
 
         # got an instance?
         if ( current_entry_instance is not None ):
@@ -1015,11 +1343,17 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
             related_success = False
             were_related_updated = False
 
+            # attributes not in model are collected, then merged into
+            #     extra_data with one call per record, if instance can.
+            do_merge_extra_data = hasattr( current_entry_instance, "update_extra_data_attrs" )
+            extra_data_name_to_value_map = {}
+
             #------------------------------------------------------------------#
             # ==> process record attributes (loop over names in dictionary)
 
             # loop over keys/names in current record to get values for
             #     each and store in instance.
+            phase_start_time = self.start_phase_timer()
             for current_key, current_value in current_record.items():
 
                 #--------------------------------------------------------------#
@@ -1064,6 +1398,15 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
                         # process value.
                         current_attr_value = self.process_value( current_attr_value, my_etl_attribute, current_entry_instance )
 
+                        # value also transformed into a separate attribute?
+                        #     Track it as changed, so bulk writes include it.
+                        transform_to_attr_name = my_etl_attribute.get_transform_to_attr_name()
+                        if ( ( transform_to_attr_name is not None ) and ( transform_to_attr_name != "" ) ):
+
+                            updated_attr_name_list.append( transform_to_attr_name )
+
+                        #-- END check to see if transform to separate attribute --#
+
                     #-- END check to see if related class. --#
 
                 else:
@@ -1078,11 +1421,31 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
                 # ==> store attribute.
 
                 # do we have an attribute name?
-                if ( ( current_attr_name is not None ) and ( current_attr_name != "" ) ):
+                if ( ( do_merge_extra_data == True )
+                    and ( current_attr_name is not None ) and ( current_attr_name != "" )
+                    and ( hasattr( current_entry_instance, current_attr_name ) == False ) ):
+
+                    # not in model - save for extra_data merge after loop.
+                    extra_data_name_to_value_map[ current_attr_name ] = current_attr_value
+
+                elif ( ( current_attr_name is not None ) and ( current_attr_name != "" ) ):
 
                     # store the value.
                     store_status = self.store_attribute( current_entry_instance, current_attr_name, current_attr_value )
 
+                    # updated? track name of changed instance attribute.
+                    was_attr_updated = store_status.get_detail_value( self.PROP_WAS_ATTR_UPDATED )
+                    if ( was_attr_updated == True ):
+
+                        # unknown attributes are stored in extra_data.
+                        if ( store_status.get_detail_value( self.PROP_WAS_UNKNOWN_ATTR ) == True ):
+                            updated_attr_name_list.append( "extra_data" )
+                        else:
+                            updated_attr_name_list.append( current_attr_name )
+                        #-- END check to see if unknown attribute --#
+
+                    #-- END check to see if attribute updated --#
+
                     # process status
                     store_update_details = store_status.get_detail_value( self.PROP_ATTR_UPDATE_DETAIL )
                     status_OUT = self.process_result_status(
@@ -1107,6 +1470,50 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
 
             #-- END loop values in record --#
 
+            # attributes not in model? Merge into extra_data all at once.
+            if ( len( extra_data_name_to_value_map ) > 0 ):
+
+                store_status = self.store_extra_data( current_entry_instance, extra_data_name_to_value_map )
+                if ( store_status.get_detail_value( self.PROP_WAS_ATTR_UPDATED ) == True ):
+                    updated_attr_name_list.append( "extra_data" )
+                #-- END check to see if extra data changed --#
+
+                status_OUT = self.process_result_status(
+                    status_OUT,
+                    store_status,
+                    self.PROP_WAS_ATTR_UPDATED,
+                    details_IN = store_status.get_detail_value( self.PROP_ATTR_UPDATE_DETAIL )
+                )
+
+            #-- END check to see if extra data --#
+
+            # change detection? Store hash of record, so next time it can be
+            #     skipped if it hasn't changed. Stored directly, not with
+            #     store_attribute(), so the hash isn't counted as an attribute
+            #     updated or not changed.
+            if ( ( self.record_hash_field_name is not None ) and ( self.record_hash is not None ) ):
+
+                store_status = ETLAttribute.store_attribute_in_ldm_instance(
+                    current_entry_instance,
+                    self.record_hash_field_name,
+                    self.record_hash,
+                    lean_status_IN = self.lean_status
+                )
+                if ( store_status.get_detail_value( self.PROP_WAS_ATTR_UPDATED ) == True ):
+                    updated_attr_name_list.append( self.record_hash_field_name )
+                #-- END check to see if hash changed --#
+
+                status_OUT = self.process_result_status(
+                    status_OUT,
+                    store_status,
+                    self.PROP_WAS_ATTR_UPDATED,
+                    details_IN = store_status.get_detail_value( self.PROP_ATTR_UPDATE_DETAIL )
+                )
+
+            #-- END check to see if change detection --#
+
+            self.stop_phase_timer( ETLInstrumentation.PHASE_PROCESS_VALUE, phase_start_time )
+
             #------------------------------------------------------------------#
             # ==> pre-save hook
 
@@ -1130,6 +1537,7 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
                 self.PROP_WAS_INSTANCE_UPDATED,
                 details_IN = None
             )
+            was_updated_pre_save = pre_save_custom_update_status.get_detail_value( self.PROP_WAS_INSTANCE_UPDATED, False )
 
             if ( my_debug_flag == True ):
                 status_message = "OVERALL status ( changed: {changed} ): {status} ".format(
@@ -1157,82 +1565,79 @@ class ETLFromDictionary( ETLDjangoModelLoader ):
                 # All processed. Save?
                 was_instance_updated = status_OUT.get_detail_value( self.PROP_WAS_INSTANCE_UPDATED, None )
                 if ( ( was_instance_updated == True )
-                    and ( save_on_success_IN == True ) ):
+                    and ( save_on_success_IN == True )
+                    and ( self.do_bulk_write == True ) ):
+
+                    # changed, and we are bulk writing - add to buffers. If
+                    #     pre-save hook changed things, we don't know which
+                    #     attributes it touched, so update them all.
+                    if ( was_updated_pre_save == True ):
+                        self.add_instance_to_bulk_write( current_entry_instance, None )
+                    else:
+                        self.add_instance_to_bulk_write( current_entry_instance, updated_attr_name_list )
+                    #-- END check to see if pre-save hook updated --#
 
-                    # changed, and we are saving...
-                    try:
+                    # post-save hook and related records need the saved
+                    #     instance, so wait until flush_bulk_write().
+                    self.add_bulk_post_save( current_entry_instance, current_record, related_attr_to_spec_map )
 
-                        if ( my_debug_flag == True ):
-                            status_message = "attempting save(): {}".format( current_entry_instance )
-                            self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
-                        #-- END DEBUG --#
+                    if ( my_debug_flag == True ):
+                        status_message = "added to bulk write buffers: {} ( changed: {} )".format( current_entry_instance, updated_attr_name_list )
+                        self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
+                    #-- END DEBUG --#
 
-                        current_entry_instance.save()
+                else:
 
-                    except DataError as de:
+                    if ( ( was_instance_updated == True )
+                        and ( save_on_success_IN == True ) ):
 
-                        # log the JSON for the current record...
-                        status_message = "DataError caught save()-ing instance (probably type mismatch). Record:\n{record_json_string}".format(
-                            record_json_string = json.dumps( current_record, indent = 4, sort_keys = True )
-                        )
-                        self.output_log_message(
-                            status_message,
-                            method_IN = me,
-                            log_level_code_IN = logging.ERROR,
-                            do_print_IN = True
-                        )
+                        # changed, and we are saving...
+                        try:
 
-                        # ...then raise the exception again.
-                        raise de
+                            if ( my_debug_flag == True ):
+                                status_message = "attempting save(): {}".format( current_entry_instance )
+                                self.output_debug( status_message, method_IN = me, do_print_IN = my_debug_flag )
+                            #-- END DEBUG --#
 
-                    #-- END try...except --#
+                            phase_start_time = self.start_phase_timer()
+                            current_entry_instance.save()
+                            self.stop_phase_timer( ETLInstrumentation.PHASE_SAVE, phase_start_time )
 
-                    # catching specific excpetions here as they arise. List:
-                    # https://docs.djangoproject.com/en/3.2/ref/exceptions/#database-exceptions
+                        except DataError as de:
 
-                #-- END check to see if we save(). --#
+                            # log the JSON for the current record...
+                            status_message = "DataError caught save()-ing instance (probably type mismatch). Record:\n{record_json_string}".format(
+                                record_json_string = json.dumps( current_record, indent = 4, sort_keys = True )
+                            )
+                            self.output_log_message(
+                                status_message,
+                                method_IN = me,
+                                log_level_code_IN = logging.ERROR,
+                                do_print_IN = True
+                            )
 
-                #--------------------------------------------------------------#
-                # ==> post-save hook
+                            # ...then raise the exception again.
+                            raise de
 
-                # call current_entry_instance.update_from_record_post_save(),
-                #     which can be overridden in a particular class to do
-                #     fancier processing for related records.
-                post_save_custom_update_status = current_entry_instance.update_from_record_post_save( current_record )
+                        #-- END try...except --#
 
-                # process status
-                status_OUT = self.process_result_status(
-                    status_OUT,
-                    post_save_custom_update_status,
-                    self.PROP_WAS_INSTANCE_UPDATED,
-                    details_IN = None
-                )
+                        # catching specific excpetions here as they arise. List:
+                        # https://docs.djangoproject.com/en/3.2/ref/exceptions/#database-exceptions
 
-                #--------------------------------------------------------------#
-                # ==> related instances.
+                    #-- END check to see if we save(). --#
 
-                # any related to process?
-                if ( ( related_attr_to_spec_map is not None ) and ( len( related_attr_to_spec_map ) > 0 ) ):
+                    #----------------------------------------------------------#
+                    # ==> post-save hook and related instances.
 
-                    # call process_related() method.
-                    related_status = self.process_related(
+                    status_OUT = self.process_post_save(
+                        status_OUT,
                         current_entry_instance,
                         current_record,
-                        related_attr_to_spec_map,
+                        related_attr_to_spec_map_IN = related_attr_to_spec_map,
                         save_on_success_IN = save_on_success_IN
                     )
 
-                    # process status
-                    status_OUT = self.process_result_status(
-                        status_OUT,
-                        related_status,
-                        self.PROP_WAS_INSTANCE_UPDATED,
-                        details_IN = None
-                    )
-
-                #-- END check if related. --#
-
-                # TODO - post-related hook?
+                #-- END check to see if bulk write --#
 
             else:
 
@@ -28,6 +28,7 @@ from python_utilities.etl.etl_entity import ETLEntity
 from python_utilities.etl.etl_error import ETLError
 from python_utilities.etl.etl_processor import ETLProcessor
 from python_utilities.etl.etl_object_loader import ETLObjectLoader
+from python_utilities.etl.etl_record_source import ETLRecordSource
 #from python_utilities.etl.etl_django_model_loader import ETLDjangoModelLoader
 from python_utilities.etl.etl_from_dictionary import ETLFromDictionary
 
@@ -52,6 +53,13 @@ class ETLFromExcelWithHeaders( ETLFromDictionary ):
     # logger name
     MY_LOGGER_NAME = "python_utilities.etl.ETLFromExcelWithHeaders"
 
+    # worksheet layout
+    HEADER_ROW_NUMBER = 1
+    FIRST_DATA_ROW_NUMBER = 2
+
+    # status properties - multi-worksheet
+    STATUS_PROP_WORKSHEET_RECORD_COUNT_MAP = "worksheet_record_count_map"
+
 
     #===========================================================================
     # ! ==> class variables
@@ -71,6 +79,30 @@ class ETLFromExcelWithHeaders( ETLFromDictionary ):
     #===========================================================================
 
 
+    @classmethod
+    def get_worksheet_name_list( cls, file_path_IN ):
+
+        '''
+        Accepts path to an Excel file. Returns list of the names of the
+            worksheets in it, in workbook order.
+        '''
+
+        # return reference
+        list_OUT = None
+
+        # declare variables
+        my_workbook = None
+
+        # open workbook read-only (doesn't read the rows), get names.
+        my_workbook = openpyxl.load_workbook( file_path_IN, read_only = True )
+        list_OUT = list( my_workbook.sheetnames )
+        my_workbook.close()
+
+        return list_OUT
+
+    #-- END class method get_worksheet_name_list() --#
+
+
     #===========================================================================
     # ! ==> __init__() method - instance variables
     #===========================================================================
@@ -88,8 +120,23 @@ class ETLFromExcelWithHeaders( ETLFromDictionary ):
         # spec
         #self.etl_entity = None
 
-        # input
+        # input - workbook is only set if opened by load_input_worksheet(), so
+        #     close_input_workbook() only closes workbooks this loader opened.
         self.input_worksheet = None
+        self.input_workbook = None
+
+        # header index for input worksheet - maps of column index to key and
+        #     key to column index, built from the worksheet's header row by
+        #     map_indexes_to_keys(). Kept here as well as in the ETLEntity (
+        #     which might be shared by loaders for other worksheets), and used
+        #     in place of the ETLEntity's maps when compiling it.
+        self.attr_index_to_key_map = None
+        self.attr_key_to_index_map = None
+
+        # read-only streaming mode - if True, rows are streamed from the
+        #     worksheet with iter_rows( values_only = True ) and processed as
+        #     dictionaries, rather than read a cell at a time by row index.
+        self.is_read_only = False
 
         # status - worksheet-level
         #self.status_message_list = []
@@ -113,6 +160,58 @@ class ETLFromExcelWithHeaders( ETLFromDictionary ):
     #===========================================================================
 
 
+    def get_compiled_entity( self ):
+
+        '''
+        Returns frozen, compiled copy of ETLEntity ( ETLCompiledEntity ), with
+            the header index for the input worksheet, if it has been mapped (
+            see map_indexes_to_keys() ). Compiles it the first time it is
+            requested, then reuses it.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        my_etl_spec = None
+
+        # get value
+        value_OUT = self.compiled_entity
+
+        # compiled yet?
+        if ( value_OUT is None ):
+
+            # no - compile, if entity.
+            my_etl_spec = self.get_etl_entity()
+            if ( my_etl_spec is not None ):
+
+                value_OUT = my_etl_spec.compile(
+                    attr_index_to_key_map_IN = self.attr_index_to_key_map,
+                    attr_key_to_index_map_IN = self.attr_key_to_index_map
+                )
+                self.compiled_entity = value_OUT
+
+            #-- END check to see if entity --#
+
+        #-- END check to see if compiled --#
+
+        return value_OUT
+
+    #-- END method get_compiled_entity() --#
+
+
+    def get_dead_letter_record( self, record_IN ):
+
+        '''
+        Overrides parent: returns dictionary of column key to value for the row
+            ( build_record_dictionary() ), rather than the row index.
+        '''
+
+        return self.build_record_dictionary( record_IN )
+
+    #-- END method get_dead_letter_record() --#
+
+
     def get_input_worksheet( self ):
 
         # return reference
@@ -126,6 +225,209 @@ class ETLFromExcelWithHeaders( ETLFromDictionary ):
     #-- END method get_input_worksheet() --#
 
 
+    def build_record_dictionary( self, record_IN ):
+
+        '''
+        Accepts record (row index, or row dictionary in read-only mode).
+            Returns dictionary of column key to value for the row, with values
+            JSON can't hold (dates, etc.) converted to strings.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        my_etl_spec = None
+        my_worksheet = None
+        key_value_list = None
+        current_column_index = None
+        current_cell = None
+        current_column_key = None
+        current_column_value = None
+
+        # init
+        my_etl_spec = self.get_compiled_entity()
+        my_worksheet = self.get_input_worksheet()
+
+        # get keys and values
+        if ( isinstance( record_IN, dict ) == True ):
+
+            key_value_list = record_IN.items()
+
+        else:
+
+            # row index - get cells in row.
+            key_value_list = []
+            for current_column_index, current_cell in enumerate( my_worksheet[ record_IN ], start = 1 ):
+
+                # key for index (index if no header).
+                current_column_key = my_etl_spec.pull_key_for_index( current_column_index )
+                if ( current_column_key is None ):
+                    current_column_key = str( current_column_index )
+                #-- END check to see if key --#
+
+                key_value_list.append( ( current_column_key, current_cell.value ) )
+
+            #-- END loop over cells --#
+
+        #-- END check to see if row dictionary --#
+
+        # make dictionary, converting values JSON can't hold.
+        value_OUT = {}
+        for current_column_key, current_column_value in key_value_list:
+
+            if ( ( current_column_value is not None )
+                and ( isinstance( current_column_value, ( str, int, float, bool ) ) == False ) ):
+
+                current_column_value = str( current_column_value )
+
+            #-- END check to see if JSON-compatible --#
+
+            value_OUT[ str( current_column_key ) ] = current_column_value
+
+        #-- END loop over columns --#
+
+        return value_OUT
+
+    #-- END method build_record_dictionary() --#
+
+
+    def build_record_hash( self, record_IN ):
+
+        '''
+        Extends parent: builds dictionary of column key to value for the row (
+            build_record_dictionary() ), then passes it to parent to hash.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # call parent.
+        value_OUT = super().build_record_hash( self.build_record_dictionary( record_IN ) )
+
+        return value_OUT
+
+    #-- END method build_record_hash() --#
+
+
+    def close_input_workbook( self ):
+
+        '''
+        If this loader opened the input workbook ( load_input_worksheet() ),
+            closes it - read-only workbooks keep the file open until closed.
+            Safe to call more than once.
+        '''
+
+        # opened a workbook?
+        if ( self.input_workbook is not None ):
+
+            self.input_workbook.close()
+            self.input_workbook = None
+
+        #-- END check to see if workbook opened --#
+
+    #-- END method close_input_workbook() --#
+
+
+    def get_column_values( self, record_list_IN, key_IN ):
+
+        '''
+        Overrides parent: in read-only mode, records are dictionaries, so calls
+            parent. If not, records are row indexes, so gets value for each
+            with get_value_for_key().
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # read-only?
+        if ( self.is_read_only == True ):
+
+            # row dictionaries - call parent
+            value_OUT = super().get_column_values( record_list_IN, key_IN )
+
+        else:
+
+            # row indexes
+            value_OUT = [ self.get_value_for_key( current_row_index, key_IN ) for current_row_index in record_list_IN ]
+
+        #-- END check to see if read-only --#
+
+        return value_OUT
+
+    #-- END method get_column_values() --#
+
+
+    def get_record_count( self ):
+
+        '''
+        In read-only mode, returns number of data rows from worksheet
+            dimensions (None if the file doesn't say). If not, calls parent.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        row_count = None
+
+        # read-only?
+        if ( self.is_read_only == True ):
+
+            # rows from dimensions, minus header.
+            row_count = self.get_input_worksheet().max_row
+            if ( row_count is not None ):
+
+                value_OUT = max( 0, row_count - self.HEADER_ROW_NUMBER )
+
+            #-- END check to see if row count --#
+
+        else:
+
+            # call parent
+            value_OUT = super().get_record_count()
+
+        #-- END check to see if read-only --#
+
+        return value_OUT
+
+    #-- END method get_record_count() --#
+
+
+    def get_record_iterator( self, start_index_IN = None, record_count_IN = None, use_islice_IN = False ):
+
+        '''
+        In read-only mode, streams rows from worksheet as dictionaries (
+            iter_worksheet_records() ), subset to start index and count. If
+            not, calls parent.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # read-only?
+        if ( self.is_read_only == True ):
+
+            # stream rows.
+            value_OUT = self.iter_worksheet_records()
+            value_OUT = ETLRecordSource.subset_iterator( value_OUT, start_index_IN, record_count_IN )
+
+        else:
+
+            # call parent
+            value_OUT = super().get_record_iterator(
+                start_index_IN = start_index_IN,
+                record_count_IN = record_count_IN,
+                use_islice_IN = use_islice_IN
+            )
+
+        #-- END check to see if read-only --#
+
+        return value_OUT
+
+    #-- END method get_record_iterator() --#
+
+
     def get_value_for_key( self, record_IN, key_IN ):
 
         # return reference
@@ -162,7 +464,7 @@ class ETLFromExcelWithHeaders( ETLFromDictionary ):
 
             # get spec information
             my_worksheet = self.get_input_worksheet()
-            my_etl_spec = self.get_etl_entity()
+            my_etl_spec = self.get_compiled_entity()
 
             if ( my_debug_flag == True ):
                 status_message = "Getting value for key: {}".format( key_IN )
@@ -227,6 +529,103 @@ class ETLFromExcelWithHeaders( ETLFromDictionary ):
     #-- END method get_value_for_key() --#
 
 
+    def iter_worksheet_records( self ):
+
+        '''
+        Generator that streams the data rows of the input worksheet, reading
+            each row once with iter_rows( values_only = True ), and yields
+            each as a dictionary of column key (from the header row, as mapped
+            by map_indexes_to_keys()) to value.
+        '''
+
+        # declare variables
+        my_worksheet = None
+        my_etl_spec = None
+        index_to_key_map = None
+        index_key_list = None
+        row_value_tuple = None
+        row_length = None
+        record_dictionary = None
+        current_column_index = None
+        current_column_key = None
+
+        # init
+        my_worksheet = self.get_input_worksheet()
+        my_etl_spec = self.get_compiled_entity()
+        index_to_key_map = my_etl_spec.get_attr_index_to_key_map()
+
+        # list of ( 0-based position in row, key ) pairs.
+        index_key_list = []
+        for current_column_index, current_column_key in index_to_key_map.items():
+
+            index_key_list.append( ( current_column_index - 1, current_column_key ) )
+
+        #-- END loop over index map --#
+
+        # stream rows.
+        for row_value_tuple in my_worksheet.iter_rows( min_row = self.FIRST_DATA_ROW_NUMBER, values_only = True ):
+
+            # make dictionary (short rows - missing cells are None).
+            row_length = len( row_value_tuple )
+            record_dictionary = {}
+            for current_column_index, current_column_key in index_key_list:
+
+                if ( current_column_index < row_length ):
+                    record_dictionary[ current_column_key ] = row_value_tuple[ current_column_index ]
+                else:
+                    record_dictionary[ current_column_key ] = None
+                #-- END check to see if cell in row --#
+
+            #-- END loop over columns --#
+
+            yield record_dictionary
+
+        #-- END loop over rows --#
+
+    #-- END method iter_worksheet_records() --#
+
+
+    def load_input_worksheet( self, file_path_IN, worksheet_name_IN = None, read_only_IN = True ):
+
+        '''
+        Opens the Excel file at the path passed in, and sets the worksheet
+            with the name passed in (or the active worksheet if no name) as the
+            input worksheet. If read_only_IN is True (the default), opens the
+            workbook in openpyxl's read-only mode, so rows are streamed from
+            the file rather than loaded into memory all at once. Cells contain
+            values, not formulas. Close the workbook with
+            close_input_workbook() when done (run_etl() does this).
+
+        Returns the worksheet.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        my_workbook = None
+        my_worksheet = None
+
+        # close workbook opened earlier, if any, then open workbook...
+        self.close_input_workbook()
+        my_workbook = openpyxl.load_workbook( file_path_IN, read_only = read_only_IN, data_only = True )
+        self.input_workbook = my_workbook
+
+        # ...get worksheet...
+        if ( worksheet_name_IN is not None ):
+            my_worksheet = my_workbook[ worksheet_name_IN ]
+        else:
+            my_worksheet = my_workbook.active
+        #-- END check to see if worksheet name --#
+
+        # ...and store it.
+        value_OUT = self.set_input_worksheet( my_worksheet )
+
+        return value_OUT
+
+    #-- END method load_input_worksheet() --#
+
+
     def map_indexes_to_keys( self ):
 
         # declare variables
@@ -243,6 +642,7 @@ class ETLFromExcelWithHeaders( ETLFromDictionary ):
         # declare variables - column processing
         column_count = None
         header_row_number = None
+        header_value_list = None
         current_column_index = None
         current_cell = None
         current_column_name = None
@@ -264,15 +664,35 @@ class ETLFromExcelWithHeaders( ETLFromDictionary ):
         missing_attr_list = []
 
         # initialize processing
-        column_count = my_worksheet.max_column
-        header_row_number = 1
+        header_row_number = self.HEADER_ROW_NUMBER
 
-        # loop over columns to get value from first row for each.
-        for current_column_index in range( 1, column_count + 1 ):
+        # get values from first row.
+        if ( self.is_read_only == True ):
+
+            # read-only - stream just the header row.
+            header_value_list = []
+            for header_value_list in my_worksheet.iter_rows( min_row = header_row_number, max_row = header_row_number, values_only = True ):
+
+                header_value_list = list( header_value_list )
+
+            #-- END loop over header row --#
+
+        else:
+
+            # retrieve value for each cell
+            column_count = my_worksheet.max_column
+            header_value_list = []
+            for current_column_index in range( 1, column_count + 1 ):
 
-            # retrieve value for this cell
-            current_cell = my_worksheet.cell( row = header_row_number, column = current_column_index )
-            current_column_name = current_cell.value
+                current_cell = my_worksheet.cell( row = header_row_number, column = current_column_index )
+                header_value_list.append( current_cell.value )
+
+            #-- END loop over columns --#
+
+        #-- END check to see if read-only --#
+
+        # loop over columns to get value from first row for each.
+        for current_column_index, current_column_name in enumerate( header_value_list, start = 1 ):
 
             # store in index-to-name map
             index_to_key_map[ current_column_index ] = current_column_name
@@ -300,10 +720,17 @@ class ETLFromExcelWithHeaders( ETLFromDictionary ):
 
         #-- END loop over columns in 1st row --#
 
-        # store the maps.
+        # store the maps, for this worksheet...
+        self.attr_index_to_key_map = index_to_key_map
+        self.attr_key_to_index_map = key_to_index_map
+
+        # ...and in spec.
         my_etl_spec.set_attr_index_to_key_map( index_to_key_map )
         my_etl_spec.set_attr_key_to_index_map( key_to_index_map )
 
+        # header index changed - compile again when needed.
+        self.reset_compiled_entity()
+
         # store unknown attributes.
         self.set_unknown_attrs_list( missing_attr_list )
 
@@ -327,7 +754,7 @@ class ETLFromExcelWithHeaders( ETLFromDictionary ):
         row_index_iterator = None
 
         # init
-        first_data_row_index = 2
+        first_data_row_index = self.FIRST_DATA_ROW_NUMBER
 
         # store value
         self.input_worksheet = value_IN
@@ -335,6 +762,11 @@ class ETLFromExcelWithHeaders( ETLFromDictionary ):
         # clear out status variables.
         self.reset_status_information()
 
+        # new worksheet - header index needs to be mapped again.
+        self.attr_index_to_key_map = None
+        self.attr_key_to_index_map = None
+        self.reset_compiled_entity()
+
         # return value
         value_OUT = self.get_input_worksheet()
 
@@ -342,17 +774,27 @@ class ETLFromExcelWithHeaders( ETLFromDictionary ):
         #     worksheet, starting with row 2 (skipping header row).
         my_worksheet = value_OUT
 
-        # get row count...
-        row_count = my_worksheet.max_row
+        # read-only workbook? If so, stream rows ( get_record_iterator() ).
+        self.is_read_only = ( getattr( my_worksheet.parent, "read_only", False ) == True )
+        if ( self.is_read_only == True ):
+
+            # no list of row indexes.
+            self.set_record_list( None )
 
-        # ...make list of row indexes...
-        first_data_row_index = 2
-        end_data_row_index = row_count
-        row_index_list = range( first_data_row_index, end_data_row_index + 1 )
+        else:
+
+            # get row count...
+            row_count = my_worksheet.max_row
+
+            # ...make list of row indexes...
+            end_data_row_index = row_count
+            row_index_list = range( first_data_row_index, end_data_row_index + 1 )
 
-        # ...and store list (from which iterator can be made each time it is
-        #     needed).
-        self.set_record_list( row_index_list )
+            # ...and store list (from which iterator can be made each time it is
+            #     needed).
+            self.set_record_list( row_index_list )
+
+        #-- END check to see if read-only --#
 
         return value_OUT
 
@@ -379,6 +821,7 @@ class ETLFromExcelWithHeaders( ETLFromDictionary ):
         current_cell = None
         current_column_value = None
         current_column_key = None
+        row_key_value_list = None
         current_attr_name = None
         current_attr_value = None
         my_etl_attribute = None
@@ -390,10 +833,11 @@ class ETLFromExcelWithHeaders( ETLFromDictionary ):
         status_OUT = StatusContainer()
         status_OUT.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
         my_debug_flag = self.debug_flag
-        my_etl_spec = self.get_etl_entity()
+        my_etl_spec = self.get_compiled_entity()
         current_entry_instance = instance_IN
         current_row_index = record_IN
         record_dictionary = {}
+        my_worksheet = self.get_input_worksheet()
 
         # store supporting information in status instance.
         status_OUT = self.init_status( status_OUT )
@@ -401,28 +845,42 @@ class ETLFromExcelWithHeaders( ETLFromDictionary ):
         # got an instance?
         if ( current_entry_instance is not None ):
 
-            # get worksheet
-            my_worksheet = self.get_input_worksheet()
-            row_count = my_worksheet.max_row
-            column_count = my_worksheet.max_column
+            # get column keys and values - either from row dictionary
+            #     streamed in read-only mode...
+            if ( isinstance( record_IN, dict ) == True ):
+
+                row_key_value_list = record_IN.items()
+
+            else:
+
+                # ...or from cells in the row with the index passed in.
+                column_count = my_worksheet.max_column
+                row_key_value_list = []
+                for current_column_index in range( 1, column_count + 1 ):
+
+                    # value --> retrieve value for this cell
+                    current_cell = my_worksheet.cell( row = current_row_index, column = current_column_index )
+                    current_column_value = current_cell.value
+
+                    # key --> get key for index.
+                    current_column_key = my_etl_spec.pull_key_for_index( current_column_index )
+
+                    row_key_value_list.append( ( current_column_key, current_column_value ) )
+
+                #-- END loop over columns in row --#
+
+            #-- END check to see if row dictionary --#
 
             #------------------------------------------------------------------#
             # ==> process record attributes (loop over columns in row)
 
             # loop over columns to get values for each column and create a
             #     dictionary that we'll pass on to parent method.
-            for current_column_index in range( 1, column_count + 1 ):
+            for current_column_key, current_column_value in row_key_value_list:
 
                 #--------------------------------------------------------------#
                 # ==> get attribute spec, name and value
 
-                # value --> retrieve value for this cell
-                current_cell = my_worksheet.cell( row = current_row_index, column = current_column_index )
-                current_column_value = current_cell.value
-
-                # key --> get key for index.
-                current_column_key = my_etl_spec.pull_key_for_index( current_column_index )
-
                 # start with attribute value set to column value
                 current_attr_value = current_column_value
 
@@ -0,0 +1,369 @@
+#===============================================================================
+# imports
+#===============================================================================
+
+
+# base python libraries
+import datetime
+import json
+import logging
+import math
+import random
+import time
+
+
+#===============================================================================
+# class ETLInstrumentation
+#===============================================================================
+
+
+# lineage: object
+class ETLInstrumentation( object ):
+
+
+    '''
+    ETLInstrumentation collects timing information for an ETL run: total time
+        and count for each processing phase (check required, find instance to
+        load into, process values, save, related records), time taken by each
+        record (for records per second and latency percentiles), and the
+        number of database queries.
+
+    Memory for record times is bounded: the count, total and maximum are kept
+        exactly, but only a fixed-size random sample of the times themselves
+        (reservoir sampling, record_sample_size times, 10,000 by default) is
+        kept for percentiles. Up to that many records, percentiles are exact;
+        after, they are estimates from the sample.
+
+    build_summary() returns all of it in a dictionary, and write_json_line()
+        appends that dictionary to a JSON Lines file, one line per run.
+
+    Times are in seconds, from time.perf_counter().
+    '''
+
+
+    #===========================================================================
+    # CONSTANTS-ish
+    #===========================================================================
+
+
+    # logger name
+    MY_LOGGER_NAME = "python_utilities.etl.ETLInstrumentation"
+
+    # phases
+    PHASE_HAS_REQUIRED = "has_required"
+    PHASE_FIND_LOAD_INSTANCE = "find_load_instance"
+    PHASE_PROCESS_VALUE = "process_value"
+    PHASE_SAVE = "save"
+    PHASE_RELATED = "related"
+
+    # summary properties
+    PROP_LABEL = "label"
+    PROP_START_DATETIME = "start_datetime"
+    PROP_RECORD_COUNT = "record_count"
+    PROP_ELAPSED_SECONDS = "elapsed_seconds"
+    PROP_RECORDS_PER_SECOND = "records_per_second"
+    PROP_RECORD_P50_SECONDS = "record_p50_seconds"
+    PROP_RECORD_P99_SECONDS = "record_p99_seconds"
+    PROP_RECORD_MAX_SECONDS = "record_max_seconds"
+    PROP_PHASE_TIMING = "phase_timing"
+    PROP_PHASE_COUNT = "count"
+    PROP_PHASE_TOTAL_SECONDS = "total_seconds"
+    PROP_PHASE_AVERAGE_SECONDS = "average_seconds"
+    PROP_QUERY_COUNT = "query_count"
+
+    # record times kept for percentiles.
+    DEFAULT_RECORD_SAMPLE_SIZE = 10000
+
+
+    #===========================================================================
+    # ! ==> class variables
+    #===========================================================================
+
+
+    # debug_flag
+    debug_flag = False
+
+
+    #===========================================================================
+    # ! ==> class methods
+    #===========================================================================
+
+
+    @classmethod
+    def get_percentile( cls, sorted_list_IN, percentile_IN ):
+
+        '''
+        Accepts a sorted list of numbers and a percentile (0 to 100). Returns
+            the value at that percentile using the nearest-rank method, or None
+            if the list is empty.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        list_length = None
+        rank = None
+
+        # anything in list?
+        list_length = len( sorted_list_IN )
+        if ( list_length > 0 ):
+
+            # nearest rank, 1-indexed, at least 1.
+            rank = int( math.ceil( ( percentile_IN / 100.0 ) * list_length ) )
+            rank = max( 1, rank )
+            value_OUT = sorted_list_IN[ rank - 1 ]
+
+        #-- END check to see if anything in list --#
+
+        return value_OUT
+
+    #-- END class method get_percentile() --#
+
+
+    #===========================================================================
+    # ! ==> __init__() method - instance variables
+    #===========================================================================
+
+
+    def __init__( self, label_IN = None, record_sample_size_IN = DEFAULT_RECORD_SAMPLE_SIZE ):
+
+        '''
+        Constructor
+        '''
+
+        # call parent's __init__()
+        super().__init__()
+
+        # label for run (name of class being loaded, for example).
+        self.label = label_IN
+
+        # run timing
+        self.start_dt = None
+        self.start_time = None
+        self.stop_time = None
+
+        # phase timing
+        self.phase_to_seconds_map = {}
+        self.phase_to_count_map = {}
+
+        # record timing - count and max of all, random sample for percentiles.
+        self.record_count = 0
+        self.record_max_seconds = None
+        self.record_sample_size = record_sample_size_IN
+        self.record_seconds_sample_list = []
+        self.record_sampler = random.Random()
+
+        # queries
+        self.query_count = 0
+
+    #-- END constructor --#
+
+
+    #===========================================================================
+    # ! ==> instance methods
+    #===========================================================================
+
+
+    def add_phase_time( self, phase_name_IN, seconds_IN ):
+
+        '''
+        Adds time passed in to total for the phase, and increments its count.
+        '''
+
+        self.phase_to_seconds_map[ phase_name_IN ] = self.phase_to_seconds_map.get( phase_name_IN, 0.0 ) + seconds_IN
+        self.phase_to_count_map[ phase_name_IN ] = self.phase_to_count_map.get( phase_name_IN, 0 ) + 1
+
+    #-- END method add_phase_time() --#
+
+
+    def add_record_time( self, seconds_IN ):
+
+        '''
+        Counts a record, and the time it took to process it. The time is kept
+            for percentiles if the sample isn't full yet, or, once it is, in
+            place of a random sample entry, with probability sample size /
+            record count (reservoir sampling - every record has the same
+            chance of being in the sample).
+        '''
+
+        # declare variables
+        sample_index = None
+
+        # count, max.
+        self.record_count += 1
+        if ( ( self.record_max_seconds is None ) or ( seconds_IN > self.record_max_seconds ) ):
+            self.record_max_seconds = seconds_IN
+        #-- END check to see if new max --#
+
+        # sample.
+        if ( len( self.record_seconds_sample_list ) < self.record_sample_size ):
+
+            # not full - keep it.
+            self.record_seconds_sample_list.append( seconds_IN )
+
+        else:
+
+            # full - replace a random entry, or not.
+            sample_index = self.record_sampler.randrange( self.record_count )
+            if ( sample_index < self.record_sample_size ):
+                self.record_seconds_sample_list[ sample_index ] = seconds_IN
+            #-- END check to see if replacing --#
+
+        #-- END check to see if sample full --#
+
+    #-- END method add_record_time() --#
+
+
+    def build_summary( self ):
+
+        '''
+        Returns dictionary of timing information for the run: record count,
+            elapsed seconds, records per second, record latency percentiles
+            (from the sample of record times - estimates past sample size),
+            count, total and average seconds for each phase, and query count.
+            If stop() hasn't been called, elapsed time is up to now.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        record_count = None
+        stop_time = None
+        elapsed_seconds = None
+        records_per_second = None
+        sorted_seconds_list = None
+        phase_timing_map = None
+        phase_name = None
+        phase_seconds = None
+        phase_count = None
+        start_datetime = None
+
+        # init
+        record_count = self.record_count
+        sorted_seconds_list = sorted( self.record_seconds_sample_list )
+
+        # elapsed
+        stop_time = self.stop_time
+        if ( stop_time is None ):
+            stop_time = time.perf_counter()
+        #-- END check to see if stopped --#
+
+        elapsed_seconds = 0.0
+        if ( self.start_time is not None ):
+            elapsed_seconds = stop_time - self.start_time
+        #-- END check to see if started --#
+
+        # throughput
+        records_per_second = None
+        if ( elapsed_seconds > 0 ):
+            records_per_second = record_count / elapsed_seconds
+        #-- END check to see if any time elapsed --#
+
+        # phases
+        phase_timing_map = {}
+        for phase_name, phase_seconds in self.phase_to_seconds_map.items():
+
+            phase_count = self.phase_to_count_map.get( phase_name, 0 )
+            phase_timing_map[ phase_name ] = {
+                self.PROP_PHASE_COUNT : phase_count,
+                self.PROP_PHASE_TOTAL_SECONDS : phase_seconds,
+                self.PROP_PHASE_AVERAGE_SECONDS : ( phase_seconds / phase_count ) if ( phase_count > 0 ) else None
+            }
+
+        #-- END loop over phases --#
+
+        # start datetime
+        if ( self.start_dt is not None ):
+            start_datetime = self.start_dt.isoformat()
+        #-- END check to see if start datetime --#
+
+        value_OUT = {
+            self.PROP_LABEL : self.label,
+            self.PROP_START_DATETIME : start_datetime,
+            self.PROP_RECORD_COUNT : record_count,
+            self.PROP_ELAPSED_SECONDS : elapsed_seconds,
+            self.PROP_RECORDS_PER_SECOND : records_per_second,
+            self.PROP_RECORD_P50_SECONDS : self.get_percentile( sorted_seconds_list, 50 ),
+            self.PROP_RECORD_P99_SECONDS : self.get_percentile( sorted_seconds_list, 99 ),
+            self.PROP_RECORD_MAX_SECONDS : self.record_max_seconds,
+            self.PROP_PHASE_TIMING : phase_timing_map,
+            self.PROP_QUERY_COUNT : self.query_count
+        }
+
+        return value_OUT
+
+    #-- END method build_summary() --#
+
+
+    def count_query( self, execute_IN, sql_IN, params_IN, many_IN, context_IN ):
+
+        '''
+        Django database execute wrapper ( connection.execute_wrapper() ) that
+            counts queries, then runs them.
+        '''
+
+        # count...
+        self.query_count += 1
+
+        # ...and execute.
+        return execute_IN( sql_IN, params_IN, many_IN, context_IN )
+
+    #-- END method count_query() --#
+
+
+    def start( self ):
+
+        '''
+        Starts run timer.
+        '''
+
+        self.start_dt = datetime.datetime.now()
+        self.start_time = time.perf_counter()
+        self.stop_time = None
+
+    #-- END method start() --#
+
+
+    def stop( self ):
+
+        '''
+        Stops run timer.
+        '''
+
+        self.stop_time = time.perf_counter()
+
+    #-- END method stop() --#
+
+
+    def write_json_line( self, file_path_IN ):
+
+        '''
+        Appends summary of run ( build_summary() ) as a line of JSON to the
+            file at the path passed in. Returns the summary.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        json_string = None
+
+        # build summary...
+        value_OUT = self.build_summary()
+        json_string = json.dumps( value_OUT, sort_keys = True )
+
+        # ...and append to file.
+        with open( file_path_IN, "a", encoding = "utf-8" ) as json_lines_file:
+
+            json_lines_file.write( json_string + "\n" )
+
+        #-- END with open() --#
+
+        return value_OUT
+
+    #-- END method write_json_line() --#
+
+
+#-- END class ETLInstrumentation --#
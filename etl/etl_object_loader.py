@@ -63,11 +63,17 @@ class ETLObjectLoader( ETLProcessor ):
     # status properties for a particular record
     PROP_WAS_INSTANCE_UPDATED = "was_instance_updated"
     PROP_UPDATED_ATTR_LIST = "updated_attr_list"
+    PROP_UPDATED_ATTR_NAME_LIST = "updated_attr_name_list"
     PROP_NO_CHANGE_ATTR_LIST = "no_change_attr_list"
     PROP_ERROR_ATTR_LIST = "error_attr_list"
     PROP_SUCCESS_STATUS_LIST = "success_status_list"
     PROP_ERROR_STATUS_LIST = "error_status_list"
 
+    # status properties - attribute store counts
+    STATUS_PROP_ATTR_UPDATED_COUNT = "attr_updated_count"
+    STATUS_PROP_ATTR_NOT_CHANGED_COUNT = "attr_not_changed_count"
+    STATUS_PROP_ATTR_UNKNOWN_COUNT = "attr_unknown_count"
+
 
     #===========================================================================
     # ! ==> class variables
@@ -118,6 +124,12 @@ class ETLObjectLoader( ETLProcessor ):
         # status - row-level
         #self.unknown_attrs_name_to_value_map = {}
 
+        # status - attribute store counts
+        self.lean_status = False
+        self.attr_updated_count = 0
+        self.attr_not_changed_count = 0
+        self.attr_unknown_count = 0
+
         # debug
         self.debug_flag = False
         self.include_detailed_status = True
@@ -147,6 +159,7 @@ class ETLObjectLoader( ETLProcessor ):
         # init
         status_OUT.set_detail_value( self.PROP_WAS_INSTANCE_UPDATED, False )
         status_OUT.set_detail_value( self.PROP_UPDATED_ATTR_LIST, list() )
+        status_OUT.set_detail_value( self.PROP_UPDATED_ATTR_NAME_LIST, list() )
         status_OUT.set_detail_value( self.PROP_NO_CHANGE_ATTR_LIST, list() )
         status_OUT.set_detail_value( self.PROP_ERROR_ATTR_LIST, list() )
         status_OUT.set_detail_value( self.PROP_SUCCESS_STATUS_LIST, list() )
@@ -336,12 +349,27 @@ class ETLObjectLoader( ETLProcessor ):
     #-- END method process_value() --#
 
 
+    def reset_status_information( self ):
+
+        # call parent
+        super().reset_status_information()
+
+        # status - attribute store counts
+        self.attr_updated_count = 0
+        self.attr_not_changed_count = 0
+        self.attr_unknown_count = 0
+
+    #-- END method reset_status_information() --#
+
+
     def store_attribute( self, instance_IN, attr_name_IN, attr_value_IN ):
 
         '''
         postconditions: In StatusContainer returned, expects
             self.PROP_WAS_ATTR_UPDATED to be set to boolean True if updated,
-            False if not.
+            False if not. Counts of attributes updated, not changed, and not
+            in the model (stored in extra data) are kept in this instance. If
+            self.lean_status is True, status messages are not built.
         '''
 
         # return reference
@@ -350,11 +378,63 @@ class ETLObjectLoader( ETLProcessor ):
         # declare variables
         me = "store_attribute"
 
-        status_OUT = ETLAttribute.store_attribute_in_ldm_instance( instance_IN, attr_name_IN, attr_value_IN )
+        status_OUT = ETLAttribute.store_attribute_in_ldm_instance(
+            instance_IN,
+            attr_name_IN,
+            attr_value_IN,
+            lean_status_IN = self.lean_status
+        )
+
+        # update counts
+        if ( status_OUT.get_detail_value( self.PROP_WAS_ATTR_UPDATED ) == True ):
+            self.attr_updated_count += 1
+        else:
+            self.attr_not_changed_count += 1
+        #-- END check to see if updated --#
+
+        if ( status_OUT.get_detail_value( self.PROP_WAS_UNKNOWN_ATTR ) == True ):
+            self.attr_unknown_count += 1
+        #-- END check to see if unknown attribute --#
 
         return status_OUT
 
     #-- END method store_attribute() --#
 
 
+    def store_extra_data( self, instance_IN, attr_name_to_value_map_IN ):
+
+        '''
+        Accepts instance and dictionary of names and values of attributes that
+            are not in the instance's model. Merges them all into the
+            instance's extra_data in one call. Counts are kept the same as if
+            each had been passed to store_attribute(): each attribute is
+            counted as unknown, and as updated or not changed.
+
+        postconditions: In StatusContainer returned, expects
+            self.PROP_WAS_ATTR_UPDATED to be set to boolean True if any of the
+            attributes were updated, False if not.
+        '''
+
+        # return reference
+        status_OUT = None
+
+        # declare variables
+        me = "store_extra_data"
+
+        status_OUT = ETLAttribute.store_extra_data_in_ldm_instance(
+            instance_IN,
+            attr_name_to_value_map_IN,
+            lean_status_IN = self.lean_status
+        )
+
+        # update counts
+        self.attr_updated_count += status_OUT.get_detail_value( ETLAttribute.PROP_EXTRA_DATA_CHANGED_COUNT, 0 )
+        self.attr_not_changed_count += status_OUT.get_detail_value( ETLAttribute.PROP_EXTRA_DATA_NOT_CHANGED_COUNT, 0 )
+        self.attr_unknown_count += len( attr_name_to_value_map_IN )
+
+        return status_OUT
+
+    #-- END method store_extra_data() --#
+
+
 #-- END class ETLObjectLoader --#
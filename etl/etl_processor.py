@@ -25,11 +25,15 @@ import pytz
 
 # python_utilities
 from python_utilities.logging.logging_helper import LoggingHelper
+from python_utilities.status.bounded_message_list import BoundedMessageList
 
 # ETL imports
 from python_utilities.etl.etl_attribute import ETLAttribute
+from python_utilities.etl.etl_dead_letter_sink import ETLDeadLetterSink
 from python_utilities.etl.etl_entity import ETLEntity
 from python_utilities.etl.etl_error import ETLError
+from python_utilities.etl.etl_instrumentation import ETLInstrumentation
+from python_utilities.etl.etl_record_source import ETLRecordSource
 
 
 #===============================================================================
@@ -68,6 +72,13 @@ class ETLProcessor( object ):
     STATUS_PROP_UPDATE_ERROR_COUNT = "update_error_count"
     STATUS_PROP_UPDATE_SUCCESS_COUNT = "update_success_count"
     STATUS_PROP_UPDATED_RECORD_COUNT = "updated_record_count"
+    STATUS_PROP_INSTRUMENTATION = "instrumentation"
+    STATUS_PROP_MISSING_REQUIRED_COUNT = "missing_required_count"
+    STATUS_PROP_MISSING_REQUIRED_KEY_COUNT_MAP = "missing_required_key_count_map"
+    STATUS_PROP_DEAD_LETTER_COUNT = "dead_letter_count"
+    STATUS_PROP_DEAD_LETTER_REASON_COUNT_MAP = "dead_letter_reason_count_map"
+    STATUS_PROP_DROPPED_STATUS_MESSAGE_COUNT = "dropped_status_message_count"
+    STATUS_PROP_STATUS_MESSAGE_CATEGORY_COUNT_MAP = "status_message_category_count_map"
 
     #===========================================================================
     # ! ==> class variables
@@ -179,14 +190,21 @@ class ETLProcessor( object ):
         # call parent's __init__()
         super().__init__()
 
-        # spec
+        # spec - compiled_entity is a frozen copy of etl_entity, built when
+        #     first requested ( get_compiled_entity() ), used when processing.
         self.etl_entity = None
+        self.compiled_entity = None
 
         # input
         self.record_list = None
+        self.record_source = None
         #self.record_iterator = None
 
-        # status - batch-level
+        # status - batch-level - if max_status_message_count is set, status
+        #     messages are kept in a BoundedMessageList that holds the first
+        #     and last half of that many, and counts the rest, by category (
+        #     see make_status_message_list() ).
+        self.max_status_message_count = None
         self.status_message_list = []
         self.latest_status = None
         self.unknown_attrs_list = []
@@ -198,6 +216,20 @@ class ETLProcessor( object ):
         self.unknown_attrs_name_to_value_map = {}
         self.missing_field_list = []
 
+        # instrumentation - if do_instrumentation is True, process_records()
+        #     stores an ETLInstrumentation instance in self.instrumentation,
+        #     and if instrumentation_file_path is set, appends summary to it
+        #     as JSON line.
+        self.do_instrumentation = False
+        self.instrumentation = None
+        self.instrumentation_file_path = None
+
+        # dead letters - if dead_letter_file_path is set, process_records()
+        #     stores an ETLDeadLetterSink in self.dead_letter_sink, and records
+        #     that fail are written to it ( write_dead_letter() ).
+        self.dead_letter_file_path = None
+        self.dead_letter_sink = None
+
         # debug
         self.debug_flag = False
 
@@ -239,7 +271,7 @@ class ETLProcessor( object ):
     #===========================================================================
 
 
-    def add_status_message( self, value_IN, do_print_IN = False ):
+    def add_status_message( self, value_IN, do_print_IN = False, category_IN = None ):
 
         # declare variables
         status_list = None
@@ -251,8 +283,22 @@ class ETLProcessor( object ):
         # get status list
         status_list = self.get_status_message_list()
 
-        # add status.
-        status_list.append( value_IN )
+        # limit set since list was made? Switch to bounded list.
+        if ( ( self.max_status_message_count is not None )
+            and ( isinstance( status_list, BoundedMessageList ) == False ) ):
+
+            status_list = self.make_status_message_list()
+            status_list.extend( self.get_status_message_list() )
+            self.set_status_message_list( status_list )
+
+        #-- END check to see if bounded list needed --#
+
+        # add status (with category, if bounded).
+        if ( isinstance( status_list, BoundedMessageList ) == True ):
+            status_list.append( value_IN, category_IN = category_IN )
+        else:
+            status_list.append( value_IN )
+        #-- END check to see if bounded --#
 
         # print?
         if ( ( do_print_IN == True ) or ( debug_flag == True ) ):
@@ -263,6 +309,189 @@ class ETLProcessor( object ):
     #-- END method add_status_message() --#
 
 
+    def build_required_mask( self, record_list_IN ):
+
+        '''
+        Accepts list of records. Checks required keys across all the records at
+            once, a column (key) at a time ( get_column_values() ), rather than
+            a record at a time like has_required(). Value is missing if None or
+            empty string, same as has_required().
+
+        Limitation: records here are python objects (dictionaries, worksheet
+            row indexes), so pulling out each column and checking its values
+            are still python loops, one step per record per required key -
+            this saves the per-record method calls of has_required(), but is
+            not vectorized. Loaders don't depend on pandas, so the vectorized
+            check ( DataFrame.isna() over a chunk ) is only in
+            ETLFromDataFrame.filter_required(), for DataFrame input.
+
+        Returns tuple of:
+        - list of booleans, one per record, True if record has all required
+            values, False if not.
+        - dictionary of required key to count of records missing a value for
+            that key (only keys with missing values).
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        my_etl_spec = None
+        required_attr_key_list = None
+        has_required_list = None
+        missing_key_to_count_map = None
+        current_required_key = None
+        column_value_list = None
+        missing_index_list = None
+        missing_index = None
+        current_index = None
+        current_value = None
+
+        # init
+        my_etl_spec = self.get_compiled_entity()
+        required_attr_key_list = my_etl_spec.get_required_attr_key_tuple()
+        has_required_list = [ True ] * len( record_list_IN )
+        missing_key_to_count_map = {}
+
+        # loop over required keys
+        for current_required_key in required_attr_key_list:
+
+            # values for key, and indexes of the ones that are missing.
+            column_value_list = self.get_column_values( record_list_IN, current_required_key )
+            missing_index_list = [ current_index for current_index, current_value in enumerate( column_value_list ) if ( ( current_value is None ) or ( current_value == "" ) ) ]
+
+            # any missing?
+            if ( len( missing_index_list ) > 0 ):
+
+                # count, and update mask (just the missing entries).
+                missing_key_to_count_map[ current_required_key ] = len( missing_index_list )
+                for missing_index in missing_index_list:
+
+                    has_required_list[ missing_index ] = False
+
+                #-- END loop over missing indexes --#
+
+            #-- END check to see if any missing --#
+
+        #-- END loop over required keys --#
+
+        value_OUT = ( has_required_list, missing_key_to_count_map )
+
+        return value_OUT
+
+    #-- END method build_required_mask() --#
+
+
+    def get_column_values( self, record_list_IN, key_IN ):
+
+        '''
+        Accepts list of records and key. Returns list of the value for that key
+            in each record. Calls get_value_for_key() on each - override in
+            child classes where there is a faster way to get a column.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        value_OUT = [ self.get_value_for_key( current_record, key_IN ) for current_record in record_list_IN ]
+
+        return value_OUT
+
+    #-- END method get_column_values() --#
+
+
+    def get_compiled_entity( self ):
+
+        '''
+        Returns frozen, compiled copy of ETLEntity ( ETLCompiledEntity ) for
+            use while processing records. Compiles it from the ETLEntity the
+            first time it is requested, then reuses it until the ETLEntity is
+            replaced or reset_compiled_entity() is called. If no ETLEntity,
+            returns None.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        my_etl_spec = None
+
+        # get value
+        value_OUT = self.compiled_entity
+
+        # compiled yet?
+        if ( value_OUT is None ):
+
+            # no - compile, if entity.
+            my_etl_spec = self.get_etl_entity()
+            if ( my_etl_spec is not None ):
+
+                value_OUT = my_etl_spec.compile()
+                self.compiled_entity = value_OUT
+
+            #-- END check to see if entity --#
+
+        #-- END check to see if compiled --#
+
+        return value_OUT
+
+    #-- END method get_compiled_entity() --#
+
+
+    def get_dead_letter_record( self, record_IN ):
+
+        '''
+        Accepts a record. Returns the record as it should be written to the
+            dead letter file. Here, the record itself - override if records
+            aren't something JSON can hold (row index, for example).
+        '''
+
+        return record_IN
+
+    #-- END method get_dead_letter_record() --#
+
+
+    def get_dropped_status_message_count( self ):
+
+        '''
+        Returns number of status messages not kept because of
+            max_status_message_count (0 if no limit).
+        '''
+
+        # return reference
+        value_OUT = 0
+
+        # bounded?
+        if ( isinstance( self.status_message_list, BoundedMessageList ) == True ):
+            value_OUT = self.status_message_list.dropped_count
+        #-- END check to see if bounded --#
+
+        return value_OUT
+
+    #-- END method get_dropped_status_message_count() --#
+
+
+    def get_status_message_category_count_map( self ):
+
+        '''
+        If max_status_message_count is set, returns map of message category to
+            count of status messages in that category, kept or not. If not,
+            returns None.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # bounded?
+        if ( isinstance( self.status_message_list, BoundedMessageList ) == True ):
+            value_OUT = self.status_message_list.category_to_count_map
+        #-- END check to see if bounded --#
+
+        return value_OUT
+
+    #-- END method get_status_message_category_count_map() --#
+
+
     def get_etl_entity( self ):
 
         # return reference
@@ -276,6 +505,19 @@ class ETLProcessor( object ):
     #-- END method get_etl_entity() --#
 
 
+    def get_instrumentation( self ):
+
+        # return reference
+        value_OUT = None
+
+        # get value
+        value_OUT = self.instrumentation
+
+        return value_OUT
+
+    #-- END method get_instrumentation() --#
+
+
     def get_missing_field_list( self ):
 
         # return reference
@@ -291,17 +533,31 @@ class ETLProcessor( object ):
 
     def get_record_count( self ):
 
+        '''
+        If record source, returns its count (which can be None for streams
+            with no count hint). If not, returns len() of record list, or None
+            if no list.
+        '''
+
         # return reference
         value_OUT = None
 
         # declare variables
         my_record_list = None
+        my_record_source = None
 
-        # get record list
+        # get record list and source
         my_record_list = self.record_list
+        my_record_source = self.get_record_source()
+
+        # do we have a source?
+        if ( my_record_source is not None ):
+
+            # ask the source.
+            value_OUT = my_record_source.get_record_count()
 
         # do we have a list?
-        if ( my_record_list is not None ):
+        elif ( my_record_list is not None ):
 
             # get len
             value_OUT = len( my_record_list )
@@ -325,13 +581,24 @@ class ETLProcessor( object ):
 
         # declare variables
         my_record_list = None
+        my_record_source = None
         my_iterator = None
         start_index = None
         stop_index = None
 
-        # do we have a record list?
+        # do we have a record source? If so, it takes precedence over list.
+        my_record_source = self.get_record_source()
         my_record_list = self.get_record_list()
-        if ( my_record_list is not None ):
+        if ( my_record_source is not None ):
+
+            # let the source make the iterator.
+            value_OUT = my_record_source.get_record_iterator(
+                start_index_IN = start_index_IN,
+                record_count_IN = record_count_IN
+            )
+
+        # do we have a record list?
+        elif ( my_record_list is not None ):
 
             # process a subset?
             if ( ( start_index_IN is not None )
@@ -456,6 +723,19 @@ class ETLProcessor( object ):
     #-- END method get_record_list() --#
 
 
+    def get_record_source( self ):
+
+        # return reference
+        value_OUT = None
+
+        # get value
+        value_OUT = self.record_source
+
+        return value_OUT
+
+    #-- END method get_record_source() --#
+
+
     def get_status_message_list( self ):
 
         # return reference
@@ -537,8 +817,8 @@ class ETLProcessor( object ):
         my_debug_flag = self.debug_flag
 
         # get spec information
-        my_etl_spec = self.get_etl_entity()
-        required_attr_key_list = my_etl_spec.get_required_attr_key_set()
+        my_etl_spec = self.get_compiled_entity()
+        required_attr_key_list = my_etl_spec.get_required_attr_key_tuple()
 
         # ==> check required.
         has_required_OUT = True
@@ -597,6 +877,40 @@ class ETLProcessor( object ):
     #-- END method has_required() --#
 
 
+    def make_status_message_list( self ):
+
+        '''
+        Returns a new, empty status message list. If max_status_message_count
+            is set, a BoundedMessageList that keeps the first half and the most
+            recent half of that many messages, and counts all of them by
+            category. If not, a plain list.
+        '''
+
+        # return reference
+        list_OUT = None
+
+        # declare variables
+        head_count = None
+
+        # limit?
+        if ( self.max_status_message_count is not None ):
+
+            # yes - split between first and most recent.
+            head_count = ( self.max_status_message_count + 1 ) // 2
+            list_OUT = BoundedMessageList( head_count_IN = head_count, tail_count_IN = self.max_status_message_count - head_count )
+
+        else:
+
+            # no - plain list.
+            list_OUT = []
+
+        #-- END check to see if limit --#
+
+        return list_OUT
+
+    #-- END method make_status_message_list() --#
+
+
     def output_log_message( self, message_IN, method_IN = "", indent_with_IN = "", log_level_code_IN = logging.DEBUG, do_print_IN = None ):
 
         '''
@@ -713,6 +1027,18 @@ class ETLProcessor( object ):
     #-- END class method initialize_etl() --#
 
 
+    def reset_compiled_entity( self ):
+
+        '''
+        Clears compiled copy of ETLEntity, so it is compiled again the next
+            time it is requested. Call after changing the ETLEntity.
+        '''
+
+        self.compiled_entity = None
+
+    #-- END method reset_compiled_entity() --#
+
+
     def reset_record_information( self ):
 
         # status - row-level
@@ -725,7 +1051,7 @@ class ETLProcessor( object ):
     def reset_status_information( self ):
 
         # reset status variables. - worksheet-level
-        self.status_message_list = []
+        self.status_message_list = self.make_status_message_list()
         self.latest_status = None
         self.unknown_attrs_list = []
         self.existing_count = 0
@@ -746,6 +1072,9 @@ class ETLProcessor( object ):
         # store value
         self.etl_entity = value_IN
 
+        # new entity - compile again when needed.
+        self.reset_compiled_entity()
+
         # return value
         value_OUT = self.get_etl_entity()
 
@@ -754,6 +1083,22 @@ class ETLProcessor( object ):
     #-- END method set_etl_entity() --#
 
 
+    def set_instrumentation( self, value_IN ):
+
+        # return reference
+        value_OUT = None
+
+        # store value
+        self.instrumentation = value_IN
+
+        # return value
+        value_OUT = self.get_instrumentation()
+
+        return value_OUT
+
+    #-- END method set_instrumentation() --#
+
+
     def set_missing_field_list( self, value_IN ):
 
         # return reference
@@ -789,6 +1134,39 @@ class ETLProcessor( object ):
     #-- END method set_record_list() --#
 
 
+    def set_record_source( self, value_IN ):
+
+        '''
+        Accepts an ETLRecordSource instance, or any iterable (generator, file
+            object, etc.), which will be wrapped in an ETLRecordSource. Once
+            set, records are read from the source rather than the record list.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # wrap plain iterables.
+        if ( ( value_IN is not None )
+            and ( isinstance( value_IN, ETLRecordSource ) == False ) ):
+
+            value_IN = ETLRecordSource( iterable_IN = value_IN )
+
+        #-- END check to see if ETLRecordSource --#
+
+        # store value
+        self.record_source = value_IN
+
+        # clear out status variables.
+        self.reset_status_information()
+
+        # return value
+        value_OUT = self.get_record_source()
+
+        return value_OUT
+
+    #-- END method set_record_source() --#
+
+
     def set_status_message_list( self, value_IN ):
 
         # return reference
@@ -837,4 +1215,68 @@ class ETLProcessor( object ):
     #-- END method set_unknown_attrs_name_to_value_map() --#
 
 
+    def start_phase_timer( self ):
+
+        '''
+        If instrumentation is on, returns start time for timing a phase of
+            processing (pass it to stop_phase_timer() when phase is done). If
+            not, returns None.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # instrumentation?
+        if ( self.instrumentation is not None ):
+
+            value_OUT = time.perf_counter()
+
+        #-- END check to see if instrumentation --#
+
+        return value_OUT
+
+    #-- END method start_phase_timer() --#
+
+
+    def stop_phase_timer( self, phase_name_IN, start_time_IN ):
+
+        '''
+        If instrumentation is on and start time passed in, adds time since
+            start time to the phase with the name passed in.
+        '''
+
+        # instrumentation?
+        if ( ( self.instrumentation is not None ) and ( start_time_IN is not None ) ):
+
+            self.instrumentation.add_phase_time( phase_name_IN, time.perf_counter() - start_time_IN )
+
+        #-- END check to see if instrumentation --#
+
+    #-- END method stop_phase_timer() --#
+
+
+    def write_dead_letter( self, record_IN, reason_IN, message_list_IN = None, record_number_IN = None ):
+
+        '''
+        If there is a dead letter sink, accepts a record that failed
+            processing, the reason it failed ( ETLDeadLetterSink.REASON_* ), and
+            optional list of error messages and record number, and writes them
+            to the sink. If no sink, does nothing.
+        '''
+
+        # dead letter sink?
+        if ( self.dead_letter_sink is not None ):
+
+            self.dead_letter_sink.write_record(
+                self.get_dead_letter_record( record_IN ),
+                reason_IN,
+                message_list_IN = message_list_IN,
+                record_number_IN = record_number_IN
+            )
+
+        #-- END check to see if dead letter sink --#
+
+    #-- END method write_dead_letter() --#
+
+
 #-- END class ETLProcessor --#
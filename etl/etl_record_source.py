@@ -0,0 +1,740 @@
+#===============================================================================
+# imports
+#===============================================================================
+
+
+# base python libraries
+import csv
+import itertools
+import json
+import logging
+
+# ETL imports
+from python_utilities.etl.etl_error import ETLError
+
+
+#===============================================================================
+# class ETLRecordSource
+#===============================================================================
+
+
+# lineage: object
+class ETLRecordSource( object ):
+
+
+    '''
+    ETLRecordSource wraps a source of records so an ETLProcessor can stream
+        through them rather than needing them all in a list in memory. This
+        base class works with any iterable - list, tuple, generator, file
+        object, etc. Child classes open files or query the database each time
+        an iterator is requested, so a source can be processed more than once.
+
+    Count hint: if the number of records is known ahead of time, pass it in as
+        count_hint_IN and it will be used for progress output rather than
+        calling len() or reading through the source to count.
+    '''
+
+
+    #===========================================================================
+    # CONSTANTS-ish
+    #===========================================================================
+
+
+    # logger name
+    MY_LOGGER_NAME = "python_utilities.etl.ETLRecordSource"
+
+
+    #===========================================================================
+    # ! ==> class variables
+    #===========================================================================
+
+
+    # debug_flag
+    debug_flag = False
+
+
+    #===========================================================================
+    # ! ==> class methods
+    #===========================================================================
+
+
+    @classmethod
+    def subset_iterator( cls, iterator_IN, start_index_IN = None, record_count_IN = None ):
+
+        '''
+        Accepts an iterator, optional start index (0-indexed) and record count.
+            Returns an iterator that skips to start index and stops after
+            record count records, using itertools.islice(). If no start index
+            or count, returns the iterator passed in.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        start_index = None
+        stop_index = None
+
+        # init
+        value_OUT = iterator_IN
+
+        # subset?
+        if ( ( start_index_IN is not None )
+            or ( record_count_IN is not None ) ):
+
+            # - start is 0-indexed
+            # - stop stops at and does not return the index you pass to stop.
+            start_index = start_index_IN
+            if ( start_index is None ):
+
+                # no start, just count (limit).
+                start_index = 0
+
+            #-- END check to see if start index --#
+
+            if ( record_count_IN is not None ):
+
+                stop_index = start_index + record_count_IN
+
+            #-- END check to see if record count --#
+
+            # islice the iterator
+            value_OUT = itertools.islice( iterator_IN, start_index, stop_index )
+
+        #-- END check to see if subset --#
+
+        return value_OUT
+
+    #-- END class method subset_iterator() --#
+
+
+    #===========================================================================
+    # ! ==> __init__() method - instance variables
+    #===========================================================================
+
+
+    def __init__( self, iterable_IN = None, count_hint_IN = None ):
+
+        '''
+        Constructor
+        '''
+
+        # call parent's __init__()
+        super().__init__()
+
+        # source
+        self.iterable = None
+
+        # count
+        self.count_hint = None
+
+        # debug
+        self.debug_flag = False
+
+        # store values passed in.
+        self.set_iterable( iterable_IN )
+        self.set_count_hint( count_hint_IN )
+
+    #-- END constructor --#
+
+
+    #===========================================================================
+    # ! ==> instance methods
+    #===========================================================================
+
+
+    def get_count_hint( self ):
+
+        # return reference
+        value_OUT = None
+
+        # get value
+        value_OUT = self.count_hint
+
+        return value_OUT
+
+    #-- END method get_count_hint() --#
+
+
+    def get_iterable( self ):
+
+        # return reference
+        value_OUT = None
+
+        # get value
+        value_OUT = self.iterable
+
+        return value_OUT
+
+    #-- END method get_iterable() --#
+
+
+    def get_record_count( self ):
+
+        '''
+        Returns count hint if one was set, else len() of iterable if it has a
+            length, else None (streams don't know how long they are until
+            they've been read).
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        my_iterable = None
+
+        # count hint?
+        value_OUT = self.get_count_hint()
+        if ( value_OUT is None ):
+
+            # no - does iterable have a length?
+            my_iterable = self.get_iterable()
+            if ( ( my_iterable is not None ) and ( hasattr( my_iterable, "__len__" ) == True ) ):
+
+                # yes.
+                value_OUT = len( my_iterable )
+
+            #-- END check to see if iterable has length --#
+
+        #-- END check to see if count hint --#
+
+        return value_OUT
+
+    #-- END method get_record_count() --#
+
+
+    def get_record_iterator( self, start_index_IN = None, record_count_IN = None ):
+
+        '''
+        Returns an iterator over the records in this source, subset to the
+            start index and count passed in, if any. Lists and tuples are
+            sliced before making the iterator, everything else is subset as
+            it streams.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        my_iterable = None
+        start_index = None
+        stop_index = None
+
+        # list or tuple? If so, slice, then make iterator.
+        my_iterable = self.get_iterable()
+        if ( isinstance( my_iterable, ( list, tuple ) ) == True ):
+
+            # slice, then make iterator.
+            start_index = start_index_IN
+            if ( start_index is None ):
+                start_index = 0
+            #-- END check to see if start index --#
+
+            if ( record_count_IN is not None ):
+                stop_index = start_index + record_count_IN
+            #-- END check to see if record count --#
+
+            value_OUT = iter( my_iterable[ start_index : stop_index ] )
+
+        else:
+
+            # stream - open iterator...
+            value_OUT = self.open_iterator()
+
+            # ...and subset as we go.
+            value_OUT = self.subset_iterator( value_OUT, start_index_IN, record_count_IN )
+
+        #-- END check to see if sliceable --#
+
+        return value_OUT
+
+    #-- END method get_record_iterator() --#
+
+
+    def open_iterator( self ):
+
+        '''
+        Returns a fresh iterator over all records in the source. Child classes
+            override this to read from wherever their records live.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        my_iterable = None
+
+        # got an iterable?
+        my_iterable = self.get_iterable()
+        if ( my_iterable is not None ):
+
+            value_OUT = iter( my_iterable )
+
+        else:
+
+            # no - error.
+            raise ETLError( "ETLRecordSource has no iterable to read records from." )
+
+        #-- END check to see if iterable --#
+
+        return value_OUT
+
+    #-- END method open_iterator() --#
+
+
+    def set_count_hint( self, value_IN ):
+
+        # return reference
+        value_OUT = None
+
+        # store value
+        self.count_hint = value_IN
+
+        # return value
+        value_OUT = self.get_count_hint()
+
+        return value_OUT
+
+    #-- END method set_count_hint() --#
+
+
+    def set_iterable( self, value_IN ):
+
+        # return reference
+        value_OUT = None
+
+        # store value
+        self.iterable = value_IN
+
+        # return value
+        value_OUT = self.get_iterable()
+
+        return value_OUT
+
+    #-- END method set_iterable() --#
+
+
+#-- END class ETLRecordSource --#
+
+
+#===============================================================================
+# class ETLRecordSourceFile
+#===============================================================================
+
+
+# lineage: object --> ETLRecordSource
+class ETLRecordSourceFile( ETLRecordSource ):
+
+
+    '''
+    Parent class for record sources that read records from a file, one at a
+        time. The file is opened each time an iterator is requested, and
+        closed when the iterator is exhausted.
+    '''
+
+
+    #===========================================================================
+    # CONSTANTS-ish
+    #===========================================================================
+
+
+    # logger name
+    MY_LOGGER_NAME = "python_utilities.etl.ETLRecordSourceFile"
+
+    # defaults
+    DEFAULT_ENCODING = "utf-8"
+
+
+    #===========================================================================
+    # ! ==> __init__() method - instance variables
+    #===========================================================================
+
+
+    def __init__( self, file_path_IN = None, count_hint_IN = None, encoding_IN = DEFAULT_ENCODING ):
+
+        '''
+        Constructor
+        '''
+
+        # call parent's __init__()
+        super().__init__( count_hint_IN = count_hint_IN )
+
+        # file
+        self.file_path = file_path_IN
+        self.encoding = encoding_IN
+
+    #-- END constructor --#
+
+
+    #===========================================================================
+    # ! ==> instance methods
+    #===========================================================================
+
+
+    def get_file_path( self ):
+
+        # return reference
+        value_OUT = None
+
+        # get value
+        value_OUT = self.file_path
+
+        return value_OUT
+
+    #-- END method get_file_path() --#
+
+
+    def get_record_count( self ):
+
+        '''
+        Files don't have a length - returns count hint, or None if none set.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # get value
+        value_OUT = self.get_count_hint()
+
+        return value_OUT
+
+    #-- END method get_record_count() --#
+
+
+    def open_iterator( self ):
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        my_file_path = None
+
+        # got a file path?
+        my_file_path = self.get_file_path()
+        if ( my_file_path is not None ):
+
+            # generator over records in file.
+            value_OUT = self.read_records( my_file_path )
+
+        else:
+
+            # no - error.
+            raise ETLError( "{} has no file path to read records from.".format( type( self ).__name__ ) )
+
+        #-- END check to see if file path --#
+
+        return value_OUT
+
+    #-- END method open_iterator() --#
+
+
+    def read_records( self, file_path_IN ):
+
+        '''
+        Generator that yields records from the file passed in. Override in
+            child classes.
+        '''
+
+        # declare variables
+        me = "read_records"
+        status_message = None
+
+        status_message = "In abstract-ish method ETLRecordSourceFile.{}(): OVERRIDE ME".format( me )
+        raise ETLError( status_message )
+
+    #-- END method read_records() --#
+
+
+    def set_file_path( self, value_IN ):
+
+        # return reference
+        value_OUT = None
+
+        # store value
+        self.file_path = value_IN
+
+        # return value
+        value_OUT = self.get_file_path()
+
+        return value_OUT
+
+    #-- END method set_file_path() --#
+
+
+#-- END class ETLRecordSourceFile --#
+
+
+#===============================================================================
+# class ETLRecordSourceCSV
+#===============================================================================
+
+
+# lineage: object --> ETLRecordSource --> ETLRecordSourceFile
+class ETLRecordSourceCSV( ETLRecordSourceFile ):
+
+
+    '''
+    Reads records from a CSV file with a header row, one dictionary per row
+        (keys are the column headers).
+    '''
+
+
+    #===========================================================================
+    # CONSTANTS-ish
+    #===========================================================================
+
+
+    # logger name
+    MY_LOGGER_NAME = "python_utilities.etl.ETLRecordSourceCSV"
+
+
+    #===========================================================================
+    # ! ==> __init__() method - instance variables
+    #===========================================================================
+
+
+    def __init__( self,
+                  file_path_IN = None,
+                  count_hint_IN = None,
+                  encoding_IN = ETLRecordSourceFile.DEFAULT_ENCODING,
+                  delimiter_IN = "," ):
+
+        '''
+        Constructor
+        '''
+
+        # call parent's __init__()
+        super().__init__(
+            file_path_IN = file_path_IN,
+            count_hint_IN = count_hint_IN,
+            encoding_IN = encoding_IN
+        )
+
+        # CSV options
+        self.delimiter = delimiter_IN
+
+    #-- END constructor --#
+
+
+    #===========================================================================
+    # ! ==> instance methods
+    #===========================================================================
+
+
+    def read_records( self, file_path_IN ):
+
+        # declare variables
+        csv_reader = None
+        current_row = None
+
+        # open file, read a row at a time.
+        with open( file_path_IN, newline = "", encoding = self.encoding ) as csv_file:
+
+            csv_reader = csv.DictReader( csv_file, delimiter = self.delimiter )
+            for current_row in csv_reader:
+
+                yield current_row
+
+            #-- END loop over rows --#
+
+        #-- END with open( file_path_IN ) --#
+
+    #-- END method read_records() --#
+
+
+#-- END class ETLRecordSourceCSV --#
+
+
+#===============================================================================
+# class ETLRecordSourceJSONLines
+#===============================================================================
+
+
+# lineage: object --> ETLRecordSource --> ETLRecordSourceFile
+class ETLRecordSourceJSONLines( ETLRecordSourceFile ):
+
+
+    '''
+    Reads records from a JSON Lines file - one JSON object per line. Blank
+        lines are skipped.
+    '''
+
+
+    #===========================================================================
+    # CONSTANTS-ish
+    #===========================================================================
+
+
+    # logger name
+    MY_LOGGER_NAME = "python_utilities.etl.ETLRecordSourceJSONLines"
+
+
+    #===========================================================================
+    # ! ==> instance methods
+    #===========================================================================
+
+
+    def read_records( self, file_path_IN ):
+
+        # declare variables
+        current_line = None
+
+        # open file, read a line at a time.
+        with open( file_path_IN, encoding = self.encoding ) as jsonl_file:
+
+            for current_line in jsonl_file:
+
+                # skip blank lines
+                current_line = current_line.strip()
+                if ( current_line != "" ):
+
+                    yield json.loads( current_line )
+
+                #-- END check to see if blank line --#
+
+            #-- END loop over lines --#
+
+        #-- END with open( file_path_IN ) --#
+
+    #-- END method read_records() --#
+
+
+#-- END class ETLRecordSourceJSONLines --#
+
+
+#===============================================================================
+# class ETLRecordSourceQuerySet
+#===============================================================================
+
+
+# lineage: object --> ETLRecordSource
+class ETLRecordSourceQuerySet( ETLRecordSource ):
+
+
+    '''
+    Reads records from a Django QuerySet, using QuerySet.iterator() so results
+        are streamed from the database in chunks rather than cached in the
+        QuerySet. Start index and record count are applied in the database
+        (OFFSET/LIMIT). To load dictionaries, pass in a QuerySet from
+        .values().
+    '''
+
+
+    #===========================================================================
+    # CONSTANTS-ish
+    #===========================================================================
+
+
+    # logger name
+    MY_LOGGER_NAME = "python_utilities.etl.ETLRecordSourceQuerySet"
+
+    # defaults
+    DEFAULT_CHUNK_SIZE = 2000
+
+
+    #===========================================================================
+    # ! ==> __init__() method - instance variables
+    #===========================================================================
+
+
+    def __init__( self, queryset_IN = None, count_hint_IN = None, chunk_size_IN = DEFAULT_CHUNK_SIZE ):
+
+        '''
+        Constructor
+        '''
+
+        # call parent's __init__()
+        super().__init__( iterable_IN = queryset_IN, count_hint_IN = count_hint_IN )
+
+        # QuerySet options
+        self.chunk_size = chunk_size_IN
+
+    #-- END constructor --#
+
+
+    #===========================================================================
+    # ! ==> instance methods
+    #===========================================================================
+
+
+    def get_record_count( self ):
+
+        '''
+        Returns count hint if set, else QuerySet.count() (a COUNT query - len()
+            would load the whole QuerySet). Stores the count as the count hint
+            so we only ask once.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        my_queryset = None
+
+        # count hint?
+        value_OUT = self.get_count_hint()
+        if ( value_OUT is None ):
+
+            # no - ask the database.
+            my_queryset = self.get_iterable()
+            if ( my_queryset is not None ):
+
+                value_OUT = my_queryset.count()
+                self.set_count_hint( value_OUT )
+
+            #-- END check to see if QuerySet --#
+
+        #-- END check to see if count hint --#
+
+        return value_OUT
+
+    #-- END method get_record_count() --#
+
+
+    def get_record_iterator( self, start_index_IN = None, record_count_IN = None ):
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        my_queryset = None
+        start_index = None
+        stop_index = None
+
+        # got a QuerySet?
+        my_queryset = self.get_iterable()
+        if ( my_queryset is not None ):
+
+            # subset? Slice QuerySet, so it is done in the database.
+            if ( ( start_index_IN is not None )
+                or ( record_count_IN is not None ) ):
+
+                start_index = start_index_IN
+                if ( start_index is None ):
+                    start_index = 0
+                #-- END check to see if start index --#
+
+                if ( record_count_IN is not None ):
+                    stop_index = start_index + record_count_IN
+                #-- END check to see if record count --#
+
+                my_queryset = my_queryset[ start_index : stop_index ]
+
+            #-- END check to see if subset --#
+
+            # stream results.
+            value_OUT = my_queryset.iterator( chunk_size = self.chunk_size )
+
+        else:
+
+            # no - error.
+            raise ETLError( "ETLRecordSourceQuerySet has no QuerySet to read records from." )
+
+        #-- END check to see if QuerySet --#
+
+        return value_OUT
+
+    #-- END method get_record_iterator() --#
+
+
+#-- END class ETLRecordSourceQuerySet --#
@@ -5,14 +5,26 @@ python_utilities/etl/loadable_django_model.py. This means it includes:
 - etl_spec class variable
 - class methods:
 
+    - create_etl_record_hash
     - get_etl_spec
     - initialize_etl
+    - merge_worker_status_list
     - run_etl
+    - run_etl_parallel
+    - run_etl_worksheets_parallel
     - set_etl_spec
 
 - instance methods:
 
+    - get_extra_data_attr_value
     - update_extra_data_attr
+    - update_extra_data_attrs
+
+Optional change detection: add a field to hold the hash of the record last
+    loaded into each instance (for example, content_hash =
+    models.CharField( max_length = 64, blank = True, null = True )) and set
+    class variable etl_record_hash_field_name to its name. ETL then skips
+    records whose hash matches the one stored in their instance.
 
 Django models that are intended to have data loaded into them by the ETL
     Framework can either:
@@ -21,24 +33,32 @@ Django models that are intended to have data loaded into them by the ETL
 '''
 
 # python built-ins
+import concurrent.futures
+import hashlib
 import json
 import logging
+import math
+import os
 
 # django imports
+from django.db import connections
 from django.db import models
 
 # python_utilities
+from python_utilities.json.json_helper import JSONHelper
 from python_utilities.logging.logging_helper import LoggingHelper
 from python_utilities.status.status_container import StatusContainer
 
 # ETL imports
 from python_utilities.etl.etl_attribute import ETLAttribute
+from python_utilities.etl.etl_django_model_loader import ETLDjangoModelLoader
 from python_utilities.etl.etl_entity import ETLEntity
 from python_utilities.etl.etl_error import ETLError
 from python_utilities.etl.etl_from_dictionary import ETLFromDictionary
 from python_utilities.etl.etl_from_excel_with_headers import ETLFromExcelWithHeaders
 from python_utilities.etl.etl_object_loader import ETLObjectLoader
 from python_utilities.etl.etl_processor import ETLProcessor
+from python_utilities.etl.etl_record_source import ETLRecordSource
 
 class LoadableDjangoModel( models.Model ):
 
@@ -55,6 +75,10 @@ class LoadableDjangoModel( models.Model ):
     # StatusContainer properties
     PROP_WAS_INSTANCE_UPDATED = ETLObjectLoader.PROP_WAS_INSTANCE_UPDATED
 
+    # run_etl() arguments that are file paths each parallel worker needs its
+    #     own copy of (see build_worker_kwargs()).
+    WORKER_FILE_PATH_ARG_NAME_LIST = [ "checkpoint_file_path_IN", "dead_letter_file_path_IN" ]
+
     #==========================================================================#
     # ! ==> model fields
     #==========================================================================#
@@ -80,11 +104,73 @@ class LoadableDjangoModel( models.Model ):
     etl_spec = None
     MY_LOGGER_NAME = "python_utilities.etl.LoadableDjangoModel"
 
+    # change detection - name of field that stores hash of record last loaded
+    #     into each instance. If set, records whose hash matches the stored
+    #     hash are skipped. To force reload, clear the field.
+    etl_record_hash_field_name = None
+
     #==========================================================================#
     # ! ==> class methods
     #==========================================================================#
 
 
+    @classmethod
+    def build_worker_kwargs( cls, kwargs_IN, worker_suffix_IN ):
+
+        '''
+        Accepts keyword arguments for run_etl() and a suffix that identifies a
+            parallel worker's share of the work (partition or worksheet
+            index). Returns a copy of the arguments where each file path in
+            WORKER_FILE_PATH_ARG_NAME_LIST that is set has the suffix added
+            ( "<path>.<suffix>" ), so workers don't write the same checkpoint
+            or dead letter file. Other arguments are passed through as-is.
+        '''
+
+        # return reference
+        kwargs_OUT = None
+
+        # declare variables
+        arg_name = None
+        file_path = None
+
+        kwargs_OUT = dict( kwargs_IN )
+        for arg_name in cls.WORKER_FILE_PATH_ARG_NAME_LIST:
+
+            file_path = kwargs_OUT.get( arg_name, None )
+            if ( file_path is not None ):
+
+                kwargs_OUT[ arg_name ] = "{file_path}.{worker_suffix}".format( file_path = file_path, worker_suffix = worker_suffix_IN )
+
+            #-- END check to see if file path set --#
+
+        #-- END loop over file path arguments --#
+
+        return kwargs_OUT
+
+    #-- END class method build_worker_kwargs() --#
+
+
+    @classmethod
+    def create_etl_record_hash( cls, record_IN ):
+
+        '''
+        Accepts record (JSON-compatible dictionary or list). Returns SHA-256
+            hex digest of the record in standard JSON format (
+            JSONHelper.create_standard_json_hash() ), for change detection.
+            Override to hash only part of a record, or hash it differently.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # make hash
+        value_OUT = JSONHelper.create_standard_json_hash( record_IN, hash_function_IN = hashlib.sha256 )
+
+        return value_OUT
+
+    #-- END class method create_etl_record_hash() --#
+
+
     @classmethod
     def get_etl_spec( cls ):
 
@@ -149,6 +235,13 @@ class LoadableDjangoModel( models.Model ):
                     # ETLFromExcelWithHeaders
                     instance_OUT = ETLFromExcelWithHeaders()
 
+                elif ( extract_storage_type == ETLEntity.STORAGE_TYPE_DATAFRAME ):
+
+                    # ETLFromDataFrame - imported here so pandas is only
+                    #     needed if you load from DataFrames.
+                    from python_utilities.etl.etl_from_dataframe import ETLFromDataFrame
+                    instance_OUT = ETLFromDataFrame()
+
                 else:
 
                     # default for everything else is ETLFromDictionary.
@@ -226,6 +319,98 @@ class LoadableDjangoModel( models.Model ):
     #-- END class method initialize_etl_loader() --#
 
 
+    @classmethod
+    def merge_worker_status_list( cls, status_list_IN, max_status_message_count_IN = None ):
+
+        '''
+        Accepts list of StatusContainers returned by run_etl() calls (by
+            workers in parallel ETL, for example). Returns a StatusContainer
+            with the counts from each added together, and all their messages
+            (each message is copied once - statuses are not also added with
+            add_status_container(), which would keep them all twice). If any
+            status is an error, so is the returned status.
+
+        If max_status_message_count_IN is set, the returned status keeps no
+            more than that many messages (the first and most recent halves,
+            like run_etl()), and the count of messages not kept (here or by
+            the workers) and the count of messages per category are stored in
+            detail properties ETLProcessor.STATUS_PROP_DROPPED_STATUS_MESSAGE_COUNT
+            and ETLProcessor.STATUS_PROP_STATUS_MESSAGE_CATEGORY_COUNT_MAP.
+        '''
+
+        # return reference
+        status_OUT = None
+
+        # declare variables
+        worker_status = None
+        worker_success = None
+        error_counter = None
+        record_counter = None
+        success_counter = None
+        update_counter = None
+        unchanged_counter = None
+
+        # init
+        status_OUT = StatusContainer()
+        status_OUT.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
+        error_counter = 0
+        record_counter = 0
+        success_counter = 0
+        update_counter = 0
+        unchanged_counter = 0
+
+        # limit on status messages?
+        if ( max_status_message_count_IN is not None ):
+
+            # yes - same split as run_etl().
+            status_OUT.set_message_capacity( ( max_status_message_count_IN + 1 ) // 2, max_status_message_count_IN // 2 )
+
+        #-- END check if status message limit --#
+
+        # merge statuses, in order.
+        for worker_status in status_list_IN:
+
+            # counts
+            error_counter += worker_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATE_ERROR_COUNT, 0 )
+            record_counter += worker_status.get_detail_value( ETLProcessor.STATUS_PROP_PROCESSED_RECORD_COUNT, 0 )
+            success_counter += worker_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATE_SUCCESS_COUNT, 0 )
+            update_counter += worker_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATED_RECORD_COUNT, 0 )
+            unchanged_counter += worker_status.get_detail_value( ETLDjangoModelLoader.STATUS_PROP_UNCHANGED_SKIPPED_COUNT, 0 )
+
+            # copy worker messages into return status
+            status_OUT.add_messages_from_list( worker_status.get_message_list() )
+
+            # error?
+            worker_success = worker_status.is_success()
+            if ( worker_success == False ):
+
+                # error
+                status_OUT.set_status_code( StatusContainer.STATUS_CODE_ERROR )
+
+            #-- END check to see if worker was a success --#
+
+        #-- END loop over statuses --#
+
+        # store merged counts
+        status_OUT.set_detail_value( ETLProcessor.STATUS_PROP_PROCESSED_RECORD_COUNT, record_counter )
+        status_OUT.set_detail_value( ETLProcessor.STATUS_PROP_UPDATE_ERROR_COUNT, error_counter )
+        status_OUT.set_detail_value( ETLProcessor.STATUS_PROP_UPDATE_SUCCESS_COUNT, success_counter )
+        status_OUT.set_detail_value( ETLProcessor.STATUS_PROP_UPDATED_RECORD_COUNT, update_counter )
+        if ( cls.etl_record_hash_field_name is not None ):
+            status_OUT.set_detail_value( ETLDjangoModelLoader.STATUS_PROP_UNCHANGED_SKIPPED_COUNT, unchanged_counter )
+        #-- END check to see if change detection --#
+
+        # status messages bounded? Store counts.
+        if ( max_status_message_count_IN is not None ):
+            status_OUT.set_detail_value( ETLProcessor.STATUS_PROP_DROPPED_STATUS_MESSAGE_COUNT, status_OUT.get_dropped_message_count() )
+            status_OUT.set_detail_value( ETLProcessor.STATUS_PROP_STATUS_MESSAGE_CATEGORY_COUNT_MAP, dict( status_OUT.get_message_category_count_map() ) )
+        #-- END check to see if status messages bounded --#
+
+        return status_OUT
+
+    #-- END class method merge_worker_status_list() --#
+
+
     @classmethod
     def run_etl( cls,
                  record_list_IN = None,
@@ -235,12 +420,98 @@ class LoadableDjangoModel( models.Model ):
                  default_time_zone_IN = None,
                  do_output_progress_IN = False,
                  allow_empty_record_list_IN = False,
+                 batch_lookup_size_IN = None,
+                 bulk_write_batch_size_IN = None,
+                 record_source_IN = None,
+                 lean_status_IN = None,
+                 related_batch_size_IN = None,
+                 instrumentation_IN = None,
+                 instrumentation_file_path_IN = None,
+                 batch_required_IN = None,
+                 checkpoint_file_path_IN = None,
+                 checkpoint_every_IN = None,
+                 resume_IN = False,
+                 worksheet_file_path_IN = None,
+                 worksheet_name_IN = None,
+                 worksheet_read_only_IN = True,
+                 dead_letter_file_path_IN = None,
+                 max_status_message_count_IN = None,
                  *args,
                  **kwargs ):
 
         '''
         preconditions:
         - time_zone_IN should be a pytz timezone instance.
+        - batch_lookup_size_IN, if set, turns on batched lookup of existing
+            instances - the loader resolves the instances for each window of
+            that many records with a single query.
+        - bulk_write_batch_size_IN, if set, turns on bulk writes - new and
+            changed instances are buffered and written with bulk_create() and
+            bulk_update() in batches of that size, once per lookup window. If
+            no batch_lookup_size_IN, it is also used as the lookup window size.
+            If a bulk write fails (IntegrityError or DataError), its instances
+            are save()-d one at a time, so only bad rows fail. Notes:
+            - bulk_create() and bulk_update() do not call the model's save()
+                (so overrides of it are skipped) or send pre_save/post_save
+                signals. Don't turn on bulk writes for models that rely on
+                either.
+            - post-save processing (related records, etc.) needs the primary
+                keys of new instances. bulk_create() sets them on PostgreSQL,
+                SQLite, and MariaDB 10.5+, but not on MySQL or older MariaDB.
+        - record_source_IN, if set, is streamed rather than record_list_IN -
+            either an ETLRecordSource instance (JSON Lines file, CSV file,
+            QuerySet, etc.) or any iterable (generator, file object, etc.).
+            If spec's extract storage type is STORAGE_TYPE_DATAFRAME, a pandas
+            DataFrame or iterable of DataFrame chunks.
+        - lean_status_IN, if True, turns off building of per-attribute status
+            messages (counts of attributes updated, not changed, and not in
+            model are still returned).
+        - related_batch_size_IN, if set, turns on batched related-record ETL -
+            related records are accumulated across parent records, and loaded
+            with one run_etl() per related class once parents are saved (at
+            the end of each lookup window, when that many related records are
+            waiting, and at the end of the run).
+        - instrumentation_IN, if True, turns on timing of the run - time spent
+            in each phase of processing, records per second, record latency
+            percentiles, and query count are returned in the status detail
+            property ETLProcessor.STATUS_PROP_INSTRUMENTATION.
+        - instrumentation_file_path_IN, if set, turns on instrumentation and
+            appends the timing summary to that file as a line of JSON.
+        - batch_required_IN, if True, turns on checking required values a
+            lookup window of records at a time - records missing required
+            values are skipped, and counted overall and per key in status
+            detail properties ETLProcessor.STATUS_PROP_MISSING_REQUIRED_COUNT
+            and ETLProcessor.STATUS_PROP_MISSING_REQUIRED_KEY_COUNT_MAP.
+        - checkpoint_file_path_IN, if set, turns on checkpoints - progress is
+            saved to that file every checkpoint_every_IN records (default
+            1000), once all records up to that point are committed.
+        - resume_IN, if True, and checkpoint file has an incomplete run,
+            resumes from the checkpoint rather than start_index_IN (the
+            range of records is the one the checkpointed run was started
+            with, so pass the same records or record source). The index
+            resumed from is returned in status detail property
+            ETLDjangoModelLoader.STATUS_PROP_RESUMED_FROM_INDEX. If the
+            checkpointed run completed, a new run is started.
+        - worksheet_file_path_IN, if set, is the path of an Excel file to load
+            from (spec's extract storage type must be
+            STORAGE_TYPE_XLSX_WITH_HEADERS). worksheet_name_IN is the
+            worksheet to load (default is the active worksheet), and
+            worksheet_read_only_IN (default True) streams rows from the file
+            rather than loading it all into memory. The worksheet's header row
+            is mapped to keys before processing.
+        - dead_letter_file_path_IN, if set, is the path of a JSON Lines file
+            that records that fail processing are appended to, with the reason
+            and error messages, as they fail ( ETLDeadLetterSink ). The count
+            is returned in status detail properties
+            ETLProcessor.STATUS_PROP_DEAD_LETTER_COUNT and
+            ETLProcessor.STATUS_PROP_DEAD_LETTER_REASON_COUNT_MAP.
+        - max_status_message_count_IN, if set, limits the number of status
+            messages held in memory, by the loader and in the returned status -
+            the first and most recent halves of that many are kept (
+            BoundedMessageList ). Messages not kept are counted in status
+            detail property ETLProcessor.STATUS_PROP_DROPPED_STATUS_MESSAGE_COUNT,
+            and all messages by category in
+            ETLProcessor.STATUS_PROP_STATUS_MESSAGE_CATEGORY_COUNT_MAP.
         '''
 
         # return reference
@@ -271,9 +542,11 @@ class LoadableDjangoModel( models.Model ):
         status_OUT = StatusContainer()
         status_OUT.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
 
-        # do we have a record list?
+        # do we have a record list or source?
         if ( ( ( record_list_IN is not None )
                 and ( len( record_list_IN ) > 0 ) )
+             or ( record_source_IN is not None )
+             or ( worksheet_file_path_IN is not None )
              or ( allow_empty_record_list_IN == True ) ):
 
             # first, make sure ETL spec is initialized.
@@ -309,6 +582,95 @@ class LoadableDjangoModel( models.Model ):
 
             #-- END check if time zone passed in. --#
 
+            # batched lookup?
+            if ( batch_lookup_size_IN is not None ):
+
+                # yes - turn it on in ETLProcessor descendant.
+                etl_instance.do_batch_lookup = True
+                etl_instance.set_batch_lookup_size( batch_lookup_size_IN )
+
+            #-- END check if batch lookup size passed in. --#
+
+            # bulk writes?
+            if ( bulk_write_batch_size_IN is not None ):
+
+                # yes - turn on in ETLProcessor descendant.
+                etl_instance.do_bulk_write = True
+                etl_instance.set_bulk_write_batch_size( bulk_write_batch_size_IN )
+
+                # window size for lookups - default to bulk write batch size.
+                if ( batch_lookup_size_IN is None ):
+
+                    etl_instance.set_batch_lookup_size( bulk_write_batch_size_IN )
+
+                #-- END check if batch lookup size passed in. --#
+
+            #-- END check if bulk write batch size passed in. --#
+
+            # lean status?
+            if ( lean_status_IN is not None ):
+
+                # yes - set in ETLProcessor descendant.
+                etl_instance.lean_status = lean_status_IN
+
+            #-- END check if lean status passed in. --#
+
+            # batched related?
+            if ( related_batch_size_IN is not None ):
+
+                # yes - turn on in ETLProcessor descendant.
+                etl_instance.do_batch_related = True
+                etl_instance.set_related_batch_size( related_batch_size_IN )
+
+            #-- END check if related batch size passed in. --#
+
+            # instrumentation?
+            if ( ( instrumentation_IN == True )
+                or ( instrumentation_file_path_IN is not None ) ):
+
+                # yes - turn on in ETLProcessor descendant.
+                etl_instance.do_instrumentation = True
+                etl_instance.instrumentation_file_path = instrumentation_file_path_IN
+
+            #-- END check if instrumentation --#
+
+            # batched required check?
+            if ( batch_required_IN is not None ):
+
+                # yes - set in ETLProcessor descendant.
+                etl_instance.do_batch_required = batch_required_IN
+
+            #-- END check if batched required check --#
+
+            # checkpoints?
+            if ( checkpoint_file_path_IN is not None ):
+
+                # yes - set in ETLProcessor descendant.
+                etl_instance.checkpoint_file_path = checkpoint_file_path_IN
+                etl_instance.do_resume = resume_IN
+                if ( checkpoint_every_IN is not None ):
+                    etl_instance.checkpoint_every = checkpoint_every_IN
+                #-- END check if checkpoint interval passed in --#
+
+            #-- END check if checkpoint file --#
+
+            # dead letters?
+            if ( dead_letter_file_path_IN is not None ):
+
+                # yes - set in ETLProcessor descendant.
+                etl_instance.dead_letter_file_path = dead_letter_file_path_IN
+
+            #-- END check if dead letter file --#
+
+            # limit on status messages?
+            if ( max_status_message_count_IN is not None ):
+
+                # yes - set in ETLProcessor descendant, and on status.
+                etl_instance.max_status_message_count = max_status_message_count_IN
+                status_OUT.set_message_capacity( ( max_status_message_count_IN + 1 ) // 2, max_status_message_count_IN // 2 )
+
+            #-- END check if status message limit --#
+
             # list of records passed in?
             if ( record_list_IN is not None ):
 
@@ -317,6 +679,35 @@ class LoadableDjangoModel( models.Model ):
 
             #-- END check if record list passed in --#
 
+            # record source passed in?
+            if ( record_source_IN is not None ):
+
+                # store source of records.
+                etl_instance.set_record_source( record_source_IN )
+
+            #-- END check if record source passed in --#
+
+            # Excel file passed in?
+            if ( worksheet_file_path_IN is not None ):
+
+                # make sure we have an Excel loader.
+                if ( isinstance( etl_instance, ETLFromExcelWithHeaders ) == False ):
+
+                    status_message = "In {my_class}.{my_method}(): Excel file passed in, but ETL loader is {loader_class}, not ETLFromExcelWithHeaders (check spec's extract storage type).".format(
+                        my_class = cls,
+                        my_method = me,
+                        loader_class = type( etl_instance )
+                    )
+                    raise ETLError( status_message )
+
+                #-- END check to see if Excel loader --#
+
+                # open worksheet, then map its header row to keys.
+                etl_instance.load_input_worksheet( worksheet_file_path_IN, worksheet_name_IN = worksheet_name_IN, read_only_IN = worksheet_read_only_IN )
+                etl_instance.map_indexes_to_keys()
+
+            #-- END check if Excel file passed in --#
+
             # loop over rrecords, processing each
             status_message = "In {my_class} - Starting {my_method}!".format(
                 my_class = cls,
@@ -329,11 +720,22 @@ class LoadableDjangoModel( models.Model ):
             )
             my_start_row = start_index_IN
             my_row_count = row_count_IN
-            process_status = etl_instance.process_records(
-                start_index_IN = my_start_row,
-                record_count_IN = my_row_count,
-                do_output_progress_IN = do_output_progress_IN
-            )
+            try:
+
+                process_status = etl_instance.process_records(
+                    start_index_IN = my_start_row,
+                    record_count_IN = my_row_count,
+                    do_output_progress_IN = do_output_progress_IN
+                )
+
+            finally:
+
+                # opened Excel file? Close it, even if processing failed.
+                if ( worksheet_file_path_IN is not None ):
+                    etl_instance.close_input_workbook()
+                #-- END check if Excel file passed in --#
+
+            #-- END try...finally --#
 
             # retrieve status counts...
             error_counter = process_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATE_ERROR_COUNT )
@@ -347,10 +749,51 @@ class LoadableDjangoModel( models.Model ):
             status_OUT.set_detail_value( ETLProcessor.STATUS_PROP_UPDATE_SUCCESS_COUNT, success_counter )
             status_OUT.set_detail_value( ETLProcessor.STATUS_PROP_UPDATED_RECORD_COUNT, update_counter )
 
-            # store process status info in return status
-            status_OUT.add_status_container( process_status )
+            # ...along with attribute store counts.
+            status_OUT.set_detail_value( ETLObjectLoader.STATUS_PROP_ATTR_UPDATED_COUNT, process_status.get_detail_value( ETLObjectLoader.STATUS_PROP_ATTR_UPDATED_COUNT ) )
+            status_OUT.set_detail_value( ETLObjectLoader.STATUS_PROP_ATTR_NOT_CHANGED_COUNT, process_status.get_detail_value( ETLObjectLoader.STATUS_PROP_ATTR_NOT_CHANGED_COUNT ) )
+            status_OUT.set_detail_value( ETLObjectLoader.STATUS_PROP_ATTR_UNKNOWN_COUNT, process_status.get_detail_value( ETLObjectLoader.STATUS_PROP_ATTR_UNKNOWN_COUNT ) )
+
+            # ...and count of unchanged records skipped, if change detection.
+            if ( cls.etl_record_hash_field_name is not None ):
+                status_OUT.set_detail_value( ETLDjangoModelLoader.STATUS_PROP_UNCHANGED_SKIPPED_COUNT, process_status.get_detail_value( ETLDjangoModelLoader.STATUS_PROP_UNCHANGED_SKIPPED_COUNT ) )
+            #-- END check to see if change detection --#
+
+            # ...and missing required counts, if checked in batches.
+            if ( etl_instance.do_batch_required == True ):
+                status_OUT.set_detail_value( ETLProcessor.STATUS_PROP_MISSING_REQUIRED_COUNT, process_status.get_detail_value( ETLProcessor.STATUS_PROP_MISSING_REQUIRED_COUNT ) )
+                status_OUT.set_detail_value( ETLProcessor.STATUS_PROP_MISSING_REQUIRED_KEY_COUNT_MAP, process_status.get_detail_value( ETLProcessor.STATUS_PROP_MISSING_REQUIRED_KEY_COUNT_MAP ) )
+            #-- END check to see if batched required check --#
+
+            # ...and index resumed from, if resumed from checkpoint.
+            if ( process_status.get_detail_value( ETLDjangoModelLoader.STATUS_PROP_RESUMED_FROM_INDEX, None ) is not None ):
+                status_OUT.set_detail_value( ETLDjangoModelLoader.STATUS_PROP_RESUMED_FROM_INDEX, process_status.get_detail_value( ETLDjangoModelLoader.STATUS_PROP_RESUMED_FROM_INDEX ) )
+            #-- END check to see if resumed --#
+
+            # ...and dead letter counts, if dead letters...
+            if ( etl_instance.dead_letter_file_path is not None ):
+                status_OUT.set_detail_value( ETLProcessor.STATUS_PROP_DEAD_LETTER_COUNT, process_status.get_detail_value( ETLProcessor.STATUS_PROP_DEAD_LETTER_COUNT ) )
+                status_OUT.set_detail_value( ETLProcessor.STATUS_PROP_DEAD_LETTER_REASON_COUNT_MAP, process_status.get_detail_value( ETLProcessor.STATUS_PROP_DEAD_LETTER_REASON_COUNT_MAP ) )
+            #-- END check to see if dead letters --#
+
+            # ...and status message counts, if bounded...
+            if ( etl_instance.max_status_message_count is not None ):
+                status_OUT.set_detail_value( ETLProcessor.STATUS_PROP_DROPPED_STATUS_MESSAGE_COUNT, process_status.get_detail_value( ETLProcessor.STATUS_PROP_DROPPED_STATUS_MESSAGE_COUNT ) )
+                status_OUT.set_detail_value( ETLProcessor.STATUS_PROP_STATUS_MESSAGE_CATEGORY_COUNT_MAP, process_status.get_detail_value( ETLProcessor.STATUS_PROP_STATUS_MESSAGE_CATEGORY_COUNT_MAP ) )
+            #-- END check to see if status messages bounded --#
+
+            # ...and timing summary, if instrumented.
+            if ( etl_instance.do_instrumentation == True ):
+                status_OUT.set_detail_value( ETLProcessor.STATUS_PROP_INSTRUMENTATION, process_status.get_detail_value( ETLProcessor.STATUS_PROP_INSTRUMENTATION ) )
+            #-- END check to see if instrumentation --#
+
+            # copy process and per-record messages into return status (counts
+            #     are copied above - don't also keep process status, or
+            #     messages are held twice). If status messages are bounded,
+            #     loader's list is already bounded, and so is status_OUT.
             process_message_list = process_status.get_message_list()
             status_OUT.add_messages_from_list( process_message_list )
+            status_OUT.add_messages_from_list( etl_instance.get_status_message_list() )
 
             # error?
             process_success = process_status.is_success()
@@ -364,7 +807,7 @@ class LoadableDjangoModel( models.Model ):
         else:
 
             # no instance passed in - log error, return error status.
-            status_message = "ERROR - No record list passed in. Can't do anything."
+            status_message = "ERROR - No record list or record source passed in. Can't do anything."
             LoggingHelper.log_message(
                 status_message,
                 method_IN = me,
@@ -384,6 +827,327 @@ class LoadableDjangoModel( models.Model ):
     #-- END class method run_etl() --#
 
 
+    @classmethod
+    def run_etl_parallel( cls,
+                          record_list_IN = None,
+                          record_source_IN = None,
+                          start_index_IN = None,
+                          row_count_IN = None,
+                          worker_count_IN = None,
+                          partition_size_IN = None,
+                          **kwargs ):
+
+        '''
+        Splits records into ranges and runs run_etl() on each range in a pool
+            of worker processes, then merges the counts from each worker's
+            status into a single StatusContainer.
+
+        preconditions:
+        - need to be able to count the records: either a record list, or an
+            ETLRecordSource whose get_record_count() isn't None (so a count
+            hint for file and generator sources).
+        - record sources are pickled and sent to each worker, which reads its
+            range using start_index_IN and row_count_IN. Record lists are
+            sliced here, and each worker only gets its slice. Generators can't
+            be pickled, so can't be processed in parallel.
+        - worker_count_IN defaults to the number of CPUs.
+        - partition_size_IN defaults to splitting records evenly across
+            workers. Smaller partitions spread the work more evenly when some
+            records take longer than others.
+        - any other keyword arguments are passed through to run_etl() (
+            default_time_zone_IN, batch_lookup_size_IN,
+            bulk_write_batch_size_IN, etc.).
+        - checkpoint_file_path_IN and dead_letter_file_path_IN get a file per
+            partition: "<path>.<partition index>" ( build_worker_kwargs() ).
+            To resume, call again with the same range, worker_count_IN and
+            partition_size_IN, so partitions line up with their checkpoints.
+        - each worker has its own database connection. Records with the same
+            identity should be in the same partition, or workers can race to
+            create the same instance.
+        '''
+
+        # return reference
+        status_OUT = None
+
+        # declare variables
+        me = "run_etl_parallel"
+        status_message = None
+        record_source = None
+        total_count = None
+        start_index = None
+        stop_index = None
+        worker_count = None
+        partition_size = None
+        partition_start = None
+        partition_stop = None
+        partition_index = None
+        worker_kwargs = None
+
+        # declare variables - processing
+        future_list = None
+        current_future = None
+        worker_status_list = None
+
+        # init
+        status_OUT = StatusContainer()
+        status_OUT.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
+
+        # how many records?
+        if ( record_list_IN is not None ):
+
+            total_count = len( record_list_IN )
+
+        elif ( record_source_IN is not None ):
+
+            # wrap plain iterables, then ask source.
+            record_source = record_source_IN
+            if ( isinstance( record_source, ETLRecordSource ) == False ):
+                record_source = ETLRecordSource( iterable_IN = record_source_IN )
+            #-- END check to see if ETLRecordSource --#
+
+            total_count = record_source.get_record_count()
+
+        #-- END check to see what we are counting --#
+
+        # got a count?
+        if ( total_count is not None ):
+
+            # figure out range to process.
+            start_index = start_index_IN
+            if ( start_index is None ):
+                start_index = 0
+            #-- END check to see if start index --#
+
+            stop_index = total_count
+            if ( row_count_IN is not None ):
+                stop_index = min( start_index + row_count_IN, total_count )
+            #-- END check to see if row count --#
+
+            # workers and partitions
+            worker_count = worker_count_IN
+            if ( worker_count is None ):
+                worker_count = os.cpu_count()
+            #-- END check to see if worker count --#
+
+            partition_size = partition_size_IN
+            if ( partition_size is None ):
+                partition_size = max( 1, math.ceil( ( stop_index - start_index ) / worker_count ) )
+            #-- END check to see if partition size --#
+
+            # close database connections so workers don't inherit them.
+            connections.close_all()
+
+            # run partitions in pool of worker processes.
+            future_list = []
+            with concurrent.futures.ProcessPoolExecutor( max_workers = worker_count, initializer = ETLDjangoModelLoader.initialize_worker_process ) as process_pool:
+
+                for partition_index, partition_start in enumerate( range( start_index, stop_index, partition_size ) ):
+
+                    partition_stop = min( partition_start + partition_size, stop_index )
+
+                    # each partition gets its own checkpoint and dead letter
+                    #     files.
+                    worker_kwargs = cls.build_worker_kwargs( kwargs, partition_index )
+
+                    if ( record_list_IN is not None ):
+
+                        # list - send just this partition's slice.
+                        current_future = process_pool.submit(
+                            cls.run_etl,
+                            record_list_IN = record_list_IN[ partition_start : partition_stop ],
+                            **worker_kwargs
+                        )
+
+                    else:
+
+                        # source - send source and range.
+                        current_future = process_pool.submit(
+                            cls.run_etl,
+                            record_source_IN = record_source_IN,
+                            start_index_IN = partition_start,
+                            row_count_IN = partition_stop - partition_start,
+                            **worker_kwargs
+                        )
+
+                    #-- END check to see if list or source --#
+
+                    future_list.append( current_future )
+
+                #-- END loop over partitions --#
+
+                # collect statuses, in partition order.
+                worker_status_list = []
+                for current_future in future_list:
+
+                    worker_status_list.append( current_future.result() )
+
+                #-- END loop over futures --#
+
+            #-- END with ProcessPoolExecutor --#
+
+            # merge statuses
+            status_OUT = cls.merge_worker_status_list( worker_status_list, max_status_message_count_IN = kwargs.get( "max_status_message_count_IN", None ) )
+
+        else:
+
+            # can't partition what we can't count - log error, return error status.
+            status_message = "ERROR - No record list, or record source with no count (pass a count hint). Can't partition."
+            LoggingHelper.log_message(
+                status_message,
+                method_IN = me,
+                logger_name_IN = cls.MY_LOGGER_NAME,
+                do_print_IN = True,
+                log_level_code_IN = logging.WARNING
+            )
+
+            # status
+            status_OUT.set_status_code( StatusContainer.STATUS_CODE_ERROR )
+            status_OUT.add_message( status_message )
+
+        #-- END check to see if count --#
+
+        return status_OUT
+
+    #-- END class method run_etl_parallel() --#
+
+
+    @classmethod
+    def run_etl_worksheets_parallel( cls,
+                                     file_path_IN,
+                                     worksheet_name_list_IN = None,
+                                     worker_count_IN = None,
+                                     **kwargs ):
+
+        '''
+        Loads each worksheet in an Excel file in its own worker process (
+            run_etl() with worksheet_file_path_IN and worksheet_name_IN), then
+            merges the counts from each worker's status into a single
+            StatusContainer ( merge_worker_status_list() ). The count of
+            records processed from each worksheet is in status detail property
+            ETLFromExcelWithHeaders.STATUS_PROP_WORKSHEET_RECORD_COUNT_MAP.
+
+        preconditions:
+        - spec's extract storage type must be STORAGE_TYPE_XLSX_WITH_HEADERS,
+            and each worksheet must have a header row. Header rows are mapped
+            separately for each worksheet, so columns can be in a different
+            order from one worksheet to the next.
+        - worksheet_name_list_IN defaults to all the worksheets in the file.
+        - worker_count_IN defaults to the number of CPUs, but never more than
+            the number of worksheets.
+        - any other keyword arguments are passed through to run_etl() (
+            worksheet_read_only_IN, bulk_write_batch_size_IN, etc.).
+        - checkpoint_file_path_IN and dead_letter_file_path_IN get a file per
+            worksheet: "<path>.<worksheet index>" ( build_worker_kwargs() ).
+            To resume, call again with the same worksheet_name_list_IN.
+        - each worker has its own database connection. Records with the same
+            identity should be in the same worksheet, or workers can race to
+            create the same instance.
+        '''
+
+        # return reference
+        status_OUT = None
+
+        # declare variables
+        me = "run_etl_worksheets_parallel"
+        status_message = None
+        worksheet_name_list = None
+        worker_count = None
+        current_worksheet_name = None
+        worksheet_index = None
+
+        # declare variables - processing
+        future_list = None
+        current_future = None
+        worker_status_list = None
+        worker_status = None
+        worksheet_record_count_map = None
+
+        # init
+        status_OUT = StatusContainer()
+        status_OUT.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
+
+        # which worksheets?
+        worksheet_name_list = worksheet_name_list_IN
+        if ( worksheet_name_list is None ):
+            worksheet_name_list = ETLFromExcelWithHeaders.get_worksheet_name_list( file_path_IN )
+        #-- END check to see if worksheet names --#
+
+        # got any?
+        if ( len( worksheet_name_list ) > 0 ):
+
+            # workers
+            worker_count = worker_count_IN
+            if ( worker_count is None ):
+                worker_count = os.cpu_count()
+            #-- END check to see if worker count --#
+            worker_count = min( worker_count, len( worksheet_name_list ) )
+
+            # close database connections so workers don't inherit them.
+            connections.close_all()
+
+            # run worksheets in pool of worker processes.
+            future_list = []
+            with concurrent.futures.ProcessPoolExecutor( max_workers = worker_count, initializer = ETLDjangoModelLoader.initialize_worker_process ) as process_pool:
+
+                for worksheet_index, current_worksheet_name in enumerate( worksheet_name_list ):
+
+                    # each worksheet gets its own checkpoint and dead letter
+                    #     files.
+                    current_future = process_pool.submit(
+                        cls.run_etl,
+                        worksheet_file_path_IN = file_path_IN,
+                        worksheet_name_IN = current_worksheet_name,
+                        **cls.build_worker_kwargs( kwargs, worksheet_index )
+                    )
+                    future_list.append( current_future )
+
+                #-- END loop over worksheets --#
+
+                # collect statuses, in worksheet order.
+                worker_status_list = []
+                for current_future in future_list:
+
+                    worker_status_list.append( current_future.result() )
+
+                #-- END loop over futures --#
+
+            #-- END with ProcessPoolExecutor --#
+
+            # merge statuses...
+            status_OUT = cls.merge_worker_status_list( worker_status_list, max_status_message_count_IN = kwargs.get( "max_status_message_count_IN", None ) )
+
+            # ...and count records per worksheet.
+            worksheet_record_count_map = {}
+            for current_worksheet_name, worker_status in zip( worksheet_name_list, worker_status_list ):
+
+                worksheet_record_count_map[ current_worksheet_name ] = worker_status.get_detail_value( ETLProcessor.STATUS_PROP_PROCESSED_RECORD_COUNT, 0 )
+
+            #-- END loop over worksheets --#
+            status_OUT.set_detail_value( ETLFromExcelWithHeaders.STATUS_PROP_WORKSHEET_RECORD_COUNT_MAP, worksheet_record_count_map )
+
+        else:
+
+            # no worksheets - log error, return error status.
+            status_message = "ERROR - No worksheets to load in {file_path}.".format( file_path = file_path_IN )
+            LoggingHelper.log_message(
+                status_message,
+                method_IN = me,
+                logger_name_IN = cls.MY_LOGGER_NAME,
+                do_print_IN = True,
+                log_level_code_IN = logging.WARNING
+            )
+
+            # status
+            status_OUT.set_status_code( StatusContainer.STATUS_CODE_ERROR )
+            status_OUT.add_message( status_message )
+
+        #-- END check to see if worksheets --#
+
+        return status_OUT
+
+    #-- END class method run_etl_worksheets_parallel() --#
+
+
     @classmethod
     def set_etl_spec( cls, value_IN ):
 
@@ -499,6 +1263,75 @@ class LoadableDjangoModel( models.Model ):
     #-- END method update_extra_data_attr() --#
 
 
+    def update_extra_data_attrs( self, attr_name_to_value_map_IN ):
+
+        '''
+        Accepts dictionary of attribute names to values for attributes that
+            are not in the model. Merges them into extra_data in one pass,
+            only updating values that are new or different. Returns map of
+            names of attributes that changed to their old values (None if they
+            weren't in extra_data yet) - empty if nothing changed.
+        '''
+
+        # return reference
+        changed_name_to_old_value_map_OUT = {}
+
+        # declare variables
+        me = "update_extra_data_attrs"
+        extra_data_json = None
+        missing = None
+        current_name = None
+        current_value = None
+        existing_value = None
+
+        # anything to merge?
+        if ( ( attr_name_to_value_map_IN is not None ) and ( len( attr_name_to_value_map_IN ) > 0 ) ):
+
+            # get extra data JSONField
+            extra_data_json = self.extra_data
+
+            # got anything already?
+            if ( ( extra_data_json is None ) or ( extra_data_json == "" ) ):
+
+                # no - everything is new.
+                self.extra_data = dict( attr_name_to_value_map_IN )
+                changed_name_to_old_value_map_OUT = dict.fromkeys( attr_name_to_value_map_IN )
+
+            else:
+
+                # diff against what is there, one lookup per name.
+                missing = object()
+                for current_name, current_value in attr_name_to_value_map_IN.items():
+
+                    existing_value = extra_data_json.get( current_name, missing )
+                    if ( existing_value is missing ):
+
+                        changed_name_to_old_value_map_OUT[ current_name ] = None
+
+                    elif ( existing_value != current_value ):
+
+                        changed_name_to_old_value_map_OUT[ current_name ] = existing_value
+
+                    #-- END check to see if new or changed --#
+
+                #-- END loop over attributes --#
+
+                # update only what changed.
+                for current_name in changed_name_to_old_value_map_OUT:
+
+                    extra_data_json[ current_name ] = attr_name_to_value_map_IN[ current_name ]
+
+                #-- END loop over changed attributes --#
+
+            #-- END check to see if initialized --#
+
+        #-- END check to see if anything to merge --#
+
+        return changed_name_to_old_value_map_OUT
+
+    #-- END method update_extra_data_attrs() --#
+
+
     def update_from_record_pre_save( self, record_IN, debug_flag_IN = False ):
 
         '''
@@ -0,0 +1,232 @@
+'''
+Minimal django models used by python_utilities/etl/tests.py to test loading
+    into a database (SQLite, set up with ETLBenchmark.configure_sqlite()).
+    Not meant to be installed in a real project.
+
+- ETLTestPerson - single identity attribute, a date, an optional record hash
+    field (for change detection), and a list of related ETLTestPet records.
+- ETLTestPet - loaded through ETLTestPerson, foreign key back to its owner.
+- ETLTestItem - composite identity ( source + code ), plus a unique field to
+    make integrity errors on demand.
+'''
+
+# django imports
+from django.db import models
+
+# ETL imports
+from python_utilities.etl.etl_attribute import ETLAttribute
+from python_utilities.etl.etl_entity import ETLEntity
+from python_utilities.etl.loadable_django_model import LoadableDjangoModel
+
+
+class ETLTestPerson( LoadableDjangoModel ):
+
+    #==========================================================================#
+    # ! ==> model fields
+    #==========================================================================#
+
+    ext_id = models.IntegerField( blank = True, null = True )
+    name = models.CharField( max_length = 255, blank = True, null = True )
+    birth_date = models.DateField( blank = True, null = True )
+    content_hash = models.CharField( max_length = 64, blank = True, null = True )
+
+    #==========================================================================#
+    # ! ==> class variables
+    #==========================================================================#
+
+    etl_spec = None
+
+    #==========================================================================#
+    # ! ==> class methods
+    #==========================================================================#
+
+
+    @classmethod
+    def initialize_etl( cls, *args, **kwargs ):
+
+        # return reference
+        spec_OUT = None
+
+        # declare variables
+        current_attr = None
+
+        # make spec
+        spec_OUT = ETLEntity()
+        spec_OUT.set_extract_storage_type( ETLEntity.STORAGE_TYPE_DICT )
+        spec_OUT.set_load_class( cls )
+
+        # identity - "id" --> ext_id
+        current_attr = ETLAttribute.create_transform_attribute(
+            extract_prop_IN = "id",
+            load_prop_IN = "ext_id",
+            load_attr_data_type_IN = ETLAttribute.DATA_TYPE_INT,
+            is_required_IN = True
+        )
+        spec_OUT.add_identity_attr( current_attr )
+
+        # data - name, birth_date
+        current_attr = ETLAttribute.create_transform_attribute(
+            extract_prop_IN = "name",
+            load_prop_IN = "name",
+            load_attr_data_type_IN = ETLAttribute.DATA_TYPE_STRING
+        )
+        spec_OUT.add_data_attr( current_attr )
+        current_attr = ETLAttribute.create_transform_attribute_date(
+            extract_prop_IN = "birth_date",
+            load_prop_IN = "birth_date",
+            conversion_string_IN = "%Y-%m-%d"
+        )
+        spec_OUT.add_data_attr( current_attr )
+
+        # related - list of pet dictionaries in "pets".
+        current_attr = ETLAttribute()
+        current_attr.set_extract_name( "pets" )
+        current_attr.set_load_attr_related_model_class_module( "python_utilities.etl.test_app.models" )
+        current_attr.set_load_attr_related_model_class_name( "ETLTestPet" )
+        current_attr.set_load_attr_related_model_data_type( ETLAttribute.RELATED_TYPE_LIST_OF_DICTS )
+        current_attr.set_load_attr_related_model_fk_attr_name( "owner" )
+        spec_OUT.add_data_attr( current_attr )
+
+        cls.set_etl_spec( spec_OUT )
+
+        return spec_OUT
+
+    #-- END class method initialize_etl() --#
+
+#-- END class ETLTestPerson --#
+
+
+class ETLTestPet( LoadableDjangoModel ):
+
+    #==========================================================================#
+    # ! ==> model fields
+    #==========================================================================#
+
+    owner = models.ForeignKey( ETLTestPerson, on_delete = models.CASCADE, blank = True, null = True )
+    pet_id = models.IntegerField( blank = True, null = True )
+    kind = models.CharField( max_length = 255, blank = True, null = True )
+
+    #==========================================================================#
+    # ! ==> class variables
+    #==========================================================================#
+
+    etl_spec = None
+
+    #==========================================================================#
+    # ! ==> class methods
+    #==========================================================================#
+
+
+    @classmethod
+    def initialize_etl( cls, *args, **kwargs ):
+
+        # return reference
+        spec_OUT = None
+
+        # declare variables
+        current_attr = None
+
+        # make spec
+        spec_OUT = ETLEntity()
+        spec_OUT.set_extract_storage_type( ETLEntity.STORAGE_TYPE_DICT )
+        spec_OUT.set_load_class( cls )
+
+        # identity - "pet_id"
+        current_attr = ETLAttribute.create_transform_attribute(
+            extract_prop_IN = "pet_id",
+            load_prop_IN = "pet_id",
+            load_attr_data_type_IN = ETLAttribute.DATA_TYPE_INT,
+            is_required_IN = True
+        )
+        spec_OUT.add_identity_attr( current_attr )
+
+        # data - kind
+        current_attr = ETLAttribute.create_transform_attribute(
+            extract_prop_IN = "kind",
+            load_prop_IN = "kind",
+            load_attr_data_type_IN = ETLAttribute.DATA_TYPE_STRING
+        )
+        spec_OUT.add_data_attr( current_attr )
+
+        cls.set_etl_spec( spec_OUT )
+
+        return spec_OUT
+
+    #-- END class method initialize_etl() --#
+
+#-- END class ETLTestPet --#
+
+
+class ETLTestItem( LoadableDjangoModel ):
+
+    #==========================================================================#
+    # ! ==> model fields
+    #==========================================================================#
+
+    source = models.CharField( max_length = 255, blank = True, null = True )
+    code = models.CharField( max_length = 255, blank = True, null = True )
+    value = models.IntegerField( blank = True, null = True )
+    serial = models.IntegerField( blank = True, null = True, unique = True )
+
+    #==========================================================================#
+    # ! ==> class variables
+    #==========================================================================#
+
+    etl_spec = None
+
+    #==========================================================================#
+    # ! ==> class methods
+    #==========================================================================#
+
+
+    @classmethod
+    def initialize_etl( cls, *args, **kwargs ):
+
+        # return reference
+        spec_OUT = None
+
+        # declare variables
+        current_attr = None
+
+        # make spec
+        spec_OUT = ETLEntity()
+        spec_OUT.set_extract_storage_type( ETLEntity.STORAGE_TYPE_DICT )
+        spec_OUT.set_load_class( cls )
+
+        # identity - "source" + "code"
+        current_attr = ETLAttribute.create_transform_attribute(
+            extract_prop_IN = "source",
+            load_prop_IN = "source",
+            load_attr_data_type_IN = ETLAttribute.DATA_TYPE_STRING,
+            is_required_IN = True
+        )
+        spec_OUT.add_identity_attr( current_attr )
+        current_attr = ETLAttribute.create_transform_attribute(
+            extract_prop_IN = "code",
+            load_prop_IN = "code",
+            load_attr_data_type_IN = ETLAttribute.DATA_TYPE_STRING,
+            is_required_IN = True
+        )
+        spec_OUT.add_identity_attr( current_attr )
+
+        # data - value, serial
+        current_attr = ETLAttribute.create_transform_attribute(
+            extract_prop_IN = "value",
+            load_prop_IN = "value",
+            load_attr_data_type_IN = ETLAttribute.DATA_TYPE_INT
+        )
+        spec_OUT.add_data_attr( current_attr )
+        current_attr = ETLAttribute.create_transform_attribute(
+            extract_prop_IN = "serial",
+            load_prop_IN = "serial",
+            load_attr_data_type_IN = ETLAttribute.DATA_TYPE_INT
+        )
+        spec_OUT.add_data_attr( current_attr )
+
+        cls.set_etl_spec( spec_OUT )
+
+        return spec_OUT
+
+    #-- END class method initialize_etl() --#
+
+#-- END class ETLTestItem --#
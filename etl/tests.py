@@ -0,0 +1,1938 @@
+# python imports
+import collections
+import concurrent.futures
+import datetime
+import importlib
+import itertools
+import json
+import os
+import shutil
+import site
+import tempfile
+import tracemalloc
+import unittest
+from unittest import mock
+
+# python packages
+import openpyxl
+import pandas
+import pytz
+
+# import the things we are testing.
+
+try:
+
+    from python_utilities.etl.etl_attribute import ETLAttribute
+    from python_utilities.etl.etl_attribute import ETLAttributeUpdateDetail
+    from python_utilities.etl.etl_checkpoint import ETLCheckpoint
+    from python_utilities.etl.etl_compiled_entity import ETLCompiledEntity
+    from python_utilities.etl.etl_dead_letter_sink import ETLDeadLetterSink
+    from python_utilities.etl.etl_entity import ETLEntity
+    from python_utilities.etl.etl_error import ETLError
+    from python_utilities.etl.etl_from_dataframe import ETLFromDataFrame
+    from python_utilities.etl.etl_from_excel_with_headers import ETLFromExcelWithHeaders
+    from python_utilities.etl.etl_instrumentation import ETLInstrumentation
+    from python_utilities.etl.etl_processor import ETLProcessor
+    from python_utilities.etl.etl_record_source import ETLRecordSource
+    from python_utilities.etl.etl_record_source import ETLRecordSourceCSV
+    from python_utilities.etl.etl_record_source import ETLRecordSourceJSONLines
+
+except ImportError as ie:
+
+    # get current directory path
+    current_directory_path = os.path.dirname( os.path.abspath( __file__ ) )
+
+    # add to python path
+    site.addsitedir( current_directory_path )
+
+    # try local import
+    from etl_attribute import ETLAttribute
+    from etl_attribute import ETLAttributeUpdateDetail
+    from etl_checkpoint import ETLCheckpoint
+    from etl_compiled_entity import ETLCompiledEntity
+    from etl_dead_letter_sink import ETLDeadLetterSink
+    from etl_entity import ETLEntity
+    from etl_error import ETLError
+    from etl_from_dataframe import ETLFromDataFrame
+    from etl_from_excel_with_headers import ETLFromExcelWithHeaders
+    from etl_instrumentation import ETLInstrumentation
+    from etl_processor import ETLProcessor
+    from etl_record_source import ETLRecordSource
+    from etl_record_source import ETLRecordSourceCSV
+    from etl_record_source import ETLRecordSourceJSONLines
+
+#-- END attempt to import ETL classes --#
+
+# django - configure a SQLite database for the test models in
+#     python_utilities/etl/test_app (a file, not in memory, so worker
+#     processes in parallel ETL tests see the same tables).
+from python_utilities.etl.etl_benchmark import ETLBenchmark
+TEST_DATABASE_DIRECTORY_PATH = tempfile.mkdtemp()
+ETLBenchmark.configure_sqlite(
+    database_path_IN = os.path.join( TEST_DATABASE_DIRECTORY_PATH, "etl_tests.sqlite3" ),
+    installed_app_list_IN = [ "python_utilities.etl.test_app" ]
+)
+
+from django.db import connection
+from django.db import connections
+from django.db import DataError
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+from python_utilities.etl.etl_django_model_loader import ETLDjangoModelLoader
+from python_utilities.etl.etl_object_loader import ETLObjectLoader
+from python_utilities.etl.loadable_django_model import LoadableDjangoModel
+from python_utilities.etl.test_app.models import ETLTestItem
+from python_utilities.etl.test_app.models import ETLTestPerson
+from python_utilities.etl.test_app.models import ETLTestPet
+from python_utilities.status.status_container import StatusContainer
+
+TEST_MODEL_CLASS_LIST = [ ETLTestPerson, ETLTestPet, ETLTestItem ]
+
+
+def setUpModule():
+
+    # create tables for test models.
+    ETLBenchmark.create_tables( TEST_MODEL_CLASS_LIST )
+
+#-- END function setUpModule() --#
+
+
+def tearDownModule():
+
+    # close connections, then remove database.
+    connections.close_all()
+    shutil.rmtree( TEST_DATABASE_DIRECTORY_PATH, ignore_errors = True )
+
+#-- END function tearDownModule() --#
+
+
+class DjangoModelTestCase(unittest.TestCase):
+
+    '''
+    Base class for tests that load into the test models - starts each test
+        with empty tables and no change detection.
+    '''
+
+    def setUp( self ):
+
+        # declare variables
+        model_class = None
+
+        for model_class in reversed( TEST_MODEL_CLASS_LIST ):
+
+            model_class.objects.all().delete()
+
+        #-- END loop over test models --#
+
+        ETLTestPerson.etl_record_hash_field_name = None
+
+    #-- END method setUp() --#
+
+
+    def make_loader( self, model_class_IN, record_list_IN ):
+
+        '''
+        Returns the loader run_etl() would make for the model class passed
+            in, with the records passed in stored in it.
+        '''
+
+        # return reference
+        loader_OUT = None
+
+        model_class_IN.initialize_etl()
+        loader_OUT = model_class_IN.get_my_etl_loader_instance()
+        loader_OUT.set_etl_entity( model_class_IN.get_etl_spec() )
+        loader_OUT = model_class_IN.initialize_etl_loader( loader_OUT )
+        loader_OUT.set_record_list( record_list_IN )
+
+        return loader_OUT
+
+    #-- END method make_loader() --#
+
+#-- END unittest class DjangoModelTestCase --#
+
+
+class TestETLAttributeConverter(unittest.TestCase):
+
+    def make_attribute( self, data_type_IN, conversion_string_IN = None ):
+
+        # return reference
+        attribute_OUT = None
+
+        attribute_OUT = ETLAttribute()
+        attribute_OUT.set_load_attr_data_type( data_type_IN )
+        attribute_OUT.set_transform_conversion_string( conversion_string_IN )
+
+        return attribute_OUT
+
+    #-- END method make_attribute() --#
+
+
+    def assert_same_conversion( self, attribute_IN, value_IN, expected_IN ):
+
+        '''
+        Asserts that the compiled converter and process_value() both convert
+            the value passed in to the expected value.
+        '''
+
+        self.assertEqual( attribute_IN.get_converter()( value_IN ), expected_IN )
+        self.assertEqual( attribute_IN.process_value( value_IN ), expected_IN )
+
+    #-- END method assert_same_conversion() --#
+
+
+    def test_convert_int( self ):
+
+        # declare variables
+        test_attribute = None
+
+        test_attribute = self.make_attribute( ETLAttribute.DATA_TYPE_INT )
+
+        # ! ----> test 1 - ints, strings stripped
+        self.assert_same_conversion( test_attribute, 7, 7 )
+        self.assert_same_conversion( test_attribute, " 12 ", 12 )
+
+    #-- END method test_convert_int() --#
+
+
+    def test_convert_date( self ):
+
+        # declare variables
+        test_attribute = None
+
+        # ! ----> test 1 - conversion string
+        test_attribute = self.make_attribute( ETLAttribute.DATA_TYPE_DATETIME_DATE, "%m/%d/%Y" )
+        self.assert_same_conversion( test_attribute, "01/02/2020", datetime.date( 2020, 1, 2 ) )
+
+        # ! ----> test 2 - no conversion string, empty is None
+        test_attribute = self.make_attribute( ETLAttribute.DATA_TYPE_DATETIME_DATE )
+        self.assert_same_conversion( test_attribute, " 2020-01-02 ", datetime.date( 2020, 1, 2 ) )
+        self.assert_same_conversion( test_attribute, "  ", None )
+
+    #-- END method test_convert_date() --#
+
+
+    def test_convert_datetime( self ):
+
+        # declare variables
+        test_attribute = None
+
+        test_attribute = self.make_attribute( ETLAttribute.DATA_TYPE_DATETIME_DATETIME )
+
+        # ! ----> test 1 - no time zone, gets default (UTC); time zone kept
+        self.assert_same_conversion( test_attribute, "2020-01-02 03:04:05", datetime.datetime( 2020, 1, 2, 3, 4, 5, tzinfo = datetime.timezone.utc ) )
+        self.assert_same_conversion( test_attribute, "2020-01-02T03:04:05+02:00", datetime.datetime( 2020, 1, 2, 1, 4, 5, tzinfo = datetime.timezone.utc ) )
+
+    #-- END method test_convert_datetime() --#
+
+
+    def test_convert_bad_value( self ):
+
+        # declare variables
+        test_attribute = None
+        current_data_type = None
+        current_conversion_string = None
+
+        # ! ----> test 1 - bad int and date strings raise ValueError, both ways
+        for current_data_type, current_conversion_string in [
+            ( ETLAttribute.DATA_TYPE_INT, None ),
+            ( ETLAttribute.DATA_TYPE_DATETIME_DATE, "%Y-%m-%d" ),
+            ( ETLAttribute.DATA_TYPE_DATETIME_DATE, None ),
+            ( ETLAttribute.DATA_TYPE_DATETIME_DATETIME, None )
+        ]:
+
+            test_attribute = self.make_attribute( current_data_type, current_conversion_string )
+            with self.assertRaises( ValueError ):
+                test_attribute.get_converter()( "not a value" )
+            #-- END with assertRaises --#
+            with self.assertRaises( ValueError ):
+                test_attribute.process_value( "not a value" )
+            #-- END with assertRaises --#
+
+        #-- END loop over types --#
+
+    #-- END method test_convert_bad_value() --#
+
+#-- END unittest class TestETLAttributeConverter --#
+
+
+class TestETLAttributeRelatedClass(unittest.TestCase):
+
+    def make_attribute( self ):
+
+        # return reference
+        attribute_OUT = None
+
+        attribute_OUT = ETLAttribute()
+        attribute_OUT.set_extract_name( "pets" )
+        attribute_OUT.set_load_attr_related_model_class_module( "collections" )
+        attribute_OUT.set_load_attr_related_model_class_name( "OrderedDict" )
+
+        return attribute_OUT
+
+    #-- END method make_attribute() --#
+
+
+    def test_get_related_model_class_cached( self ):
+
+        # declare variables
+        cache_key = None
+        import_module = None
+        test_class = None
+
+        cache_key = ( "collections", "OrderedDict" )
+        ETLAttribute.related_model_class_cache.pop( cache_key, None )
+
+        with mock.patch.object( importlib, "import_module", wraps = importlib.import_module ) as import_module:
+
+            # ! ----> test 1 - first lookup imports, and caches
+            test_class = self.make_attribute().get_related_model_class()
+
+            # and the asserts
+            self.assertIs( test_class, collections.OrderedDict )
+            self.assertEqual( import_module.call_count, 1 )
+            self.assertIs( ETLAttribute.related_model_class_cache[ cache_key ], collections.OrderedDict )
+
+            # ! ----> test 2 - another attribute, same class - from cache
+            test_class = self.make_attribute().get_related_model_class()
+            self.assertIs( test_class, collections.OrderedDict )
+            self.assertEqual( import_module.call_count, 1 )
+
+        #-- END with mock.patch.object() --#
+
+    #-- END method test_get_related_model_class_cached() --#
+
+#-- END unittest class TestETLAttributeRelatedClass --#
+
+
+class TestETLCheckpoint(unittest.TestCase):
+
+    def test_start_update_load( self ):
+
+        # declare variables
+        temp_directory = None
+        checkpoint_file_path = None
+        test_checkpoint = None
+        loaded_checkpoint = None
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+
+            checkpoint_file_path = os.path.join( temp_directory, "checkpoint.json" )
+
+            # ! ----> test 1 - start
+            test_checkpoint = ETLCheckpoint( file_path_IN = checkpoint_file_path, label_IN = "run" )
+            test_checkpoint.start( start_index_IN = 10, record_count_IN = 100 )
+
+            # and the asserts
+            self.assertEqual( test_checkpoint.next_index, 10 )
+            self.assertEqual( test_checkpoint.counter_map, {} )
+            self.assertEqual( test_checkpoint.get_remaining_count(), 100 )
+            self.assertFalse( os.path.exists( checkpoint_file_path ) )
+
+            # ! ----> test 2 - update saves, no temp file left
+            test_checkpoint.update( 50, { "created" : 30, "error" : 10 } )
+
+            # and the asserts
+            self.assertEqual( test_checkpoint.get_remaining_count(), 60 )
+            self.assertTrue( os.path.exists( checkpoint_file_path ) )
+            self.assertFalse( os.path.exists( checkpoint_file_path + ".tmp" ) )
+            with open( checkpoint_file_path, "r", encoding = "utf-8" ) as checkpoint_file:
+                self.assertEqual( json.load( checkpoint_file )[ ETLCheckpoint.PROP_NEXT_INDEX ], 50 )
+            #-- END with open() --#
+
+            # ! ----> test 3 - load into a new instance
+            loaded_checkpoint = ETLCheckpoint( file_path_IN = checkpoint_file_path, label_IN = "run" )
+
+            # and the asserts
+            self.assertTrue( loaded_checkpoint.load() )
+            self.assertEqual( loaded_checkpoint.start_index, 10 )
+            self.assertEqual( loaded_checkpoint.record_count, 100 )
+            self.assertEqual( loaded_checkpoint.next_index, 50 )
+            self.assertEqual( loaded_checkpoint.counter_map, { "created" : 30, "error" : 10 } )
+            self.assertFalse( loaded_checkpoint.is_complete )
+
+            # ! ----> test 4 - resumed run's counts added to counts loaded
+            loaded_checkpoint.update( 110, { "created" : 5, "updated" : 2 }, is_complete_IN = True )
+
+            # and the asserts
+            self.assertEqual( loaded_checkpoint.counter_map, { "created" : 35, "error" : 10, "updated" : 2 } )
+            self.assertEqual( loaded_checkpoint.get_remaining_count(), 0 )
+            self.assertTrue( loaded_checkpoint.is_complete )
+
+            # ! ----> test 5 - start again clears progress
+            loaded_checkpoint.start()
+
+            # and the asserts
+            self.assertEqual( loaded_checkpoint.next_index, 0 )
+            self.assertEqual( loaded_checkpoint.base_counter_map, {} )
+            self.assertIsNone( loaded_checkpoint.get_remaining_count() )
+
+        #-- END with TemporaryDirectory --#
+
+    #-- END method test_start_update_load() --#
+
+
+    def test_load_no_file( self ):
+
+        # declare variables
+        temp_directory = None
+        test_checkpoint = None
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+
+            # ! ----> test 1 - file does not exist
+            test_checkpoint = ETLCheckpoint( file_path_IN = os.path.join( temp_directory, "missing.json" ) )
+            self.assertFalse( test_checkpoint.load() )
+
+            # ! ----> test 2 - no file path
+            test_checkpoint = ETLCheckpoint()
+            self.assertFalse( test_checkpoint.load() )
+
+        #-- END with TemporaryDirectory --#
+
+    #-- END method test_load_no_file() --#
+
+
+    def test_load_label_mismatch( self ):
+
+        # declare variables
+        temp_directory = None
+        checkpoint_file_path = None
+        test_checkpoint = None
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+
+            checkpoint_file_path = os.path.join( temp_directory, "checkpoint.json" )
+            test_checkpoint = ETLCheckpoint( file_path_IN = checkpoint_file_path, label_IN = "run_a" )
+            test_checkpoint.start()
+            test_checkpoint.update( 5, { "created" : 5 } )
+
+            # ! ----> test 1 - different label
+            test_checkpoint = ETLCheckpoint( file_path_IN = checkpoint_file_path, label_IN = "run_b" )
+            with self.assertRaises( ETLError ):
+                test_checkpoint.load()
+            #-- END with assertRaises --#
+
+            # ! ----> test 2 - no label, takes label from file
+            test_checkpoint = ETLCheckpoint( file_path_IN = checkpoint_file_path )
+            self.assertTrue( test_checkpoint.load() )
+            self.assertEqual( test_checkpoint.label, "run_a" )
+
+        #-- END with TemporaryDirectory --#
+
+    #-- END method test_load_label_mismatch() --#
+
+#-- END unittest class TestETLCheckpoint --#
+
+
+class TestETLCompiledEntity(unittest.TestCase):
+
+    def make_entity( self ):
+
+        # return reference
+        entity_OUT = None
+
+        # declare variables
+        current_name = None
+        current_index = None
+        current_attr = None
+
+        # three columns, "b" and "a" required.
+        entity_OUT = ETLEntity()
+        for current_index, current_name in enumerate( [ "b", "c", "a" ] ):
+
+            current_attr = ETLAttribute()
+            current_attr.set_extract_name( current_name )
+            current_attr.set_extract_index( current_index )
+            current_attr.set_extract_is_required( current_name != "c" )
+            entity_OUT.add_data_attr( current_attr )
+
+        #-- END loop over columns --#
+
+        return entity_OUT
+
+    #-- END method make_entity() --#
+
+
+    def test_read_only( self ):
+
+        # declare variables
+        test_compiled = None
+
+        test_compiled = self.make_entity().compile()
+
+        # ! ----> test 1 - can't set or delete attributes
+        with self.assertRaises( AttributeError ):
+            test_compiled.debug_flag = True
+        #-- END with assertRaises --#
+        with self.assertRaises( AttributeError ):
+            del test_compiled.debug_flag
+        #-- END with assertRaises --#
+        with self.assertRaises( AttributeError ):
+            test_compiled.new_attribute = 1
+        #-- END with assertRaises --#
+
+        # ! ----> test 2 - maps and key lists can't be changed
+        with self.assertRaises( TypeError ):
+            test_compiled.get_attr_key_to_attribute_map()[ "d" ] = ETLAttribute()
+        #-- END with assertRaises --#
+        with self.assertRaises( TypeError ):
+            test_compiled.get_attr_index_to_key_map()[ 3 ] = "d"
+        #-- END with assertRaises --#
+        with self.assertRaises( AttributeError ):
+            test_compiled.get_data_attr_key_list().append( "d" )
+        #-- END with assertRaises --#
+
+    #-- END method test_read_only() --#
+
+
+    def test_index_maps( self ):
+
+        # declare variables
+        test_entity = None
+        test_compiled = None
+
+        test_entity = self.make_entity()
+        test_compiled = test_entity.compile()
+
+        # ! ----> test 1 - index maps copied from the entity, tuple built
+        self.assertEqual( dict( test_compiled.get_attr_index_to_key_map() ), { 0 : "b", 1 : "c", 2 : "a" } )
+        self.assertEqual( dict( test_compiled.get_attr_key_to_index_map() ), { "b" : 0, "c" : 1, "a" : 2 } )
+        self.assertEqual( test_compiled.index_key_tuple, ( "b", "c", "a" ) )
+
+        # and the asserts
+        self.assertEqual( test_compiled.pull_key_for_index( 2 ), "a" )
+        self.assertEqual( test_compiled.pull_index_for_key( "c" ), 1 )
+        self.assertIsNone( test_compiled.pull_key_for_index( 3 ) )
+        self.assertIsNone( test_compiled.pull_key_for_index( -1 ) )
+        self.assertIsNone( test_compiled.pull_key_for_index( "0" ) )
+
+        # ! ----> test 2 - index maps passed in replace the entity's
+        test_compiled = test_entity.compile( attr_index_to_key_map_IN = { 5 : "a" }, attr_key_to_index_map_IN = { "a" : 5 } )
+        self.assertEqual( test_compiled.index_key_tuple, ( None, None, None, None, None, "a" ) )
+        self.assertEqual( test_compiled.pull_key_for_index( 5 ), "a" )
+        self.assertIsNone( test_compiled.pull_key_for_index( 0 ) )
+
+        # ! ----> test 3 - indexes that aren't positions - map, no tuple
+        test_compiled = test_entity.compile( attr_index_to_key_map_IN = { "A" : "a" }, attr_key_to_index_map_IN = { "a" : "A" } )
+        self.assertIsNone( test_compiled.index_key_tuple )
+        self.assertEqual( test_compiled.pull_key_for_index( "A" ), "a" )
+
+        # ! ----> test 4 - entity changed later - compiled copy doesn't change
+        test_compiled = test_entity.compile()
+        test_entity.get_attr_index_to_key_map()[ 3 ] = "d"
+        self.assertIsNone( test_compiled.pull_key_for_index( 3 ) )
+
+    #-- END method test_index_maps() --#
+
+
+    def test_required_attr_keys( self ):
+
+        # declare variables
+        test_entity = None
+        test_compiled = None
+
+        test_entity = self.make_entity()
+        test_compiled = test_entity.compile()
+
+        # ! ----> test 1 - tuple, in sorted order, same from entity and compiled
+        self.assertEqual( test_compiled.get_required_attr_key_tuple(), ( "a", "b" ) )
+        self.assertEqual( test_entity.get_required_attr_key_tuple(), ( "a", "b" ) )
+
+        # ! ----> test 2 - set is a frozenset
+        self.assertEqual( test_compiled.get_required_attr_key_set(), frozenset( [ "a", "b" ] ) )
+        self.assertIsInstance( test_compiled.get_required_attr_key_set(), frozenset )
+
+    #-- END method test_required_attr_keys() --#
+
+
+    def test_compile_converters( self ):
+
+        # declare variables
+        test_entity = None
+        converter_map = None
+
+        test_entity = self.make_entity()
+
+        # ! ----> test 1 - entity and compiled copy share attributes
+        converter_map = test_entity.compile_converters()
+
+        # and the asserts
+        self.assertEqual( set( converter_map.keys() ), { "a", "b", "c" } )
+        self.assertIs( test_entity.compile().get_attr_key_to_attribute_map()[ "a" ], test_entity.pull_attr_for_key( "a" ) )
+
+    #-- END method test_compile_converters() --#
+
+#-- END unittest class TestETLCompiledEntity --#
+
+
+class TestETLDeadLetterSink(unittest.TestCase):
+
+    def read_line_list( self, file_path_IN ):
+
+        # return reference
+        list_OUT = None
+
+        with open( file_path_IN, "r", encoding = "utf-8" ) as dead_letter_file:
+            list_OUT = [ json.loads( current_line ) for current_line in dead_letter_file ]
+        #-- END with open() --#
+
+        return list_OUT
+
+    #-- END method read_line_list() --#
+
+
+    def test_write_record( self ):
+
+        # declare variables
+        temp_directory = None
+        dead_letter_file_path = None
+        test_sink = None
+        written_dict = None
+        line_list = None
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+
+            dead_letter_file_path = os.path.join( temp_directory, "dead_letters.jsonl" )
+
+            # ! ----> test 1 - write as context manager
+            with ETLDeadLetterSink( file_path_IN = dead_letter_file_path, label_IN = "Person" ) as test_sink:
+
+                written_dict = test_sink.write_record( { "id" : 1, "born" : datetime.date( 2000, 1, 2 ) }, ETLDeadLetterSink.REASON_MISSING_REQUIRED, [ "no name" ], record_number_IN = 3 )
+                test_sink.write_record( { "id" : 2 }, ETLDeadLetterSink.REASON_UPDATE_FAILED )
+                test_sink.write_record( { "id" : 3 }, ETLDeadLetterSink.REASON_UPDATE_FAILED )
+
+                # lines flushed as written
+                self.assertEqual( len( self.read_line_list( dead_letter_file_path ) ), 3 )
+
+            #-- END with ETLDeadLetterSink --#
+
+            # and the asserts
+            self.assertIsNone( test_sink.dead_letter_file )
+            self.assertEqual( written_dict[ ETLDeadLetterSink.PROP_MESSAGE_LIST ], [ "no name" ] )
+            self.assertEqual( test_sink.record_count, 3 )
+            self.assertEqual( test_sink.reason_to_count_map, { ETLDeadLetterSink.REASON_MISSING_REQUIRED : 1, ETLDeadLetterSink.REASON_UPDATE_FAILED : 2 } )
+
+            line_list = self.read_line_list( dead_letter_file_path )
+            self.assertEqual( line_list[ 0 ][ ETLDeadLetterSink.PROP_LABEL ], "Person" )
+            self.assertEqual( line_list[ 0 ][ ETLDeadLetterSink.PROP_REASON ], ETLDeadLetterSink.REASON_MISSING_REQUIRED )
+            self.assertEqual( line_list[ 0 ][ ETLDeadLetterSink.PROP_RECORD_NUMBER ], 3 )
+            self.assertEqual( line_list[ 0 ][ ETLDeadLetterSink.PROP_RECORD ], { "id" : 1, "born" : "2000-01-02" } )
+            self.assertIn( ETLDeadLetterSink.PROP_FAILED_DATETIME, line_list[ 0 ] )
+            self.assertIsNone( line_list[ 1 ][ ETLDeadLetterSink.PROP_RECORD_NUMBER ] )
+            self.assertEqual( line_list[ 1 ][ ETLDeadLetterSink.PROP_MESSAGE_LIST ], [] )
+
+            # ! ----> test 2 - new sink appends, opens file on first write
+            test_sink = ETLDeadLetterSink( file_path_IN = dead_letter_file_path, label_IN = "Person" )
+            test_sink.write_record( { "id" : 4 }, ETLDeadLetterSink.REASON_NO_INSTANCE )
+            test_sink.close()
+
+            # and the asserts
+            line_list = self.read_line_list( dead_letter_file_path )
+            self.assertEqual( len( line_list ), 4 )
+            self.assertEqual( line_list[ 3 ][ ETLDeadLetterSink.PROP_RECORD ], { "id" : 4 } )
+            self.assertEqual( test_sink.record_count, 1 )
+
+        #-- END with TemporaryDirectory --#
+
+    #-- END method test_write_record() --#
+
+#-- END unittest class TestETLDeadLetterSink --#
+
+
+class TestETLInstrumentation(unittest.TestCase):
+
+    def test_record_time_sample( self ):
+
+        # declare variables
+        test_instrumentation = None
+        test_summary = None
+
+        # ! ----> test 1 - under sample size, percentiles exact
+        test_instrumentation = ETLInstrumentation( record_sample_size_IN = 10 )
+        for seconds in range( 1, 5 ):
+            test_instrumentation.add_record_time( float( seconds ) )
+        #-- END loop over record times --#
+        test_summary = test_instrumentation.build_summary()
+
+        # and the asserts
+        self.assertEqual( test_summary[ ETLInstrumentation.PROP_RECORD_COUNT ], 4 )
+        self.assertEqual( test_summary[ ETLInstrumentation.PROP_RECORD_P50_SECONDS ], 2.0 )
+        self.assertEqual( test_summary[ ETLInstrumentation.PROP_RECORD_MAX_SECONDS ], 4.0 )
+
+        # ! ----> test 2 - past sample size, memory bounded, count and max exact
+        test_instrumentation = ETLInstrumentation( record_sample_size_IN = 10 )
+        for seconds in range( 1, 1001 ):
+            test_instrumentation.add_record_time( float( seconds ) )
+        #-- END loop over record times --#
+        test_summary = test_instrumentation.build_summary()
+
+        # and the asserts
+        self.assertEqual( len( test_instrumentation.record_seconds_sample_list ), 10 )
+        self.assertEqual( test_summary[ ETLInstrumentation.PROP_RECORD_COUNT ], 1000 )
+        self.assertEqual( test_summary[ ETLInstrumentation.PROP_RECORD_MAX_SECONDS ], 1000.0 )
+        self.assertIn( test_summary[ ETLInstrumentation.PROP_RECORD_P50_SECONDS ], test_instrumentation.record_seconds_sample_list )
+
+    #-- END method test_record_time_sample() --#
+
+#-- END unittest class TestETLInstrumentation --#
+
+
+class TestETLFromDataFrame(unittest.TestCase):
+
+    def make_attribute( self, data_type_IN, conversion_string_IN = None ):
+
+        # return reference
+        attribute_OUT = None
+
+        attribute_OUT = ETLAttribute()
+        attribute_OUT.set_load_attr_data_type( data_type_IN )
+        attribute_OUT.set_transform_conversion_string( conversion_string_IN )
+
+        return attribute_OUT
+
+    #-- END method make_attribute() --#
+
+
+    def test_convert_series_int( self ):
+
+        # declare variables
+        test_processor = None
+        test_attribute = None
+        test_series = None
+
+        test_processor = ETLFromDataFrame()
+        test_attribute = self.make_attribute( ETLAttribute.DATA_TYPE_INT )
+
+        # ! ----> test 1 - strings, stripped and parsed column-wise
+        test_series = test_processor.convert_series( pandas.Series( [ " 1", "2", None ] ), test_attribute )
+
+        # and the asserts
+        self.assertEqual( test_series[ : 2 ].tolist(), [ 1, 2 ] )
+        self.assertTrue( pandas.isna( test_series[ 2 ] ) )
+
+        # ! ----> test 2 - floats truncated, like int()
+        test_series = test_processor.convert_series( pandas.Series( [ 1.7, -2.5 ] ), test_attribute )
+        self.assertEqual( test_series.tolist(), [ 1, -2 ] )
+
+        # ! ----> test 3 - mixed column, a value at a time, ints stay ints
+        test_series = test_processor.convert_series( pandas.Series( [ 1, " 2", None ], dtype = object ), test_attribute )
+        self.assertEqual( test_series.tolist(), [ 1, 2, None ] )
+        self.assertIsInstance( test_series[ 1 ], int )
+
+        # ! ----> test 4 - not whole numbers, same error as process_value()
+        with self.assertRaises( ValueError ):
+            test_processor.convert_series( pandas.Series( [ "1", "2.5" ] ), test_attribute )
+        #-- END with assertRaises --#
+
+    #-- END method test_convert_series_int() --#
+
+
+    def test_convert_series_string( self ):
+
+        # declare variables
+        test_processor = None
+        test_attribute = None
+        test_series = None
+
+        test_processor = ETLFromDataFrame()
+        test_attribute = self.make_attribute( ETLAttribute.DATA_TYPE_STRING )
+
+        # ! ----> test 1 - strings stripped, missing left missing
+        test_series = test_processor.convert_series( pandas.Series( [ " a ", None ] ), test_attribute )
+        self.assertEqual( test_series[ 0 ], "a" )
+        self.assertTrue( pandas.isna( test_series[ 1 ] ) )
+
+        # ! ----> test 2 - ints and floats made strings
+        self.assertEqual( test_processor.convert_series( pandas.Series( [ 1, 2 ] ), test_attribute ).tolist(), [ "1", "2" ] )
+        self.assertEqual( test_processor.convert_series( pandas.Series( [ 1.5 ] ), test_attribute ).tolist(), [ "1.5" ] )
+
+    #-- END method test_convert_series_string() --#
+
+
+    def test_convert_series_date( self ):
+
+        # declare variables
+        test_processor = None
+        test_attribute = None
+        test_series = None
+
+        test_processor = ETLFromDataFrame()
+
+        # ! ----> test 1 - date with conversion string, empty is None
+        test_attribute = self.make_attribute( ETLAttribute.DATA_TYPE_DATETIME_DATE, "%m/%d/%Y" )
+        test_series = test_processor.convert_series( pandas.Series( [ " 01/02/2020", "", None ] ), test_attribute )
+        self.assertEqual( test_series.tolist(), [ datetime.date( 2020, 1, 2 ), None, None ] )
+
+        # ! ----> test 2 - datetime gets default time zone
+        test_attribute = self.make_attribute( ETLAttribute.DATA_TYPE_DATETIME_DATETIME, "%Y-%m-%d %H:%M" )
+        test_series = test_processor.convert_series( pandas.Series( [ "2020-01-02 03:04" ] ), test_attribute )
+        self.assertEqual( test_series[ 0 ].replace( tzinfo = None ), datetime.datetime( 2020, 1, 2, 3, 4 ) )
+        self.assertEqual( test_series[ 0 ].utcoffset(), test_processor.get_default_time_zone().localize( datetime.datetime( 2020, 1, 2, 3, 4 ) ).utcoffset() )
+
+        # ! ----> test 3 - no conversion string, a value at a time
+        test_attribute = self.make_attribute( ETLAttribute.DATA_TYPE_DATETIME_DATE )
+        test_series = test_processor.convert_series( pandas.Series( [ "2020-01-02", None ] ), test_attribute )
+        self.assertEqual( test_series[ 0 ], datetime.date( 2020, 1, 2 ) )
+        self.assertTrue( pandas.isna( test_series[ 1 ] ) )
+
+        # ! ----> test 4 - no type, Series returned as is
+        test_series = pandas.Series( [ 1, 2 ] )
+        self.assertIs( test_processor.convert_series( test_series, self.make_attribute( None ) ), test_series )
+
+    #-- END method test_convert_series_date() --#
+
+#-- END unittest class TestETLFromDataFrame --#
+
+
+class TestETLRecordSource(unittest.TestCase):
+
+    def test_subset_iterator( self ):
+
+        # declare variables
+        test_iterator = None
+
+        # ! ----> test 1 - no start or count, same iterator back
+        test_iterator = iter( range( 10 ) )
+        self.assertIs( ETLRecordSource.subset_iterator( test_iterator ), test_iterator )
+
+        # ! ----> test 2 - start and count
+        test_iterator = ETLRecordSource.subset_iterator( iter( range( 10 ) ), start_index_IN = 2, record_count_IN = 3 )
+        self.assertEqual( list( test_iterator ), [ 2, 3, 4 ] )
+
+        # ! ----> test 3 - start only, count only
+        self.assertEqual( list( ETLRecordSource.subset_iterator( iter( range( 5 ) ), start_index_IN = 3 ) ), [ 3, 4 ] )
+        self.assertEqual( list( ETLRecordSource.subset_iterator( iter( range( 5 ) ), record_count_IN = 2 ) ), [ 0, 1 ] )
+
+        # ! ----> test 4 - only reads what it needs from an endless stream
+        test_iterator = ETLRecordSource.subset_iterator( itertools.count(), start_index_IN = 5, record_count_IN = 2 )
+        self.assertEqual( list( test_iterator ), [ 5, 6 ] )
+
+    #-- END method test_subset_iterator() --#
+
+
+    def test_get_record_iterator( self ):
+
+        # declare variables
+        test_source = None
+        test_generator = None
+
+        # ! ----> test 1 - list, sliced, can be read more than once
+        test_source = ETLRecordSource( [ "a", "b", "c", "d" ] )
+
+        # and the asserts
+        self.assertEqual( test_source.get_record_count(), 4 )
+        self.assertEqual( list( test_source.get_record_iterator() ), [ "a", "b", "c", "d" ] )
+        self.assertEqual( list( test_source.get_record_iterator( start_index_IN = 1, record_count_IN = 2 ) ), [ "b", "c" ] )
+        self.assertEqual( list( test_source.get_record_iterator( start_index_IN = 3, record_count_IN = 10 ) ), [ "d" ] )
+
+        # ! ----> test 2 - generator, streamed, no length unless hinted
+        test_generator = ( { "id" : counter } for counter in itertools.count() )
+        test_source = ETLRecordSource( test_generator )
+
+        # and the asserts
+        self.assertIsNone( test_source.get_record_count() )
+        self.assertEqual( list( test_source.get_record_iterator( start_index_IN = 2, record_count_IN = 2 ) ), [ { "id" : 2 }, { "id" : 3 } ] )
+
+        test_source.set_count_hint( 100 )
+        self.assertEqual( test_source.get_record_count(), 100 )
+
+        # ! ----> test 3 - no iterable
+        test_source = ETLRecordSource()
+        with self.assertRaises( ETLError ):
+            test_source.get_record_iterator()
+        #-- END with assertRaises --#
+
+    #-- END method test_get_record_iterator() --#
+
+
+    def test_file_sources( self ):
+
+        # declare variables
+        temp_directory = None
+        csv_file_path = None
+        jsonl_file_path = None
+        test_source = None
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+
+            csv_file_path = os.path.join( temp_directory, "records.csv" )
+            with open( csv_file_path, "w", newline = "", encoding = "utf-8" ) as csv_file:
+                csv_file.write( "id,name\n1,ann\n2,bob\n3,cy\n" )
+            #-- END with open() --#
+
+            jsonl_file_path = os.path.join( temp_directory, "records.jsonl" )
+            with open( jsonl_file_path, "w", encoding = "utf-8" ) as jsonl_file:
+                jsonl_file.write( '{"id": 1}\n\n{"id": 2}\n{"id": 3}\n' )
+            #-- END with open() --#
+
+            # ! ----> test 1 - CSV, rows as dictionaries, re-opened each time
+            test_source = ETLRecordSourceCSV( file_path_IN = csv_file_path )
+
+            # and the asserts
+            self.assertIsNone( test_source.get_record_count() )
+            self.assertEqual( list( test_source.get_record_iterator() ), [ { "id" : "1", "name" : "ann" }, { "id" : "2", "name" : "bob" }, { "id" : "3", "name" : "cy" } ] )
+            self.assertEqual( list( test_source.get_record_iterator( start_index_IN = 1, record_count_IN = 1 ) ), [ { "id" : "2", "name" : "bob" } ] )
+
+            # ! ----> test 2 - JSON Lines, blank lines skipped, count hint
+            test_source = ETLRecordSourceJSONLines( file_path_IN = jsonl_file_path, count_hint_IN = 3 )
+
+            # and the asserts
+            self.assertEqual( test_source.get_record_count(), 3 )
+            self.assertEqual( list( test_source.get_record_iterator() ), [ { "id" : 1 }, { "id" : 2 }, { "id" : 3 } ] )
+            self.assertEqual( list( test_source.get_record_iterator( start_index_IN = 2 ) ), [ { "id" : 3 } ] )
+
+            # ! ----> test 3 - no file path
+            test_source = ETLRecordSourceJSONLines()
+            with self.assertRaises( ETLError ):
+                test_source.get_record_iterator()
+            #-- END with assertRaises --#
+
+        #-- END with TemporaryDirectory --#
+
+    #-- END method test_file_sources() --#
+
+#-- END unittest class TestETLRecordSource --#
+
+
+class TestETLDjangoModelLoaderBulkWrite(DjangoModelTestCase):
+
+    def test_bulk_create( self ):
+
+        # declare variables
+        record_list = None
+        test_loader = None
+        test_status = None
+
+        # ! ----> test 1 - new instances bulk created, batched lookup flag left alone
+        record_list = [ { "source" : "a", "code" : str( index ), "value" : index } for index in range( 3 ) ]
+        test_loader = self.make_loader( ETLTestItem, record_list )
+        test_loader.do_bulk_write = True
+        test_loader.set_bulk_write_batch_size( 2 )
+        test_status = test_loader.process_records( do_output_progress_IN = False )
+
+        # and the asserts
+        self.assertEqual( test_status.get_detail_value( ETLDjangoModelLoader.STATUS_PROP_BULK_CREATED_COUNT ), 3 )
+        self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATE_SUCCESS_COUNT ), 3 )
+        self.assertEqual( sorted( ETLTestItem.objects.values_list( "code", "value" ) ), [ ( "0", 0 ), ( "1", 1 ), ( "2", 2 ) ] )
+        self.assertFalse( test_loader.do_batch_lookup )
+        self.assertTrue( test_loader.is_batch_lookup_on() )
+
+        # ! ----> test 2 - bulk write turned off, so is batched lookup
+        test_loader.do_bulk_write = False
+
+        # and the asserts
+        self.assertFalse( test_loader.is_batch_lookup_on() )
+
+    #-- END method test_bulk_create() --#
+
+
+    def test_bulk_update_changed_fields( self ):
+
+        # declare variables
+        record_list = None
+        test_status = None
+        bulk_update_mock = None
+
+        # existing items
+        ETLTestItem.objects.create( source = "a", code = "1", value = 1, serial = 1 )
+        ETLTestItem.objects.create( source = "a", code = "2", value = 2, serial = 2 )
+
+        # ! ----> test 1 - only changed field updated
+        record_list = [ { "source" : "a", "code" : "1", "value" : 10, "serial" : 1 }, { "source" : "a", "code" : "2", "value" : 2, "serial" : 2 } ]
+        with mock.patch.object( QuerySet, "bulk_update", autospec = True, side_effect = QuerySet.bulk_update ) as bulk_update_mock:
+            test_status = ETLTestItem.run_etl( record_list_IN = record_list, bulk_write_batch_size_IN = 10 )
+        #-- END with mock.patch.object() --#
+
+        # and the asserts
+        self.assertEqual( bulk_update_mock.call_count, 1 )
+        self.assertEqual( len( bulk_update_mock.call_args[ 0 ][ 1 ] ), 1 )
+        self.assertEqual( list( bulk_update_mock.call_args[ 0 ][ 2 ] ), [ "value" ] )
+        self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATED_RECORD_COUNT ), 1 )
+        self.assertEqual( sorted( ETLTestItem.objects.values_list( "code", "value", "serial" ) ), [ ( "1", 10, 1 ), ( "2", 2, 2 ) ] )
+
+    #-- END method test_bulk_update_changed_fields() --#
+
+
+    def test_bulk_write_fallback( self ):
+
+        # declare variables
+        record_list = None
+        test_status = None
+
+        # ! ----> test 1 - IntegrityError - only bad row fails
+        record_list = [
+            { "source" : "a", "code" : "1", "serial" : 1 },
+            { "source" : "a", "code" : "2", "serial" : 1 },
+            { "source" : "a", "code" : "3", "serial" : 3 }
+        ]
+        test_status = ETLTestItem.run_etl( record_list_IN = record_list, bulk_write_batch_size_IN = 10 )
+
+        # and the asserts
+        self.assertEqual( sorted( ETLTestItem.objects.values_list( "code", flat = True ) ), [ "1", "3" ] )
+        self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATE_ERROR_COUNT ), 1 )
+        self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATE_SUCCESS_COUNT ), 2 )
+
+        # ! ----> test 2 - DataError - all saved one at a time
+        ETLTestItem.objects.all().delete()
+        with mock.patch.object( QuerySet, "bulk_create", side_effect = DataError( "value too long" ) ):
+            test_status = ETLTestItem.run_etl( record_list_IN = record_list[ : 1 ] + record_list[ 2 : ], bulk_write_batch_size_IN = 10 )
+        #-- END with mock.patch.object() --#
+
+        # and the asserts
+        self.assertEqual( sorted( ETLTestItem.objects.values_list( "code", flat = True ) ), [ "1", "3" ] )
+        self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATE_ERROR_COUNT ), 0 )
+        self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATE_SUCCESS_COUNT ), 2 )
+
+    #-- END method test_bulk_write_fallback() --#
+
+#-- END unittest class TestETLDjangoModelLoaderBulkWrite --#
+
+
+class TestETLDjangoModelLoaderBatchLookup(DjangoModelTestCase):
+
+    def test_load_identity_map_composite_key( self ):
+
+        # declare variables
+        existing_a1 = None
+        existing_b1 = None
+        record_list = None
+        test_loader = None
+        identity_map = None
+        query_context = None
+
+        # existing items - ( "a", "2" ) is not asked for, but matches each
+        #     half of a key that is.
+        existing_a1 = ETLTestItem.objects.create( source = "a", code = "1" )
+        ETLTestItem.objects.create( source = "a", code = "2" )
+        existing_b1 = ETLTestItem.objects.create( source = "b", code = "1" )
+
+        # ! ----> test 1 - only exact key matches loaded
+        record_list = [ { "source" : "a", "code" : "1" }, { "source" : "b", "code" : "2" }, { "source" : "b", "code" : "1" } ]
+        test_loader = self.make_loader( ETLTestItem, record_list )
+        test_loader.do_batch_lookup = True
+
+        # and the asserts
+        self.assertEqual( test_loader.load_lookup_identity_map( record_list ), 2 )
+        identity_map = test_loader.get_lookup_identity_map()
+        self.assertEqual( set( identity_map.keys() ), { ( "a", "1" ), ( "b", "2" ), ( "b", "1" ) } )
+        self.assertEqual( [ instance.pk for instance in identity_map[ ( "a", "1" ) ] ], [ existing_a1.pk ] )
+        self.assertEqual( identity_map[ ( "b", "2" ) ], [] )
+
+        # ! ----> test 2 - find_load_instance() served from map, no queries
+        with CaptureQueriesContext( connection ) as query_context:
+            self.assertEqual( test_loader.find_load_instance( record_list[ 2 ] ).pk, existing_b1.pk )
+            self.assertIsNone( test_loader.find_load_instance( record_list[ 1 ] ).pk )
+        #-- END with CaptureQueriesContext() --#
+
+        # and the asserts
+        self.assertEqual( len( query_context ), 0 )
+        self.assertEqual( test_loader.existing_count, 1 )
+        self.assertEqual( test_loader.new_count, 1 )
+
+    #-- END method test_load_identity_map_composite_key() --#
+
+
+    def test_duplicate_keys_in_window( self ):
+
+        # declare variables
+        record_list = None
+        test_loader = None
+        first_instance = None
+
+        # ! ----> test 1 - second record with same key gets pending instance
+        record_list = [ { "source" : "a", "code" : "1", "value" : 1 }, { "source" : "a", "code" : "1", "value" : 2 } ]
+        test_loader = self.make_loader( ETLTestItem, record_list )
+        test_loader.do_batch_lookup = True
+        test_loader.load_lookup_identity_map( record_list )
+        first_instance = test_loader.find_load_instance( record_list[ 0 ] )
+
+        # and the asserts
+        self.assertIs( test_loader.find_load_instance( record_list[ 1 ] ), first_instance )
+
+        # ! ----> test 2 - processed, one row, last value wins
+        test_loader = self.make_loader( ETLTestItem, record_list )
+        test_loader.do_batch_lookup = True
+        test_loader.set_batch_lookup_size( 10 )
+        test_loader.process_records( do_output_progress_IN = False )
+
+        # and the asserts
+        self.assertEqual( list( ETLTestItem.objects.values_list( "source", "code", "value" ) ), [ ( "a", "1", 2 ) ] )
+
+    #-- END method test_duplicate_keys_in_window() --#
+
+
+    def test_counts_match_unbatched( self ):
+
+        # declare variables
+        record_list = None
+        count_list = None
+        do_batch_lookup = None
+        test_loader = None
+
+        # ! ----> test 1 - same new and existing counts with and without batches
+        record_list = [
+            { "source" : "a", "code" : "1" },
+            { "source" : "a", "code" : "2" },
+            { "source" : "a", "code" : "1" },
+            { "source" : "b", "code" : "1" }
+        ]
+        ETLTestItem.objects.create( source = "b", code = "1" )
+        count_list = []
+        for do_batch_lookup in [ False, True ]:
+
+            ETLTestItem.objects.exclude( source = "b" ).delete()
+            test_loader = self.make_loader( ETLTestItem, record_list )
+            test_loader.do_batch_lookup = do_batch_lookup
+            test_loader.set_batch_lookup_size( 10 )
+            test_loader.process_records( do_output_progress_IN = False )
+            count_list.append( ( test_loader.new_count, test_loader.existing_count, ETLTestItem.objects.count() ) )
+
+        #-- END loop over batched or not --#
+
+        # and the asserts
+        self.assertEqual( count_list[ 0 ], ( 2, 2, 3 ) )
+        self.assertEqual( count_list[ 1 ], count_list[ 0 ] )
+
+    #-- END method test_counts_match_unbatched() --#
+
+#-- END unittest class TestETLDjangoModelLoaderBatchLookup --#
+
+
+class TestETLDjangoModelLoaderDeadLetters(DjangoModelTestCase):
+
+    def test_record_number_and_update_failed( self ):
+
+        # declare variables
+        temp_directory = None
+        dead_letter_file_path = None
+        record_list = None
+        batch_required = None
+        test_status = None
+        line_list = None
+
+        # good, missing required, won't convert, good.
+        record_list = [
+            { "source" : "a", "code" : "1", "value" : 1 },
+            { "source" : None, "code" : "2", "value" : 2 },
+            { "source" : "a", "code" : "3", "value" : "notint" },
+            { "source" : "a", "code" : "4", "value" : 4 }
+        ]
+
+        for batch_required in [ False, True ]:
+
+            with tempfile.TemporaryDirectory() as temp_directory:
+
+                dead_letter_file_path = os.path.join( temp_directory, "dead_letters.jsonl" )
+                ETLTestItem.objects.all().delete()
+
+                # ! ----> test 1 - update failure doesn't stop run, numbers match position
+                test_status = ETLTestItem.run_etl(
+                    record_list_IN = record_list,
+                    batch_required_IN = batch_required,
+                    batch_lookup_size_IN = 10,
+                    dead_letter_file_path_IN = dead_letter_file_path
+                )
+
+                # and the asserts
+                self.assertEqual( sorted( ETLTestItem.objects.values_list( "code", flat = True ) ), [ "1", "4" ] )
+                self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_PROCESSED_RECORD_COUNT ), 4 )
+                self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATE_ERROR_COUNT ), 1 )
+
+                with open( dead_letter_file_path, "r", encoding = "utf-8" ) as dead_letter_file:
+                    line_list = [ json.loads( current_line ) for current_line in dead_letter_file ]
+                #-- END with open() --#
+                line_list.sort( key = lambda line : line[ ETLDeadLetterSink.PROP_RECORD_NUMBER ] )
+                self.assertEqual( [ line[ ETLDeadLetterSink.PROP_RECORD_NUMBER ] for line in line_list ], [ 2, 3 ] )
+                self.assertEqual( [ line[ ETLDeadLetterSink.PROP_REASON ] for line in line_list ], [ ETLDeadLetterSink.REASON_MISSING_REQUIRED, ETLDeadLetterSink.REASON_UPDATE_FAILED ] )
+                self.assertIn( "ValueError", line_list[ 1 ][ ETLDeadLetterSink.PROP_MESSAGE_LIST ][ 0 ] )
+
+            #-- END with TemporaryDirectory --#
+
+        #-- END loop over batched required or not --#
+
+    #-- END method test_record_number_and_update_failed() --#
+
+#-- END unittest class TestETLDjangoModelLoaderDeadLetters --#
+
+
+class TestETLDjangoModelLoaderCleanup(DjangoModelTestCase):
+
+    def test_cleanup_when_processing_raises( self ):
+
+        # declare variables
+        temp_directory = None
+        test_loader = None
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+
+            # ! ----> test 1 - dead letter file closed, query counter removed
+            test_loader = self.make_loader( ETLTestItem, [ { "source" : "a", "code" : "1" } ] )
+            test_loader.dead_letter_file_path = os.path.join( temp_directory, "dead_letters.jsonl" )
+            test_loader.do_instrumentation = True
+            with mock.patch.object( ETLDjangoModelLoader, "find_load_instance", side_effect = RuntimeError( "lookup failed" ) ):
+                with self.assertRaises( RuntimeError ):
+                    test_loader.process_records( do_output_progress_IN = False )
+                #-- END with assertRaises --#
+            #-- END with mock.patch.object() --#
+
+            # and the asserts
+            self.assertIsNone( test_loader.dead_letter_sink.dead_letter_file )
+            self.assertEqual( connection.execute_wrappers, [] )
+
+        #-- END with TemporaryDirectory --#
+
+    #-- END method test_cleanup_when_processing_raises() --#
+
+#-- END unittest class TestETLDjangoModelLoaderCleanup --#
+
+
+class TestETLFromDictionaryRelatedBatch(DjangoModelTestCase):
+
+    def test_flush_related( self ):
+
+        # declare variables
+        record_list = None
+        test_time_zone = None
+        test_status = None
+        pet_run_etl = None
+        call_kwargs = None
+        test_pet = None
+
+        record_list = [
+            { "id" : 1, "name" : "Ann", "pets" : [ { "pet_id" : 11, "kind" : "cat" }, { "pet_id" : 12, "kind" : "dog" } ] },
+            { "id" : 2, "name" : "Bob", "pets" : [ { "pet_id" : 21, "kind" : "fish" } ] },
+            { "id" : 3, "name" : "Cy", "pets" : [ { "pet_id" : 31, "kind" : "bird" } ] }
+        ]
+        test_time_zone = pytz.timezone( "America/New_York" )
+
+        # ! ----> test 1 - related records batched, foreign keys back-filled
+        with mock.patch.object( ETLTestPet, "run_etl", wraps = ETLTestPet.run_etl ) as pet_run_etl:
+            test_status = ETLTestPerson.run_etl(
+                record_list,
+                default_time_zone_IN = test_time_zone,
+                bulk_write_batch_size_IN = 2,
+                related_batch_size_IN = 10,
+                batch_required_IN = True,
+                max_status_message_count_IN = 50
+            )
+        #-- END with mock.patch.object() --#
+
+        # and the asserts
+        self.assertTrue( test_status.is_success() )
+        self.assertEqual( ETLTestPet.objects.count(), 4 )
+        for test_pet in ETLTestPet.objects.all():
+            self.assertIsNotNone( test_pet.owner )
+            self.assertEqual( test_pet.owner.ext_id, test_pet.pet_id // 10 )
+        #-- END loop over pets --#
+
+        # ! ----> test 2 - one nested run per window, parent's options passed
+        self.assertEqual( pet_run_etl.call_count, 2 )
+        call_kwargs = pet_run_etl.call_args[ 1 ]
+        self.assertEqual( call_kwargs[ "default_time_zone_IN" ], test_time_zone )
+        self.assertEqual( call_kwargs[ "bulk_write_batch_size_IN" ], 2 )
+        self.assertEqual( call_kwargs[ "related_batch_size_IN" ], 10 )
+        self.assertEqual( call_kwargs[ "batch_required_IN" ], True )
+        self.assertEqual( call_kwargs[ "max_status_message_count_IN" ], 50 )
+
+    #-- END method test_flush_related() --#
+
+#-- END unittest class TestETLFromDictionaryRelatedBatch --#
+
+
+class TestETLProcessorRequiredMask(DjangoModelTestCase):
+
+    def test_build_required_mask( self ):
+
+        # declare variables
+        record_list = None
+        test_loader = None
+        has_required_list = None
+        missing_key_to_count_map = None
+
+        # ! ----> test 1 - missing if None, empty, or not there, counted per key
+        record_list = [
+            { "source" : "a", "code" : "1" },
+            { "source" : None, "code" : "" },
+            { "source" : "", "code" : "3" },
+            { "code" : "4" },
+            { "source" : "a", "code" : 0 }
+        ]
+        test_loader = self.make_loader( ETLTestItem, record_list )
+        has_required_list, missing_key_to_count_map = test_loader.build_required_mask( record_list )
+
+        # and the asserts
+        self.assertEqual( has_required_list, [ True, False, False, False, True ] )
+        self.assertEqual( missing_key_to_count_map, { "source" : 3, "code" : 1 } )
+
+    #-- END method test_build_required_mask() --#
+
+#-- END unittest class TestETLProcessorRequiredMask --#
+
+
+class TestETLFromDataFrameRequired(DjangoModelTestCase):
+
+    def test_missing_required_dead_letters( self ):
+
+        # declare variables
+        temp_directory = None
+        dead_letter_file_path = None
+        chunk_list = None
+        test_loader = None
+        test_status = None
+        line_list = None
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+
+            dead_letter_file_path = os.path.join( temp_directory, "dead_letters.jsonl" )
+
+            # two chunks, a row missing "id" in each.
+            chunk_list = [
+                pandas.DataFrame( { "id" : [ 1, None ], "name" : [ "ann", "bob" ] } ),
+                pandas.DataFrame( { "id" : [ 3, None, 5 ], "name" : [ "cy", "dee", "" ] } )
+            ]
+
+            # ! ----> test 1 - rows missing required values dead lettered, counted
+            ETLTestPerson.initialize_etl()
+            test_loader = ETLFromDataFrame()
+            test_loader.set_etl_entity( ETLTestPerson.get_etl_spec() )
+            test_loader.set_input_dataframe( chunk_list )
+            test_loader.do_batch_required = True
+            test_loader.dead_letter_file_path = dead_letter_file_path
+            test_status = test_loader.process_records( start_index_IN = 1, do_output_progress_IN = False )
+
+            # and the asserts
+            self.assertEqual( sorted( ETLTestPerson.objects.values_list( "ext_id", flat = True ) ), [ 3, 5 ] )
+            self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_PROCESSED_RECORD_COUNT ), 4 )
+            self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_MISSING_REQUIRED_COUNT ), 2 )
+            self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_DEAD_LETTER_COUNT ), 2 )
+            self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_DEAD_LETTER_REASON_COUNT_MAP ), { ETLDeadLetterSink.REASON_MISSING_REQUIRED : 2 } )
+
+            with open( dead_letter_file_path, "r", encoding = "utf-8" ) as dead_letter_file:
+                line_list = [ json.loads( current_line ) for current_line in dead_letter_file ]
+            #-- END with open() --#
+            self.assertEqual( [ line[ ETLDeadLetterSink.PROP_RECORD ][ "name" ] for line in line_list ], [ "bob", "dee" ] )
+            self.assertEqual( [ line[ ETLDeadLetterSink.PROP_RECORD_NUMBER ] for line in line_list ], [ 1, 3 ] )
+            self.assertIsNone( line_list[ 0 ][ ETLDeadLetterSink.PROP_RECORD ][ "id" ] )
+            self.assertEqual( line_list[ 0 ][ ETLDeadLetterSink.PROP_MESSAGE_LIST ], [ "missing required fields: ['id']" ] )
+
+        #-- END with TemporaryDirectory --#
+
+    #-- END method test_missing_required_dead_letters() --#
+
+#-- END unittest class TestETLFromDataFrameRequired --#
+
+
+class TestETLDjangoModelLoaderChangeDetection(DjangoModelTestCase):
+
+    def make_record_list( self ):
+
+        # return reference
+        list_OUT = None
+
+        list_OUT = []
+        for index in range( 1, 6 ):
+            list_OUT.append( { "id" : index, "name" : "person {}".format( index ), "birth_date" : "2000-01-0{}".format( index ) } )
+        #-- END loop over records --#
+
+        return list_OUT
+
+    #-- END method make_record_list() --#
+
+
+    def test_unchanged_skipped_count( self ):
+
+        # declare variables
+        bulk_write_batch_size = None
+        record_list = None
+        expected_updated_count = None
+        test_status = None
+
+        for bulk_write_batch_size in [ None, 2 ]:
+
+            with self.subTest( bulk_write_batch_size = bulk_write_batch_size ):
+
+                # counts without change detection, to compare.
+                ETLTestPerson.objects.all().delete()
+                ETLTestPerson.etl_record_hash_field_name = None
+                test_status = ETLTestPerson.run_etl( self.make_record_list(), bulk_write_batch_size_IN = bulk_write_batch_size )
+                expected_updated_count = test_status.get_detail_value( ETLObjectLoader.STATUS_PROP_ATTR_UPDATED_COUNT )
+
+                # ! ----> test 1 - first run, hash stored but not counted
+                ETLTestPerson.objects.all().delete()
+                ETLTestPerson.etl_record_hash_field_name = "content_hash"
+                test_status = ETLTestPerson.run_etl( self.make_record_list(), bulk_write_batch_size_IN = bulk_write_batch_size )
+
+                # and the asserts
+                self.assertTrue( test_status.is_success() )
+                self.assertEqual( test_status.get_detail_value( ETLObjectLoader.STATUS_PROP_ATTR_UPDATED_COUNT ), expected_updated_count )
+                self.assertEqual( test_status.get_detail_value( ETLDjangoModelLoader.STATUS_PROP_UNCHANGED_SKIPPED_COUNT ), 0 )
+                self.assertEqual( ETLTestPerson.objects.filter( content_hash__isnull = True ).count(), 0 )
+
+                # ! ----> test 2 - same records again, all skipped
+                test_status = ETLTestPerson.run_etl( self.make_record_list(), bulk_write_batch_size_IN = bulk_write_batch_size )
+                self.assertEqual( test_status.get_detail_value( ETLDjangoModelLoader.STATUS_PROP_UNCHANGED_SKIPPED_COUNT ), 5 )
+                self.assertEqual( test_status.get_detail_value( ETLObjectLoader.STATUS_PROP_ATTR_UPDATED_COUNT ), 0 )
+
+                # ! ----> test 3 - one record changed, it alone is updated
+                record_list = self.make_record_list()
+                record_list[ 2 ][ "name" ] = "changed"
+                test_status = ETLTestPerson.run_etl( record_list, bulk_write_batch_size_IN = bulk_write_batch_size )
+                self.assertEqual( test_status.get_detail_value( ETLDjangoModelLoader.STATUS_PROP_UNCHANGED_SKIPPED_COUNT ), 4 )
+                self.assertEqual( test_status.get_detail_value( ETLObjectLoader.STATUS_PROP_ATTR_UPDATED_COUNT ), 1 )
+                self.assertEqual( ETLTestPerson.objects.get( ext_id = 3 ).name, "changed" )
+
+            #-- END with subTest() --#
+
+        #-- END loop over bulk write settings --#
+
+    #-- END method test_unchanged_skipped_count() --#
+
+#-- END unittest class TestETLDjangoModelLoaderChangeDetection --#
+
+
+class TestETLFromExcelWithHeadersReadOnly(DjangoModelTestCase):
+
+    def write_workbook( self, file_path_IN ):
+
+        # declare variables
+        test_workbook = None
+        test_worksheet = None
+
+        # columns not in spec order, plus one not in spec, and a short row.
+        test_workbook = openpyxl.Workbook()
+        test_worksheet = test_workbook.active
+        test_worksheet.append( [ "name", "nickname", "id", "birth_date" ] )
+        test_worksheet.append( [ "Ann", "A", 1, "2000-01-01" ] )
+        test_worksheet.append( [ "Bob", None, 2 ] )
+        test_workbook.save( file_path_IN )
+
+    #-- END method write_workbook() --#
+
+
+    def test_iter_worksheet_records( self ):
+
+        # declare variables
+        temp_directory = None
+        file_path = None
+        test_loader = None
+        record_list = None
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+
+            file_path = os.path.join( temp_directory, "people.xlsx" )
+            self.write_workbook( file_path )
+
+            # ! ----> test 1 - header row mapped to columns, rows streamed
+            test_loader = ETLFromExcelWithHeaders()
+            test_loader.set_etl_entity( ETLTestPerson.initialize_etl() )
+            test_loader.load_input_worksheet( file_path, read_only_IN = True )
+            test_loader.map_indexes_to_keys()
+            record_list = list( test_loader.iter_worksheet_records() )
+
+            # and the asserts
+            self.assertTrue( test_loader.is_read_only )
+            self.assertEqual( test_loader.attr_index_to_key_map, { 1 : "name", 2 : "nickname", 3 : "id", 4 : "birth_date" } )
+            self.assertEqual( test_loader.attr_key_to_index_map[ "id" ], 3 )
+            self.assertEqual( test_loader.get_unknown_attrs_list(), [ "nickname" ] )
+            self.assertEqual( record_list, [
+                { "name" : "Ann", "nickname" : "A", "id" : 1, "birth_date" : "2000-01-01" },
+                { "name" : "Bob", "nickname" : None, "id" : 2, "birth_date" : None }
+            ] )
+
+            # ! ----> test 2 - workbook closed, closing again is fine
+            test_loader.close_input_workbook()
+            self.assertIsNone( test_loader.input_workbook )
+            test_loader.close_input_workbook()
+
+        #-- END with TemporaryDirectory --#
+
+    #-- END method test_iter_worksheet_records() --#
+
+
+    def test_run_etl_closes_workbook( self ):
+
+        # declare variables
+        temp_directory = None
+        file_path = None
+        close_input_workbook = None
+        test_status = None
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+
+            file_path = os.path.join( temp_directory, "people.xlsx" )
+            self.write_workbook( file_path )
+
+            # ! ----> test 1 - run_etl() loads worksheet, then closes workbook
+            with mock.patch.object( ETLFromExcelWithHeaders, "close_input_workbook", autospec = True, side_effect = ETLFromExcelWithHeaders.close_input_workbook ) as close_input_workbook:
+                with mock.patch.object( ETLTestPerson, "get_my_etl_loader_instance", return_value = ETLFromExcelWithHeaders() ):
+                    test_status = ETLTestPerson.run_etl( worksheet_file_path_IN = file_path )
+                #-- END with mock.patch.object() --#
+            #-- END with mock.patch.object() --#
+
+            # and the asserts
+            self.assertTrue( test_status.is_success() )
+            self.assertEqual( ETLTestPerson.objects.get( ext_id = 2 ).name, "Bob" )
+            self.assertEqual( close_input_workbook.call_count, 2 )
+            self.assertIsNone( close_input_workbook.call_args[ 0 ][ 0 ].input_workbook )
+
+        #-- END with TemporaryDirectory --#
+
+    #-- END method test_run_etl_closes_workbook() --#
+
+#-- END unittest class TestETLFromExcelWithHeadersReadOnly --#
+
+
+class TestETLWorksheetsParallel(DjangoModelTestCase):
+
+    def test_run_etl_worksheets_parallel( self ):
+
+        # declare variables
+        temp_directory = None
+        file_path = None
+        test_workbook = None
+        test_worksheet = None
+        original_initialize_etl = None
+        test_status = None
+
+        # ETLTestPerson reads dictionaries - read from Excel instead.
+        original_initialize_etl = ETLTestPerson.initialize_etl
+
+        def initialize_excel_etl( cls, *args, **kwargs ):
+
+            # declare variables
+            excel_etl_spec = None
+
+            excel_etl_spec = original_initialize_etl( *args, **kwargs )
+            excel_etl_spec.set_extract_storage_type( ETLEntity.STORAGE_TYPE_XLSX_WITH_HEADERS )
+
+            return excel_etl_spec
+
+        #-- END function initialize_excel_etl() --#
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+
+            # two worksheets, columns in a different order in each.
+            file_path = os.path.join( temp_directory, "people.xlsx" )
+            test_workbook = openpyxl.Workbook()
+            test_worksheet = test_workbook.active
+            test_worksheet.title = "first"
+            test_worksheet.append( [ "id", "name" ] )
+            test_worksheet.append( [ 1, "Ann" ] )
+            test_worksheet.append( [ 2, "Bob" ] )
+            test_worksheet = test_workbook.create_sheet( "second" )
+            test_worksheet.append( [ "name", "birth_date", "id" ] )
+            test_worksheet.append( [ "Cy", "2000-01-03", 3 ] )
+            test_workbook.save( file_path )
+
+            # ! ----> test 1 - each worksheet mapped by its own header row
+            #     (threads in place of processes, so the test database and
+            #     spec patch are shared).
+            with mock.patch.object( ETLTestPerson, "initialize_etl", classmethod( initialize_excel_etl ) ):
+                with mock.patch.object( concurrent.futures, "ProcessPoolExecutor", concurrent.futures.ThreadPoolExecutor ):
+                    test_status = ETLTestPerson.run_etl_worksheets_parallel( file_path, worker_count_IN = 2 )
+                #-- END with mock.patch.object() --#
+            #-- END with mock.patch.object() --#
+
+            # and the asserts
+            self.assertEqual( dict( ETLTestPerson.objects.values_list( "ext_id", "name" ) ), { 1 : "Ann", 2 : "Bob", 3 : "Cy" } )
+            self.assertEqual( ETLTestPerson.objects.get( ext_id = 3 ).birth_date, datetime.date( 2000, 1, 3 ) )
+
+            # ! ----> test 2 - statuses merged
+            self.assertTrue( test_status.is_success() )
+            self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_PROCESSED_RECORD_COUNT ), 3 )
+            self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATE_ERROR_COUNT ), 0 )
+            self.assertEqual( test_status.get_detail_value( ETLFromExcelWithHeaders.STATUS_PROP_WORKSHEET_RECORD_COUNT_MAP ), { "first" : 2, "second" : 1 } )
+
+        #-- END with TemporaryDirectory --#
+
+    #-- END method test_run_etl_worksheets_parallel() --#
+
+#-- END unittest class TestETLWorksheetsParallel --#
+
+
+class TestETLLeanStatus(DjangoModelTestCase):
+
+    def test_store_attribute_lean( self ):
+
+        # declare variables
+        lean_status = None
+        test_instance = None
+        test_status = None
+        status_map = None
+
+        # ! ----> test 1 - same flags and details either way, no messages if lean
+        status_map = {}
+        for lean_status in [ False, True ]:
+
+            test_instance = ETLTestPerson( name = "old" )
+            test_status = ETLAttribute.store_attribute_in_ldm_instance( test_instance, "name", "new", lean_status_IN = lean_status )
+            status_map[ lean_status ] = test_status
+            self.assertEqual( test_instance.name, "new" )
+            self.assertTrue( test_status.get_detail_value( ETLAttribute.PROP_WAS_ATTR_UPDATED ) )
+            self.assertFalse( test_status.get_detail_value( ETLAttribute.PROP_WAS_UNKNOWN_ATTR ) )
+
+        #-- END loop over lean settings --#
+
+        # and the asserts
+        self.assertGreater( len( status_map[ False ].get_message_list() ), 0 )
+        self.assertEqual( len( status_map[ True ].get_message_list() ), 0 )
+        self.assertIsInstance( status_map[ True ].get_detail_value( ETLAttribute.PROP_ATTR_UPDATE_DETAIL ), ETLAttributeUpdateDetail )
+        self.assertEqual( str( status_map[ True ].get_detail_value( ETLAttribute.PROP_ATTR_UPDATE_DETAIL ) ), status_map[ False ].get_detail_value( ETLAttribute.PROP_ATTR_UPDATE_DETAIL ) )
+
+        # ! ----> test 2 - extra data, counts kept, no messages if lean
+        test_instance = ETLTestPerson( extra_data = { "a" : 1 } )
+        test_status = ETLAttribute.store_extra_data_in_ldm_instance( test_instance, { "a" : 1, "b" : 2 }, lean_status_IN = True )
+        self.assertEqual( len( test_status.get_message_list() ), 0 )
+        self.assertTrue( test_status.get_detail_value( ETLAttribute.PROP_WAS_ATTR_UPDATED ) )
+        self.assertEqual( test_status.get_detail_value( ETLAttribute.PROP_EXTRA_DATA_CHANGED_COUNT ), 1 )
+        self.assertEqual( test_status.get_detail_value( ETLAttribute.PROP_EXTRA_DATA_NOT_CHANGED_COUNT ), 1 )
+        self.assertEqual( str( test_status.get_detail_value( ETLAttribute.PROP_ATTR_UPDATE_DETAIL ) ), "X extra_data: {'b': None} ==> {'b': 2}." )
+
+    #-- END method test_store_attribute_lean() --#
+
+
+    def test_loader_lean( self ):
+
+        # declare variables
+        record = None
+        lean_status = None
+        test_loader = None
+        test_status = None
+        count_map = None
+        message_count_map = None
+        current_status = None
+
+        record = { "id" : 1, "name" : "Ann", "birth_date" : "2000-01-01", "nickname" : "A" }
+
+        # ! ----> test 1 - counters the same either way, per-record messages only if not lean
+        count_map = {}
+        message_count_map = {}
+        for lean_status in [ False, True ]:
+
+            test_loader = self.make_loader( ETLTestPerson, [ record ] )
+            test_loader.lean_status = lean_status
+            test_status = test_loader.update_instance_from_record( ETLTestPerson(), dict( record ), save_on_success_IN = False )
+            self.assertTrue( test_status.is_success() )
+            count_map[ lean_status ] = ( test_loader.attr_updated_count, test_loader.attr_not_changed_count, test_loader.attr_unknown_count )
+            message_count_map[ lean_status ] = 0
+            for current_status in test_status.get_detail_value( ETLObjectLoader.PROP_SUCCESS_STATUS_LIST ):
+                message_count_map[ lean_status ] += len( current_status.get_message_list() )
+            #-- END loop over attribute statuses --#
+
+        #-- END loop over lean settings --#
+
+        # and the asserts
+        self.assertEqual( count_map[ True ], count_map[ False ] )
+        self.assertEqual( count_map[ True ][ 2 ], 1 )
+        self.assertGreater( message_count_map[ False ], 0 )
+        self.assertEqual( message_count_map[ True ], 0 )
+
+    #-- END method test_loader_lean() --#
+
+#-- END unittest class TestETLLeanStatus --#
+
+
+class TestETLBenchmark(DjangoModelTestCase):
+
+    def make_benchmark( self, work_directory_IN ):
+
+        # return reference
+        benchmark_OUT = None
+
+        benchmark_OUT = ETLBenchmark( model_class_IN = ETLTestPerson, work_directory_IN = work_directory_IN )
+        benchmark_OUT.record_count = 5
+        benchmark_OUT.extra_field_count = 2
+        benchmark_OUT.related_count = 2
+
+        return benchmark_OUT
+
+    #-- END method make_benchmark() --#
+
+
+    def test_run_suite( self ):
+
+        # declare variables
+        temp_directory = None
+        test_benchmark = None
+        original_initialize_etl = None
+        result_list = None
+        current_result = None
+
+        original_initialize_etl = ETLTestPerson.__dict__[ "initialize_etl" ]
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+
+            # ! ----> test 1 - each scenario runs against SQLite
+            test_benchmark = self.make_benchmark( temp_directory )
+            result_list = test_benchmark.run_suite( results_file_path_IN = os.path.join( temp_directory, "results.jsonl" ) )
+
+            # and the asserts
+            self.assertEqual( [ current_result[ ETLBenchmark.PROP_SCENARIO ] for current_result in result_list ], ETLBenchmark.SCENARIO_LIST )
+            for current_result in result_list:
+                self.assertTrue( current_result[ ETLBenchmark.PROP_IS_SUCCESS ] )
+                self.assertEqual( current_result[ ETLBenchmark.PROP_PROCESSED_RECORD_COUNT ], 5 )
+                self.assertEqual( current_result[ ETLBenchmark.PROP_DATABASE_VENDOR ], "sqlite" )
+                self.assertGreater( current_result[ ETLBenchmark.PROP_QUERY_COUNT ], 0 )
+            #-- END loop over results --#
+            self.assertEqual( result_list[ 1 ][ ETLBenchmark.PROP_RELATED_RECORD_COUNT ], 10 )
+            with open( os.path.join( temp_directory, "results.jsonl" ) ) as results_file:
+                self.assertEqual( len( results_file.readlines() ), 3 )
+            #-- END with open() --#
+
+            # ! ----> test 2 - model's initialize_etl() and spec put back after Excel
+            self.assertIs( ETLTestPerson.__dict__[ "initialize_etl" ], original_initialize_etl )
+            self.assertEqual( ETLTestPerson.get_etl_spec().get_extract_storage_type(), ETLEntity.STORAGE_TYPE_DICT )
+
+        #-- END with TemporaryDirectory --#
+
+    #-- END method test_run_suite() --#
+
+
+    def test_run_benchmark_restores_on_error( self ):
+
+        # declare variables
+        temp_directory = None
+        test_benchmark = None
+        original_initialize_etl = None
+
+        original_initialize_etl = ETLTestPerson.__dict__[ "initialize_etl" ]
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+
+            # ! ----> test 1 - run fails, initialize_etl() still put back
+            test_benchmark = self.make_benchmark( temp_directory )
+            with mock.patch.object( tracemalloc, "reset_peak", side_effect = RuntimeError( "set up failed" ) ):
+                with self.assertRaises( RuntimeError ):
+                    test_benchmark.run_benchmark( ETLBenchmark.SCENARIO_EXCEL, worksheet_file_path_IN = os.path.join( temp_directory, "missing.xlsx" ) )
+                #-- END with assertRaises --#
+            #-- END with mock.patch.object() --#
+
+            # and the asserts
+            self.assertIs( ETLTestPerson.__dict__[ "initialize_etl" ], original_initialize_etl )
+            self.assertEqual( ETLTestPerson.get_etl_spec().get_extract_storage_type(), ETLEntity.STORAGE_TYPE_DICT )
+
+        #-- END with TemporaryDirectory --#
+
+    #-- END method test_run_benchmark_restores_on_error() --#
+
+#-- END unittest class TestETLBenchmark --#
+
+
+class TestLoadableDjangoModelExtraData(DjangoModelTestCase):
+
+    def test_update_extra_data_attrs( self ):
+
+        # declare variables
+        test_instance = None
+        changed_map = None
+
+        # ! ----> test 1 - no extra data yet, everything new
+        test_instance = ETLTestPerson()
+        changed_map = test_instance.update_extra_data_attrs( { "a" : 1, "b" : 2 } )
+
+        # and the asserts
+        self.assertEqual( changed_map, { "a" : None, "b" : None } )
+        self.assertEqual( test_instance.extra_data, { "a" : 1, "b" : 2 } )
+
+        # ! ----> test 2 - unchanged payload, nothing changed
+        changed_map = test_instance.update_extra_data_attrs( { "a" : 1, "b" : 2 } )
+        self.assertEqual( changed_map, {} )
+        self.assertEqual( test_instance.extra_data, { "a" : 1, "b" : 2 } )
+
+        # ! ----> test 3 - changed and new values, old values returned
+        changed_map = test_instance.update_extra_data_attrs( { "a" : 1, "b" : 3, "c" : 4 } )
+        self.assertEqual( changed_map, { "b" : 2, "c" : None } )
+        self.assertEqual( test_instance.extra_data, { "a" : 1, "b" : 3, "c" : 4 } )
+
+        # ! ----> test 4 - nothing passed in
+        self.assertEqual( test_instance.update_extra_data_attrs( {} ), {} )
+        self.assertEqual( test_instance.update_extra_data_attrs( None ), {} )
+
+    #-- END method test_update_extra_data_attrs() --#
+
+
+    def test_run_etl_extra_data( self ):
+
+        # declare variables
+        record = None
+        test_status = None
+        save_method = None
+
+        record = { "id" : 1, "name" : "Ann", "nickname" : "A", "team" : "red" }
+        ETLTestPerson.run_etl( [ dict( record ) ] )
+
+        # ! ----> test 1 - unchanged payload, instance not saved
+        with mock.patch.object( ETLTestPerson, "save", autospec = True ) as save_method:
+            test_status = ETLTestPerson.run_etl( [ dict( record ) ] )
+        #-- END with mock.patch.object() --#
+
+        # and the asserts
+        self.assertTrue( test_status.is_success() )
+        self.assertEqual( save_method.call_count, 0 )
+        self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATED_RECORD_COUNT ), 0 )
+        self.assertEqual( test_status.get_detail_value( ETLObjectLoader.STATUS_PROP_ATTR_UNKNOWN_COUNT ), 2 )
+
+        # ! ----> test 2 - changed payload, saved with merged extra data
+        record[ "team" ] = "blue"
+        test_status = ETLTestPerson.run_etl( [ dict( record ) ] )
+        self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATED_RECORD_COUNT ), 1 )
+        self.assertEqual( test_status.get_detail_value( ETLObjectLoader.STATUS_PROP_ATTR_UPDATED_COUNT ), 1 )
+        self.assertEqual( ETLTestPerson.objects.get( ext_id = 1 ).extra_data, { "nickname" : "A", "team" : "blue" } )
+
+    #-- END method test_run_etl_extra_data() --#
+
+#-- END unittest class TestLoadableDjangoModelExtraData --#
+
+
+class TestLoadableDjangoModelStatus(DjangoModelTestCase):
+
+    def test_run_etl_messages( self ):
+
+        # declare variables
+        record_list = None
+        test_status = None
+
+        # ! ----> test 1 - messages kept once, no contained statuses
+        record_list = [ { "id" : 1, "name" : "ann" }, { "id" : None, "name" : "bob" } ]
+        test_status = ETLTestPerson.run_etl( record_list_IN = record_list )
+
+        # and the asserts
+        self.assertEqual( test_status.status_container_list, [] )
+        self.assertEqual( len( test_status.get_message_list() ), 1 )
+        self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_PROCESSED_RECORD_COUNT ), 2 )
+
+        # ! ----> test 2 - bounded - only as many as the limit
+        record_list = [ { "id" : None, "name" : str( index ) } for index in range( 5 ) ]
+        test_status = ETLTestPerson.run_etl( record_list_IN = record_list, max_status_message_count_IN = 2 )
+
+        # and the asserts
+        self.assertEqual( test_status.status_container_list, [] )
+        self.assertEqual( len( test_status.get_message_list() ), 2 )
+        self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_DROPPED_STATUS_MESSAGE_COUNT ), 3 )
+
+    #-- END method test_run_etl_messages() --#
+
+
+    def test_merge_worker_status_list( self ):
+
+        # declare variables
+        worker_status_list = None
+        worker_status = None
+        test_status = None
+
+        # two workers, two messages each.
+        worker_status_list = []
+        for index in range( 2 ):
+
+            worker_status = StatusContainer()
+            worker_status.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
+            worker_status.add_message( "worker {} message 1".format( index ) )
+            worker_status.add_message( "worker {} message 2".format( index ) )
+            worker_status_list.append( worker_status )
+
+        #-- END loop over workers --#
+
+        # ! ----> test 1 - messages copied once, statuses not contained
+        test_status = ETLTestPerson.merge_worker_status_list( worker_status_list )
+
+        # and the asserts
+        self.assertEqual( test_status.status_container_list, [] )
+        self.assertEqual( len( test_status.get_message_list() ), 4 )
+
+    #-- END method test_merge_worker_status_list() --#
+
+
+    def test_merge_worker_status_list_counts( self ):
+
+        # declare variables
+        worker_status_list = None
+        worker_status = None
+        test_status = None
+
+        # two workers - second bounded, and dropped a message.
+        worker_status_list = []
+        for index in range( 2 ):
+
+            worker_status = StatusContainer()
+            worker_status.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
+            if ( index == 1 ):
+                worker_status.set_message_capacity( 1, 1 )
+            #-- END check to see if bounded worker --#
+            for message_index in range( 3 ):
+                worker_status.add_message( "worker {} message {}".format( index, message_index ) )
+            #-- END loop over messages --#
+            worker_status.set_detail_value( ETLProcessor.STATUS_PROP_PROCESSED_RECORD_COUNT, 10 + index )
+            worker_status.set_detail_value( ETLProcessor.STATUS_PROP_UPDATE_ERROR_COUNT, 1 )
+            worker_status.set_detail_value( ETLProcessor.STATUS_PROP_UPDATE_SUCCESS_COUNT, 9 + index )
+            worker_status.set_detail_value( ETLProcessor.STATUS_PROP_UPDATED_RECORD_COUNT, 5 )
+            worker_status.set_detail_value( ETLDjangoModelLoader.STATUS_PROP_UNCHANGED_SKIPPED_COUNT, 2 )
+            worker_status_list.append( worker_status )
+
+        #-- END loop over workers --#
+
+        # ! ----> test 1 - counts summed, each message once
+        ETLTestPerson.etl_record_hash_field_name = "content_hash"
+        test_status = ETLTestPerson.merge_worker_status_list( worker_status_list )
+
+        # and the asserts
+        self.assertTrue( test_status.is_success() )
+        self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_PROCESSED_RECORD_COUNT ), 21 )
+        self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATE_ERROR_COUNT ), 2 )
+        self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATE_SUCCESS_COUNT ), 19 )
+        self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_UPDATED_RECORD_COUNT ), 10 )
+        self.assertEqual( test_status.get_detail_value( ETLDjangoModelLoader.STATUS_PROP_UNCHANGED_SKIPPED_COUNT ), 4 )
+        self.assertEqual( list( test_status.get_message_list() ), [ "worker 0 message 0", "worker 0 message 1", "worker 0 message 2", "worker 1 message 0", "worker 1 message 2" ] )
+
+        # ! ----> test 2 - cap respected, dropped counted (including worker's)
+        test_status = ETLTestPerson.merge_worker_status_list( worker_status_list, max_status_message_count_IN = 3 )
+
+        # and the asserts
+        self.assertEqual( list( test_status.get_message_list() ), [ "worker 0 message 0", "worker 0 message 1", "worker 1 message 2" ] )
+        self.assertEqual( test_status.get_detail_value( ETLProcessor.STATUS_PROP_DROPPED_STATUS_MESSAGE_COUNT ), 3 )
+
+        # ! ----> test 3 - any worker error, error
+        worker_status_list[ 0 ].set_status_code( StatusContainer.STATUS_CODE_ERROR )
+        test_status = ETLTestPerson.merge_worker_status_list( worker_status_list )
+
+        # and the asserts
+        self.assertTrue( test_status.is_error() )
+
+    #-- END method test_merge_worker_status_list_counts() --#
+
+
+    def test_build_worker_kwargs( self ):
+
+        # declare variables
+        kwargs_map = None
+        test_kwargs = None
+
+        # ! ----> test 1 - file paths get suffix, others passed through
+        kwargs_map = {
+            "checkpoint_file_path_IN" : "/tmp/run.checkpoint",
+            "dead_letter_file_path_IN" : "/tmp/run.jsonl",
+            "bulk_write_batch_size_IN" : 100
+        }
+        test_kwargs = LoadableDjangoModel.build_worker_kwargs( kwargs_map, 3 )
+
+        # and the asserts
+        self.assertEqual( test_kwargs, {
+            "checkpoint_file_path_IN" : "/tmp/run.checkpoint.3",
+            "dead_letter_file_path_IN" : "/tmp/run.jsonl.3",
+            "bulk_write_batch_size_IN" : 100
+        } )
+        self.assertEqual( kwargs_map[ "checkpoint_file_path_IN" ], "/tmp/run.checkpoint" )
+
+        # ! ----> test 2 - paths not set, or None, left alone
+        test_kwargs = LoadableDjangoModel.build_worker_kwargs( { "dead_letter_file_path_IN" : None }, 0 )
+
+        # and the asserts
+        self.assertEqual( test_kwargs, { "dead_letter_file_path_IN" : None } )
+
+    #-- END method test_build_worker_kwargs() --#
+
+#-- END unittest class TestLoadableDjangoModelStatus --#
+
+
+if __name__ == '__main__':
+    unittest.main()
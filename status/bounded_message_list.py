@@ -0,0 +1,270 @@
+'''
+Usage:
+
+    # import BoundedMessageList
+    from python_utilities.status.bounded_message_list import BoundedMessageList
+
+    # make an instance that keeps the first 100 and last 100 messages.
+    my_message_list = BoundedMessageList( head_count_IN = 100, tail_count_IN = 100 )
+
+    # add messages, with optional category
+    my_message_list.append( "record 1 is missing required fields." , category_IN = "missing_required" )
+    my_message_list.append( "loaded 1000 records." )
+
+    # messages kept (first 100, then last 100), in order added.
+    kept_message_list = my_message_list.get_list()
+
+    # counts - all messages added, messages not kept, and all messages added
+    #     per category.
+    total_count = my_message_list.total_count
+    dropped_count = my_message_list.dropped_count
+    category_to_count_map = my_message_list.category_to_count_map
+
+    # StatusContainer can use one in place of its message list:
+    my_status_container.set_message_capacity( 100, 100 )
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python built-ins
+import collections
+
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+
+class BoundedMessageList( object ):
+
+
+    '''
+    BoundedMessageList is a list of messages that holds at most
+        head_count + tail_count messages, no matter how many are added: the
+        first head_count messages are kept, then the most recent tail_count
+        (a ring buffer - once full, each new message pushes out the oldest).
+        Messages in between are counted, not kept.
+
+    Each message can have a category (default CATEGORY_DEFAULT), and every
+        message added is counted by category, kept or not, so a summary of
+        everything that happened survives even when the messages don't.
+
+    Can be used where code expects a list of messages - iteration, len(),
+        indexing, append() and extend() all work on the messages kept.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+    # default category
+    CATEGORY_DEFAULT = "message"
+
+    # default capacity
+    DEFAULT_HEAD_COUNT = 100
+    DEFAULT_TAIL_COUNT = 100
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() and __str__() methods
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self, head_count_IN = DEFAULT_HEAD_COUNT, tail_count_IN = DEFAULT_TAIL_COUNT, *args, **kwargs ):
+
+        # capacity
+        self.head_count = max( 0, head_count_IN )
+        self.tail_count = max( 0, tail_count_IN )
+
+        # messages kept - ( category, message ) pairs.
+        self.head_item_list = []
+        self.tail_item_deque = collections.deque( maxlen = self.tail_count )
+
+        # counts
+        self.total_count = 0
+        self.dropped_count = 0
+        self.category_to_count_map = {}
+
+    #-- END method __init__() --#
+
+
+    def __getitem__( self, index_IN ):
+
+        return self.get_list()[ index_IN ]
+
+    #-- END method __getitem__() --#
+
+
+    def __iter__( self ):
+
+        return iter( self.get_list() )
+
+    #-- END method __iter__() --#
+
+
+    def __len__( self ):
+
+        return len( self.head_item_list ) + len( self.tail_item_deque )
+
+    #-- END method __len__() --#
+
+
+    def __str__( self ):
+
+        # return reference
+        string_OUT = ''
+
+        string_OUT = str( self.get_list() )
+        if ( self.dropped_count > 0 ):
+            string_OUT += " ( {} more not kept )".format( self.dropped_count )
+        #-- END check to see if any dropped --#
+
+        return string_OUT
+
+    #-- END method __str__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def append( self, value_IN, category_IN = None, *args, **kwargs ):
+
+        '''
+        Adds message to list, in category passed in (CATEGORY_DEFAULT if none).
+            Kept if within first head_count messages, or (until pushed out by
+            newer messages) in the last tail_count. If pushed out, counted in
+            dropped_count.
+        '''
+
+        # declare variables
+        category = None
+
+        # init
+        category = category_IN
+        if ( category is None ):
+            category = self.CATEGORY_DEFAULT
+        #-- END check to see if category --#
+
+        # count...
+        self.total_count += 1
+        self.category_to_count_map[ category ] = self.category_to_count_map.get( category, 0 ) + 1
+
+        # ...and store.
+        if ( len( self.head_item_list ) < self.head_count ):
+
+            # still room at the start.
+            self.head_item_list.append( ( category, value_IN ) )
+
+        else:
+
+            # ring buffer - is the oldest about to be pushed out?
+            if ( len( self.tail_item_deque ) == self.tail_count ):
+                self.dropped_count += 1
+            #-- END check to see if tail is full --#
+
+            if ( self.tail_count > 0 ):
+                self.tail_item_deque.append( ( category, value_IN ) )
+            #-- END check to see if tail --#
+
+        #-- END check to see if room in head --#
+
+    #-- END method append() --#
+
+
+    def extend( self, list_IN, *args, **kwargs ):
+
+        '''
+        Adds each message in the list passed in. If it is another
+            BoundedMessageList, the messages it kept are added in their
+            categories, and the messages it dropped are counted as dropped
+            here, too.
+        '''
+
+        # declare variables
+        kept_category_to_count_map = None
+        current_category = None
+        current_message = None
+        current_count = None
+
+        # BoundedMessageList?
+        if ( isinstance( list_IN, BoundedMessageList ) == True ):
+
+            # add messages kept, with their categories...
+            kept_category_to_count_map = {}
+            for current_category, current_message in list_IN.get_item_list():
+
+                self.append( current_message, category_IN = current_category )
+                kept_category_to_count_map[ current_category ] = kept_category_to_count_map.get( current_category, 0 ) + 1
+
+            #-- END loop over kept messages --#
+
+            # ...then count the ones it dropped.
+            self.total_count += list_IN.dropped_count
+            self.dropped_count += list_IN.dropped_count
+            for current_category, current_count in list_IN.category_to_count_map.items():
+
+                current_count = current_count - kept_category_to_count_map.get( current_category, 0 )
+                if ( current_count > 0 ):
+                    self.category_to_count_map[ current_category ] = self.category_to_count_map.get( current_category, 0 ) + current_count
+                #-- END check to see if any dropped --#
+
+            #-- END loop over categories --#
+
+        elif ( list_IN is not None ):
+
+            # plain list - add each.
+            for current_message in list_IN:
+
+                self.append( current_message )
+
+            #-- END loop over messages --#
+
+        #-- END check to see what kind of list --#
+
+    #-- END method extend() --#
+
+
+    def get_item_list( self ):
+
+        '''
+        Returns list of ( category, message ) pairs for the messages kept, in
+            the order they were added.
+        '''
+
+        # return reference
+        list_OUT = None
+
+        list_OUT = list( self.head_item_list )
+        list_OUT.extend( self.tail_item_deque )
+
+        return list_OUT
+
+    #-- END method get_item_list() --#
+
+
+    def get_list( self ):
+
+        '''
+        Returns list of the messages kept, in the order they were added.
+        '''
+
+        # return reference
+        list_OUT = None
+
+        # declare variables
+        current_item = None
+
+        list_OUT = [ current_item[ 1 ] for current_item in self.get_item_list() ]
+
+        return list_OUT
+
+    #-- END method get_list() --#
+
+
+#-- END class BoundedMessageList --#
@@ -57,6 +57,13 @@ Usage:
     # get list of status messages
     my_status_message_list = my_status_container.get_message_list()
 
+    # for long-running processes, limit messages held in memory - keep the
+    #     first 100 and last 100, count the rest (overall and by category).
+    my_status_container.set_message_capacity( 100, 100 )
+    my_status_container.add_message( "record 12 failed.", category_IN = "error" )
+    dropped_count = my_status_container.get_dropped_message_count()
+    category_count_map = my_status_container.get_message_category_count_map()
+
     # get detail values
     detail_1 = my_status_container.get_detail_value( "detail_name_1" )
     detail_2 = my_status_container.get_detail_value_as_int( "detail_name_2" )
@@ -72,6 +79,7 @@ Usage:
 
 # python_utilities
 from python_utilities.dictionaries.dict_helper import DictHelper
+from python_utilities.status.bounded_message_list import BoundedMessageList
 
 
 #===============================================================================
@@ -136,7 +144,7 @@ class StatusContainer( object ):
     #---------------------------------------------------------------------------
 
 
-    def add_message( self, value_IN, *args, **kwargs ):
+    def add_message( self, value_IN, category_IN = None, *args, **kwargs ):
 
         # return reference
         value_OUT = ""
@@ -150,8 +158,12 @@ class StatusContainer( object ):
             # retrieve the message list.
             message_list = self.status_message_list
 
-            # add message to the list
-            message_list.append( value_IN )
+            # add message to the list (with category, if bounded).
+            if ( isinstance( message_list, BoundedMessageList ) == True ):
+                message_list.append( value_IN, category_IN = category_IN )
+            else:
+                message_list.append( value_IN )
+            #-- END check to see if bounded --#
 
         #-- END check to see if message passed in. --#
 
@@ -342,6 +354,47 @@ class StatusContainer( object ):
     #-- END method get_detail_value_as_str() --#
 
 
+    def get_dropped_message_count( self, *args, **kwargs ):
+
+        '''
+        Returns number of messages added but not kept because of the message
+            capacity ( set_message_capacity() ). 0 if no capacity set.
+        '''
+
+        # return reference
+        value_OUT = 0
+
+        # bounded?
+        if ( isinstance( self.status_message_list, BoundedMessageList ) == True ):
+            value_OUT = self.status_message_list.dropped_count
+        #-- END check to see if bounded --#
+
+        return value_OUT
+
+    #-- END method get_dropped_message_count() --#
+
+
+    def get_message_category_count_map( self, *args, **kwargs ):
+
+        '''
+        If a message capacity is set ( set_message_capacity() ), returns map of
+            message category to count of messages added in that category, kept
+            or not. If not, returns None.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # bounded?
+        if ( isinstance( self.status_message_list, BoundedMessageList ) == True ):
+            value_OUT = self.status_message_list.category_to_count_map
+        #-- END check to see if bounded --#
+
+        return value_OUT
+
+    #-- END method get_message_category_count_map() --#
+
+
     def get_message_list( self, *args, **kwargs ):
 
         # return reference
@@ -580,6 +633,39 @@ class StatusContainer( object ):
     #-- END method get_detail_value_as_str() --#
 
 
+    def set_message_capacity( self, head_count_IN, tail_count_IN = None, *args, **kwargs ):
+
+        """
+            Method: set_message_capacity()
+
+            Purpose: limits the number of messages held - keeps the first
+                head_count_IN messages and the most recent tail_count_IN
+                (defaults to head_count_IN), and counts the rest (see
+                BoundedMessageList). Messages already added are carried over.
+
+            Params:
+            - head_count_IN - number of messages to keep from the start.
+            - tail_count_IN - number of most recent messages to keep.
+        """
+
+        # declare variables
+        tail_count = None
+        message_list = None
+
+        # init
+        tail_count = tail_count_IN
+        if ( tail_count is None ):
+            tail_count = head_count_IN
+        #-- END check to see if tail count --#
+
+        # make bounded list, carry over messages, and store it.
+        message_list = BoundedMessageList( head_count_IN = head_count_IN, tail_count_IN = tail_count )
+        message_list.extend( self.status_message_list )
+        self.status_message_list = message_list
+
+    #-- END method set_message_capacity() --#
+
+
     def set_status_code( self, value_IN, require_known_IN = True, *args, **kwargs ):
 
         # return reference
@@ -0,0 +1,158 @@
+# python imports
+import os
+import site
+import unittest
+
+# import the things we are testing.
+
+try:
+
+    from python_utilities.status.bounded_message_list import BoundedMessageList
+    from python_utilities.status.status_container import StatusContainer
+
+except ImportError as ie:
+
+    # get current directory path
+    current_directory_path = os.path.dirname( os.path.abspath( __file__ ) )
+
+    # add to python path
+    site.addsitedir( current_directory_path )
+
+    # try local import
+    from bounded_message_list import BoundedMessageList
+    from status_container import StatusContainer
+
+#-- END attempt to import status classes --#
+
+
+class TestBoundedMessageList(unittest.TestCase):
+
+    def test_append( self ):
+
+        # declare variables
+        test_list = None
+        counter = None
+
+        # ! ----> test 1 - under capacity, everything kept
+        test_list = BoundedMessageList( head_count_IN = 2, tail_count_IN = 2 )
+        test_list.append( "a" )
+        test_list.append( "b", category_IN = "error" )
+        test_list.append( "c" )
+
+        # and the asserts
+        self.assertEqual( test_list.get_list(), [ "a", "b", "c" ] )
+        self.assertEqual( len( test_list ), 3 )
+        self.assertEqual( test_list.total_count, 3 )
+        self.assertEqual( test_list.dropped_count, 0 )
+
+        # ! ----> test 2 - over capacity, first 2 and last 2 kept
+        for counter in range( 4, 11 ):
+            test_list.append( str( counter ), category_IN = "error" )
+        #-- END loop over messages --#
+
+        # and the asserts
+        self.assertEqual( test_list.get_list(), [ "a", "b", "9", "10" ] )
+        self.assertEqual( test_list[ -1 ], "10" )
+        self.assertEqual( list( test_list ), [ "a", "b", "9", "10" ] )
+        self.assertEqual( test_list.total_count, 10 )
+        self.assertEqual( test_list.dropped_count, 6 )
+        self.assertEqual( test_list.category_to_count_map, { BoundedMessageList.CATEGORY_DEFAULT : 2, "error" : 8 } )
+        self.assertEqual( test_list.get_item_list()[ 1 ], ( "error", "b" ) )
+
+        # ! ----> test 3 - no tail, everything after head dropped
+        test_list = BoundedMessageList( head_count_IN = 1, tail_count_IN = 0 )
+        test_list.append( "a" )
+        test_list.append( "b" )
+        test_list.append( "c" )
+
+        # and the asserts
+        self.assertEqual( test_list.get_list(), [ "a" ] )
+        self.assertEqual( test_list.total_count, 3 )
+        self.assertEqual( test_list.dropped_count, 2 )
+
+    #-- END method test_append() --#
+
+
+    def test_extend( self ):
+
+        # declare variables
+        source_list = None
+        test_list = None
+
+        # ! ----> test 1 - plain list
+        test_list = BoundedMessageList( head_count_IN = 1, tail_count_IN = 1 )
+        test_list.extend( [ "a", "b", "c" ] )
+
+        # and the asserts
+        self.assertEqual( test_list.get_list(), [ "a", "c" ] )
+        self.assertEqual( test_list.dropped_count, 1 )
+
+        # ! ----> test 2 - another BoundedMessageList, dropped counts carried over
+        source_list = BoundedMessageList( head_count_IN = 1, tail_count_IN = 1 )
+        source_list.append( "a", category_IN = "x" )
+        source_list.append( "b", category_IN = "y" )
+        source_list.append( "c", category_IN = "y" )
+        test_list = BoundedMessageList( head_count_IN = 5, tail_count_IN = 5 )
+        test_list.extend( source_list )
+
+        # and the asserts
+        self.assertEqual( test_list.get_list(), [ "a", "c" ] )
+        self.assertEqual( test_list.total_count, 3 )
+        self.assertEqual( test_list.dropped_count, 1 )
+        self.assertEqual( test_list.category_to_count_map, { "x" : 1, "y" : 2 } )
+
+        # ! ----> test 3 - None, nothing added
+        test_list.extend( None )
+        self.assertEqual( test_list.total_count, 3 )
+
+    #-- END method test_extend() --#
+
+#-- END unittest class TestBoundedMessageList --#
+
+
+class TestStatusContainer(unittest.TestCase):
+
+    def test_set_message_capacity( self ):
+
+        # declare variables
+        test_container = None
+        counter = None
+
+        # ! ----> test 1 - no capacity, plain list, nothing dropped
+        test_container = StatusContainer()
+        test_container.add_message( "before" )
+        test_container.add_message( "" )
+
+        # and the asserts
+        self.assertEqual( list( test_container.get_message_list() ), [ "before" ] )
+        self.assertEqual( test_container.get_dropped_message_count(), 0 )
+        self.assertIsNone( test_container.get_message_category_count_map() )
+
+        # ! ----> test 2 - set capacity, existing messages carried over
+        test_container.set_message_capacity( 2 )
+        for counter in range( 1, 6 ):
+            test_container.add_message( str( counter ), category_IN = "error" )
+        #-- END loop over messages --#
+
+        # and the asserts
+        self.assertIsInstance( test_container.get_message_list(), BoundedMessageList )
+        self.assertEqual( list( test_container.get_message_list() ), [ "before", "1", "4", "5" ] )
+        self.assertEqual( test_container.get_dropped_message_count(), 2 )
+        self.assertEqual( test_container.get_message_category_count_map(), { BoundedMessageList.CATEGORY_DEFAULT : 1, "error" : 5 } )
+
+        # ! ----> test 3 - separate tail count
+        test_container = StatusContainer()
+        test_container.set_message_capacity( 1, 0 )
+        test_container.add_messages_from_list( [ "a", "b", "c" ] )
+
+        # and the asserts
+        self.assertEqual( list( test_container.get_message_list() ), [ "a" ] )
+        self.assertEqual( test_container.get_dropped_message_count(), 2 )
+
+    #-- END method test_set_message_capacity() --#
+
+#-- END unittest class TestStatusContainer --#
+
+
+if __name__ == '__main__':
+    unittest.main()